@@ -10,6 +10,8 @@ from typing import List, Dict, Optional, Tuple, Any
 import yfinance as yf
 import json
 
+from backend.ai_models.sequence_builder import build_sequences, materialize
+
 # ML kütüphaneleri için mock implementasyon
 try:
     import lightgbm as lgb
@@ -318,6 +320,9 @@ class AIEnsembleProvider:
             # Model derle
             model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
             
+            # Keras bitişik tensör ister: pencere görünümlerini burada kopyala
+            X_train, X_val = materialize(X_train), materialize(X_val)
+            
             # Eğitim
             history = model.fit(
                 X_train, y_train,
@@ -412,15 +417,8 @@ class AIEnsembleProvider:
             X = data[feature_cols].values
             y = data['target'].values
             
-            # Sequence oluştur
-            X_sequences = []
-            y_sequences = []
-            
-            for i in range(sequence_length, len(X)):
-                X_sequences.append(X[i-sequence_length:i])
-                y_sequences.append(y[i])
-            
-            return np.array(X_sequences), np.array(y_sequences)
+            # Sequence oluştur (sıfır kopya pencere görünümü)
+            return build_sequences(X, y, sequence_length)
             
         except Exception as e:
             print(f"⚠️ Sequence oluşturma hatası: {e}")
@@ -12,6 +12,9 @@ import json
 from dataclasses import dataclass
 from enum import Enum
 import warnings
+
+import indicator_library as indicators
+
 warnings.filterwarnings('ignore')
 
 logger = logging.getLogger(__name__)
@@ -91,12 +94,7 @@ class TechnicalIndicators:
     @staticmethod
     def rsi(prices: pd.Series, window: int = 14) -> pd.Series:
         """Relative Strength Index"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.fillna(50)
+        return indicators.calculate_rsi(prices, window).fillna(50)
     
     @staticmethod
     def bollinger_bands(prices: pd.Series, window: int = 20, std_dev: float = 2) -> Tuple[pd.Series, pd.Series, pd.Series]:
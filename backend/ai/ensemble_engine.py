@@ -41,10 +41,74 @@ except ImportError:
     CATBOOST_AVAILABLE = False
     print("⚠️ CatBoost not available - install with: pip install catboost")
 
+try:
+    from ai_models.sequence_builder import build_sequences, materialize
+except ImportError:
+    from backend.ai_models.sequence_builder import build_sequences, materialize
+
+try:
+    from core.feature_store import feature_store
+except ImportError:
+    from backend.core.feature_store import feature_store
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def technical_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Technical feature columns for the ensemble models (causal, same index as df)"""
+    close = df['Close']
+    out = pd.DataFrame(index=df.index)
+
+    # Price features
+    out['Returns'] = close.pct_change()
+    out['Log_Returns'] = np.log(close / close.shift(1))
+
+    # Technical indicators
+    out['SMA_5'] = close.rolling(window=5).mean()
+    out['SMA_20'] = close.rolling(window=20).mean()
+    out['SMA_50'] = close.rolling(window=50).mean()
+
+    out['EMA_12'] = close.ewm(span=12).mean()
+    out['EMA_26'] = close.ewm(span=26).mean()
+
+    # RSI
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    out['RSI'] = 100 - (100 / (1 + rs))
+
+    # MACD
+    out['MACD'] = out['EMA_12'] - out['EMA_26']
+    out['MACD_Signal'] = out['MACD'].ewm(span=9).mean()
+    out['MACD_Histogram'] = out['MACD'] - out['MACD_Signal']
+
+    # Bollinger Bands
+    out['BB_Middle'] = close.rolling(window=20).mean()
+    bb_std = close.rolling(window=20).std()
+    out['BB_Upper'] = out['BB_Middle'] + (bb_std * 2)
+    out['BB_Lower'] = out['BB_Middle'] - (bb_std * 2)
+    out['BB_Width'] = out['BB_Upper'] - out['BB_Lower']
+    out['BB_Position'] = (close - out['BB_Lower']) / (out['BB_Upper'] - out['BB_Lower'])
+
+    # Volume features
+    out['Volume_SMA'] = df['Volume'].rolling(window=20).mean()
+    out['Volume_Ratio'] = df['Volume'] / out['Volume_SMA']
+
+    # Volatility
+    out['Volatility'] = out['Returns'].rolling(window=20).std()
+
+    # Price position
+    out['Price_Position'] = (close - close.rolling(window=20).min()) / (close.rolling(window=20).max() - close.rolling(window=20).min())
+
+    return out
+
+
+feature_store.register('ensemble_technical', technical_features, version=1, warmup=400)
+
+
 class EnsembleEngine:
     def __init__(self):
         self.models = {}
@@ -117,53 +181,17 @@ class EnsembleEngine:
         
         return data
 
-    def prepare_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Prepare technical features for ML models"""
-        df = df.copy()
-        
-        # Price features
-        df['Returns'] = df['Close'].pct_change()
-        df['Log_Returns'] = np.log(df['Close'] / df['Close'].shift(1))
-        
-        # Technical indicators
-        df['SMA_5'] = df['Close'].rolling(window=5).mean()
-        df['SMA_20'] = df['Close'].rolling(window=20).mean()
-        df['SMA_50'] = df['Close'].rolling(window=50).mean()
-        
-        df['EMA_12'] = df['Close'].ewm(span=12).mean()
-        df['EMA_26'] = df['Close'].ewm(span=26).mean()
-        
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        # MACD
-        df['MACD'] = df['EMA_12'] - df['EMA_26']
-        df['MACD_Signal'] = df['MACD'].ewm(span=9).mean()
-        df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
-        
-        # Bollinger Bands
-        df['BB_Middle'] = df['Close'].rolling(window=20).mean()
-        bb_std = df['Close'].rolling(window=20).std()
-        df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-        df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
-        df['BB_Width'] = df['BB_Upper'] - df['BB_Lower']
-        df['BB_Position'] = (df['Close'] - df['BB_Lower']) / (df['BB_Upper'] - df['BB_Lower'])
-        
-        # Volume features
-        df['Volume_SMA'] = df['Volume'].rolling(window=20).mean()
-        df['Volume_Ratio'] = df['Volume'] / df['Volume_SMA']
-        
-        # Volatility
-        df['Volatility'] = df['Returns'].rolling(window=20).std()
-        
-        # Price position
-        df['Price_Position'] = (df['Close'] - df['Close'].rolling(window=20).min()) / (df['Close'].rolling(window=20).max() - df['Close'].rolling(window=20).min())
-        
-        return df.dropna()
+    def prepare_features(self, df: pd.DataFrame, symbol: str = None, interval: str = '1d') -> pd.DataFrame:
+        """Prepare technical features for ML models (stored per symbol when a symbol is given)"""
+        if symbol is not None and 'Date' in df.columns:
+            bars = df.set_index(pd.DatetimeIndex(df['Date']))
+            features = feature_store.materialize(symbol, interval, 'ensemble_technical', bars)
+            # Store tekrarlanan tarihleri tekilleştirir: satırlar Date üzerinden hizalanır
+            features = features.reindex(bars.index)
+            features.index = df.index
+        else:
+            features = technical_features(df)
+        return pd.concat([df, features], axis=1).dropna()
 
     def train_prophet_model(self, df: pd.DataFrame, symbol: str) -> Dict[str, Any]:
         """Train Prophet model"""
@@ -226,13 +254,8 @@ class EnsembleEngine:
             
             # Create sequences
             sequence_length = self.config['lstm']['params']['sequence_length']
-            X, y = [], []
-            
-            for i in range(sequence_length, len(features_scaled)):
-                X.append(features_scaled[i-sequence_length:i])
-                y.append(features_scaled[i, 0])  # Close price
-            
-            X, y = np.array(X), np.array(y)
+            X, y = build_sequences(features_scaled, features_scaled[:, 0], sequence_length)  # Close price
+            X = materialize(X)
             
             # Split data
             split_idx = int(0.8 * len(X))
@@ -358,7 +381,7 @@ class EnsembleEngine:
             logger.info(f"📊 Training models for {symbol}")
             
             # Prepare features
-            df_features = self.prepare_features(df)
+            df_features = self.prepare_features(df, symbol=symbol)
             
             if len(df_features) < 100:
                 logger.warning(f"Insufficient data for {symbol}, skipping")
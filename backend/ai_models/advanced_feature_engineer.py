@@ -10,6 +10,11 @@ import ta
 from typing import Dict, List, Optional, Tuple
 import logging
 
+try:
+    from core.feature_store import feature_store
+except ImportError:
+    from backend.core.feature_store import feature_store
+
 logger = logging.getLogger(__name__)
 
 class AdvancedFeatureEngineer:
@@ -143,17 +148,25 @@ class AdvancedFeatureEngineer:
             logger.error(f"Rolling özelliği oluşturma hatası: {e}")
             return df
     
-    def engineer_all_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Tüm özellikleri mühendislik et"""
+    def build_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Tüm özellik adımlarını sırayla uygula (NaN temizliği yapılmaz)"""
+        df = self.calculate_technical_indicators(df)
+        df = self.calculate_advanced_features(df)
+        df = self.create_interaction_features(df)
+        df = self.create_lag_features(df)
+        df = self.create_rolling_features(df)
+        return df
+    
+    def engineer_all_features(self, df: pd.DataFrame, symbol: Optional[str] = None,
+                              interval: str = '1d') -> pd.DataFrame:
+        """Tüm özellikleri mühendislik et (symbol verilirse feature store'dan)"""
         try:
             logger.info("Özellik mühendisliği başlıyor...")
             
-            # Sırayla özellikleri ekle
-            df = self.calculate_technical_indicators(df)
-            df = self.calculate_advanced_features(df)
-            df = self.create_interaction_features(df)
-            df = self.create_lag_features(df)
-            df = self.create_rolling_features(df)
+            if symbol is not None:
+                df = feature_store.materialize(symbol, interval, 'advanced_features', df)
+            else:
+                df = self.build_features(df)
             
             # NaN değerleri temizle
             df = df.dropna()
@@ -253,3 +266,10 @@ class AdvancedFeatureEngineer:
         except Exception as e:
             logger.error(f"Özellik özet alma hatası: {e}")
             return {}
+
+
+def _advanced_features(df: pd.DataFrame) -> pd.DataFrame:
+    return AdvancedFeatureEngineer().build_features(df.copy())
+
+
+feature_store.register('advanced_features', _advanced_features, version=1, warmup=300, cumulative=('obv',))
@@ -21,6 +21,11 @@ from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 import os
 
+from ai_models.sequence_builder import (
+    build_sequences, materialize, virtual_nbytes, SequenceBatchGenerator
+)
+from indicator_library import calculate_macd, calculate_rsi
+
 logger = logging.getLogger(__name__)
 
 class LSTMModel:
@@ -42,6 +47,8 @@ class LSTMModel:
         self.learning_rate = 0.001
         self.batch_size = 32
         self.epochs = 100
+        # Bu boyutun üzerindeki sequence tensörleri mini-batch olarak akıtılır
+        self.max_in_memory_bytes = 512 * 1024 * 1024
         
         # GPU kullanımı
         self.setup_gpu()
@@ -94,12 +101,7 @@ class LSTMModel:
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """RSI hesapla"""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
+            return calculate_rsi(prices, period)
         except Exception as e:
             logger.error(f"RSI hesaplama hatası: {e}")
             return pd.Series(50, index=prices.index)
@@ -107,10 +109,7 @@ class LSTMModel:
     def calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.Series:
         """MACD hesapla"""
         try:
-            ema_fast = prices.ewm(span=fast).mean()
-            ema_slow = prices.ewm(span=slow).mean()
-            macd = ema_fast - ema_slow
-            return macd
+            return calculate_macd(prices, fast, slow, signal)[0]
         except Exception as e:
             logger.error(f"MACD hesaplama hatası: {e}")
             return pd.Series(0, index=prices.index)
@@ -139,20 +138,17 @@ class LSTMModel:
             # Normalize et
             scaled_data = self.scaler.fit_transform(feature_data)
             
-            X, y = [], []
+            # Target: i anından itibaren prediction_steps sonraki fiyat değişimi
+            close = df['Close'].values.astype(float)
+            steps = self.prediction_steps
+            current_price = close[self.sequence_length - 1:len(close) - steps]
+            future_price = close[self.sequence_length + steps - 1:]
+            price_change = (future_price - current_price) / current_price
             
-            for i in range(self.sequence_length, len(scaled_data) - self.prediction_steps + 1):
-                # Input sequence
-                X.append(scaled_data[i-self.sequence_length:i])
-                
-                # Target: gelecek 4 saatlik fiyat değişimi
-                future_prices = df['Close'].iloc[i:i+self.prediction_steps].values
-                current_price = df['Close'].iloc[i-1]
-                price_change = (future_prices[-1] - current_price) / current_price
-                
-                y.append(price_change)
+            # Input sequence'leri: sıfır kopya kayan pencere görünümü
+            X, _ = build_sequences(scaled_data, None, self.sequence_length, horizon=steps)
             
-            return np.array(X), np.array(y)
+            return X, price_change[:len(X)]
             
         except Exception as e:
             logger.error(f"Sequence hazırlama hatası: {e}")
@@ -216,6 +212,21 @@ class LSTMModel:
             if self.model is None:
                 raise ValueError("Model oluşturulamadı")
             
+            # Büyük veri: pencereleri kopyalamadan mini-batch akıt
+            streaming = virtual_nbytes(X) > self.max_in_memory_bytes
+            if streaming:
+                logger.info(f"Sequence tensörü {virtual_nbytes(X) / 1e6:.0f} MB, mini-batch akışı kullanılıyor")
+                train_data = SequenceBatchGenerator([X_train], [y_train], batch_size=self.batch_size).to_keras()
+                val_data = SequenceBatchGenerator([X_val], [y_val], batch_size=self.batch_size).to_keras()
+                fit_args = {'x': train_data, 'validation_data': val_data}
+            else:
+                val_data = materialize(X_val)
+                fit_args = {
+                    'x': materialize(X_train), 'y': y_train,
+                    'validation_data': (val_data, y_val),
+                    'batch_size': self.batch_size
+                }
+            
             # Callbacks
             callbacks = [
                 EarlyStopping(monitor='val_loss', patience=10, restore_best_weights=True),
@@ -225,16 +236,14 @@ class LSTMModel:
             
             # Eğitim
             history = self.model.fit(
-                X_train, y_train,
-                validation_data=(X_val, y_val),
-                batch_size=self.batch_size,
+                **fit_args,
                 epochs=self.epochs,
                 callbacks=callbacks,
                 verbose=1
             )
             
             # Validation metrikleri
-            val_predictions = self.model.predict(X_val)
+            val_predictions = self.model.predict(val_data)
             val_mse = mean_squared_error(y_val, val_predictions)
             val_mae = mean_absolute_error(y_val, val_predictions)
             
@@ -256,39 +265,85 @@ class LSTMModel:
             logger.error(f"LSTM eğitim hatası: {e}")
             return {}
     
+    def _last_sequence(self, df: pd.DataFrame) -> np.ndarray:
+        """Feature'ları oluştur ve son sequence'i (sequence_length, features) döndür"""
+        features_df = self.create_features(df)
+        feature_data = features_df[self.feature_columns].values
+        scaled_data = self.scaler.transform(feature_data)
+        return scaled_data[-self.sequence_length:]
+    
+    def forecast_batch(self, sequences: np.ndarray) -> np.ndarray:
+        """
+        Recursive multi-step forecast, tüm semboller tek batch'te
+        
+        Args:
+            sequences: (n_symbols, sequence_length, n_features)
+            
+        Returns:
+            (n_symbols, prediction_steps) tahmin matrisi
+        """
+        if not self.is_trained or self.model is None:
+            raise ValueError("Model eğitilmemiş")
+        
+        current = np.array(sequences, dtype=np.float32, copy=True)
+        outputs = np.empty((current.shape[0], self.prediction_steps), dtype=np.float32)
+        
+        for step in range(self.prediction_steps):
+            # Küçük batch'lerde model(...) predict()'ten belirgin şekilde hızlı
+            preds = np.asarray(self.model(current, training=False)).reshape(-1)
+            outputs[:, step] = preds
+            
+            # Sequence'i güncelle (basit yaklaşım)
+            current = np.roll(current, -1, axis=1)
+            current[:, -1, 0] = preds  # Close price güncelle
+        
+        return outputs
+    
+    def predict_batch(self, dfs: List[pd.DataFrame]) -> List[Tuple[float, List[float]]]:
+        """
+        Birden fazla sembol için tek forward pass zinciriyle tahmin.
+        Sequence'i oluşturulamayan (kısa/bozuk) frame'ler yalnız kendileri için (0.0, []) döner.
+        """
+        results: List[Tuple[float, List[float]]] = [(0.0, []) for _ in dfs]
+        sequences, positions = [], []
+        for i, df in enumerate(dfs):
+            try:
+                sequence = self._last_sequence(df)
+                if sequence.shape != (self.sequence_length, len(self.feature_columns)):
+                    raise ValueError(f"yetersiz veri: {sequence.shape[0]}/{self.sequence_length} bar")
+                if not np.isfinite(sequence).all():
+                    raise ValueError("sequence NaN/inf içeriyor")
+            except Exception as e:
+                logger.error(f"LSTM batch tahmin hatası (#{i}): {e}")
+                continue
+            sequences.append(sequence)
+            positions.append(i)
+        if not sequences:
+            return results
+        
+        try:
+            forecasts = self.forecast_batch(np.stack(sequences))
+        except Exception as e:
+            logger.error(f"LSTM batch tahmin hatası: {e}")
+            return results
+        for i, row in zip(positions, forecasts):
+            results[i] = (float(row[0]), [float(p) for p in row])
+        return results
+    
     def predict(self, df: pd.DataFrame) -> Tuple[float, List[float]]:
         """Tahmin yap"""
         try:
             if not self.is_trained or self.model is None:
                 raise ValueError("Model eğitilmemiş")
             
-            # Feature'ları oluştur
-            features_df = self.create_features(df)
-            
-            # Son sequence'i al
-            feature_data = features_df[self.feature_columns].values
-            scaled_data = self.scaler.transform(feature_data)
-            
             # Son 60 mum
-            last_sequence = scaled_data[-self.sequence_length:].reshape(1, self.sequence_length, len(self.feature_columns))
-            
-            # Tahmin
-            prediction = self.model.predict(last_sequence)[0][0]
+            last_sequence = self._last_sequence(df)[np.newaxis, ...]
             
-            # 4 saatlik tahminler
-            multi_step_predictions = []
-            current_sequence = last_sequence.copy()
-            
-            for _ in range(self.prediction_steps):
-                pred = self.model.predict(current_sequence)[0][0]
-                multi_step_predictions.append(pred)
-                
-                # Sequence'i güncelle (basit yaklaşım)
-                # Gerçek uygulamada daha sofistike olabilir
-                current_sequence = np.roll(current_sequence, -1, axis=1)
-                current_sequence[0, -1, 0] = pred  # Close price güncelle
+            # 4 saatlik tahminler (ilk adım = anlık tahmin)
+            forecast = self.forecast_batch(last_sequence)[0]
+            multi_step_predictions = [float(p) for p in forecast]
             
-            return prediction, multi_step_predictions
+            return multi_step_predictions[0], multi_step_predictions
             
         except Exception as e:
             logger.error(f"LSTM tahmin hatası: {e}")
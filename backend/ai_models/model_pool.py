@@ -0,0 +1,229 @@
+"""
+Model Pool - Sıcak model havuzu ve tahmin mikro-batch katmanı
+- Her model süreç başına bir kez yüklenir (joblib/keras yükleme maliyeti tek sefer)
+- Eşzamanlı istekler tek bir predict çağrısında birleştirilir
+- Model başına p50/p99 inference gecikmesi
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Son N inference süresini tutan sabit boyutlu pencere"""
+
+    def __init__(self, window: int = 1000):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.batch_sizes: Deque[int] = deque(maxlen=window)
+        self.total_calls = 0
+
+    def record(self, elapsed_ms: float, batch_size: int = 1):
+        self.samples.append(elapsed_ms)
+        self.batch_sizes.append(batch_size)
+        self.total_calls += 1
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {'count': 0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'mean_batch_size': 0.0}
+        arr = np.fromiter(self.samples, dtype=float)
+        return {
+            'count': self.total_calls,
+            'p50_ms': round(float(np.percentile(arr, 50)), 3),
+            'p99_ms': round(float(np.percentile(arr, 99)), 3),
+            'mean_batch_size': round(float(np.mean(self.batch_sizes)), 2)
+        }
+
+
+class MicroBatcher:
+    """
+    Kısa bir pencere içinde gelen tekil istekleri toplayıp tek predict
+    çağrısında çalıştırır. predict_fn bir input listesi alır ve aynı
+    sırada sonuç listesi döndürür.
+    """
+
+    def __init__(self, name: str, predict_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0,
+                 latency: Optional[LatencyTracker] = None):
+        self.name = name
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.latency = latency or LatencyTracker()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def submit(self, item: Any) -> Any:
+        """Tek bir input gönder, batch sonucu içindeki kendi çıktısını bekle"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item, future = await self._queue.get()
+            batch: List[Tuple[Any, asyncio.Future]] = [(item, future)]
+            deadline = loop.time() + self.max_wait_ms / 1000.0
+
+            # Pencere dolana veya batch büyüklüğüne ulaşana kadar topla
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            inputs = [b[0] for b in batch]
+            try:
+                start = time.perf_counter()
+                outputs = await loop.run_in_executor(None, self.predict_fn, inputs)
+                self.latency.record((time.perf_counter() - start) * 1000.0, len(inputs))
+                for (_, fut), out in zip(batch, outputs):
+                    if not fut.done():
+                        fut.set_result(out)
+            except Exception as e:
+                logger.error(f"❌ {self.name} batch tahmin hatası: {e}")
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+
+class ModelPool:
+    """Süreç başına sıcak model havuzu"""
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._batchers: Dict[str, MicroBatcher] = {}
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Model fabrikası kaydet (yükleme ilk kullanımda yapılır)"""
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """Sıcak modeli getir, yoksa bir kez yükle (yükleme hatası havuza girmez, sonraki çağrı yeniden dener)"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            model = self._models.get(name)
+            if model is None:
+                factory = self._factories.get(name)
+                if factory is None:
+                    raise KeyError(f"Model kayıtlı değil: {name}")
+                start = time.perf_counter()
+                model = factory()
+                self._models[name] = model
+                logger.info(f"🔥 {name} havuza yüklendi ({(time.perf_counter() - start) * 1000:.1f} ms)")
+        return model
+
+    def put(self, name: str, model: Any):
+        """Yeni eğitilmiş modeli havuza koy (eskisinin yerine geçer)"""
+        with self._lock:
+            self._models[name] = model
+
+    def invalidate(self, name: str):
+        with self._lock:
+            self._models.pop(name, None)
+
+    def latency(self, name: str) -> LatencyTracker:
+        tracker = self._latency.get(name)
+        if tracker is None:
+            tracker = self._latency.setdefault(name, LatencyTracker())
+        return tracker
+
+    def timed_predict(self, name: str, method: str, *args, batch_size: int = 1, **kwargs) -> Any:
+        """Havuzdaki modelin bir metodunu çağır ve gecikmeyi kaydet"""
+        model = self.get(name)
+        start = time.perf_counter()
+        result = getattr(model, method)(*args, **kwargs)
+        self.latency(name).record((time.perf_counter() - start) * 1000.0, batch_size)
+        return result
+
+    def batcher(self, name: str, predict_fn: Callable[[List[Any]], List[Any]],
+                max_batch_size: int = 64, max_wait_ms: float = 5.0) -> MicroBatcher:
+        """Model için mikro-batcher getir/oluştur"""
+        batcher = self._batchers.get(name)
+        if batcher is None:
+            batcher = MicroBatcher(name, predict_fn, max_batch_size, max_wait_ms, self.latency(name))
+            self._batchers[name] = batcher
+        return batcher
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'loaded': sorted(self._models.keys()),
+            'registered': sorted(self._factories.keys()),
+            'latency': {name: t.summary() for name, t in self._latency.items()}
+        }
+
+    async def close(self):
+        for batcher in self._batchers.values():
+            await batcher.close()
+        self._batchers.clear()
+
+
+def _load_lstm():
+    from ai_models.lstm_model import LSTMModel
+    model = LSTMModel()
+    if not model.load_model():
+        raise FileNotFoundError("LSTM modeli yüklenemedi (eğitilmemiş)")
+    return model
+
+
+def _load_lightgbm():
+    from ai_models.lightgbm_model import LightGBMModel
+    model = LightGBMModel()
+    if not model.load_model():
+        raise FileNotFoundError("LightGBM modeli yüklenemedi (eğitilmemiş)")
+    return model
+
+
+def _load_ensemble_manager():
+    from ai_models.ensemble_manager import AIEnsembleManager
+    return AIEnsembleManager()
+
+
+# Global instance
+model_pool = ModelPool()
+model_pool.register('lstm', _load_lstm)
+model_pool.register('lightgbm', _load_lightgbm)
+model_pool.register('ensemble', _load_ensemble_manager)
+
+
+async def predict_lstm(df) -> Tuple[float, List[float]]:
+    """LSTM tahmini; eşzamanlı istekler tek forecast_batch çağrısında birleşir"""
+    def _run(frames):
+        return model_pool.get('lstm').predict_batch(frames)
+    return await model_pool.batcher('lstm', _run).submit(df)
+
+
+def loaded_or_none(name: str) -> Any:
+    """Havuzdaki modeli getir; yüklenemiyorsa (eğitilmemiş) None"""
+    try:
+        return model_pool.get(name)
+    except Exception as e:
+        logger.debug(f"{name} havuzdan yüklenemedi: {e}")
+        return None
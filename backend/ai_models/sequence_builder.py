@@ -0,0 +1,176 @@
+"""
+Sequence Builder - LSTM/Transformer için kayan pencere tensörleri
+- sliding_window_view ile sıfır kopya (N, seq_len, features) görünümler
+- Kopya yalnızca framework gerektirdiğinde (materialize)
+- Çoklu sembol batch üretimi
+- Mini-batch akışı: yıllarca dakikalık veri belleğe sığar
+"""
+
+import logging
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+
+def sliding_windows(data: np.ndarray, sequence_length: int, count: Optional[int] = None) -> np.ndarray:
+    """
+    Sıfır kopya kayan pencere görünümü
+
+    windows[k] == data[k:k + sequence_length], yani i = k + sequence_length
+    indeksinden önceki pencere.
+
+    Args:
+        data: (T, features) veya (T,) dizi
+        sequence_length: Pencere uzunluğu
+        count: Döndürülecek pencere sayısı (varsayılan: tümü)
+
+    Returns:
+        (N, sequence_length, features) salt okunur strided görünüm
+    """
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data[:, np.newaxis]
+    if len(data) < sequence_length:
+        return np.empty((0, sequence_length, data.shape[1]), dtype=data.dtype)
+
+    # sliding_window_view pencere eksenini sona ekler: (N, features, seq_len)
+    windows = sliding_window_view(data, sequence_length, axis=0).swapaxes(1, 2)
+    if count is not None:
+        windows = windows[:max(count, 0)]
+    return windows
+
+
+def build_sequences(features: np.ndarray, targets: Optional[np.ndarray], sequence_length: int,
+                    horizon: int = 1) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Klasik `for i in range(seq_len, len - horizon + 1)` döngüsünün vektörel karşılığı
+
+    X[k] = features[i - seq_len:i], y[k] = targets[i + horizon - 1], i = seq_len + k
+
+    Args:
+        features: (T, features) dizi
+        targets: (T,) hedef dizisi veya None
+        sequence_length: Pencere uzunluğu
+        horizon: Hedefin kaç adım ileride olduğu (1 = aynı i indeksi)
+
+    Returns:
+        (X görünümü, y)
+    """
+    n_samples = len(features) - sequence_length - horizon + 1
+    X = sliding_windows(features, sequence_length, count=n_samples)
+    if targets is None:
+        return X, None
+    start = sequence_length + horizon - 1
+    y = np.asarray(targets)[start:start + len(X)]
+    return X, y
+
+
+def materialize(windows: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """Framework'ün istediği bitişik (C-contiguous) kopyayı üret"""
+    return np.ascontiguousarray(windows, dtype=dtype)
+
+
+def virtual_nbytes(windows: np.ndarray, dtype=np.float32) -> int:
+    """Görünüm materialize edilirse kaplayacağı bellek (byte)"""
+    return int(np.prod(windows.shape)) * np.dtype(dtype).itemsize
+
+
+def build_multi_symbol_sequences(panel: Dict[str, np.ndarray], sequence_length: int,
+                                 target_column: Optional[int] = None,
+                                 horizon: int = 1) -> Tuple[List[np.ndarray], List[np.ndarray], List[str]]:
+    """
+    Birden fazla sembol için pencere görünümleri (kopya yok)
+
+    Args:
+        panel: {symbol: (T, features)} dizileri
+        sequence_length: Pencere uzunluğu
+        target_column: Hedef olarak kullanılacak feature sütunu (None ise y üretilmez)
+        horizon: Hedef ufku
+
+    Returns:
+        (X görünümleri, y dizileri, semboller)
+    """
+    xs, ys, symbols = [], [], []
+    for symbol, data in panel.items():
+        data = np.asarray(data)
+        targets = data[:, target_column] if target_column is not None else None
+        X, y = build_sequences(data, targets, sequence_length, horizon)
+        if len(X) == 0:
+            continue
+        xs.append(X)
+        ys.append(y if y is not None else np.empty(0))
+        symbols.append(symbol)
+    return xs, ys, symbols
+
+
+class SequenceBatchGenerator:
+    """
+    Pencere görünümlerinden mini-batch akışı
+
+    Her batch için yalnızca batch_size kadar pencere kopyalanır; tam tensör
+    hiçbir zaman bellekte oluşmaz. Birden fazla sembolün görünümlerini tek
+    indeks uzayında birleştirir.
+    """
+
+    def __init__(self, windows: Sequence[np.ndarray], targets: Sequence[np.ndarray],
+                 batch_size: int = 32, shuffle: bool = False, dtype=np.float32, seed: Optional[int] = None):
+        self.windows = list(windows)
+        self.targets = list(targets)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.dtype = dtype
+        self._rng = np.random.default_rng(seed)
+
+        sizes = np.array([len(w) for w in self.windows], dtype=np.int64)
+        self._offsets = np.concatenate([[0], np.cumsum(sizes)])
+        self.n_samples = int(self._offsets[-1])
+        self._order = np.arange(self.n_samples)
+        if self.shuffle:
+            self._rng.shuffle(self._order)
+
+    def __len__(self) -> int:
+        return (self.n_samples + self.batch_size - 1) // self.batch_size
+
+    def __getitem__(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        flat = self._order[index * self.batch_size:(index + 1) * self.batch_size]
+        # Global indeksi (sembol, yerel indeks) çiftine çevir
+        part = np.searchsorted(self._offsets, flat, side='right') - 1
+        local = flat - self._offsets[part]
+
+        first = self.windows[0]
+        X = np.empty((len(flat),) + first.shape[1:], dtype=self.dtype)
+        y = np.empty(len(flat), dtype=self.dtype)
+        for p in np.unique(part):
+            mask = part == p
+            X[mask] = self.windows[p][local[mask]]
+            y[mask] = self.targets[p][local[mask]]
+        return X, y
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            self._rng.shuffle(self._order)
+
+    def to_keras(self):
+        """keras.utils.Sequence adaptörü (TensorFlow yalnızca burada import edilir)"""
+        from tensorflow.keras.utils import Sequence as KerasSequence
+
+        generator = self
+
+        class _KerasSequence(KerasSequence):
+            def __len__(self):
+                return len(generator)
+
+            def __getitem__(self, index):
+                return generator[index]
+
+            def on_epoch_end(self):
+                generator.on_epoch_end()
+
+        return _KerasSequence()
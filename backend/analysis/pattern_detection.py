@@ -15,6 +15,11 @@ import ta
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+try:
+    from core.compute_pool import cpu_bound
+except ImportError:
+    from backend.core.compute_pool import cpu_bound
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -377,6 +382,11 @@ class TechnicalPatternEngine:
             logger.error(f"Pattern tarama hatası: {e}")
             return []
 
+@cpu_bound(engine=TechnicalPatternEngine)
+def scan_patterns(engine: TechnicalPatternEngine, df: pd.DataFrame, symbol: str = None) -> List[PatternSignal]:
+    """Süreç havuzunda, işçinin hazır motoruyla tarama: await scan_patterns(df, symbol)"""
+    return engine.scan_all_patterns(df, symbol)
+
 # Test fonksiyonu
 def test_pattern_detection():
     """Teknik formasyon tespitini test et"""
@@ -0,0 +1,5 @@
+"""Analitik kernel micro-benchmark paketi (python -m benchmarks)"""
+
+from .harness import (KERNELS, BenchmarkRunner, append_history, format_table, kernel, load_history,
+                      plot_trends, trend)
+from . import kernels  # noqa: F401  (kernel kayıtları)
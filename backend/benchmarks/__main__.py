@@ -0,0 +1,93 @@
+"""
+Kullanım (backend dizininden, ağ gerekmez):
+    python -m benchmarks list
+    python -m benchmarks run                       # quick preset, tüm kernel'ler
+    python -m benchmarks run --preset full --kernels harmonic_gartley triple_barrier_labels
+    python -m benchmarks trend --kernel harmonic_gartley --chart trend.png
+    python -m benchmarks check                     # hızlı kernel'ler == eski döngüler
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from . import KERNELS, BenchmarkRunner, append_history, format_table, load_history, plot_trends, trend
+from .harness import HISTORY_PATH, PRESETS, size_label
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Analytics kernel micro-benchmarks')
+    parser.add_argument('--history', default=HISTORY_PATH, help='JSONL history path')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('list', help='list registered kernels and sizes')
+
+    run = sub.add_parser('run', help='measure kernels and append to history')
+    run.add_argument('--preset', default='quick', choices=sorted(PRESETS))
+    run.add_argument('--kernels', nargs='*', default=None)
+    run.add_argument('--budget', type=float, default=None, help='max estimated seconds per call before skipping')
+    run.add_argument('--target-time', type=float, default=1.0, help='timed seconds per size (repeats)')
+    run.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    run.add_argument('--no-history', action='store_true', help='do not append to history')
+    run.add_argument('--json', default=None, help='also write this run to a JSON file')
+
+    ck = sub.add_parser('check', help='compare optimised kernels against the reference loops')
+    ck.add_argument('--checks', nargs='*', default=None)
+
+    tr = sub.add_parser('trend', help='show history for a kernel')
+    tr.add_argument('--kernel', default=None, help='kernel name (default: all)')
+    tr.add_argument('--chart', default=None, help='write a PNG trend chart (matplotlib)')
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    logging.getLogger(__package__).setLevel(logging.INFO)
+
+    if args.command == 'list':
+        for name, spec in KERNELS.items():
+            print(f"{name:<24} {spec.description}")
+            print(f"{'':<24} sizes: {'; '.join(size_label(s) for s in spec.sizes)}")
+        return 0
+
+    if args.command == 'run':
+        runner = BenchmarkRunner(preset=args.preset, budget=args.budget, target_time=args.target_time,
+                                 memory=not args.no_memory)
+        record = runner.run(args.kernels)
+        print(format_table(record))
+        if not args.no_history:
+            print(f"💾 History: {append_history(record, args.history)}")
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(record, f, indent=2)
+        return 1 if any(r['status'] == 'error' for r in record['results']) else 0
+
+    if args.command == 'check':
+        from .consistency import CHECKS
+        failed = 0
+        for name in args.checks or list(CHECKS):
+            result = CHECKS[name]()
+            print(f"{'✅' if result['ok'] else '❌'} {name}: {result['patterns']} ({result['seeds']} seed, {result['bars']} bar)")
+            for problem in result['problems'][:20]:
+                print(f"   {problem}")
+            failed += not result['ok']
+        return 1 if failed else 0
+
+    history = load_history(args.history)
+    if not history:
+        print(f"History boş: {args.history}")
+        return 1
+    names = [args.kernel] if args.kernel else sorted({r['kernel'] for h in history for r in h['results']})
+    for name in names:
+        data = trend(history, name)
+        if data.empty:
+            continue
+        table = data.pivot_table(index=['timestamp', 'commit'], columns='size', values='median_ms', sort=False)
+        print(f"\n📈 {name} (median ms)")
+        print(table.round(3).to_string())
+    if args.chart:
+        print(f"🖼️ Chart: {plot_trends(history, args.chart, names)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Hızlandırılmış kernel'lerin eski döngülerle tutarlılık kontrolü
+
+Harmonic XABCD dedektörleri (Gartley, Butterfly, Bat) swing_pattern_core aday
+üreticisine taşındı. Burada eski O(H*L*n) döngüler referans olarak korunur;
+aynı sentetik veride yeni dedektörlerle karşılaştırılır. Bilinen tek fark:
+aynı B-C-D bacaklarını paylaşan adaylardan yalnızca en güvenilir olanı kalır,
+referans sonuçlara da aynı seçim uygulanır.
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from .generators import synthetic_ohlcv
+from .kernels import BACKEND_DIR  # noqa: F401  (backend sys.path'e eklenir)
+
+Prices = Tuple[float, float, float, float, float]
+
+
+def reference_swing_points(highs: np.ndarray, lows: np.ndarray, window: int = 5) -> Tuple[List[int], List[int]]:
+    """Eski swing tespiti: her bar için pencere taraması"""
+    swing_highs, swing_lows = [], []
+    for i in range(window, len(highs) - window):
+        if all(highs[i] >= highs[j] for j in range(i - window, i + window + 1)):
+            swing_highs.append(i)
+        if all(lows[i] <= lows[j] for j in range(i - window, i + window + 1)):
+            swing_lows.append(i)
+    return swing_highs, swing_lows
+
+
+def reference_xabcd(highs: np.ndarray, lows: np.ndarray,
+                    validate: Callable[..., bool]) -> List[Tuple[Tuple[int, ...], Prices]]:
+    """Eski XABCD döngüsü: (X, A) çiftleri, B/C/D için 'sonraki swing' liste taraması"""
+    swing_highs, swing_lows = reference_swing_points(highs, lows)
+    found = []
+    if len(swing_highs) < 3 or len(swing_lows) < 2:
+        return found
+    for i in range(len(swing_highs) - 2):
+        for j in range(len(swing_lows) - 1):
+            x_idx, a_idx = swing_lows[j], swing_highs[i]
+            b_candidates = [idx for idx in swing_lows if idx > a_idx]
+            if not b_candidates:
+                continue
+            b_idx = b_candidates[0]
+            c_candidates = [idx for idx in swing_highs if idx > b_idx]
+            if not c_candidates:
+                continue
+            c_idx = c_candidates[0]
+            d_candidates = [idx for idx in swing_lows if idx > c_idx]
+            if not d_candidates:
+                continue
+            d_idx = d_candidates[0]
+            prices = (lows[x_idx], highs[a_idx], lows[b_idx], highs[c_idx], lows[d_idx])
+            if validate(*prices):
+                found.append(((x_idx, a_idx, b_idx, c_idx, d_idx), prices))
+    return found
+
+
+def _within(actual: float, expected: float, tolerance: float = 0.08) -> bool:
+    return abs(actual - expected) / expected <= tolerance
+
+
+def _ratios(x: float, a: float, b: float, c: float, d: float) -> Tuple[float, float, float, float]:
+    """AB/XA, BC/AB, CD/BC, AD/XA"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (a - b) / (a - x), (c - b) / (a - b), (c - d) / (c - b), (a - d) / (a - x)
+
+
+def validate_gartley(*prices: float) -> bool:
+    """Eski HarmonicPatternDetector._validate_gartley_ratios"""
+    ab, bc, cd, ad = _ratios(*prices)
+    return _within(ab, 0.618) and 0.382 <= bc <= 0.886 and 1.272 <= cd <= 1.618 and _within(ad, 0.786)
+
+
+def gartley_confidence(*prices: float) -> float:
+    """Eski HarmonicPatternDetector._calculate_gartley_confidence"""
+    x, a = prices[0], prices[1]
+    ab, bc, cd, ad = _ratios(*prices)
+    confidence = 100.0 - (20 if a - x <= 0 else 0)
+    confidence -= abs(ab - 0.618) / 0.618 * 50
+    confidence += 10 if 0.382 <= bc <= 0.886 else -20
+    confidence += 10 if 1.272 <= cd <= 1.618 else -20
+    confidence -= abs(ad - 0.786) / 0.786 * 50
+    return max(0, min(100, confidence))
+
+
+def butterfly_validator(ratios: Dict[str, float]) -> Callable[..., bool]:
+    """Eski ButterflyPatternDetector._validate_butterfly_ratios"""
+    def validate(*prices: float) -> bool:
+        ab, bc, cd, ad = _ratios(*prices)
+        return (_within(ab, ratios['AB_retracement'])
+                and ratios['BC_retracement_min'] <= bc <= ratios['BC_retracement_max']
+                and ratios['CD_extension_min'] <= cd <= ratios['CD_extension_max']
+                and _within(ad, ratios['D_extension']))
+    return validate
+
+
+def bat_validator(ratios: Dict[str, float]) -> Callable[..., bool]:
+    """Eski BatPatternDetector._validate_bat_ratios"""
+    def validate(*prices: float) -> bool:
+        ab, bc, cd, ad = _ratios(*prices)
+        return (ratios['AB_retracement_min'] <= ab <= ratios['AB_retracement_max']
+                and ratios['BC_retracement_min'] <= bc <= ratios['BC_retracement_max']
+                and ratios['CD_extension_min'] <= cd <= ratios['CD_extension_max']
+                and _within(ad, ratios['D_retracement']))
+    return validate
+
+
+def _best_per_leg(found: List[Tuple[Tuple[int, ...], Prices]], confidence: List[float]) -> List[int]:
+    """Aynı B noktasını (dolayısıyla B-C-D bacaklarını) paylaşanlardan en güvenilir olan, ilk görülen"""
+    best: Dict[int, int] = {}
+    for row, (points, _) in enumerate(found):
+        key = points[2]
+        if key not in best or confidence[row] > confidence[best[key]]:
+            best[key] = row
+    return sorted(best.values())
+
+
+def _signature(pattern: Dict[str, Any]) -> Tuple[int, ...]:
+    return tuple(int(pattern['points'][p]['index']) for p in 'XABCD')
+
+
+def compare_xabcd(name: str, patterns: List[Dict], highs: np.ndarray, lows: np.ndarray,
+                  validate: Callable[..., bool], confidence: Callable[..., float],
+                  target: Callable[..., float], stop_loss: Callable[..., float]) -> List[str]:
+    """Yeni dedektör çıktısını referans döngüyle karşılaştır; farkları döner"""
+    found = reference_xabcd(highs, lows, validate)
+    scores = [confidence(*prices) for _, prices in found]
+    expected = [(found[row], scores[row]) for row in _best_per_leg(found, scores)]
+
+    problems = []
+    if [points for (points, _), _ in expected] != [_signature(p) for p in patterns]:
+        problems.append(f"{name}: nokta kümesi farklı ({len(expected)} referans, {len(patterns)} yeni)")
+        return problems
+    for ((points, prices), score), pattern in zip(expected, patterns):
+        got = (pattern['confidence'], pattern['target'], pattern['stop_loss'])
+        want = (score, target(*prices), stop_loss(*prices))
+        if not np.allclose(got, want, rtol=1e-9, atol=1e-9):
+            problems.append(f"{name} {points}: {got} != {want}")
+    return problems
+
+
+def check_harmonic(bars: int = 1_000, seeds: Tuple[int, ...] = tuple(range(8)),
+                   volatility: float = 0.02) -> Dict[str, Any]:
+    """Gartley / Butterfly / Bat dedektörlerini eski döngülerle karşılaştır"""
+    from bat_pattern_detector import BatPatternDetector
+    from butterfly_pattern_detector import ButterflyPatternDetector
+    from harmonic_pattern_detector import HarmonicPatternDetector
+
+    harmonic, butterfly, bat = HarmonicPatternDetector(), ButterflyPatternDetector(), BatPatternDetector()
+    problems: List[str] = []
+    counts = {'gartley': 0, 'butterfly': 0, 'bat': 0}
+    for seed in seeds:
+        df = synthetic_ohlcv(bars, seed=seed, volatility=volatility)
+        highs, lows, closes = (df[c].to_numpy() for c in ('High', 'Low', 'Close'))
+        runs = {
+            'gartley': (harmonic.detect_gartley_pattern(highs, lows, closes), validate_gartley,
+                        gartley_confidence, harmonic._calculate_gartley_target,
+                        harmonic._calculate_gartley_stop_loss),
+            'butterfly': (butterfly.detect_butterfly_pattern(highs, lows, closes),
+                          butterfly_validator(butterfly.butterfly_ratios),
+                          butterfly._calculate_butterfly_confidence, butterfly._calculate_butterfly_target,
+                          butterfly._calculate_butterfly_stop_loss),
+            'bat': (bat.detect_bat_pattern(highs, lows, closes), bat_validator(bat.bat_ratios),
+                    bat._calculate_bat_confidence, bat._calculate_bat_target, bat._calculate_bat_stop_loss),
+        }
+        for name, (patterns, *reference) in runs.items():
+            counts[name] += len(patterns)
+            problems += [f"seed={seed} {p}" for p in compare_xabcd(name, patterns, highs, lows, *reference)]
+    return {'check': 'harmonic_xabcd', 'bars': bars, 'seeds': len(seeds), 'patterns': counts,
+            'ok': not problems, 'problems': problems}
+
+
+CHECKS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    'harmonic_xabcd': check_harmonic,
+}
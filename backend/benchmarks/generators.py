@@ -0,0 +1,67 @@
+"""
+Deterministik sentetik veri üreticileri (benchmark'lar için)
+
+Aynı (boyut, seed) her makinede aynı veriyi üretir; ağ/veri dosyası gerekmez.
+- synthetic_ohlcv: GBM tabanlı tek sembol OHLCV (100 bar - 5M bar)
+- synthetic_returns: tek faktörlü (piyasa + sektör) korelasyonlu getiri paneli
+- synthetic_fundamentals: sembol başına temel oranlar (10 - 1000 sembol)
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+BAR_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000, 5_000_000)
+SYMBOL_SIZES = (10, 100, 1_000)
+
+FUNDAMENTAL_COLUMNS = ('ROE', 'NetMargin', 'DebtEquity', 'CurrentRatio', 'PE', 'PB', 'RevenueGrowth')
+
+
+def symbol_names(n_symbols: int) -> List[str]:
+    return [f"SYM{i:04d}.IS" for i in range(n_symbols)]
+
+
+def synthetic_ohlcv(n_bars: int, seed: int = 42, start_price: float = 100.0,
+                    volatility: float = 0.01, freq: str = 'min') -> pd.DataFrame:
+    """Open/High/Low/Close/Volume; fiyatlar her zaman pozitif, High >= max(O, C), Low <= min(O, C)"""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0, volatility, n_bars)))
+    open_ = np.empty(n_bars)
+    open_[0] = start_price
+    open_[1:] = close[:-1]
+    spread = np.abs(rng.normal(0.0, volatility / 2, n_bars))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.integers(10_000, 1_000_000, n_bars).astype(np.float64)
+    index = pd.date_range('2015-01-01', periods=n_bars, freq=freq)
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+                        index=index)
+
+
+def synthetic_returns(n_bars: int, n_symbols: int, seed: int = 42, n_sectors: int = 10) -> pd.DataFrame:
+    """Getiri = beta * piyasa + sektör faktörü + özgün gürültü (gerçekçi korelasyon yapısı)"""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0003, 0.010, n_bars)
+    sectors = rng.normal(0.0, 0.006, (n_bars, n_sectors))
+    beta = rng.uniform(0.6, 1.4, n_symbols)
+    sector_of = np.arange(n_symbols) % n_sectors
+    returns = (market[:, None] * beta + sectors[:, sector_of]
+               + rng.normal(0.0, 0.012, (n_bars, n_symbols)))
+    index = pd.date_range('2015-01-01', periods=n_bars, freq='B')
+    return pd.DataFrame(returns, index=index, columns=symbol_names(n_symbols))
+
+
+def synthetic_fundamentals(n_symbols: int, seed: int = 42) -> pd.DataFrame:
+    """Sembol x temel oran matrisi (GreyTOPSIS / MCDM girdileri)"""
+    rng = np.random.default_rng(seed)
+    data = {
+        'ROE': rng.uniform(0.02, 0.35, n_symbols),
+        'NetMargin': rng.uniform(0.01, 0.30, n_symbols),
+        'DebtEquity': rng.uniform(0.05, 2.5, n_symbols),
+        'CurrentRatio': rng.uniform(0.6, 3.5, n_symbols),
+        'PE': rng.uniform(3.0, 40.0, n_symbols),
+        'PB': rng.uniform(0.4, 8.0, n_symbols),
+        'RevenueGrowth': rng.normal(0.10, 0.15, n_symbols),
+    }
+    return pd.DataFrame(data, index=symbol_names(n_symbols))
@@ -0,0 +1,296 @@
+"""
+Kernel micro-benchmark harness
+
+- Kernel kaydı: setup(**size) -> argümansız çağrılabilir (veri üretimi zamana dahil değil)
+- Boyut başına: ısınma/kalibrasyon çağrısı, hedef süreye göre tekrar, min/median/mean,
+  ayrı bir tracemalloc çağrısında tahsis tepe noktası
+- Zaman bütçesi: sonraki boyutun süresi son iki ölçümden uydurulan büyüme
+  üssüyle tahmin edilir; bütçeyi aşacaksa boyut atlanır (dizüstünde 5M bar
+  O(n²) bir kernel'i saatlerce koşturmaz)
+- Geçmiş: her çalıştırma JSONL'e bir satır (commit, makine, sürümler) -> trend grafikleri;
+  varsayılan ~/.cache/bist-ai/benchmarks/history.jsonl (BENCHMARK_HISTORY ile değiştirilir)
+"""
+
+import json
+import logging
+import math
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Geçmiş repo dışında tutulur (kullanıcı önbellek dizini); BENCHMARK_HISTORY ile değiştirilebilir
+CACHE_DIR = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+HISTORY_PATH = os.getenv("BENCHMARK_HISTORY", os.path.join(CACHE_DIR, "bist-ai", "benchmarks", "history.jsonl"))
+
+PRESETS = {
+    'quick': {'max_bars': 100_000, 'max_symbols': 100, 'budget': 10.0},
+    'full': {'max_bars': None, 'max_symbols': None, 'budget': 120.0},
+}
+
+
+@dataclass
+class Kernel:
+    name: str
+    setup: Callable[..., Callable[[], Any]]
+    sizes: List[Dict[str, int]]
+    description: str = ''
+
+
+@dataclass
+class Measurement:
+    kernel: str
+    size: Dict[str, int]
+    status: str = 'ok'  # ok | skipped | unavailable | error
+    repeats: int = 0
+    min_s: Optional[float] = None
+    median_s: Optional[float] = None
+    mean_s: Optional[float] = None
+    stdev_s: Optional[float] = None
+    peak_kb: Optional[float] = None
+    setup_s: Optional[float] = None
+    note: str = ''
+
+    @property
+    def label(self) -> str:
+        return size_label(self.size)
+
+
+KERNELS: Dict[str, Kernel] = {}
+
+
+def kernel(name: str, sizes: List[Dict[str, int]], description: str = ''):
+    """setup fonksiyonunu kernel olarak kaydeden dekoratör"""
+    def decorator(setup: Callable[..., Callable[[], Any]]):
+        KERNELS[name] = Kernel(name=name, setup=setup, sizes=list(sizes), description=description)
+        return setup
+    return decorator
+
+
+def size_label(size: Dict[str, int]) -> str:
+    return ",".join(f"{k}={v}" for k, v in size.items())
+
+
+def _cost(size: Dict[str, int]) -> float:
+    return float(math.prod(size.values()))
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PACKAGE_DIR,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+class BenchmarkRunner:
+    """Kayıtlı kernel'leri boyut merdiveni boyunca ölçer"""
+
+    def __init__(self, preset: str = 'quick', budget: Optional[float] = None, target_time: float = 1.0,
+                 max_repeats: int = 20, memory: bool = True):
+        limits = PRESETS[preset]
+        self.preset = preset
+        self.max_bars = limits['max_bars']
+        self.max_symbols = limits['max_symbols']
+        self.budget = budget if budget is not None else limits['budget']
+        self.target_time = target_time
+        self.max_repeats = max_repeats
+        self.memory = memory
+
+    def _in_preset(self, size: Dict[str, int]) -> bool:
+        if self.max_bars is not None and size.get('bars', 0) > self.max_bars:
+            return False
+        if self.max_symbols is not None and size.get('symbols', 0) > self.max_symbols:
+            return False
+        return True
+
+    def _estimate(self, done: List[Measurement], size: Dict[str, int]) -> Optional[float]:
+        """Son iki ölçümden büyüme üssü (1..3) ile sonraki boyutun süresi"""
+        ok = [m for m in done if m.status == 'ok']
+        if not ok:
+            return None
+        last = ok[-1]
+        exponent = 1.0
+        if len(ok) >= 2:
+            prev = ok[-2]
+            cost_ratio = _cost(last.size) / _cost(prev.size)
+            if cost_ratio > 1 and prev.median_s > 0 and last.median_s > 0:
+                exponent = min(max(math.log(last.median_s / prev.median_s) / math.log(cost_ratio), 1.0), 3.0)
+        return last.median_s * (_cost(size) / _cost(last.size)) ** exponent
+
+    def measure(self, name: str, fn: Callable[[], Any], size: Dict[str, int]) -> Measurement:
+        m = Measurement(kernel=name, size=dict(size))
+        start = time.perf_counter()
+        fn()
+        first = time.perf_counter() - start
+
+        if first >= self.target_time:
+            samples = [first]
+        else:
+            repeats = min(max(int(self.target_time / max(first, 1e-9)), 1), self.max_repeats)
+            samples = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                fn()
+                samples.append(time.perf_counter() - start)
+
+        m.repeats = len(samples)
+        m.min_s = min(samples)
+        m.median_s = statistics.median(samples)
+        m.mean_s = statistics.mean(samples)
+        m.stdev_s = statistics.stdev(samples) if len(samples) > 1 else 0.0
+
+        # tracemalloc Python ağırlıklı döngüleri birkaç kat yavaşlatır: bütçeyi aşacaksa atla
+        if self.memory and first * 3 <= self.budget:
+            tracemalloc.start()
+            try:
+                base, _ = tracemalloc.get_traced_memory()
+                fn()
+                m.peak_kb = round((tracemalloc.get_traced_memory()[1] - base) / 1024, 1)
+            finally:
+                tracemalloc.stop()
+        return m
+
+    def run_kernel(self, spec: Kernel) -> List[Measurement]:
+        results: List[Measurement] = []
+        sizes = sorted((s for s in spec.sizes if self._in_preset(s)), key=_cost)
+        for size in sizes:
+            estimate = self._estimate(results, size)
+            if estimate is not None and estimate > self.budget:
+                results.append(Measurement(kernel=spec.name, size=dict(size), status='skipped',
+                                           note=f"estimated {estimate:.1f}s > budget {self.budget:.0f}s"))
+                continue
+            try:
+                started = time.perf_counter()
+                fn = spec.setup(**size)
+                setup_s = time.perf_counter() - started
+                m = self.measure(spec.name, fn, size)
+                m.setup_s = round(setup_s, 4)
+            except ImportError as e:
+                results.append(Measurement(kernel=spec.name, size=dict(size), status='unavailable',
+                                           note=f"{type(e).__name__}: {e}"))
+                logger.warning(f"⚠️ {spec.name} kullanılamıyor: {e}")
+                break
+            except Exception as e:
+                m = Measurement(kernel=spec.name, size=dict(size), status='error',
+                                note=f"{type(e).__name__}: {e}")
+                logger.error(f"❌ {spec.name} [{size_label(size)}] hatası: {e}")
+            results.append(m)
+            if m.status == 'ok':
+                logger.info(f"📊 {spec.name:<24} {m.label:<24} median {m.median_s * 1000:10.2f}ms "
+                            f"x{m.repeats:<3} peak {m.peak_kb if m.peak_kb is not None else '-'} KB")
+        return results
+
+    def run(self, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Seçili (varsayılan: tümü) kernel'leri ölçer; geçmişe yazılabilir çalıştırma kaydı döner"""
+        names = names or list(KERNELS)
+        unknown = [n for n in names if n not in KERNELS]
+        if unknown:
+            raise KeyError(f"Bilinmeyen kernel: {', '.join(unknown)} (kayıtlı: {', '.join(KERNELS)})")
+
+        started = datetime.now()
+        measurements: List[Measurement] = []
+        for name in names:
+            measurements.extend(self.run_kernel(KERNELS[name]))
+
+        return {
+            'run_id': started.strftime('%Y%m%d_%H%M%S'),
+            'timestamp': started.isoformat(),
+            'commit': _git_commit(),
+            'host': socket.gethostname(),
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'preset': self.preset,
+            'budget_s': self.budget,
+            'results': [asdict(m) for m in measurements],
+        }
+
+
+# ---------------------------------------------------------------------------
+# Geçmiş ve trend
+# ---------------------------------------------------------------------------
+
+def append_history(record: Dict[str, Any], path: str = HISTORY_PATH) -> str:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + '\n')
+    return path
+
+
+def load_history(path: str = HISTORY_PATH) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def trend(history: List[Dict[str, Any]], kernel_name: str) -> pd.DataFrame:
+    """Kernel için çalıştırma x boyut tablosu (median ms, peak KB, commit)"""
+    rows = []
+    for record in history:
+        for r in record['results']:
+            if r['kernel'] == kernel_name and r['status'] == 'ok':
+                rows.append({
+                    'timestamp': pd.Timestamp(record['timestamp']),
+                    'commit': record.get('commit') or '-',
+                    'host': record.get('host'),
+                    'size': size_label(r['size']),
+                    'median_ms': r['median_s'] * 1000,
+                    'peak_kb': r['peak_kb'],
+                })
+    return pd.DataFrame(rows, columns=['timestamp', 'commit', 'host', 'size', 'median_ms', 'peak_kb'])
+
+
+def plot_trends(history: List[Dict[str, Any]], output: str, kernels: Optional[List[str]] = None) -> str:
+    """Kernel başına bir panel, boyut başına bir çizgi (log ölçek median ms)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    names = kernels or sorted({r['kernel'] for record in history for r in record['results']})
+    fig, axes = plt.subplots(len(names), 1, figsize=(10, 3.2 * len(names)), squeeze=False)
+    for ax, name in zip(axes[:, 0], names):
+        data = trend(history, name)
+        for label, group in data.groupby('size', sort=False):
+            ax.plot(group['timestamp'], group['median_ms'], marker='o', label=label)
+        ax.set_title(name)
+        ax.set_ylabel('median ms')
+        ax.set_yscale('log')
+        if not data.empty:
+            ax.legend(fontsize=7, loc='upper left')
+    fig.tight_layout()
+    fig.savefig(output, dpi=110)
+    plt.close(fig)
+    return output
+
+
+def format_table(record: Dict[str, Any]) -> str:
+    lines = [
+        f"🎯 KERNEL BENCHMARK  preset={record['preset']}  budget={record['budget_s']}s  "
+        f"commit={record['commit']}  host={record['host']}",
+        f"{'kernel':<26}{'size':<26}{'status':<12}{'median ms':>12}{'min ms':>12}{'x':>4}{'peak KB':>12}",
+        "-" * 104,
+    ]
+    for r in record['results']:
+        if r['status'] == 'ok':
+            lines.append(f"{r['kernel']:<26}{size_label(r['size']):<26}{r['status']:<12}"
+                         f"{r['median_s'] * 1000:>12.3f}{r['min_s'] * 1000:>12.3f}{r['repeats']:>4}"
+                         f"{r['peak_kb'] if r['peak_kb'] is not None else '-':>12}")
+        else:
+            lines.append(f"{r['kernel']:<26}{size_label(r['size']):<26}{r['status']:<12}  {r['note']}")
+    return "\n".join(lines)
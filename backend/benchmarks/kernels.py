@@ -0,0 +1,69 @@
+"""
+Ölçülen analitik kernel'ler
+
+Her setup hedef modülü tembel import eder: bir kernel'in bağımlılığı eksikse
+yalnızca o kernel 'unavailable' olur, diğerleri koşmaya devam eder.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from .generators import BAR_SIZES, SYMBOL_SIZES, synthetic_fundamentals, synthetic_ohlcv, synthetic_returns
+from .harness import kernel
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.append(BACKEND_DIR)
+
+
+@kernel('triple_barrier_labels', [{'bars': n} for n in BAR_SIZES],
+        'ml_prob_engine.triple_barrier_labels (up=2.5%, dn=1.5%, max_h=8)')
+def triple_barrier(bars: int):
+    from ml_prob_engine import triple_barrier_labels
+    close = synthetic_ohlcv(bars)['Close']
+    return lambda: triple_barrier_labels(close)
+
+
+@kernel('harmonic_gartley', [{'bars': n} for n in BAR_SIZES],
+        'HarmonicPatternDetector.detect_gartley_pattern (swing noktaları dahil)')
+def harmonic_gartley(bars: int):
+    from harmonic_pattern_detector import HarmonicPatternDetector
+    df = synthetic_ohlcv(bars)
+    highs, lows, closes = (df[c].to_numpy() for c in ('High', 'Low', 'Close'))
+    detector = HarmonicPatternDetector()
+    return lambda: detector.detect_gartley_pattern(highs, lows, closes)
+
+
+@kernel('grey_topsis_rank', [{'symbols': n} for n in SYMBOL_SIZES],
+        'GreyTOPSISRanking.rank_stocks (7 kriter, entropi ağırlıkları)')
+def grey_topsis_rank(symbols: int):
+    from grey_topsis_ranking import GreyTOPSISRanking
+    data = synthetic_fundamentals(symbols)
+    # DebtEquity, PE, PB: küçük daha iyi
+    criteria_types = np.array([0 if c in ('DebtEquity', 'PE', 'PB') else 1 for c in data.columns])
+    ranker = GreyTOPSISRanking()
+    return lambda: ranker.rank_stocks(data, criteria_types)
+
+
+@kernel('monte_carlo_var', [{'bars': n} for n in BAR_SIZES],
+        'VaRCalculator.calculate_monte_carlo_var (10k simülasyon, seed=42)')
+def monte_carlo_var(bars: int):
+    from var_calculator import VaRCalculator
+    returns = synthetic_returns(bars, 1, n_sectors=1).iloc[:, 0]
+    calculator = VaRCalculator()
+    return lambda: calculator.calculate_monte_carlo_var(returns, seed=42)
+
+
+@kernel('rolling_correlation', [{'bars': 1_000, 'symbols': n} for n in SYMBOL_SIZES],
+        'CorrelationAnalyzer.calculate_rolling_correlation (window=63, tüm çiftler)')
+def rolling_correlation(bars: int, symbols: int):
+    from correlation_analyzer import CorrelationAnalyzer
+    from correlation_engine import CorrelationEngine
+    returns = synthetic_returns(bars, symbols)
+
+    def run():
+        # Motorun içerik önbelleği tekrarları ücretsiz yapmasın: her çağrıda taze motor
+        return CorrelationAnalyzer(engine=CorrelationEngine()).calculate_rolling_correlation(returns)
+    return run
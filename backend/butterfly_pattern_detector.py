@@ -10,6 +10,13 @@ from typing import Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from swing_pattern_core import (SwingCandidateGenerator, best_per_key, find_swing_points,
+                                    harmonic_spec, tolerance_band)
+except ImportError:
+    from backend.swing_pattern_core import (SwingCandidateGenerator, best_per_key, find_swing_points,
+                                            harmonic_spec, tolerance_band)
+
 class ButterflyPatternDetector:
     """Butterfly pattern tespit edici - Accuracy boost için"""
     
@@ -51,19 +58,7 @@ class ButterflyPatternDetector:
         Returns:
             Tuple of swing highs and lows indices
         """
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(window, len(highs) - window):
-            # Swing high detection
-            if all(highs[i] >= highs[j] for j in range(i-window, i+window+1)):
-                swing_highs.append(i)
-            
-            # Swing low detection
-            if all(lows[i] <= lows[j] for j in range(i-window, i+window+1)):
-                swing_lows.append(i)
-        
-        return np.array(swing_highs), np.array(swing_lows)
+        return find_swing_points(highs, lows, window)
     
     def calculate_fibonacci_retracement(self, start_price: float, end_price: float, 
                                       ratio: float) -> float:
@@ -92,104 +87,43 @@ class ButterflyPatternDetector:
         - CD: 161.8-224% extension of BC
         - D: 127.2% extension of XA
         """
-        patterns = []
-        swing_highs, swing_lows = self.find_swing_points(highs, lows)
-        
-        # Need at least 5 swing points for Butterfly
-        if len(swing_highs) < 3 or len(swing_lows) < 2:
-            return patterns
+        # Ortak aday üretici: B/C/D binary search, oranlar vektörel doğrulanır
+        spec = harmonic_spec(
+            'Butterfly', tolerance_band(self.butterfly_ratios['AB_retracement'], 0.08),
+            (self.butterfly_ratios['BC_retracement_min'], self.butterfly_ratios['BC_retracement_max']),
+            (self.butterfly_ratios['CD_extension_min'], self.butterfly_ratios['CD_extension_max']),
+            tolerance_band(self.butterfly_ratios['D_extension'], 0.08))
+        found = SwingCandidateGenerator(highs, lows).generate(spec)
+        if not len(found):
+            return []
         
-        # Look for potential Butterfly patterns
-        for i in range(len(swing_highs) - 2):
-            for j in range(len(swing_lows) - 1):
-                # Point X (swing low)
-                x_idx = swing_lows[j]
-                x_price = lows[x_idx]
-                
-                # Point A (swing high)
-                a_idx = swing_highs[i]
-                a_price = highs[a_idx]
-                
-                # Point B (swing low after A)
-                b_candidates = [idx for idx in swing_lows if idx > a_idx]
-                if not b_candidates:
-                    continue
-                    
-                b_idx = b_candidates[0]
-                b_price = lows[b_idx]
-                
-                # Point C (swing high after B)
-                c_candidates = [idx for idx in swing_highs if idx > b_idx]
-                if not c_candidates:
-                    continue
-                    
-                c_idx = c_candidates[0]
-                c_price = highs[c_idx]
-                
-                # Point D (swing low after C)
-                d_candidates = [idx for idx in swing_lows if idx > c_idx]
-                if not d_candidates:
-                    continue
-                    
-                d_idx = d_candidates[0]
-                d_price = lows[d_idx]
-                
-                # Validate Butterfly pattern ratios
-                if self._validate_butterfly_ratios(x_price, a_price, b_price, c_price, d_price):
-                    pattern = {
-                        'pattern_type': 'Butterfly',
-                        'points': {
-                            'X': {'index': x_idx, 'price': x_price, 'type': 'low'},
-                            'A': {'index': a_idx, 'price': a_price, 'type': 'high'},
-                            'B': {'index': b_idx, 'price': b_price, 'type': 'low'},
-                            'C': {'index': c_idx, 'price': c_price, 'type': 'high'},
-                            'D': {'index': d_idx, 'price': d_price, 'type': 'low'}
-                        },
-                        'confidence': self._calculate_butterfly_confidence(x_price, a_price, b_price, c_price, d_price),
-                        'signal': 'BUY' if d_price < b_price else 'SELL',
-                        'target': self._calculate_butterfly_target(x_price, a_price, b_price, c_price, d_price),
-                        'stop_loss': self._calculate_butterfly_stop_loss(x_price, a_price, b_price, c_price, d_price),
-                        'pattern_subtype': self._determine_butterfly_subtype(x_price, a_price, b_price, c_price, d_price)
-                    }
-                    patterns.append(pattern)
+        rows = [(found.free_price[i], *(p[i] for p in found.prices)) for i in range(len(found))]
+        confidence = np.array([self._calculate_butterfly_confidence(*prices) for prices in rows])
+        # Aynı B-C-D bacaklarını paylaşan adaylardan en güvenilir olan kalır
+        keep = best_per_key(found.indices[1], confidence)
         
+        patterns = []
+        for row in keep:
+            prices = rows[row]
+            x_price, a_price, b_price, c_price, d_price = prices
+            x_idx, (a_idx, b_idx, c_idx, d_idx) = found.free_index[row], [idx[row] for idx in found.indices]
+            patterns.append({
+                'pattern_type': 'Butterfly',
+                'points': {
+                    'X': {'index': x_idx, 'price': x_price, 'type': 'low'},
+                    'A': {'index': a_idx, 'price': a_price, 'type': 'high'},
+                    'B': {'index': b_idx, 'price': b_price, 'type': 'low'},
+                    'C': {'index': c_idx, 'price': c_price, 'type': 'high'},
+                    'D': {'index': d_idx, 'price': d_price, 'type': 'low'}
+                },
+                'confidence': confidence[row],
+                'signal': 'BUY' if d_price < b_price else 'SELL',
+                'target': self._calculate_butterfly_target(*prices),
+                'stop_loss': self._calculate_butterfly_stop_loss(*prices),
+                'pattern_subtype': self._determine_butterfly_subtype(*prices)
+            })
         return patterns
     
-    def _validate_butterfly_ratios(self, x_price: float, a_price: float, 
-                                  b_price: float, c_price: float, d_price: float) -> bool:
-        """Butterfly pattern oranlarını validate et"""
-        try:
-            # XA move
-            xa_move = a_price - x_price
-            
-            # AB retracement (should be 78.6%)
-            ab_move = a_price - b_price
-            ab_ratio = ab_move / xa_move
-            if not self.is_within_tolerance(ab_ratio, self.butterfly_ratios['AB_retracement'], 0.08):
-                return False
-            
-            # BC retracement (should be 38.2-88.6%)
-            bc_move = c_price - b_price
-            bc_ratio = bc_move / ab_move
-            if not (self.butterfly_ratios['BC_retracement_min'] <= bc_ratio <= self.butterfly_ratios['BC_retracement_max']):
-                return False
-            
-            # CD extension (should be 161.8-224%)
-            cd_move = c_price - d_price
-            cd_ratio = cd_move / bc_move
-            if not (self.butterfly_ratios['CD_extension_min'] <= cd_ratio <= self.butterfly_ratios['CD_extension_max']):
-                return False
-            
-            # D extension (should be 127.2% of XA)
-            d_extension = (a_price - d_price) / xa_move
-            if not self.is_within_tolerance(d_extension, self.butterfly_ratios['D_extension'], 0.08):
-                return False
-            
-            return True
-            
-        except ZeroDivisionError:
-            return False
-    
     def _calculate_butterfly_confidence(self, x_price: float, a_price: float,
                                       b_price: float, c_price: float, d_price: float) -> float:
         """Butterfly pattern güven skorunu hesapla (0-100)"""
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+🕯️ COLUMNAR CANDLESTICK ENGINE - BIST AI Smart Trader
+Gövde, gölge ve gap dizileri bir kez hesaplanır; tüm formasyonlar tek
+geçişte boolean maske + güven dizisi olarak değerlendirilir.
+
+Girdiler (T,) tek sembol ya da (T, S) çoklu sembol paneli olabilir; tüm
+işlemler zaman ekseninde (axis 0) kaydırma ile yapılır. Maskedeki i
+indeksi formasyonun son mumunu gösterir.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _lag(values: np.ndarray, k: int) -> np.ndarray:
+    """k bar önceki değerler; ilk k bar NaN (karşılaştırmalar False döner)"""
+    if k == 0:
+        return values
+    out = np.full_like(values, np.nan)
+    out[k:] = values[:-k]
+    return out
+
+
+def _band(condition_hi: np.ndarray, condition_lo: np.ndarray, up: float, down: float) -> np.ndarray:
+    """condition_hi -> +up, condition_lo -> -down, aksi halde 0"""
+    return np.where(condition_hi, up, np.where(condition_lo, -down, 0.0))
+
+
+def _safe_ratio(num: np.ndarray, den: np.ndarray, fallback: float) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(den > 0, num / np.where(den > 0, den, 1.0), fallback)
+
+
+@dataclass
+class CandleFeatures:
+    """Mum başına bir kez hesaplanan kolonlar"""
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    body: np.ndarray            # |close - open|
+    body_top: np.ndarray        # max(open, close)
+    body_bottom: np.ndarray     # min(open, close)
+    range: np.ndarray           # high - low
+    upper_shadow: np.ndarray
+    lower_shadow: np.ndarray
+    bullish: np.ndarray
+    bearish: np.ndarray
+
+    @classmethod
+    def from_arrays(cls, opens, highs, lows, closes) -> 'CandleFeatures':
+        o, h, l, c = (np.asarray(a, dtype=np.float64) for a in (opens, highs, lows, closes))
+        body_top = np.maximum(o, c)
+        body_bottom = np.minimum(o, c)
+        return cls(
+            open=o, high=h, low=l, close=c,
+            body=np.abs(c - o),
+            body_top=body_top,
+            body_bottom=body_bottom,
+            range=h - l,
+            upper_shadow=h - body_top,
+            lower_shadow=body_bottom - l,
+            bullish=c > o,
+            bearish=c < o
+        )
+
+    def lag(self, name: str, k: int) -> np.ndarray:
+        return _lag(getattr(self, name), k)
+
+
+@dataclass
+class PatternResult:
+    """Formasyon maskesi ve bar başına türetilmiş değerler"""
+    mask: np.ndarray
+    confidence: Optional[np.ndarray] = None
+    target: Optional[np.ndarray] = None
+    stop_loss: Optional[np.ndarray] = None
+    bullish: Optional[np.ndarray] = None   # yön maskesi (harami gibi çift yönlü formasyonlar)
+
+    def hits(self) -> np.ndarray:
+        return np.flatnonzero(self.mask)
+
+
+class CandlestickEngine:
+    """Sütunsal (vektörel) candlestick formasyon motoru"""
+
+    def __init__(self, min_body_size: float = 0.01):
+        self.min_body_size = min_body_size
+
+    # ------------------------------------------------------------------
+    # Tek mum formasyonları
+    # ------------------------------------------------------------------
+    @staticmethod
+    def hammer(f: CandleFeatures, require_body: bool = True) -> np.ndarray:
+        mask = (f.lower_shadow > f.body * 2) & (f.upper_shadow < f.body * 0.5)
+        return mask & (f.body > 0) if require_body else mask
+
+    @staticmethod
+    def shooting_star(f: CandleFeatures, require_body: bool = True) -> np.ndarray:
+        mask = (f.upper_shadow > f.body * 2) & (f.lower_shadow < f.body * 0.5)
+        return mask & (f.body > 0) if require_body else mask
+
+    @staticmethod
+    def doji(f: CandleFeatures) -> np.ndarray:
+        return (f.body < f.range * 0.1) & (f.range > 0)
+
+    # ------------------------------------------------------------------
+    # İki mum formasyonları
+    # ------------------------------------------------------------------
+    @staticmethod
+    def bullish_engulfing(f: CandleFeatures, min_body_ratio: Optional[float] = None) -> np.ndarray:
+        prev_open, prev_close = f.lag('open', 1), f.lag('close', 1)
+        mask = (prev_close < prev_open) & f.bullish & (f.open < prev_close) & (f.close > prev_open)
+        if min_body_ratio is not None:
+            mask &= f.body > f.lag('body', 1) * min_body_ratio
+        return mask
+
+    @staticmethod
+    def bearish_engulfing(f: CandleFeatures, min_body_ratio: Optional[float] = None) -> np.ndarray:
+        prev_open, prev_close = f.lag('open', 1), f.lag('close', 1)
+        mask = (prev_close > prev_open) & f.bearish & (f.open > prev_close) & (f.close < prev_open)
+        if min_body_ratio is not None:
+            mask &= f.body > f.lag('body', 1) * min_body_ratio
+        return mask
+
+    def harami(self, f: CandleFeatures) -> PatternResult:
+        o1, h1, l1, c1 = (f.lag(n, 1) for n in ('open', 'high', 'low', 'close'))
+        body1, range1 = f.lag('body', 1), f.lag('range', 1)
+        top1, bottom1 = f.lag('body_top', 1), f.lag('body_bottom', 1)
+
+        contained = (f.body_top <= top1) & (f.body_bottom >= bottom1)
+        mask = (body1 >= self.min_body_size * o1) & (f.body <= body1 * 0.5) & contained
+
+        # Gün 1 yükselişse gün 2 yönü belirler; düşüşse gün 2 düşüş değilse bullish
+        bullish = np.where(c1 > o1, f.close > f.open, ~(f.close < f.open))
+
+        day1_ratio = _safe_ratio(body1, range1, 0.0)
+        day2_ratio = _safe_ratio(f.body, body1, 1.0)
+        confidence = (100.0
+                      + _band(day1_ratio > 0.7, day1_ratio < 0.5, 15, 20)
+                      + _band(day2_ratio < 0.3, day2_ratio > 0.5, 20, 25)
+                      + np.where(contained, 25.0, -50.0))
+
+        day2_up = f.close > f.open
+        height = h1 - l1
+        return PatternResult(
+            mask=mask,
+            confidence=np.clip(confidence, 0, 100),
+            target=np.where(day2_up, f.close + height * 0.618, f.close - height * 0.618),
+            stop_loss=np.where(day2_up, l1 * 0.98, h1 * 1.02),
+            bullish=bullish
+        )
+
+    # ------------------------------------------------------------------
+    # Üç mum formasyonları
+    # ------------------------------------------------------------------
+    def _star(self, f: CandleFeatures, morning: bool) -> PatternResult:
+        o1, h1, l1, c1 = (f.lag(n, 2) for n in ('open', 'high', 'low', 'close'))
+        body1, range1 = f.lag('body', 2), f.lag('range', 2)
+        h2, l2, body2 = f.lag('high', 1), f.lag('low', 1), f.lag('body', 1)
+        midpoint = (h1 + l1) / 2
+
+        long_day1 = body1 > self.min_body_size * o1
+        long_day3 = f.body > self.min_body_size * f.open
+        if morning:
+            day1_dir, day3_dir = c1 < o1, f.close > f.open
+            gap_ok = h2 < o1
+            beyond_mid = f.close > midpoint
+            gap = o1 - h2
+        else:
+            day1_dir, day3_dir = c1 > o1, f.close < f.open
+            gap_ok = l2 > c1
+            beyond_mid = f.close < midpoint
+            gap = l2 - c1
+
+        mask = day1_dir & long_day1 & (body2 < body1 * 0.3) & gap_ok & day3_dir & long_day3 & beyond_mid
+
+        s1 = _safe_ratio(body1, range1, 0.0)
+        s3 = _safe_ratio(f.body, f.range, 0.0)
+        gap_ratio = _safe_ratio(gap, body1, 0.0)
+        confidence = (100.0
+                      + _band(s1 > 0.7, s1 < 0.5, 10, 20)
+                      + np.where((gap_ratio >= 0.1) & (gap_ratio <= 0.3), 15.0, -15.0)
+                      + _band(s3 > 0.7, s3 < 0.5, 15, 20)
+                      + np.where(beyond_mid, 20.0, -30.0))
+
+        height = h1 - l1
+        return PatternResult(
+            mask=mask,
+            confidence=np.clip(confidence, 0, 100),
+            target=f.close + height * 1.618 if morning else f.close - height * 1.618,
+            stop_loss=l1 * 0.98 if morning else h1 * 1.02
+        )
+
+    def morning_star(self, f: CandleFeatures) -> PatternResult:
+        return self._star(f, morning=True)
+
+    def evening_star(self, f: CandleFeatures) -> PatternResult:
+        return self._star(f, morning=False)
+
+    def _three_candles(self, f: CandleFeatures, white: bool) -> PatternResult:
+        lags = range(2, -1, -1)  # day1 (i-2), day2 (i-1), day3 (i)
+        o = [f.lag('open', k) for k in lags]
+        h = [f.lag('high', k) for k in lags]
+        l = [f.lag('low', k) for k in lags]
+        c = [f.lag('close', k) for k in lags]
+
+        mask = np.ones_like(f.close, dtype=bool)
+        confidence = np.full_like(f.close, 100.0)
+        for j in range(3):
+            body = (c[j] - o[j]) if white else (o[j] - c[j])
+            mask &= (c[j] > o[j]) if white else (c[j] < o[j])
+
+            # Kapanış tepe/dibe yakın (%30)
+            distance = (h[j] - c[j]) if white else (c[j] - l[j])
+            mask &= ~(distance > body * 0.3)
+
+            body_ratio = _safe_ratio(body, h[j] - l[j], 0.0)
+            close_ratio = _safe_ratio(distance, body, 1.0)
+            confidence += _band(body_ratio > 0.7, body_ratio < 0.5, 10, 15)
+            confidence += np.where(close_ratio < 0.3, 10.0, -15.0)
+
+        for j in (1, 2):
+            if white:
+                # Açılış önceki gövdenin içinde
+                mask &= (np.minimum(o[j - 1], c[j - 1]) <= o[j]) & (o[j] <= np.maximum(o[j - 1], c[j - 1]))
+                consistency = np.abs(o[j] - c[j - 1]) / c[j - 1]
+            else:
+                # Açılış önceki açılışa %2 yakın
+                consistency = np.abs(o[j] - o[j - 1]) / o[j - 1]
+                mask &= ~(consistency > 0.02)
+            confidence += np.where(consistency < 0.02, 10.0, -10.0)
+
+        if white:
+            move = c[2] - o[0]
+            target = c[2] + move * 1.618
+            stop_loss = np.minimum(np.minimum(l[0], l[1]), l[2]) * 0.98
+        else:
+            move = o[0] - c[2]
+            target = c[2] - move * 1.618
+            stop_loss = np.maximum(np.maximum(h[0], h[1]), h[2]) * 1.02
+
+        return PatternResult(mask=mask, confidence=np.clip(confidence, 0, 100),
+                             target=target, stop_loss=stop_loss)
+
+    def three_white_soldiers(self, f: CandleFeatures) -> PatternResult:
+        return self._three_candles(f, white=True)
+
+    def three_black_crows(self, f: CandleFeatures) -> PatternResult:
+        return self._three_candles(f, white=False)
+
+    # ------------------------------------------------------------------
+    # Toplu tarama
+    # ------------------------------------------------------------------
+    def scan(self, opens, highs, lows, closes) -> Dict[str, PatternResult]:
+        """Tüm formasyonları tek geçişte hesapla"""
+        f = CandleFeatures.from_arrays(opens, highs, lows, closes)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return {
+                'morning_star': self.morning_star(f),
+                'evening_star': self.evening_star(f),
+                'three_white_soldiers': self.three_white_soldiers(f),
+                'three_black_crows': self.three_black_crows(f),
+                'harami': self.harami(f),
+                'hammer': PatternResult(mask=self.hammer(f)),
+                'shooting_star': PatternResult(mask=self.shooting_star(f)),
+                'doji': PatternResult(mask=self.doji(f)),
+                'bullish_engulfing': PatternResult(mask=self.bullish_engulfing(f, 1.1)),
+                'bearish_engulfing': PatternResult(mask=self.bearish_engulfing(f, 1.1)),
+            }
+
+    def scan_panel(self, panel: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, pd.Series]]:
+        """
+        Çoklu sembol OHLC paneli: semboller ortak zaman eksenine hizalanır,
+        (T, S) dizilerde tek seferde taranır.
+
+        Returns:
+            {pattern: {symbol: boolean Series}}
+        """
+        symbols = list(panel.keys())
+        columns = {}
+        for field in ('Open', 'High', 'Low', 'Close'):
+            columns[field] = pd.concat({s: panel[s][field] for s in symbols}, axis=1, join='outer').sort_index()
+        index = columns['Close'].index
+        results = self.scan(*(columns[k].to_numpy(dtype=np.float64) for k in ('Open', 'High', 'Low', 'Close')))
+        return {
+            name: {s: pd.Series(res.mask[:, k], index=index) for k, s in enumerate(symbols)}
+            for name, res in results.items()
+        }
+
+
+def benchmark_candlestick_engine(bar_counts: List[int] = (10_000, 100_000, 1_000_000),
+                                 n_symbols: int = 100, repeats: int = 3) -> List[Dict]:
+    """Candlestick motoru throughput benchmark'ı (bars/sec)"""
+    rng = np.random.default_rng(42)
+    engine = CandlestickEngine()
+    results = []
+    for n_bars in bar_counts:
+        per_symbol = max(1, n_bars // n_symbols)
+        closes = 100 + np.cumsum(rng.normal(0, 1, (per_symbol, n_symbols)), axis=0)
+        opens = closes + rng.normal(0, 0.5, closes.shape)
+        highs = np.maximum(opens, closes) + rng.uniform(0, 1, closes.shape)
+        lows = np.minimum(opens, closes) - rng.uniform(0, 1, closes.shape)
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            engine.scan(opens, highs, lows, closes)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        total_bars = per_symbol * n_symbols
+        results.append({
+            'bars': total_bars,
+            'symbols': n_symbols,
+            'seconds': round(best, 4),
+            'bars_per_sec': round(total_bars / best) if best > 0 else 0
+        })
+        print(f"📊 {total_bars:>10,} bar ({n_symbols} sembol): {results[-1]['bars_per_sec']:,} bars/sec")
+    return results
+
+
+# Paylaşılan örnek
+candlestick_engine = CandlestickEngine()
+
+
+if __name__ == "__main__":
+    benchmark_candlestick_engine()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Compute Pool - CPU-yoğun analizler için süreç havuzu
+- Saf Python formasyon/indikatör kodu GIL'e takılmadan çekirdek sayısıyla ölçeklenir
+- Motorlar (ör. TechnicalPatternEngine) her işçi süreçte bir kez kurulur
+- DataFrame argümanları pickle yerine tek bir paylaşımlı bellek bloğundan geçer
+- Fonksiyonlar @cpu_bound ile havuza alınır
+
+Not: İşçiler varsayılan olarak 'spawn' ile başlar; @cpu_bound fonksiyonları
+import maliyeti düşük modüllerde tanımlanmalıdır.
+"""
+
+import asyncio
+import importlib
+import logging
+import math
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import wraps
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from monitoring.request_timing import record_executor
+except ImportError:
+    from backend.monitoring.request_timing import record_executor
+
+logger = logging.getLogger(__name__)
+
+FactoryRef = Tuple[str, str]
+
+
+def _ref(obj: Callable) -> FactoryRef:
+    return obj.__module__, obj.__qualname__
+
+
+def _resolve(ref: FactoryRef) -> Any:
+    module_name, qualname = ref
+    obj = importlib.import_module(module_name)
+    for part in qualname.split('.'):
+        obj = getattr(obj, part)
+    return obj
+
+
+# ----------------------------------------------------------------------
+# Paylaşımlı bellek üzerinden DataFrame aktarımı
+# ----------------------------------------------------------------------
+@dataclass
+class SharedFrame:
+    """Paylaşımlı bloktaki bir DataFrame'in konumu (pickle edilen tek şey budur)"""
+    offset: int
+    rows: int
+    columns: Tuple[Any, ...]
+    index_tz: Optional[str] = None
+    index: Any = None  # DatetimeIndex değilse index nesnesinin kendisi
+
+
+def _is_shareable(df: pd.DataFrame) -> bool:
+    return len(df.columns) > 0 and all(pd.api.types.is_numeric_dtype(t) for t in df.dtypes)
+
+
+def _frame_size(df: pd.DataFrame) -> int:
+    """float64 eleman sayısı: değerler + (DatetimeIndex ise) ns zaman damgaları"""
+    extra = len(df) if isinstance(df.index, pd.DatetimeIndex) else 0
+    return len(df) * len(df.columns) + extra
+
+
+def _pack_calls(calls: Sequence[Tuple[tuple, dict]]):
+    """Çağrılardaki tüm sayısal DataFrame'leri tek bir bloğa yazar"""
+    frames = [
+        value
+        for args, kwargs in calls
+        for value in (*args, *kwargs.values())
+        if isinstance(value, pd.DataFrame) and _is_shareable(value)
+    ]
+    total = sum(_frame_size(df) for df in frames)
+    if total == 0:
+        return None, list(calls)
+
+    block = shared_memory.SharedMemory(create=True, size=total * 8)
+    buf = np.ndarray((total,), dtype=np.float64, buffer=block.buf)
+    offset = 0
+
+    def share(value):
+        nonlocal offset
+        if not (isinstance(value, pd.DataFrame) and _is_shareable(value)):
+            return value
+        rows, cols = value.shape
+        desc = SharedFrame(offset=offset, rows=rows, columns=tuple(value.columns))
+        buf[offset:offset + rows * cols] = value.to_numpy(dtype=np.float64).ravel()
+        offset += rows * cols
+        if isinstance(value.index, pd.DatetimeIndex):
+            index = value.index
+            if index.tz is not None:
+                desc.index_tz = str(index.tz)
+                index = index.tz_convert('UTC').tz_localize(None)
+            # asi8 index birimindedir (s/ms/us olabilir); ns'ye sabitlenir
+            buf[offset:offset + rows].view(np.int64)[:] = index.values.astype('datetime64[ns]').view(np.int64)
+            offset += rows
+        else:
+            desc.index = value.index
+        return desc
+
+    try:
+        packed = [
+            (tuple(share(a) for a in args), {k: share(v) for k, v in kwargs.items()})
+            for args, kwargs in calls
+        ]
+    except Exception:
+        del buf
+        _release(block)
+        raise
+    del buf
+    return block, packed
+
+
+def _release(block: Optional[shared_memory.SharedMemory]):
+    if block is None:
+        return
+    try:
+        block.close()
+        block.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _restore(value: Any, buf: Optional[np.ndarray]) -> Any:
+    if not isinstance(value, SharedFrame):
+        return value
+    cols = len(value.columns)
+    end = value.offset + value.rows * cols
+    values = buf[value.offset:end].reshape(value.rows, cols).copy()
+    if value.index is None:
+        index = pd.DatetimeIndex(buf[end:end + value.rows].view('datetime64[ns]').copy())
+        if value.index_tz:
+            index = index.tz_localize('UTC').tz_convert(value.index_tz)
+    else:
+        index = value.index
+    return pd.DataFrame(values, index=index, columns=list(value.columns))
+
+
+# ----------------------------------------------------------------------
+# İşçi süreç tarafı
+# ----------------------------------------------------------------------
+_WORKER_ENGINES: Dict[FactoryRef, Any] = {}
+
+
+def _init_worker(warm: Sequence[FactoryRef]):
+    for ref in warm:
+        try:
+            _WORKER_ENGINES[ref] = _resolve(ref)()
+        except Exception as e:
+            logger.warning(f"Compute pool motor ısıtma hatası {ref}: {e}")
+
+
+def _worker_engine(ref: FactoryRef) -> Any:
+    engine = _WORKER_ENGINES.get(ref)
+    if engine is None:
+        engine = _WORKER_ENGINES[ref] = _resolve(ref)()
+    return engine
+
+
+def _warmup() -> int:
+    return os.getpid()
+
+
+def _run_chunk(fn_ref: FactoryRef, engine_ref: Optional[FactoryRef], block_name: Optional[str],
+               calls: List[Tuple[tuple, dict]]) -> List[Any]:
+    """Bir parça çağrıyı çalıştırır; hatalar çağrı bazında döner (return_exceptions gibi)"""
+    fn = _resolve(fn_ref)
+    fn = getattr(fn, '__wrapped__', fn)
+    engine = _worker_engine(engine_ref) if engine_ref else None
+
+    block = shared_memory.SharedMemory(name=block_name) if block_name else None
+    buf = np.ndarray((block.size // 8,), dtype=np.float64, buffer=block.buf) if block else None
+    results = []
+    try:
+        for args, kwargs in calls:
+            try:
+                args = tuple(_restore(a, buf) for a in args)
+                kwargs = {k: _restore(v, buf) for k, v in kwargs.items()}
+                results.append(fn(engine, *args, **kwargs) if engine is not None else fn(*args, **kwargs))
+            except Exception as e:
+                results.append(e)
+    finally:
+        del buf
+        if block is not None:
+            block.close()
+    return results
+
+
+# ----------------------------------------------------------------------
+# Havuz
+# ----------------------------------------------------------------------
+class ComputePool:
+    """Boyutu ayarlanabilir, motorları önceden ısıtılmış süreç havuzu"""
+
+    def __init__(self, max_workers: Optional[int] = None, start_method: Optional[str] = None):
+        self.max_workers = max_workers or int(os.getenv('COMPUTE_POOL_WORKERS', 0)) or os.cpu_count() or 1
+        self.start_method = start_method or os.getenv('COMPUTE_POOL_START_METHOD', 'spawn')
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._warm: List[FactoryRef] = []
+        self.stats = {
+            'tasks': 0,
+            'calls': 0,
+            'failed_calls': 0,
+            'shared_bytes': 0,
+            'busy_ms': 0.0,
+        }
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=mp.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(tuple(self._warm),),
+            )
+        return self._executor
+
+    async def start(self, warm: Iterable[Callable] = ()):
+        """Havuzu kurar ve tüm işçileri motorlarıyla birlikte ayağa kaldırır"""
+        for factory in warm:
+            ref = _ref(factory)
+            if ref not in self._warm:
+                self._warm.append(ref)
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, _warmup) for _ in range(self.max_workers)
+        ))
+        logger.info(f"✅ Compute pool hazır: {len(set(pids))} işçi, {len(self._warm)} motor")
+
+    async def map(self, fn: Callable, calls: Sequence[Tuple[tuple, dict]],
+                  engine: Optional[Callable] = None, chunk_size: Optional[int] = None) -> List[Any]:
+        """Çağrıları parçalara bölüp işçilere dağıtır; sonuçlar sırayla, hatalar nesne olarak döner"""
+        if not calls:
+            return []
+        block, packed = _pack_calls(calls)
+        chunk_size = chunk_size or max(1, math.ceil(len(packed) / (self.max_workers * 4)))
+        chunks = [packed[i:i + chunk_size] for i in range(0, len(packed), chunk_size)]
+        fn_ref = _ref(fn)
+        engine_ref = _ref(engine) if engine else None
+        block_name = block.name if block else None
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            chunk_results = await asyncio.gather(*(
+                loop.run_in_executor(self.executor, _run_chunk, fn_ref, engine_ref, block_name, chunk)
+                for chunk in chunks
+            ), return_exceptions=True)
+        finally:
+            _release(block)
+
+        results: List[Any] = []
+        for chunk, res in zip(chunks, chunk_results):
+            # Süreç düzeyinde hata (ör. BrokenProcessPool) parçadaki tüm çağrılara yazılır
+            results.extend([res] * len(chunk) if isinstance(res, BaseException) else res)
+
+        self.stats['tasks'] += len(chunks)
+        self.stats['calls'] += len(results)
+        self.stats['failed_calls'] += sum(isinstance(r, BaseException) for r in results)
+        self.stats['shared_bytes'] += block.size if block else 0
+        elapsed = time.perf_counter() - started
+        self.stats['busy_ms'] += elapsed * 1000
+        record_executor(elapsed)
+        return results
+
+    async def call(self, fn: Callable, *args, engine: Optional[Callable] = None, **kwargs) -> Any:
+        result = (await self.map(fn, [(args, kwargs)], engine=engine))[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'busy_ms': round(self.stats['busy_ms'], 1),
+            'max_workers': self.max_workers,
+            'start_method': self.start_method,
+            'running': self._executor is not None,
+            'warm_engines': ['.'.join(ref) for ref in self._warm],
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info("🛑 Compute pool kapatıldı")
+
+
+# Global compute pool
+compute_pool = ComputePool()
+
+
+def cpu_bound(engine: Optional[Callable] = None, pool: Optional[ComputePool] = None):
+    """
+    Senkron, modül seviyesindeki bir fonksiyonu süreç havuzunda çalışan
+    async fonksiyona çevirir. engine verilirse işçideki hazır motor ilk
+    argüman olarak geçer. Toplu kullanım: await fn.map([(args, kwargs), ...])
+    """
+    def decorator(fn: Callable) -> Callable:
+        target = pool or compute_pool
+
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await target.call(wrapper, *args, engine=engine, **kwargs)
+
+        async def map_calls(calls: Sequence[Tuple[tuple, dict]], chunk_size: Optional[int] = None) -> List[Any]:
+            return await target.map(wrapper, calls, engine=engine, chunk_size=chunk_size)
+
+        wrapper.map = map_calls
+        wrapper.engine = engine
+        return wrapper
+    return decorator
+
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+@cpu_bound()
+def _benchmark_task(df: pd.DataFrame, window: int = 20) -> float:
+    """Saf Python döngüsü (formasyon taramalarına benzer GIL'e bağlı iş)"""
+    closes = df['Close'].tolist()
+    score = 0.0
+    for i in range(window, len(closes)):
+        segment = closes[i - window:i]
+        hi, lo = max(segment), min(segment)
+        score += (closes[i] - lo) / (hi - lo) if hi > lo else 0.0
+    return score
+
+
+async def benchmark_compute_pool(n_symbols: int = 100, rows: int = 2000, window: int = 60) -> Dict[str, Any]:
+    """100 sembollük tarama: tek süreç vs süreç havuzu"""
+    rng = np.random.default_rng(42)
+    index = pd.date_range('2020-01-01', periods=rows, freq='D', tz='Europe/Istanbul')
+    frames = []
+    for _ in range(n_symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+        frames.append(pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99,
+                                    'Close': close, 'Volume': rng.integers(100_000, 1_000_000, rows)}, index=index))
+
+    start = time.perf_counter()
+    serial = [_benchmark_task.__wrapped__(df, window) for df in frames]
+    serial_elapsed = time.perf_counter() - start
+
+    await compute_pool.start()
+    start = time.perf_counter()
+    pooled = await _benchmark_task.map([((df, window), {}) for df in frames])
+    pool_elapsed = time.perf_counter() - start
+
+    return {
+        'symbols': n_symbols,
+        'workers': compute_pool.max_workers,
+        'serial_sec': round(serial_elapsed, 3),
+        'pool_sec': round(pool_elapsed, 3),
+        'speedup': round(serial_elapsed / pool_elapsed, 2) if pool_elapsed else None,
+        'results_match': bool(np.allclose(serial, pooled)),
+    }
+
+
+if __name__ == "__main__":
+    print(asyncio.run(benchmark_compute_pool()))
+    compute_pool.shutdown()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Endpoint Cache - Analitik endpoint'ler için yanıt önbelleği
+- TTL + LRU sınırlı süreç içi önbellek
+- Single-flight: aynı anahtar için eşzamanlı ıskalar tek hesaplamayı bekler
+- Stale-while-revalidate: süresi dolan yanıt hemen döner, arka planda yenilenir
+- ETag / If-None-Match ile 304 yanıtları
+- Hata yükleri ({'error': ...}) önbelleğe girmez
+- Paylaşımlı Redis katmanı (cache_manager) ile tüm uvicorn worker'ları faydalanır
+- Geçersiz kılma Redis'teki endpoint işaretiyle diğer worker'lara yayılır
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+try:
+    from core.cache import cache_manager
+except ImportError:
+    from backend.core.cache import cache_manager
+
+logger = logging.getLogger(__name__)
+
+SHARED_BY_DEFAULT = os.getenv('ENDPOINT_CACHE_SHARED', '1') == '1'
+# Diğer worker'ların geçersiz kılma işaretinin en fazla bu aralıkla kontrol edilmesi
+INVALIDATION_SYNC_SECONDS = float(os.getenv('ENDPOINT_CACHE_SYNC_SECONDS', '1.0'))
+# Önbelleği tamamen atla (soğuk gecikme ölçümü, benchmark)
+BYPASS = os.getenv('ENDPOINT_CACHE_BYPASS', '0') == '1'
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    etag: str
+    created: float
+    fresh_until: float
+    stale_until: float
+
+
+def _etag(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str, separators=(',', ':'))
+    return '"' + hashlib.blake2b(payload.encode(), digest_size=16).hexdigest() + '"'
+
+
+class EndpointCache:
+    """Tek bir endpoint'in TTL + LRU önbelleği"""
+
+    def __init__(self, name: str, ttl: float = 60.0, stale_ttl: float = 0.0,
+                 max_entries: int = 256, shared: bool = SHARED_BY_DEFAULT):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Bu andan önce oluşturulmuş (yerel veya paylaşımlı) kayıtlar geçersiz
+        self._invalidated_at = 0.0
+        self._synced_at = 0.0
+        self.stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'shared_hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'refreshes': 0,
+            'evictions': 0,
+            'errors': 0,
+            'uncached_errors': 0,
+            'not_modified': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Yerel LRU
+    # ------------------------------------------------------------------
+    def _store(self, key: str, value: Any, etag: Optional[str] = None, created: Optional[float] = None) -> CacheEntry:
+        created = created or time.time()
+        entry = CacheEntry(
+            value=value,
+            etag=etag or _etag(value),
+            created=created,
+            fresh_until=created + self.ttl,
+            stale_until=created + self.ttl + self.stale_ttl,
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+        return entry
+
+    def _lookup(self, key: str, now: float) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now >= entry.stale_until or entry.created <= self._invalidated_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def invalidate(self, key: Optional[str] = None):
+        """Yerel kayıtları ve paylaşımlı kayıtları (tüm worker'lar için) geçersiz kıl"""
+        if key is not None:
+            self._entries.pop(key, None)
+            if self.shared:
+                await cache_manager.delete(self._shared_key(key))
+            return
+        self._entries.clear()
+        self._invalidated_at = time.time()
+        if self.shared:
+            # İşaret, kendinden önce oluşturulmuş kayıtlar yaşadığı sürece tutulur
+            await cache_manager.set(self._marker_key(), self._invalidated_at,
+                                    ex=max(1, int(self.ttl + self.stale_ttl) + 1))
+
+    async def _sync_invalidation(self, now: float):
+        """Başka bir worker'ın geçersiz kılmasını al (en fazla INVALIDATION_SYNC_SECONDS'ta bir)"""
+        if not self.shared or now - self._synced_at < INVALIDATION_SYNC_SECONDS:
+            return
+        self._synced_at = now
+        marker = await cache_manager.get(self._marker_key())
+        if marker is not None and float(marker) > self._invalidated_at:
+            self._entries.clear()
+            self._invalidated_at = float(marker)
+
+    # ------------------------------------------------------------------
+    # Paylaşımlı katman
+    # ------------------------------------------------------------------
+    def _shared_key(self, key: str) -> str:
+        return f"endpoint:{self.name}:{key}"
+
+    def _marker_key(self) -> str:
+        return f"endpoint:{self.name}:__invalidated__"
+
+    async def _load_shared(self, key: str, now: float) -> Optional[CacheEntry]:
+        if not self.shared:
+            return None
+        data = await cache_manager.get(self._shared_key(key))
+        if not data or now >= data['created'] + self.ttl + self.stale_ttl or data['created'] <= self._invalidated_at:
+            return None
+        self.stats['shared_hits'] += 1
+        return self._store(key, data['value'], data['etag'], data['created'])
+
+    async def _save_shared(self, key: str, entry: CacheEntry):
+        if not self.shared:
+            return
+        await cache_manager.set(
+            self._shared_key(key),
+            {'value': entry.value, 'etag': entry.etag, 'created': entry.created},
+            ex=max(1, int(self.ttl + self.stale_ttl)),
+        )
+
+    # ------------------------------------------------------------------
+    # Single-flight hesaplama
+    # ------------------------------------------------------------------
+    async def _run(self, key: str, compute: Callable[[], Awaitable[Any]]) -> CacheEntry:
+        # Kayıt hesaplamanın başladığı anla damgalanır: hesaplama sürerken yapılan
+        # geçersiz kılma sonucu da geçersiz sayar
+        started = time.time()
+        try:
+            value = jsonable_encoder(await compute())
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+        if isinstance(value, dict) and 'error' in value:
+            # Hata yükü yalnızca bu isteğe döner; sonraki istek yeniden hesaplar
+            self.stats['uncached_errors'] += 1
+            now = time.time()
+            return CacheEntry(value=value, etag=_etag(value), created=now, fresh_until=now, stale_until=now)
+        entry = self._store(key, value, created=started)
+        if started > self._invalidated_at:
+            await self._save_shared(key, entry)
+        return entry
+
+    def _start(self, key: str, compute: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        # Ayrı task: ilk isteği yapan istemci koparsa bekleyen diğerleri etkilenmez
+        task = self._inflight[key] = asyncio.create_task(self._run(key, compute))
+        task.add_done_callback(lambda _, k=key: self._inflight.pop(k, None))
+        return task
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> CacheEntry:
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats['misses'] += 1
+            task = self._start(key, compute)
+        else:
+            self.stats['coalesced'] += 1
+        return await asyncio.shield(task)
+
+    def _refresh_in_background(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        if key in self._inflight:
+            return
+        self.stats['refreshes'] += 1
+        self._start(key, compute).add_done_callback(self._log_refresh_error)
+
+    def _log_refresh_error(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Endpoint cache yenileme hatası {self.name}: {task.exception()}")
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Tuple[CacheEntry, str]:
+        """(entry, durum) döner; durum: HIT | STALE | SHARED | MISS"""
+        now = time.time()
+        await self._sync_invalidation(now)
+        entry = self._lookup(key, now)
+        if entry is not None:
+            if now < entry.fresh_until:
+                self.stats['hits'] += 1
+                return entry, 'HIT'
+            self.stats['stale_hits'] += 1
+            self._refresh_in_background(key, compute)
+            return entry, 'STALE'
+
+        if key not in self._inflight:
+            entry = await self._load_shared(key, now)
+            if entry is not None:
+                if now >= entry.fresh_until:
+                    self._refresh_in_background(key, compute)
+                return entry, 'SHARED'
+
+        return await self._compute(key, compute), 'MISS'
+
+    def get_stats(self) -> Dict[str, Any]:
+        # Single-flight ile bekleyenler de hesaplama yapmadan yanıt alır
+        served = self.stats['hits'] + self.stats['stale_hits'] + self.stats['shared_hits'] + self.stats['coalesced']
+        total = served + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'inflight': len(self._inflight),
+            'hit_rate': round(served / total, 4) if total else 0.0,
+            'ttl': self.ttl,
+            'stale_ttl': self.stale_ttl,
+            'max_entries': self.max_entries,
+            'shared': self.shared,
+        }
+
+
+_caches: Dict[str, EndpointCache] = {}
+
+
+def get_endpoint_cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: cache.get_stats() for name, cache in _caches.items()}
+
+
+async def invalidate_endpoint_cache(name: Optional[str] = None):
+    """Endpoint önbelleğini tüm worker'larda geçersiz kıl (name=None: hepsi)"""
+    for cache_name, cache in list(_caches.items()):
+        if name is None or cache_name == name:
+            await cache.invalidate()
+
+
+def set_endpoint_cache_bypass(enabled: bool):
+    """Açıkken endpoint'ler her istekte hesaplanır, hiçbir şey saklanmaz (X-Cache: BYPASS)"""
+    global BYPASS
+    BYPASS = enabled
+
+
+def _request_key(bound: Dict[str, Any]) -> str:
+    raw = json.dumps(bound, sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def endpoint_cache(ttl: float = 60.0, stale_ttl: float = 0.0, max_entries: int = 256,
+                   shared: bool = SHARED_BY_DEFAULT, name: Optional[str] = None):
+    """
+    FastAPI endpoint'ini önbelleğe alır (@app.get'in altına yazılır).
+    Anahtar endpoint parametrelerinden üretilir; HTTPException ve {'error': ...}
+    yükleri önbelleğe girmez.
+    """
+    def decorator(func: Callable):
+        cache = _caches[name or func.__name__] = EndpointCache(
+            name or func.__name__, ttl=ttl, stale_ttl=stale_ttl, max_entries=max_entries, shared=shared
+        )
+        signature = inspect.signature(func)
+        request_param = next(
+            (p.name for p in signature.parameters.values() if p.annotation is Request), None
+        )
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Optional[Request] = kwargs.get(request_param) if request_param else kwargs.pop('_cache_request', None)
+            if BYPASS:
+                value = jsonable_encoder(await func(*args, **kwargs))
+                return JSONResponse(content=value, headers={'X-Cache': 'BYPASS'})
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            key = _request_key({k: v for k, v in bound.items() if k != request_param})
+
+            entry, status = await cache.get_or_compute(key, lambda: func(*args, **kwargs))
+
+            headers = {
+                'ETag': entry.etag,
+                'Cache-Control': f'max-age={max(0, int(entry.fresh_until - time.time()))}',
+                'X-Cache': status,
+            }
+            if request is not None and request.headers.get('if-none-match') == entry.etag:
+                cache.stats['not_modified'] += 1
+                return Response(status_code=304, headers=headers)
+            return JSONResponse(content=entry.value, headers=headers)
+
+        # FastAPI Request'i enjekte etsin diye imzaya eklenir
+        if request_param is None:
+            extra = inspect.Parameter('_cache_request', inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), extra])
+        else:
+            wrapper.__signature__ = signature
+        wrapper.cache = cache
+        return wrapper
+    return decorator
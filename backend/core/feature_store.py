@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+Feature Store - Sürümlü, sütunsal (columnar) özellik blokları
+- Sembol/interval/özellik seti/sürüm başına bloklar halinde feature_store.db'de saklanır
+- Point-in-time okuma: as_of verilirse yalnızca o ana kadarki satırlar döner
+- Artımlı ekleme: yeni barlar için yalnızca kuyruk (warmup + yeni barlar) hesaplanır
+- Online inference için O(1) "son satır" sorgusu
+
+Her satırla birlikte girdi barının özeti (hash) saklanır. Bar değişmişse (gün içinde
+güncellenen açık son bar, split/temettü geri düzeltmesi) o satırdan itibaren özellikler
+yeniden hesaplanıp üzerine yazılır; ilk örtüşen bar değişmişse tüm geçmiş yeniden
+oluşturulur. Eğitim ve servis aynı hesaplamayı paylaşır. Eski EAV tabloları
+(feature_values vb.) olduğu gibi bırakılır.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FEATURE_STORE_DB = os.getenv(
+    'FEATURE_STORE_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'feature_store.db'),
+)
+
+Key = Tuple[str, str, str, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feature_sets (
+    feature_set TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    columns TEXT NOT NULL,
+    warmup INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (feature_set, version)
+);
+CREATE TABLE IF NOT EXISTS feature_blocks (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    feature_set TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL,
+    n_rows INTEGER NOT NULL,
+    tz TEXT,
+    columns TEXT NOT NULL,
+    ts BLOB NOT NULL,
+    data BLOB NOT NULL,
+    src BLOB,
+    materialized_at REAL NOT NULL,
+    PRIMARY KEY (symbol, interval, feature_set, version, start_ts)
+);
+CREATE TABLE IF NOT EXISTS feature_latest (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    feature_set TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    tz TEXT,
+    columns TEXT NOT NULL,
+    data BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (symbol, interval, feature_set, version)
+);
+"""
+
+
+@dataclass
+class FeatureSetSpec:
+    """Kayıtlı özellik seti: fn(bars) -> bars ile aynı index'te özellik DataFrame'i"""
+    name: str
+    version: int
+    fn: Callable[[pd.DataFrame], pd.DataFrame]
+    warmup: int = 0
+    cumulative: Tuple[str, ...] = ()
+    description: str = ''
+    fingerprint: str = ''
+
+
+@dataclass
+class BlockRange:
+    start_ts: int
+    end_ts: int
+    n_blocks: int
+    n_rows: int
+    tz: Optional[str] = None
+    columns: List[str] = field(default_factory=list)
+
+
+def _fingerprint(fn: Callable) -> str:
+    if isinstance(fn, partial):
+        bound = json.dumps([fn.args, fn.keywords], sort_keys=True, default=str)
+        return hashlib.blake2b((_fingerprint(fn.func) + bound).encode(), digest_size=8).hexdigest()
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        source = f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', repr(fn))}"
+    return hashlib.blake2b(source.encode(), digest_size=8).hexdigest()
+
+
+def _to_ns(index: pd.DatetimeIndex) -> Tuple[np.ndarray, Optional[str]]:
+    """DatetimeIndex -> (int64 ns, tz); tz'li index UTC'ye çevrilir"""
+    tz = str(index.tz) if index.tz is not None else None
+    if tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    # asi8 index birimindedir (s/ms/us olabilir); ns'ye sabitlenir
+    return index.values.astype('datetime64[ns]').view(np.int64), tz
+
+
+def _to_index(ts: np.ndarray, tz: Optional[str]) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(ts.view('datetime64[ns]'))
+    if tz is not None:
+        index = index.tz_localize('UTC').tz_convert(tz)
+    return index
+
+
+def _to_ts(value: Any, tz: Optional[str]) -> int:
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is not None:
+        stamp = stamp.tz_convert('UTC').tz_localize(None)
+    elif tz is not None:
+        stamp = stamp.tz_localize(tz).tz_convert('UTC').tz_localize(None)
+    return int(stamp.value)
+
+
+def _numeric(frame: pd.DataFrame) -> pd.DataFrame:
+    numeric = frame.select_dtypes(include=[np.number, bool])
+    return numeric.astype(np.float64, copy=False)
+
+
+def _bar_hashes(bars: pd.DataFrame) -> np.ndarray:
+    """Bar başına girdi özeti (uint64); 0 'bilinmiyor' için ayrılmıştır"""
+    values = _numeric(bars).round(8)
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+    return np.where(hashes == 0, np.uint64(1), hashes)
+
+
+def _src_array(blob: Optional[bytes], n_rows: int) -> np.ndarray:
+    if blob is None:
+        return np.zeros(n_rows, dtype=np.uint64)
+    return np.frombuffer(blob, dtype=np.uint64)
+
+
+class FeatureStore:
+    """feature_store.db üzerinde sütunsal özellik blokları"""
+
+    def __init__(self, db_path: str = FEATURE_STORE_DB, max_blocks: int = 32,
+                 rtol: float = 1e-6, atol: float = 1e-9):
+        self.db_path = db_path
+        self.max_blocks = max_blocks
+        self.rtol = rtol
+        self.atol = atol
+        self.specs: Dict[str, Dict[int, FeatureSetSpec]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._ranges: Dict[Key, Optional[BlockRange]] = {}
+        self._latest: Dict[Key, pd.Series] = {}
+        self._checked: set = set()
+        self.stats = {
+            'reads': 0,
+            'materialized': 0,
+            'appends': 0,
+            'rewrites': 0,
+            'history_rewrites': 0,
+            'backfills': 0,
+            'full_recomputes': 0,
+            'rows_computed': 0,
+            'rows_stored': 0,
+            'latest_hits': 0,
+            'latest_misses': 0,
+            'bypassed': 0,
+            'compactions': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Kayıt
+    # ------------------------------------------------------------------
+    def register(self, name: str, fn: Callable[[pd.DataFrame], pd.DataFrame], version: int = 1,
+                 warmup: int = 0, cumulative: Sequence[str] = (), description: str = '') -> FeatureSetSpec:
+        """
+        Özellik setini kaydet. fn nedensel (causal) olmalı: t anındaki satır yalnızca
+        t ve öncesindeki barları kullanmalı. warmup, artımlı eklemede yeni barların
+        önüne eklenecek geçmiş bar sayısıdır: en uzun pencere kadar, üstel ortalamalar
+        (EMA/Wilder) için (1 - alpha) ** warmup < rtol olacak kadar. cumulative
+        sütunlar (OBV gibi) kuyruk hesabında saklı değere hizalanır.
+        """
+        spec = FeatureSetSpec(name=name, version=version, fn=fn, warmup=warmup,
+                              cumulative=tuple(cumulative), description=description,
+                              fingerprint=_fingerprint(fn))
+        self.specs.setdefault(name, {})[version] = spec
+        return spec
+
+    def spec(self, name: str, version: Optional[int] = None) -> FeatureSetSpec:
+        versions = self.specs.get(name)
+        if not versions:
+            raise KeyError(f"Kayıtlı olmayan özellik seti: {name}")
+        if version is None:
+            version = max(versions)
+        if version not in versions:
+            raise KeyError(f"{name} için kayıtlı olmayan sürüm: {version}")
+        return versions[version]
+
+    # ------------------------------------------------------------------
+    # Veritabanı
+    # ------------------------------------------------------------------
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                    conn.execute('PRAGMA journal_mode=WAL')
+                    conn.execute('PRAGMA synchronous=NORMAL')
+                    conn.executescript(_SCHEMA)
+                    columns = {row[1] for row in conn.execute('PRAGMA table_info(feature_blocks)')}
+                    if 'src' not in columns:
+                        # Eski şema: girdi özeti olmayan satırlar 'bilinmiyor' (0) okunur
+                        conn.execute('ALTER TABLE feature_blocks ADD COLUMN src BLOB')
+                    self._conn = conn
+        return self._conn
+
+    def _check_spec(self, spec: FeatureSetSpec, columns: List[str]):
+        """Aynı sürümün kodu değiştiyse uyar (sürüm artırılmalı)"""
+        if (spec.name, spec.version) in self._checked:
+            return
+        row = self.conn.execute(
+            'SELECT fingerprint FROM feature_sets WHERE feature_set = ? AND version = ?',
+            (spec.name, spec.version),
+        ).fetchone()
+        if row is None:
+            self.conn.execute(
+                'INSERT INTO feature_sets (feature_set, version, columns, warmup, fingerprint, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (spec.name, spec.version, json.dumps(columns), spec.warmup, spec.fingerprint, time.time()),
+            )
+        elif row[0] != spec.fingerprint:
+            logger.warning(f"⚠️ {spec.name} v{spec.version} kodu değişmiş; saklı bloklar eski hesaplamaya ait, "
+                           f"sürümü artırın")
+        self._checked.add((spec.name, spec.version))
+
+    def _range(self, key: Key) -> Optional[BlockRange]:
+        if key not in self._ranges:
+            row = self.conn.execute(
+                'SELECT MIN(start_ts), MAX(end_ts), COUNT(*), SUM(n_rows) FROM feature_blocks '
+                'WHERE symbol = ? AND interval = ? AND feature_set = ? AND version = ?', key,
+            ).fetchone()
+            if row is None or row[2] == 0:
+                self._ranges[key] = None
+            else:
+                meta = self.conn.execute(
+                    'SELECT tz, columns FROM feature_blocks WHERE symbol = ? AND interval = ? '
+                    'AND feature_set = ? AND version = ? ORDER BY start_ts LIMIT 1', key,
+                ).fetchone()
+                self._ranges[key] = BlockRange(row[0], row[1], row[2], row[3], meta[0], json.loads(meta[1]))
+        return self._ranges[key]
+
+    def _insert_block(self, key: Key, ts: np.ndarray, data: np.ndarray, columns: List[str],
+                      tz: Optional[str], src: np.ndarray):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO feature_blocks (symbol, interval, feature_set, version, start_ts, end_ts, '
+            'n_rows, tz, columns, ts, data, src, materialized_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (*key, int(ts[0]), int(ts[-1]), len(ts), tz, json.dumps(columns),
+             np.ascontiguousarray(ts, dtype=np.int64).tobytes(), np.ascontiguousarray(data).tobytes(),
+             np.ascontiguousarray(src, dtype=np.uint64).tobytes(), time.time()),
+        )
+
+    def _truncate(self, key: Key, from_ts: int):
+        """from_ts ve sonrasındaki saklı satırları sil (açık transaction içinde çağrılır)"""
+        rows = self.conn.execute(
+            'SELECT start_ts, ts, data, columns, tz, src FROM feature_blocks WHERE symbol = ? AND interval = ? '
+            'AND feature_set = ? AND version = ? AND end_ts >= ?', (*key, int(from_ts)),
+        ).fetchall()
+        for start_ts, ts_blob, data_blob, columns_json, tz, src_blob in rows:
+            self.conn.execute(
+                'DELETE FROM feature_blocks WHERE symbol = ? AND interval = ? AND feature_set = ? AND version = ? '
+                'AND start_ts = ?', (*key, start_ts),
+            )
+            ts = np.frombuffer(ts_blob, dtype=np.int64)
+            keep = int(np.searchsorted(ts, from_ts, side='left'))
+            if keep:
+                data = np.frombuffer(data_blob, dtype=np.float64).reshape(-1, len(ts))[:, :keep]
+                self._insert_block(key, ts[:keep], data, json.loads(columns_json), tz,
+                                   _src_array(src_blob, len(ts))[:keep])
+        self.conn.execute(
+            'DELETE FROM feature_latest WHERE symbol = ? AND interval = ? AND feature_set = ? AND version = ? '
+            'AND ts >= ?', (*key, int(from_ts)),
+        )
+        self._ranges.pop(key, None)
+        self._latest.pop(key, None)
+
+    def _write_block(self, key: Key, features: pd.DataFrame, ts: np.ndarray, tz: Optional[str],
+                     src: np.ndarray, replace_from: Optional[int] = None):
+        """Blok yaz; replace_from verilirse o zaman damgasından itibaren saklı satırlar önce silinir"""
+        if len(features) == 0:
+            return
+        columns = list(features.columns)
+        # Sütun başına bitişik: (n_columns, n_rows)
+        data = np.ascontiguousarray(features.to_numpy(dtype=np.float64).T)
+        now = time.time()
+        with self.conn:
+            if replace_from is not None:
+                self._truncate(key, replace_from)
+            self._insert_block(key, ts, data, columns, tz, src)
+            current = self._range(key)
+            if current is None or ts[-1] >= current.end_ts:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO feature_latest (symbol, interval, feature_set, version, ts, tz, '
+                    'columns, data, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (*key, int(ts[-1]), tz, json.dumps(columns), data[:, -1].tobytes(), now),
+                )
+                self._latest[key] = pd.Series(data[:, -1], index=columns, name=_to_index(ts[-1:], tz)[0])
+        self._ranges.pop(key, None)
+        self.stats['rows_stored'] += len(ts)
+
+    def _load(self, key: Key, lo: Optional[int], hi: Optional[int],
+              with_src: bool = False) -> Tuple[np.ndarray, ...]:
+        """(ts, data, columns, tz) ve with_src ise girdi özetleri"""
+        sql = ('SELECT ts, data, columns, tz, src FROM feature_blocks WHERE symbol = ? AND interval = ? '
+               'AND feature_set = ? AND version = ?')
+        params: List[Any] = list(key)
+        if lo is not None:
+            sql += ' AND end_ts >= ?'
+            params.append(int(lo))
+        if hi is not None:
+            sql += ' AND start_ts <= ?'
+            params.append(int(hi))
+        rows = self.conn.execute(sql + ' ORDER BY start_ts', params).fetchall()
+        if not rows:
+            empty = (np.empty(0, dtype=np.int64), np.empty((0, 0)), [], None)
+            return (*empty, np.empty(0, dtype=np.uint64)) if with_src else empty
+
+        columns = json.loads(rows[0][2])
+        tz = rows[0][3]
+        stamps, blocks, sources = [], [], []
+        for ts_blob, data_blob, columns_json, _, src_blob in rows:
+            ts = np.frombuffer(ts_blob, dtype=np.int64)
+            data = np.frombuffer(data_blob, dtype=np.float64).reshape(-1, len(ts))
+            block_columns = json.loads(columns_json)
+            if block_columns != columns:
+                order = {name: i for i, name in enumerate(block_columns)}
+                data = np.stack([data[order[c]] if c in order else np.full(len(ts), np.nan) for c in columns])
+            stamps.append(ts)
+            blocks.append(data)
+            sources.append(_src_array(src_blob, len(ts)))
+
+        ts = np.concatenate(stamps)
+        data = np.concatenate(blocks, axis=1)
+        first = np.searchsorted(ts, lo, side='left') if lo is not None else 0
+        last = np.searchsorted(ts, hi, side='right') if hi is not None else len(ts)
+        if with_src:
+            return ts[first:last], data[:, first:last], columns, tz, np.concatenate(sources)[first:last]
+        return ts[first:last], data[:, first:last], columns, tz
+
+    # ------------------------------------------------------------------
+    # Hesaplama
+    # ------------------------------------------------------------------
+    def _compute(self, spec: FeatureSetSpec, bars: pd.DataFrame) -> pd.DataFrame:
+        features = _numeric(spec.fn(bars))
+        self.stats['rows_computed'] += len(bars)
+        if not features.index.equals(bars.index):
+            features = features.reindex(bars.index)
+        return features
+
+    def _tail(self, spec: FeatureSetSpec, key: Key, bars: pd.DataFrame, ts: np.ndarray,
+              first_new: int) -> pd.DataFrame:
+        """Yeni barların özellikleri; warmup örtüşmesi saklı değerlerle doğrulanır"""
+        lo = max(0, first_new - spec.warmup)
+        features = self._compute(spec, bars.iloc[lo:])
+        if first_new == lo:
+            return features.iloc[first_new - lo:]
+
+        # Örtüşen son satır: saklı değer ile kuyruk hesabı karşılaştırılır
+        anchor_ts = ts[first_new - 1]
+        _, stored, columns, _ = self._load(key, anchor_ts, anchor_ts)
+        pos = first_new - lo - 1
+        if stored.shape[1] == 1 and columns == list(features.columns):
+            stored_row = stored[:, 0]
+            for name in spec.cumulative:
+                if name in features.columns:
+                    col = columns.index(name)
+                    features[name] = features[name] + (stored_row[col] - features[name].iloc[pos])
+            if np.allclose(features.iloc[pos].to_numpy(), stored_row, rtol=self.rtol, atol=self.atol, equal_nan=True):
+                return features.iloc[first_new - lo:]
+
+        # Warmup yetmedi (veya sütunlar değişti): tüm barlardan hesapla
+        self.stats['full_recomputes'] += 1
+        logger.debug(f"{spec.name} v{spec.version} {key[0]}: warmup örtüşmesi tutmadı, tam hesaplama")
+        features = self._compute(spec, bars)
+        if stored.shape[1] == 1 and columns == list(features.columns):
+            for name in spec.cumulative:
+                if name in features.columns:
+                    col = columns.index(name)
+                    features[name] = features[name] + (stored[col, 0] - features[name].iloc[first_new - 1])
+        return features.iloc[first_new:]
+
+    def _first_changed(self, key: Key, current: BlockRange, ts: np.ndarray, src: np.ndarray) -> Optional[int]:
+        """
+        Saklı aralıkla örtüşen barlardan girdisi değişen (veya saklı olmayan) ilkinin
+        pozisyonu. Özeti bilinmeyen eski satırlar aynı kabul edilir; son saklı bar
+        (açık bar olabilir) hariç.
+        """
+        first = int(np.searchsorted(ts, current.start_ts, side='left'))
+        last = int(np.searchsorted(ts, current.end_ts, side='right'))
+        if first >= last:
+            return None
+        window_ts, window_src = ts[first:last], src[first:last]
+        stored_ts, _, _, _, stored_src = self._load(key, int(window_ts[0]), int(window_ts[-1]), with_src=True)
+        if len(stored_ts) == 0:
+            return first
+        idx = np.minimum(np.searchsorted(stored_ts, window_ts), len(stored_ts) - 1)
+        found = stored_ts[idx] == window_ts
+        stored = np.where(found, stored_src[idx], 0)
+        unknown = found & (stored == 0) & (window_ts != current.end_ts)
+        changed = ~found | ((stored != window_src) & ~unknown)
+        return first + int(np.argmax(changed)) if changed.any() else None
+
+    def materialize(self, symbol: str, interval: str, feature_set: str, bars: pd.DataFrame,
+                    version: Optional[int] = None) -> pd.DataFrame:
+        """
+        bars için özellikleri döndürür; eksik veya girdisi değişmiş olanlar hesaplanıp saklanır.
+        İlk çağrıda tüm seri, sonrakilerde yalnızca değişen ilk bardan (genelde açık son bar)
+        ve yeni barlardan itibaren kuyruk hesaplanır. Dönen frame bars ile aynı index'e sahiptir.
+        """
+        spec = self.spec(feature_set, version)
+        if not isinstance(bars.index, pd.DatetimeIndex) or len(bars) == 0:
+            self.stats['bypassed'] += 1
+            return self._compute(spec, bars)
+        if not bars.index.is_monotonic_increasing:
+            bars = bars.sort_index()
+        bars = bars[~bars.index.duplicated(keep='last')]
+
+        key: Key = (symbol, interval, spec.name, spec.version)
+        ts, tz = _to_ns(bars.index)
+        src = _bar_hashes(bars)
+        with self._lock:
+            current = self._range(key)
+            changed = self._first_changed(key, current, ts, src) if current is not None else None
+            if (changed is not None and ts[changed] < current.end_ts
+                    and changed == int(np.searchsorted(ts, current.start_ts, side='left'))):
+                # İlk örtüşen bar değişmiş (split/temettü geri düzeltmesi): saklı geçmiş geçersiz
+                self._drop_key(key)
+                current = None
+                self.stats['history_rewrites'] += 1
+                logger.info(f"♻️ {spec.name} v{spec.version} {symbol} {interval}: geçmiş değişmiş, yeniden oluşturuluyor")
+            elif current is not None and ts[0] < current.start_ts:
+                # Saklı aralıktan önceki geçmiş (backfill): saklı satırlar kısa geçmişle
+                # (warmup eksik, kümülatifler yanlış başlangıçla) hesaplandı, tümü yeniden hesaplanır
+                self._drop_key(key)
+                current = None
+                self.stats['backfills'] += 1
+                logger.info(f"♻️ {spec.name} v{spec.version} {symbol} {interval}: eski geçmiş eklendi, yeniden oluşturuluyor")
+
+            if current is None:
+                features = self._compute(spec, bars)
+                self._check_spec(spec, list(features.columns))
+                self._write_block(key, features, ts, tz, src)
+                self.stats['materialized'] += 1
+                logger.info(f"📦 {spec.name} v{spec.version} {symbol} {interval}: {len(features)} satır saklandı")
+                return features
+
+            first_new = int(np.searchsorted(ts, current.end_ts, side='right'))
+            replace_from = None
+            if changed is not None and changed < first_new:
+                # Açık bar güncellendi veya geçmiş bar düzeltildi: o bardan itibaren üzerine yazılır
+                first_new = changed
+                replace_from = int(ts[changed])
+                self.stats['rewrites'] += 1
+            elif first_new < len(ts):
+                self.stats['appends'] += 1
+            if first_new < len(ts):
+                features = self._tail(spec, key, bars, ts, first_new)
+                self._write_block(key, features, ts[first_new:], tz, src[first_new:], replace_from=replace_from)
+
+            if self._range(key).n_blocks > self.max_blocks:
+                self.compact(symbol, interval, feature_set, spec.version)
+
+        return self.read(symbol, interval, feature_set, spec.version, start=bars.index[0],
+                         end=bars.index[-1]).reindex(bars.index)
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+    def read(self, symbol: str, interval: str, feature_set: str, version: Optional[int] = None,
+             start: Any = None, end: Any = None, as_of: Any = None) -> pd.DataFrame:
+        """
+        Saklı özellikler. as_of: point-in-time sınırı, o andan sonraki satırlar
+        dönmez (eğitimde sızıntı olmaz). end ile birlikte verilirse küçüğü kullanılır.
+        """
+        spec = self.spec(feature_set, version)
+        key: Key = (symbol, interval, spec.name, spec.version)
+        with self._lock:
+            current = self._range(key)
+            if current is None:
+                return pd.DataFrame()
+            tz = current.tz
+            lo = _to_ts(start, tz) if start is not None else None
+            bounds = [_to_ts(value, tz) for value in (end, as_of) if value is not None]
+            hi = min(bounds) if bounds else None
+            ts, data, columns, tz = self._load(key, lo, hi)
+            self.stats['reads'] += 1
+        # (n_columns, n_rows) bloğun transpozu: pandas sütunları kopyasız alır
+        return pd.DataFrame(data.T, index=_to_index(ts, tz), columns=columns)
+
+    def latest(self, symbol: str, interval: str, feature_set: str,
+               version: Optional[int] = None) -> Optional[pd.Series]:
+        """Son saklı satır (online inference); Series.name zaman damgasıdır"""
+        spec = self.spec(feature_set, version)
+        key: Key = (symbol, interval, spec.name, spec.version)
+        row = self._latest.get(key)
+        if row is not None:
+            self.stats['latest_hits'] += 1
+            return row
+        self.stats['latest_misses'] += 1
+        with self._lock:
+            record = self.conn.execute(
+                'SELECT ts, tz, columns, data FROM feature_latest WHERE symbol = ? AND interval = ? '
+                'AND feature_set = ? AND version = ?', key,
+            ).fetchone()
+            if record is None:
+                return None
+            stamp = _to_index(np.array([record[0]], dtype=np.int64), record[1])[0]
+            row = pd.Series(np.frombuffer(record[3], dtype=np.float64).copy(),
+                            index=json.loads(record[2]), name=stamp)
+            self._latest[key] = row
+            return row
+
+    # ------------------------------------------------------------------
+    # Bakım
+    # ------------------------------------------------------------------
+    def compact(self, symbol: str, interval: str, feature_set: str, version: Optional[int] = None):
+        """Artımlı eklemelerle biriken küçük blokları tek blokta birleştir"""
+        spec = self.spec(feature_set, version)
+        key: Key = (symbol, interval, spec.name, spec.version)
+        with self._lock:
+            ts, data, columns, tz, src = self._load(key, None, None, with_src=True)
+            if len(ts) == 0:
+                return
+            with self.conn:
+                self.conn.execute(
+                    'DELETE FROM feature_blocks WHERE symbol = ? AND interval = ? AND feature_set = ? AND version = ?',
+                    key,
+                )
+                self._insert_block(key, ts, data, columns, tz, src)
+            self._ranges.pop(key, None)
+            self.stats['compactions'] += 1
+
+    def drop(self, symbol: str, interval: str, feature_set: str, version: Optional[int] = None):
+        spec = self.spec(feature_set, version)
+        self._drop_key((symbol, interval, spec.name, spec.version))
+
+    def _drop_key(self, key: Key):
+        with self._lock, self.conn:
+            for table in ('feature_blocks', 'feature_latest'):
+                self.conn.execute(
+                    f'DELETE FROM {table} WHERE symbol = ? AND interval = ? AND feature_set = ? AND version = ?', key,
+                )
+            self._ranges.pop(key, None)
+            self._latest.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(n_rows), 0), COALESCE(SUM(LENGTH(data)), 0) FROM feature_blocks'
+            ).fetchone()
+        return {
+            **self.stats,
+            'db_path': self.db_path,
+            'feature_sets': {name: sorted(versions) for name, versions in self.specs.items()},
+            'blocks': totals[0],
+            'rows': totals[1],
+            'bytes': totals[2],
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._ranges.clear()
+
+
+# Global instance
+feature_store = FeatureStore()
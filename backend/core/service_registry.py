@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Service Registry - Motorların tembel (lazy) çözümlenmesi ve paralel başlatma
+- Modül importu ve nesne kurulumu ilk kullanımda yapılır
+- eager=True servisler startup'ta thread'lerde eşzamanlı kurulur
+- Bileşen başına hazır olma durumu ve import/init süre profili
+
+Kayıtlı her servis bağlı namespace'e (ör. fastapi_main globals()) bir
+LazyService vekili olarak yazılır; çözümlenince yerini gerçek nesne alır,
+başarısız olursa None olur. Çözümlenmemiş vekil hiçbir zaman None değildir:
+`x is None` yerine `services.available('x')` kullanılmalıdır.
+
+async handler'larda çözümleme (import + kurulum) event loop'u bloklamamalı:
+`await services.aavailable('x')` veya kullanmadan önce `await services.aload('x', ...)`.
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ServiceSpec:
+    name: str
+    module: str
+    attr: Optional[str] = None
+    call: bool = True
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    eager: bool = False
+    start: Optional[Callable[[Any], Awaitable[Any]]] = None
+    fallback: Any = None
+    state: str = 'lazy'  # lazy | loading | ready | failed
+    value: Any = None
+    error: Optional[str] = None
+    import_ms: float = 0.0
+    init_ms: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class LazyService:
+    """İlk erişimde servisi çözen vekil"""
+
+    __slots__ = ('_registry', '_name')
+
+    def __init__(self, registry: 'ServiceRegistry', name: str):
+        object.__setattr__(self, '_registry', registry)
+        object.__setattr__(self, '_name', name)
+
+    def _resolve(self) -> Any:
+        target = self._registry.get(self._name)
+        if target is None:
+            spec = self._registry.specs[self._name]
+            raise RuntimeError(f"{self._name} kullanılamıyor: {spec.error}")
+        return target
+
+    def __getattr__(self, item):
+        return getattr(self._resolve(), item)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __getitem__(self, key):
+        return self._resolve()[key]
+
+    def __bool__(self) -> bool:
+        return bool(self._registry.get(self._name))
+
+    def __repr__(self) -> str:
+        return f"<LazyService {self._name} ({self._registry.specs[self._name].state})>"
+
+
+class ServiceRegistry:
+    def __init__(self, namespace: Optional[Dict[str, Any]] = None, import_retries: int = 2):
+        self.namespace = namespace
+        self.import_retries = import_retries
+        self.specs: Dict[str, ServiceSpec] = {}
+
+    def register(self, name: str, module: str, attr: Optional[str] = None, *, call: bool = True,
+                 eager: bool = False, start: Optional[Callable[[Any], Awaitable[Any]]] = None,
+                 fallback: Any = None, **kwargs) -> LazyService:
+        """
+        module.attr(**kwargs) ile kurulan servis (call=False: attr olduğu gibi,
+        ör. modül seviyesindeki singleton veya enum). fallback import/kurulum
+        başarısız olursa kullanılacak değerdir.
+        """
+        self.specs[name] = ServiceSpec(name=name, module=module, attr=attr, call=call, kwargs=kwargs,
+                                       eager=eager, start=start, fallback=fallback)
+        proxy = LazyService(self, name)
+        if self.namespace is not None:
+            self.namespace[name] = proxy
+        return proxy
+
+    def _import(self, name: str):
+        """
+        Eşzamanlı kurulumda iki thread ortak bir bağımlılığı (ör. sklearn) aynı anda
+        import ederken Python'un deadlock koruması birine yarım modül verebilir;
+        o thread'in import'u tekrar denenir (diğeri bitirene kadar bekler).
+        """
+        for attempt in range(self.import_retries + 1):
+            try:
+                return importlib.import_module(name)
+            except ImportError as e:
+                if 'partially initialized module' not in str(e) or attempt == self.import_retries:
+                    raise
+                logger.debug(f"{name} import yarışı, tekrar deneniyor: {e}")
+
+    def _load(self, spec: ServiceSpec) -> Any:
+        started = time.perf_counter()
+        module = self._import(spec.module)
+        target = getattr(module, spec.attr) if spec.attr else module
+        imported = time.perf_counter()
+        spec.import_ms = (imported - started) * 1000
+        value = target(**spec.kwargs) if spec.call else target
+        spec.init_ms = (time.perf_counter() - imported) * 1000
+        return value
+
+    def get(self, name: str) -> Any:
+        """Servisi döndürür; gerekirse import edip kurar (thread-safe, tek sefer)"""
+        spec = self.specs[name]
+        if spec.state in ('ready', 'failed'):
+            return spec.value
+        with spec.lock:
+            if spec.state in ('ready', 'failed'):
+                return spec.value
+            spec.state = 'loading'
+            try:
+                spec.value = self._load(spec)
+                spec.state = 'ready'
+                logger.info(f"✅ {name} hazır (import {spec.import_ms:.0f}ms, init {spec.init_ms:.0f}ms)")
+            except Exception as e:
+                spec.value = spec.fallback
+                spec.error = f"{type(e).__name__}: {e}"
+                spec.state = 'ready' if spec.fallback is not None else 'failed'
+                logger.warning(f"⚠️ {name} yüklenemedi: {spec.error}")
+            if self.namespace is not None:
+                self.namespace[name] = spec.value
+            return spec.value
+
+    async def start_eager(self) -> Dict[str, str]:
+        """eager servisleri eşzamanlı kurar, ardından start hook'larını çalıştırır"""
+        names = [name for name, spec in self.specs.items() if spec.eager]
+        started = time.perf_counter()
+        await asyncio.gather(*(asyncio.to_thread(self.get, name) for name in names))
+
+        for name in names:
+            spec = self.specs[name]
+            if spec.start is None or spec.state != 'ready' or spec.value is None:
+                continue
+            try:
+                await spec.start(spec.value)
+            except Exception as e:
+                spec.state = 'failed'
+                spec.error = f"{type(e).__name__}: {e}"
+                spec.value = None
+                if self.namespace is not None:
+                    self.namespace[name] = None
+                logger.warning(f"⚠️ {name} başlatılamadı: {spec.error}")
+
+        elapsed = (time.perf_counter() - started) * 1000
+        serial = sum(self.specs[n].import_ms + self.specs[n].init_ms for n in names)
+        logger.info(f"🚀 {len(names)} servis {elapsed:.0f}ms'de başlatıldı (sıralı toplam {serial:.0f}ms)")
+        return {name: self.specs[name].state for name in names}
+
+    async def aget(self, name: str) -> Any:
+        """get'in async karşılığı: çözümleme gerekiyorsa thread'de yapılır"""
+        spec = self.specs[name]
+        if spec.state in ('ready', 'failed'):
+            return spec.value
+        return await asyncio.to_thread(self.get, name)
+
+    async def aload(self, *names: str):
+        """Handler'ın kullanacağı servisleri loop dışında (eşzamanlı) çözer"""
+        pending = [name for name in names if self.specs[name].state not in ('ready', 'failed')]
+        if pending:
+            await asyncio.gather(*(asyncio.to_thread(self.get, name) for name in pending))
+
+    async def aavailable(self, name: str) -> bool:
+        """available'ın async karşılığı (çözümleme thread'de)"""
+        return await self.aget(name) is not None
+
+    def available(self, name: str, load: bool = True) -> bool:
+        """
+        Servis kullanılabilir mi (`is None` kontrolünün yerine). load=False
+        servisi kurmaz: yalnızca zaten hazır olanlar için True döner (health vb.)
+        """
+        if not load:
+            spec = self.specs[name]
+            return spec.state == 'ready' and spec.value is not None
+        return self.get(name) is not None
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                'state': spec.state,
+                'eager': spec.eager,
+                'import_ms': round(spec.import_ms, 1),
+                'init_ms': round(spec.init_ms, 1),
+                'error': spec.error,
+            }
+            for name, spec in self.specs.items()
+        }
+
+    def readiness(self) -> str:
+        """ready: tüm eager servisler hazır; initializing: yükleniyor; degraded: hata var"""
+        eager = [spec for spec in self.specs.values() if spec.eager]
+        if any(spec.state in ('lazy', 'loading') for spec in eager):
+            return 'initializing'
+        if any(spec.state == 'failed' for spec in eager):
+            return 'degraded'
+        return 'ready'
+
+    def profile(self, top_n: int = 15) -> List[Dict[str, Any]]:
+        loaded = [spec for spec in self.specs.values() if spec.state != 'lazy']
+        loaded.sort(key=lambda spec: spec.import_ms + spec.init_ms, reverse=True)
+        return [
+            {'name': spec.name, 'import_ms': round(spec.import_ms, 1), 'init_ms': round(spec.init_ms, 1)}
+            for spec in loaded[:top_n]
+        ]
+
+    def log_profile(self, top_n: int = 15):
+        for row in self.profile(top_n):
+            logger.info(f"⏱️ {row['name']:<28} import {row['import_ms']:>8.1f}ms  init {row['init_ms']:>8.1f}ms")
@@ -23,6 +23,8 @@ from sklearn.decomposition import PCA
 import warnings
 warnings.filterwarnings('ignore')
 
+from correlation_engine import CorrelationEngine, correlation_engine
+
 @dataclass
 class CorrelationResult:
     """Korelasyon analiz sonucu"""
@@ -42,20 +44,24 @@ class CorrelationAnalyzer:
     - Korelasyon rejimi tespiti
     """
     
-    def __init__(self, min_periods: int = 30, method: str = "pearson"):
+    def __init__(self, min_periods: int = 30, method: str = "pearson",
+                 engine: Optional[CorrelationEngine] = None):
         """
         Correlation Analyzer başlatıcı
         
         Args:
             min_periods: Minimum veri noktası
             method: Korelasyon metodu (pearson, spearman, kendall)
+            engine: Paylaşılan korelasyon motoru (varsayılan: modül örneği)
         """
         self.min_periods = min_periods
         self.method = method
+        self.engine = engine or correlation_engine
         
         # Korelasyon analizi için sabitler
         self.CORRELATION_METHODS = ["pearson", "spearman", "kendall"]
         self.ROLLING_WINDOWS = [21, 63, 126, 252]  # 1a, 3a, 6a, 1y
+        self.HEATMAP_ANNOTATION_LIMIT = 900  # 30x30 hücre
         
     def calculate_correlation_matrix(self, returns: pd.DataFrame,
                                    method: Optional[str] = None) -> CorrelationResult:
@@ -121,21 +127,15 @@ class CorrelationAnalyzer:
         if method is None:
             method = self.method
             
-        rolling_corrs = {}
+        rolling = self.engine.rolling_correlation(returns, window, self.min_periods)
         
-        # Her varlık çifti için rolling correlation
-        for i, asset1 in enumerate(returns.columns):
-            for j, asset2 in enumerate(returns.columns):
-                if i < j:  # Üst üçgen matris
-                    pair_name = f"{asset1}_vs_{asset2}"
-                    
-                    # Rolling correlation hesapla
-                    rolling_corr = returns[asset1].rolling(
-                        window=window, 
-                        min_periods=self.min_periods
-                    ).corr(returns[asset2])
-                    
-                    rolling_corrs[pair_name] = rolling_corr
+        # Her varlık çifti için rolling correlation (üst üçgen)
+        rolling_corrs = {}
+        n_assets = len(rolling.symbols)
+        for i in range(n_assets):
+            for j in range(i + 1, n_assets):
+                pair_name = f"{rolling.symbols[i]}_vs_{rolling.symbols[j]}"
+                rolling_corrs[pair_name] = rolling.pair_series(i, j).reindex(returns.index)
         
         return rolling_corrs
     
@@ -282,61 +282,31 @@ class CorrelationAnalyzer:
         Returns:
             Dict: Korelasyon rejimi analizi
         """
-        # Rolling correlation hesapla
-        rolling_corrs = self.calculate_rolling_correlation(returns, window)
-        
-        # Her zaman noktası için ortalama korelasyon
-        all_corrs = []
-        dates = []
+        # Rolling correlation (önbellekli) ve her tarih için ortalama korelasyon
+        rolling = self.engine.rolling_correlation(returns, window, self.min_periods)
+        mean_corr = rolling.mean_pairwise()
         
-        for pair_name, rolling_corr in rolling_corrs.items():
-            if not rolling_corr.isna().all():
-                all_corrs.append(rolling_corr)
-                dates.append(rolling_corr.index)
-        
-        if not all_corrs:
+        if mean_corr.isna().all():
             return {"error": "Yeterli veri yok"}
         
-        # Ortak tarih aralığını bul
-        common_dates = set.intersection(*[set(dates[i]) for i in range(len(dates))])
-        common_dates = sorted(list(common_dates))
+        common_dates = list(rolling.index)
         
         if len(common_dates) < window:
             return {"error": "Yeterli tarih verisi yok"}
         
-        # Her tarih için ortalama korelasyon
-        avg_correlations = []
-        high_corr_periods = []
+        valid = mean_corr.dropna()
+        avg_correlations = valid.tolist()
         
-        for date in common_dates:
-            date_corrs = []
-            for corr_series in all_corrs:
-                if date in corr_series.index and not pd.isna(corr_series[date]):
-                    date_corrs.append(corr_series[date])
-            
-            if date_corrs:
-                avg_corr = np.mean(date_corrs)
-                avg_correlations.append(avg_corr)
-                
-                # Yüksek korelasyon dönemleri
-                if avg_corr > threshold:
-                    high_corr_periods.append({
-                        "date": date,
-                        "correlation": avg_corr,
-                        "regime": "high_correlation"
-                    })
-                elif avg_corr < 0.3:
-                    high_corr_periods.append({
-                        "date": date,
-                        "correlation": avg_corr,
-                        "regime": "low_correlation"
-                    })
-                else:
-                    high_corr_periods.append({
-                        "date": date,
-                        "correlation": avg_corr,
-                        "regime": "normal_correlation"
-                    })
+        # Rejim sınıflandırması (vektörel)
+        regimes = np.select(
+            [valid.values > threshold, valid.values < 0.3],
+            ["high_correlation", "low_correlation"],
+            default="normal_correlation"
+        )
+        high_corr_periods = [
+            {"date": date, "correlation": corr, "regime": regime}
+            for date, corr, regime in zip(valid.index, avg_correlations, regimes.tolist())
+        ]
         
         # Rejim istatistikleri
         regime_stats = {}
@@ -378,11 +348,12 @@ class CorrelationAnalyzer:
         plt.xticks(range(len(correlation_matrix.columns)), correlation_matrix.columns, rotation=45)
         plt.yticks(range(len(correlation_matrix.index)), correlation_matrix.index)
         
-        # Korelasyon değerlerini ekle
-        for i in range(len(correlation_matrix.index)):
-            for j in range(len(correlation_matrix.columns)):
-                plt.text(j, i, f'{correlation_matrix.iloc[i, j]:.2f}',
-                        ha='center', va='center', fontsize=8)
+        # Korelasyon değerlerini ekle (büyük matrislerde okunaksız, atlanır)
+        n_rows, n_cols = correlation_matrix.shape
+        if n_rows * n_cols <= self.HEATMAP_ANNOTATION_LIMIT:
+            labels = np.char.mod('%.2f', correlation_matrix.values)
+            for (i, j), label in np.ndenumerate(labels):
+                plt.text(j, i, label, ha='center', va='center', fontsize=8)
         
         plt.title(f'Varlık Korelasyon Matrisi ({correlation_matrix.shape[0]} varlık)')
         plt.tight_layout()
@@ -0,0 +1,276 @@
+"""
+Correlation Engine - Çoklu varlık korelasyon çekirdeği
+
+- Getiriler bir kez hizalanıp yoğun float32 panele dönüştürülür; eksik
+  gözlemler NaN kalır, her çift kendi ortak tarihlerini kullanır (pairwise-complete)
+- Rolling korelasyon matrisleri artımlı moment güncellemesiyle
+  (adım başına O(N²), pencere uzunluğundan bağımsız)
+- Sonuçlar veri penceresi anahtarıyla önbelleğe alınır
+
+CorrelationAnalyzer, InternationalCorrelationAnalyzer ve portföy/RL
+modülleri aynı örneği paylaşabilir.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class ReturnPanel:
+    """Hizalanmış getiri paneli (T x N)"""
+    values: np.ndarray          # float32, eksik gözlem NaN
+    index: pd.Index
+    symbols: List[str]
+
+    @property
+    def fingerprint(self) -> str:
+        """Veri penceresi anahtarı: semboller + tarih aralığı + içerik özeti"""
+        digest = hashlib.blake2b(self.values.tobytes(), digest_size=16).hexdigest()
+        span = (str(self.index[0]), str(self.index[-1])) if len(self.index) else ('', '')
+        return f"{','.join(self.symbols)}|{span[0]}|{span[1]}|{len(self.index)}|{digest}"
+
+
+@dataclass
+class RollingCorrelation:
+    """Rolling korelasyon sonucu"""
+    matrices: np.ndarray        # (T, N, N) float32, yetersiz veri olan adımlarda NaN
+    index: pd.Index
+    symbols: List[str]
+    window: int
+
+    def pair_series(self, i: int, j: int) -> pd.Series:
+        return pd.Series(self.matrices[:, i, j], index=self.index)
+
+    def mean_pairwise(self) -> pd.Series:
+        """Her adım için üst üçgen ortalama korelasyon"""
+        iu = np.triu_indices(len(self.symbols), k=1)
+        upper = self.matrices[:, iu[0], iu[1]]
+        with np.errstate(invalid='ignore'):
+            valid = ~np.isnan(upper)
+            counts = valid.sum(axis=1)
+            sums = np.where(valid, upper, 0.0).sum(axis=1, dtype=np.float64)
+            mean = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        return pd.Series(mean, index=self.index)
+
+
+class CorrelationEngine:
+    """Paylaşılan korelasyon hesaplama motoru"""
+
+    def __init__(self, cache_size: int = 32):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, RollingCorrelation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ------------------------------------------------------------------
+    # Hizalama
+    # ------------------------------------------------------------------
+    @staticmethod
+    def align_returns(returns: Union[pd.DataFrame, Dict[str, pd.Series]]) -> ReturnPanel:
+        """
+        Getirileri tek seferde tarih birleşimine hizala (outer join)
+
+        Tek bir sembolün eksik günü diğer çiftleri kısaltmasın diye satırlar
+        atılmaz (yalnızca tamamen boş olanlar); korelasyonlar çift bazında
+        ortak gözlemlerle hesaplanır.
+        """
+        frame = returns if isinstance(returns, pd.DataFrame) else pd.concat(returns, axis=1, join='outer')
+        frame = frame.sort_index().dropna(how='all')
+        return ReturnPanel(
+            values=np.ascontiguousarray(frame.to_numpy(dtype=np.float32)),
+            index=frame.index,
+            symbols=[str(c) for c in frame.columns]
+        )
+
+    @classmethod
+    def align_prices(cls, prices: Dict[str, pd.Series]) -> ReturnPanel:
+        """Fiyat serilerinden hizalanmış getiri paneli"""
+        frame = pd.concat(prices, axis=1, join='outer').sort_index()
+        return cls.align_returns(frame.pct_change(fill_method=None).iloc[1:])
+
+    # ------------------------------------------------------------------
+    # Statik korelasyon
+    # ------------------------------------------------------------------
+    @staticmethod
+    def correlation_matrix(returns: Union[pd.DataFrame, ReturnPanel], min_periods: int = 2) -> pd.DataFrame:
+        """
+        Korelasyon matrisi: eksik veri yoksa tek np.corrcoef çağrısı, varsa
+        pairwise-complete maskeli momentler (DataFrame.corr ile aynı); ortak
+        gözlemi min_periods'tan az olan çiftler 0
+        """
+        panel = returns if isinstance(returns, ReturnPanel) else CorrelationEngine.align_returns(returns)
+        if len(panel.index) < 2:
+            return pd.DataFrame(np.eye(len(panel.symbols)), index=panel.symbols, columns=panel.symbols)
+        values = panel.values.astype(np.float64)
+        valid = ~np.isnan(values)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if valid.all():
+                corr = np.corrcoef(values, rowvar=False)
+            else:
+                x = np.where(valid, values - np.nanmean(values, axis=0), 0.0)
+                m = valid.astype(np.float64)
+                n = m.T @ m
+                sx = x.T @ m                      # sx[i, j]: i'nin j ile ortak gözlemlerdeki toplamı
+                var = (x ** 2).T @ m - sx ** 2 / n
+                cov = x.T @ x - sx * sx.T / n
+                corr = np.where(n >= max(min_periods, 2), cov / np.sqrt(var * var.T), np.nan)
+        corr = np.nan_to_num(np.atleast_2d(corr), nan=0.0)
+        np.fill_diagonal(corr, 1.0)
+        return pd.DataFrame(corr, index=panel.symbols, columns=panel.symbols)
+
+    @staticmethod
+    def correlate_with(target: pd.Series, others: Dict[str, pd.Series], min_periods: int = 10) -> Dict[str, float]:
+        """
+        Bir seri ile birden fazla seri arasında pairwise-complete korelasyon
+
+        Her çift kendi ortak tarihleri üzerinden hesaplanır (pairwise dropna ile
+        aynı sonuç), ancak tüm çiftler tek maskeli moment hesabında çözülür.
+        """
+        if not others:
+            return {}
+        frame = pd.concat({'__target__': target, **others}, axis=1, join='outer')
+        y = frame['__target__'].to_numpy(dtype=np.float64)[:, np.newaxis]
+        X = frame[list(others.keys())].to_numpy(dtype=np.float64)
+
+        mask = ~np.isnan(X) & ~np.isnan(y)
+        n = mask.sum(axis=0)
+        Xm = np.where(mask, X, 0.0)
+        ym = np.where(mask, y, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_x = Xm.sum(axis=0) / n
+            mean_y = ym.sum(axis=0) / n
+            dx = np.where(mask, X - mean_x, 0.0)
+            dy = np.where(mask, y - mean_y, 0.0)
+            corr = (dx * dy).sum(axis=0) / np.sqrt((dx ** 2).sum(axis=0) * (dy ** 2).sum(axis=0))
+        corr = np.where((n >= min_periods) & np.isfinite(corr), corr, 0.0)
+        return {name: float(c) for name, c in zip(others.keys(), corr)}
+
+    # ------------------------------------------------------------------
+    # Rolling korelasyon
+    # ------------------------------------------------------------------
+    def rolling_correlation(self, returns: Union[pd.DataFrame, ReturnPanel], window: int,
+                            min_periods: Optional[int] = None) -> RollingCorrelation:
+        """
+        Artımlı rolling korelasyon matrisleri
+
+        Pencereye giren satırın dış çarpımı eklenir, çıkan satırınki çıkarılır;
+        her adım O(N²). Sonuç veri penceresi + parametrelerle önbelleğe alınır.
+        """
+        panel = returns if isinstance(returns, ReturnPanel) else self.align_returns(returns)
+        min_periods = window if min_periods is None else min(min_periods, window)
+        key = (panel.fingerprint, window, min_periods)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+
+        result = RollingCorrelation(
+            matrices=self._rolling_moments(panel.values, window, max(min_periods, 2)),
+            index=panel.index,
+            symbols=panel.symbols,
+            window=window
+        )
+
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _rolling_moments(values: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+        T, N = values.shape
+        out = np.full((T, N, N), np.nan, dtype=np.float32)
+        if T == 0:
+            return out
+        if np.isnan(values).any():
+            return CorrelationEngine._rolling_pairwise_moments(values, window, min_periods, out)
+
+        # Sayısal kararlılık için sütun ortalamasını çıkar, moment toplamları float64
+        x = values.astype(np.float64)
+        x -= x.mean(axis=0)
+
+        s = np.zeros(N)
+        sxy = np.zeros((N, N))
+        for t in range(T):
+            row = x[t]
+            s += row
+            sxy += np.outer(row, row)
+            if t >= window:
+                old = x[t - window]
+                s -= old
+                sxy -= np.outer(old, old)
+
+            n = min(t + 1, window)
+            if n < min_periods:
+                continue
+
+            cov = sxy - np.outer(s, s) / n
+            var = np.clip(np.diag(cov), 0.0, None)
+            denom = np.sqrt(np.outer(var, var))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                corr = np.where(denom > 1e-18, cov / denom, np.nan)
+            out[t] = np.clip(corr, -1.0, 1.0)
+        return out
+
+    @staticmethod
+    def _rolling_pairwise_moments(values: np.ndarray, window: int, min_periods: int,
+                                  out: np.ndarray) -> np.ndarray:
+        """
+        Eksik gözlemli panel: çift başına gözlem sayısı ve toplamlar ayrı tutulur
+        (pandas rolling(window, min_periods).corr ile aynı), adım başına yine O(N²)
+        """
+        T, N = values.shape
+        valid = ~np.isnan(values)
+        x = np.where(valid, values.astype(np.float64) - np.nanmean(values, axis=0, dtype=np.float64), 0.0)
+        m = valid.astype(np.float64)
+
+        n = np.zeros((N, N))
+        sx = np.zeros((N, N))       # sx[i, j]: j'nin de gözlemlendiği satırlarda x_i toplamı
+        sxx = np.zeros((N, N))
+        sxy = np.zeros((N, N))
+        for t in range(T):
+            n += np.outer(m[t], m[t])
+            sx += np.outer(x[t], m[t])
+            sxx += np.outer(x[t] ** 2, m[t])
+            sxy += np.outer(x[t], x[t])
+            if t >= window:
+                old, old_m = x[t - window], m[t - window]
+                n -= np.outer(old_m, old_m)
+                sx -= np.outer(old, old_m)
+                sxx -= np.outer(old ** 2, old_m)
+                sxy -= np.outer(old, old)
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                var = np.clip(sxx - sx ** 2 / n, 0.0, None)
+                cov = sxy - sx * sx.T / n
+                denom = np.sqrt(var * var.T)
+                corr = np.where((n >= min_periods) & (denom > 1e-18), cov / denom, np.nan)
+            out[t] = np.clip(corr, -1.0, 1.0)
+        return out
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._cache),
+            'hits': self.cache_hits,
+            'misses': self.cache_misses
+        }
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# Paylaşılan örnek
+correlation_engine = CorrelationEngine()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+BIST AI Smart Trader - Async SQLite Access Layer
+Shared pooled access to the SQLite files used by the async services
+
+- One writer connection on a dedicated thread (writes never contend in-process)
+- Reader connections, one per worker thread, in WAL mode (reads run in parallel
+  with the writer instead of serializing on the database lock)
+- Parameterized statements go through sqlite3's per-connection statement cache
+- Per-query timing (queue wait + execution) and a slow-query log
+"""
+
+import asyncio
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class WriteResult:
+    """Result of a single write statement"""
+    lastrowid: Optional[int]
+    rowcount: int
+
+
+@dataclass
+class QueryStats:
+    """Aggregated timings for one statement shape"""
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    wait_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'avg_wait_ms': round(self.wait_ms / self.count, 3) if self.count else 0.0,
+        }
+
+
+class AsyncSQLite:
+    """Async facade over a writer thread and a pool of reader threads"""
+
+    def __init__(self, db_path: str, readers: int = 4, busy_timeout_ms: int = 5000,
+                 slow_query_ms: float = 50.0, statement_cache: int = 256):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.slow_query_ms = slow_query_ms
+        self.statement_cache = statement_cache
+
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="sqlite-reader")
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._conn_lock = threading.Lock()
+
+        self._stats: Dict[str, QueryStats] = {}
+        self._stats_lock = threading.Lock()
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=100)
+
+    # ------------------------------------------------------------------
+    # Connections (one per worker thread)
+    # ------------------------------------------------------------------
+    def _open(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.statement_cache,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+        conn.execute('PRAGMA foreign_keys=ON')
+        if read_only:
+            conn.execute('PRAGMA query_only=ON')
+        with self._conn_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _connection(self, read_only: bool) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._open(read_only)
+        return conn
+
+    # ------------------------------------------------------------------
+    # Instrumentation
+    # ------------------------------------------------------------------
+    def _record(self, label: str, exec_ms: float, wait_ms: float):
+        key = _WHITESPACE.sub(' ', label).strip()[:160]
+        with self._stats_lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats()
+            stats.count += 1
+            stats.total_ms += exec_ms
+            stats.wait_ms += wait_ms
+            stats.max_ms = max(stats.max_ms, exec_ms)
+
+        if exec_ms + wait_ms >= self.slow_query_ms:
+            entry = {
+                'query': key,
+                'exec_ms': round(exec_ms, 3),
+                'wait_ms': round(wait_ms, 3),
+                'timestamp': time.time(),
+            }
+            self.slow_queries.append(entry)
+            logger.warning(f"🐢 Slow query ({exec_ms:.1f}ms + {wait_ms:.1f}ms wait): {key}")
+
+    async def _submit(self, read_only: bool, label: str, fn: Callable[[sqlite3.Connection], T]) -> T:
+        submitted = time.perf_counter()
+
+        def job() -> T:
+            started = time.perf_counter()
+            conn = self._connection(read_only)
+            try:
+                if read_only:
+                    return fn(conn)
+                with conn:
+                    return fn(conn)
+            finally:
+                finished = time.perf_counter()
+                self._record(label, (finished - started) * 1000, (started - submitted) * 1000)
+
+        executor = self._readers if read_only else self._writer
+        return await asyncio.get_running_loop().run_in_executor(executor, job)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        return await self._submit(True, sql, lambda conn: conn.execute(sql, params).fetchall())
+
+    async def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        return await self._submit(True, sql, lambda conn: conn.execute(sql, params).fetchone())
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> WriteResult:
+        def run(conn: sqlite3.Connection) -> WriteResult:
+            cursor = conn.execute(sql, params)
+            return WriteResult(cursor.lastrowid, cursor.rowcount)
+        return await self._submit(False, sql, run)
+
+    async def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> WriteResult:
+        rows = list(seq_of_params)
+
+        def run(conn: sqlite3.Connection) -> WriteResult:
+            cursor = conn.executemany(sql, rows)
+            return WriteResult(cursor.lastrowid, cursor.rowcount)
+        return await self._submit(False, sql, run)
+
+    async def read(self, fn: Callable[[sqlite3.Connection], T], label: Optional[str] = None) -> T:
+        """Run several reads on one reader connection"""
+        return await self._submit(True, label or getattr(fn, '__name__', 'read'), fn)
+
+    async def write(self, fn: Callable[[sqlite3.Connection], T], label: Optional[str] = None) -> T:
+        """Run fn(conn) on the writer thread inside one transaction"""
+        return await self._submit(False, label or getattr(fn, '__name__', 'write'), fn)
+
+    def get_stats(self, top_n: int = 20) -> Dict[str, Any]:
+        with self._stats_lock:
+            ranked = sorted(self._stats.items(), key=lambda item: item[1].total_ms, reverse=True)[:top_n]
+            queries = {key: stats.to_dict() for key, stats in ranked}
+        return {
+            'db_path': self.db_path,
+            'connections': len(self._connections),
+            'slow_query_ms': self.slow_query_ms,
+            'slow_queries': list(self.slow_queries)[-10:],
+            'queries': queries,
+        }
+
+    def close(self):
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        with self._conn_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+
+
+_databases: Dict[str, AsyncSQLite] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_path: str = "bist_ai.db", **kwargs) -> AsyncSQLite:
+    """Shared AsyncSQLite per database file"""
+    with _databases_lock:
+        db = _databases.get(db_path)
+        if db is None:
+            db = _databases[db_path] = AsyncSQLite(db_path, **kwargs)
+        return db
+
+
+def close_all():
+    with _databases_lock:
+        for db in _databases.values():
+            db.close()
+        _databases.clear()
@@ -15,6 +15,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
 
+try:
+    from db.async_sqlite import get_database
+except ImportError:
+    from backend.db.async_sqlite import get_database
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -42,6 +47,7 @@ class WatchlistCRUD:
     def __init__(self, db_path: str = "bist_ai.db"):
         self.db_path = db_path
         self.init_database()
+        self.db = get_database(db_path)
         
         # WebSocket connections for real-time updates
         self.active_connections: List[Any] = []
@@ -111,7 +117,7 @@ class WatchlistCRUD:
             raise
 
     def get_db_connection(self):
-        """Get database connection"""
+        """Get a blocking database connection (sync callers only; async paths use self.db)"""
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
@@ -119,17 +125,12 @@ class WatchlistCRUD:
     async def create_watchlist(self, user_id: str, watchlist_data: WatchlistCreate) -> Dict[str, Any]:
         """Create a new watchlist"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            written = await self.db.execute('''
                 INSERT INTO watchlists (name, description, user_id, is_public)
                 VALUES (?, ?, ?, ?)
             ''', (watchlist_data.name, watchlist_data.description, user_id, watchlist_data.is_public))
             
-            watchlist_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            watchlist_id = written.lastrowid
             
             result = {
                 'id': watchlist_id,
@@ -155,11 +156,8 @@ class WatchlistCRUD:
     async def get_watchlists(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all watchlists for a user"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
             # Get user's own watchlists and shared ones
-            cursor.execute('''
+            rows = await self.db.fetchall('''
                 SELECT DISTINCT w.*, 
                        COUNT(wi.id) as item_count,
                        MAX(wi.added_at) as last_updated
@@ -174,7 +172,7 @@ class WatchlistCRUD:
             ''', (user_id, user_id))
             
             watchlists = []
-            for row in cursor.fetchall():
+            for row in rows:
                 watchlist = {
                     'id': row['id'],
                     'name': row['name'],
@@ -188,8 +186,6 @@ class WatchlistCRUD:
                 }
                 watchlists.append(watchlist)
             
-            conn.close()
-            
             logger.info(f"📋 Retrieved {len(watchlists)} watchlists for user {user_id}")
             return watchlists
             
@@ -200,29 +196,30 @@ class WatchlistCRUD:
     async def get_watchlist(self, watchlist_id: int, user_id: str) -> Dict[str, Any]:
         """Get a specific watchlist with items"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Check if user has access to this watchlist
-            cursor.execute('''
-                SELECT w.* FROM watchlists w
-                LEFT JOIN watchlist_shares ws ON w.id = ws.watchlist_id
-                WHERE w.id = ? AND (w.user_id = ? OR ws.shared_with_user_id = ?)
-            ''', (watchlist_id, user_id, user_id))
-            
-            watchlist_row = cursor.fetchone()
+            def load(conn):
+                # Check if user has access to this watchlist
+                watchlist_row = conn.execute('''
+                    SELECT w.* FROM watchlists w
+                    LEFT JOIN watchlist_shares ws ON w.id = ws.watchlist_id
+                    WHERE w.id = ? AND (w.user_id = ? OR ws.shared_with_user_id = ?)
+                ''', (watchlist_id, user_id, user_id)).fetchone()
+                if not watchlist_row:
+                    return None, []
+                
+                # Get watchlist items
+                item_rows = conn.execute('''
+                    SELECT * FROM watchlist_items
+                    WHERE watchlist_id = ?
+                    ORDER BY added_at DESC
+                ''', (watchlist_id,)).fetchall()
+                return watchlist_row, item_rows
+            
+            watchlist_row, item_rows = await self.db.read(load, 'get_watchlist')
             if not watchlist_row:
                 raise HTTPException(status_code=404, detail="Watchlist not found")
             
-            # Get watchlist items
-            cursor.execute('''
-                SELECT * FROM watchlist_items
-                WHERE watchlist_id = ?
-                ORDER BY added_at DESC
-            ''', (watchlist_id,))
-            
             items = []
-            for row in cursor.fetchall():
+            for row in item_rows:
                 item = {
                     'id': row['id'],
                     'symbol': row['symbol'],
@@ -234,8 +231,6 @@ class WatchlistCRUD:
                 }
                 items.append(item)
             
-            conn.close()
-            
             result = {
                 'id': watchlist_row['id'],
                 'name': watchlist_row['name'],
@@ -258,15 +253,6 @@ class WatchlistCRUD:
     async def update_watchlist(self, watchlist_id: int, user_id: str, update_data: WatchlistUpdate) -> Dict[str, Any]:
         """Update a watchlist"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Check ownership
-            cursor.execute('SELECT user_id FROM watchlists WHERE id = ?', (watchlist_id,))
-            owner_row = cursor.fetchone()
-            if not owner_row or owner_row['user_id'] != user_id:
-                raise HTTPException(status_code=403, detail="Not authorized to update this watchlist")
-            
             # Build update query
             update_fields = []
             update_values = []
@@ -283,19 +269,22 @@ class WatchlistCRUD:
                 update_fields.append('is_public = ?')
                 update_values.append(update_data.is_public)
             
-            if update_fields:
-                update_fields.append('updated_at = CURRENT_TIMESTAMP')
-                update_values.append(watchlist_id)
+            def apply(conn):
+                # Check ownership (aynı transaction içinde)
+                owner_row = conn.execute('SELECT user_id FROM watchlists WHERE id = ?', (watchlist_id,)).fetchone()
+                if not owner_row or owner_row['user_id'] != user_id:
+                    return False
                 
-                cursor.execute(f'''
-                    UPDATE watchlists 
-                    SET {', '.join(update_fields)}
-                    WHERE id = ?
-                ''', update_values)
-                
-                conn.commit()
-            
-            conn.close()
+                if update_fields:
+                    conn.execute(f'''
+                        UPDATE watchlists 
+                        SET {', '.join(update_fields + ['updated_at = CURRENT_TIMESTAMP'])}
+                        WHERE id = ?
+                    ''', update_values + [watchlist_id])
+                return True
+            
+            if not await self.db.write(apply, 'update_watchlist'):
+                raise HTTPException(status_code=403, detail="Not authorized to update this watchlist")
             
             # Get updated watchlist
             result = await self.get_watchlist(watchlist_id, user_id)
@@ -316,12 +305,8 @@ class WatchlistCRUD:
     async def delete_watchlist(self, watchlist_id: int, user_id: str) -> Dict[str, Any]:
         """Delete a watchlist"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
             # Check ownership
-            cursor.execute('SELECT user_id FROM watchlists WHERE id = ?', (watchlist_id,))
-            owner_row = cursor.fetchone()
+            owner_row = await self.db.fetchone('SELECT user_id FROM watchlists WHERE id = ?', (watchlist_id,))
             if not owner_row or owner_row['user_id'] != user_id:
                 raise HTTPException(status_code=403, detail="Not authorized to delete this watchlist")
             
@@ -329,9 +314,7 @@ class WatchlistCRUD:
             watchlist_info = await self.get_watchlist(watchlist_id, user_id)
             
             # Delete watchlist (items will be deleted by CASCADE)
-            cursor.execute('DELETE FROM watchlists WHERE id = ?', (watchlist_id,))
-            conn.commit()
-            conn.close()
+            await self.db.execute('DELETE FROM watchlists WHERE id = ? AND user_id = ?', (watchlist_id, user_id))
             
             logger.info(f"✅ Watchlist deleted: {watchlist_id}")
             
@@ -349,31 +332,28 @@ class WatchlistCRUD:
     async def add_to_watchlist(self, watchlist_id: int, user_id: str, item: WatchlistItem) -> Dict[str, Any]:
         """Add item to watchlist"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Check access
-            cursor.execute('''
-                SELECT w.user_id FROM watchlists w
-                LEFT JOIN watchlist_shares ws ON w.id = ws.watchlist_id
-                WHERE w.id = ? AND (w.user_id = ? OR ws.shared_with_user_id = ?)
-            ''', (watchlist_id, user_id, user_id))
-            
-            access_row = cursor.fetchone()
-            if not access_row:
+            def insert(conn):
+                # Check access
+                access_row = conn.execute('''
+                    SELECT w.user_id FROM watchlists w
+                    LEFT JOIN watchlist_shares ws ON w.id = ws.watchlist_id
+                    WHERE w.id = ? AND (w.user_id = ? OR ws.shared_with_user_id = ?)
+                ''', (watchlist_id, user_id, user_id)).fetchone()
+                if not access_row:
+                    return None
+                
+                # Add item
+                cursor = conn.execute('''
+                    INSERT OR REPLACE INTO watchlist_items 
+                    (watchlist_id, symbol, name, notes, alert_price, alert_type)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (watchlist_id, item.symbol, item.name, item.notes, item.alert_price, item.alert_type))
+                return cursor.lastrowid
+            
+            item_id = await self.db.write(insert, 'add_to_watchlist')
+            if item_id is None:
                 raise HTTPException(status_code=404, detail="Watchlist not found")
             
-            # Add item
-            cursor.execute('''
-                INSERT OR REPLACE INTO watchlist_items 
-                (watchlist_id, symbol, name, notes, alert_price, alert_type)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (watchlist_id, item.symbol, item.name, item.notes, item.alert_price, item.alert_type))
-            
-            item_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            
             result = {
                 'id': item_id,
                 'watchlist_id': watchlist_id,
@@ -401,32 +381,28 @@ class WatchlistCRUD:
     async def remove_from_watchlist(self, watchlist_id: int, user_id: str, symbol: str) -> Dict[str, Any]:
         """Remove item from watchlist"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Check access
-            cursor.execute('''
-                SELECT w.user_id FROM watchlists w
-                LEFT JOIN watchlist_shares ws ON w.id = ws.watchlist_id
-                WHERE w.id = ? AND (w.user_id = ? OR ws.shared_with_user_id = ?)
-            ''', (watchlist_id, user_id, user_id))
-            
-            access_row = cursor.fetchone()
-            if not access_row:
+            def delete(conn):
+                # Check access
+                access_row = conn.execute('''
+                    SELECT w.user_id FROM watchlists w
+                    LEFT JOIN watchlist_shares ws ON w.id = ws.watchlist_id
+                    WHERE w.id = ? AND (w.user_id = ? OR ws.shared_with_user_id = ?)
+                ''', (watchlist_id, user_id, user_id)).fetchone()
+                if not access_row:
+                    return None
+                
+                # Remove item
+                return conn.execute('''
+                    DELETE FROM watchlist_items 
+                    WHERE watchlist_id = ? AND symbol = ?
+                ''', (watchlist_id, symbol)).rowcount
+            
+            removed = await self.db.write(delete, 'remove_from_watchlist')
+            if removed is None:
                 raise HTTPException(status_code=404, detail="Watchlist not found")
-            
-            # Remove item
-            cursor.execute('''
-                DELETE FROM watchlist_items 
-                WHERE watchlist_id = ? AND symbol = ?
-            ''', (watchlist_id, symbol))
-            
-            if cursor.rowcount == 0:
+            if removed == 0:
                 raise HTTPException(status_code=404, detail="Item not found in watchlist")
             
-            conn.commit()
-            conn.close()
-            
             logger.info(f"✅ Removed {symbol} from watchlist {watchlist_id}")
             
             # Notify WebSocket clients
@@ -465,37 +441,32 @@ class WatchlistCRUD:
         except Exception as e:
             logger.error(f"❌ Failed to broadcast watchlist update: {e}")
 
-    def get_watchlist_stats(self, user_id: str) -> Dict[str, Any]:
+    async def get_watchlist_stats(self, user_id: str) -> Dict[str, Any]:
         """Get watchlist statistics for a user"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Get basic stats
-            cursor.execute('''
-                SELECT 
-                    COUNT(*) as total_watchlists,
-                    SUM(CASE WHEN is_public = 1 THEN 1 ELSE 0 END) as public_watchlists,
-                    SUM(CASE WHEN is_public = 0 THEN 1 ELSE 0 END) as private_watchlists
-                FROM watchlists 
-                WHERE user_id = ?
-            ''', (user_id,))
-            
-            stats_row = cursor.fetchone()
-            
-            # Get item stats
-            cursor.execute('''
-                SELECT 
-                    COUNT(*) as total_items,
-                    COUNT(DISTINCT symbol) as unique_symbols
-                FROM watchlist_items wi
-                JOIN watchlists w ON wi.watchlist_id = w.id
-                WHERE w.user_id = ?
-            ''', (user_id,))
-            
-            item_stats_row = cursor.fetchone()
-            
-            conn.close()
+            def load(conn):
+                # Get basic stats
+                stats_row = conn.execute('''
+                    SELECT 
+                        COUNT(*) as total_watchlists,
+                        SUM(CASE WHEN is_public = 1 THEN 1 ELSE 0 END) as public_watchlists,
+                        SUM(CASE WHEN is_public = 0 THEN 1 ELSE 0 END) as private_watchlists
+                    FROM watchlists 
+                    WHERE user_id = ?
+                ''', (user_id,)).fetchone()
+                
+                # Get item stats
+                item_stats_row = conn.execute('''
+                    SELECT 
+                        COUNT(*) as total_items,
+                        COUNT(DISTINCT symbol) as unique_symbols
+                    FROM watchlist_items wi
+                    JOIN watchlists w ON wi.watchlist_id = w.id
+                    WHERE w.user_id = ?
+                ''', (user_id,)).fetchone()
+                return stats_row, item_stats_row
+            
+            stats_row, item_stats_row = await self.db.read(load, 'get_watchlist_stats')
             
             stats = {
                 'total_watchlists': stats_row['total_watchlists'],
@@ -571,7 +542,16 @@ async def remove_from_watchlist_endpoint(
 
 @app.get("/api/watchlists/stats")
 async def get_watchlist_stats_endpoint(user_id: str = "default_user"):
-    return watchlist_crud.get_watchlist_stats(user_id)
+    return await watchlist_crud.get_watchlist_stats(user_id)
+
+@app.get("/api/watchlists/db/stats")
+async def get_watchlist_db_stats_endpoint():
+    """Query timings and slow-query log of the shared SQLite layer"""
+    return watchlist_crud.db.get_stats()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    watchlist_crud.db.close()
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8002)
\ No newline at end of file
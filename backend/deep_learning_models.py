@@ -12,6 +12,8 @@ import json
 import re
 from dataclasses import dataclass
 
+from indicator_library import calculate_rsi
+
 # Deep Learning imports
 try:
     import tensorflow as tf
@@ -243,12 +245,7 @@ class TransformerModel:
     
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """RSI hesapla"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.fillna(50)
+        return calculate_rsi(prices, period).fillna(50)
     
     def train(self, df: pd.DataFrame) -> Dict:
         """Modeli eğit"""
@@ -455,12 +452,7 @@ class LSTMModel:
     
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """RSI hesapla"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.fillna(50)
+        return calculate_rsi(prices, period).fillna(50)
     
     def train(self, df: pd.DataFrame) -> Dict:
         """Modeli eğit"""
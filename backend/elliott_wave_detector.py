@@ -10,6 +10,13 @@ from typing import Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from swing_pattern_core import (ELLIOTT_CORRECTIVE_SPEC, SwingCandidateGenerator, best_per_key,
+                                    elliott_impulse_spec, find_swing_points)
+except ImportError:
+    from backend.swing_pattern_core import (ELLIOTT_CORRECTIVE_SPEC, SwingCandidateGenerator, best_per_key,
+                                            elliott_impulse_spec, find_swing_points)
+
 class ElliottWaveDetector:
     """Elliott Wave pattern tespit edici - Accuracy boost için"""
     
@@ -53,19 +60,7 @@ class ElliottWaveDetector:
         Returns:
             Tuple of swing highs and lows indices
         """
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(window, len(highs) - window):
-            # Swing high detection
-            if all(highs[i] >= highs[j] for j in range(i-window, i+window+1)):
-                swing_highs.append(i)
-            
-            # Swing low detection
-            if all(lows[i] <= lows[j] for j in range(i-window, i+window+1)):
-                swing_lows.append(i)
-        
-        return np.array(swing_highs), np.array(swing_lows)
+        return find_swing_points(highs, lows, window)
     
     def detect_elliott_impulse_wave(self, highs: np.ndarray, lows: np.ndarray, 
                                    prices: np.ndarray) -> List[Dict]:
@@ -79,95 +74,51 @@ class ElliottWaveDetector:
         - Wave 4: Retracement (23.6-38.2%)
         - Wave 5: Final move (61.8-100% of Wave 1)
         """
-        patterns = []
-        swing_highs, swing_lows = self.find_swing_points(highs, lows)
+        return self._detect_impulse_waves(SwingCandidateGenerator(highs, lows))
+    
+    def _detect_impulse_waves(self, generator: SwingCandidateGenerator) -> List[Dict]:
+        """Ortak aday üretici: dalga noktaları binary search, oranlar vektörel; örtüşenlerden en iyisi"""
+        found = generator.generate(elliott_impulse_spec(self.elliott_ratios))
+        if not len(found):
+            return []
         
-        # Need at least 5 swing points for Impulse Wave
-        if len(swing_highs) < 3 or len(swing_lows) < 2:
-            return patterns
+        start = found.free_price
+        w1, w2, w3, w4, w5 = found.prices
+        wave1_move = w1 - start
+        wave3_move = w3 - w2
+        wave5_move = w5 - w4
+        with np.errstate(divide='ignore', invalid='ignore'):
+            wave2_retracement = (w1 - w2) / wave1_move
+            wave3_extension = wave3_move / wave1_move
+            wave4_retracement = (w3 - w4) / wave3_move
+            wave5_extension = wave5_move / wave1_move
         
-        # Look for potential Impulse Wave patterns
-        for i in range(len(swing_highs) - 2):
-            for j in range(len(swing_lows) - 1):
-                # Wave 1: Initial move (swing high)
-                wave1_start_idx = swing_lows[j]
-                wave1_start_price = lows[wave1_start_idx]
-                wave1_end_idx = swing_highs[i]
-                wave1_end_price = highs[wave1_end_idx]
-                wave1_move = wave1_end_price - wave1_start_price
-                
-                # Wave 2: Retracement (swing low)
-                wave2_candidates = [idx for idx in swing_lows if idx > wave1_end_idx]
-                if not wave2_candidates:
-                    continue
-                    
-                wave2_idx = wave2_candidates[0]
-                wave2_price = lows[wave2_idx]
-                wave2_retracement = (wave1_end_price - wave2_price) / wave1_move
-                
-                # Validate Wave 2 retracement (50-78.6%)
-                if not (self.elliott_ratios['wave_2_retracement_min'] <= wave2_retracement <= self.elliott_ratios['wave_2_retracement_max']):
-                    continue
-                
-                # Wave 3: Strongest move (swing high)
-                wave3_candidates = [idx for idx in swing_highs if idx > wave2_idx]
-                if not wave3_candidates:
-                    continue
-                    
-                wave3_idx = wave3_candidates[0]
-                wave3_price = highs[wave3_idx]
-                wave3_move = wave3_price - wave2_price
-                wave3_extension = wave3_move / wave1_move
-                
-                # Validate Wave 3 extension (161.8-261.8%)
-                if not (self.elliott_ratios['wave_3_extension_min'] <= wave3_extension <= self.elliott_ratios['wave_3_extension_max']):
-                    continue
-                
-                # Wave 4: Retracement (swing low)
-                wave4_candidates = [idx for idx in swing_lows if idx > wave3_idx]
-                if not wave4_candidates:
-                    continue
-                    
-                wave4_idx = wave4_candidates[0]
-                wave4_price = lows[wave4_idx]
-                wave4_retracement = (wave3_price - wave4_price) / wave3_move
-                
-                # Validate Wave 4 retracement (23.6-38.2%)
-                if not (self.elliott_ratios['wave_4_retracement_min'] <= wave4_retracement <= self.elliott_ratios['wave_4_retracement_max']):
-                    continue
-                
-                # Wave 5: Final move (swing high)
-                wave5_candidates = [idx for idx in swing_highs if idx > wave4_idx]
-                if not wave5_candidates:
-                    continue
-                    
-                wave5_idx = wave5_candidates[0]
-                wave5_price = highs[wave5_idx]
-                wave5_move = wave5_price - wave4_price
-                wave5_extension = wave5_move / wave1_move
-                
-                # Validate Wave 5 extension (61.8-100%)
-                if not (self.elliott_ratios['wave_5_extension_min'] <= wave5_extension <= self.elliott_ratios['wave_5_extension_max']):
-                    continue
-                
-                # Create pattern
-                pattern = {
-                    'pattern_type': 'Elliott Impulse Wave',
-                    'waves': {
-                        'Wave1': {'index': wave1_end_idx, 'price': wave1_end_price, 'move': wave1_move},
-                        'Wave2': {'index': wave2_idx, 'price': wave2_price, 'retracement': wave2_retracement},
-                        'Wave3': {'index': wave3_idx, 'price': wave3_price, 'move': wave3_move, 'extension': wave3_extension},
-                        'Wave4': {'index': wave4_idx, 'price': wave4_price, 'retracement': wave4_retracement},
-                        'Wave5': {'index': wave5_idx, 'price': wave5_price, 'move': wave5_move, 'extension': wave5_extension}
-                    },
-                    'confidence': self._calculate_impulse_wave_confidence(wave1_move, wave2_retracement, wave3_extension, wave4_retracement, wave5_extension),
-                    'signal': 'BUY' if wave5_price > wave3_price else 'SELL',
-                    'target': self._calculate_impulse_wave_target(wave1_move, wave2_price, wave3_price, wave4_price, wave5_price),
-                    'stop_loss': self._calculate_impulse_wave_stop_loss(wave1_start_price, wave2_price, wave3_price, wave4_price, wave5_price),
-                    'wave_characteristics': self._analyze_impulse_wave_characteristics(wave1_move, wave2_retracement, wave3_extension, wave4_retracement, wave5_extension)
-                }
-                patterns.append(pattern)
+        confidence = np.array([
+            self._calculate_impulse_wave_confidence(*args)
+            for args in zip(wave1_move, wave2_retracement, wave3_extension, wave4_retracement, wave5_extension)
+        ])
+        keep = best_per_key(found.indices[1], confidence)
         
+        patterns = []
+        for row in keep:
+            i1, i2, i3, i4, i5 = (idx[row] for idx in found.indices)
+            ratios = (wave1_move[row], wave2_retracement[row], wave3_extension[row],
+                      wave4_retracement[row], wave5_extension[row])
+            patterns.append({
+                'pattern_type': 'Elliott Impulse Wave',
+                'waves': {
+                    'Wave1': {'index': i1, 'price': w1[row], 'move': wave1_move[row]},
+                    'Wave2': {'index': i2, 'price': w2[row], 'retracement': wave2_retracement[row]},
+                    'Wave3': {'index': i3, 'price': w3[row], 'move': wave3_move[row], 'extension': wave3_extension[row]},
+                    'Wave4': {'index': i4, 'price': w4[row], 'retracement': wave4_retracement[row]},
+                    'Wave5': {'index': i5, 'price': w5[row], 'move': wave5_move[row], 'extension': wave5_extension[row]}
+                },
+                'confidence': confidence[row],
+                'signal': 'BUY' if w5[row] > w3[row] else 'SELL',
+                'target': self._calculate_impulse_wave_target(wave1_move[row], w2[row], w3[row], w4[row], w5[row]),
+                'stop_loss': self._calculate_impulse_wave_stop_loss(start[row], w2[row], w3[row], w4[row], w5[row]),
+                'wave_characteristics': self._analyze_impulse_wave_characteristics(*ratios)
+            })
         return patterns
     
     def detect_elliott_corrective_wave(self, highs: np.ndarray, lows: np.ndarray, 
@@ -180,66 +131,45 @@ class ElliottWaveDetector:
         - Wave B: Retracement (38.2-78.6% of A)
         - Wave C: Final decline (100-161.8% of A)
         """
-        patterns = []
-        swing_highs, swing_lows = self.find_swing_points(highs, lows)
+        return self._detect_corrective_waves(SwingCandidateGenerator(highs, lows))
+    
+    def _detect_corrective_waves(self, generator: SwingCandidateGenerator) -> List[Dict]:
+        """ABC adayları impulse ile aynı üreticiden (WaveA sonu anchor, başlangıcı serbest nokta)"""
+        found = generator.generate(ELLIOTT_CORRECTIVE_SPEC)
+        if not len(found):
+            return []
         
-        # Need at least 3 swing points for Corrective Wave
-        if len(swing_highs) < 2 or len(swing_lows) < 1:
-            return patterns
+        start = found.free_price
+        a_end, b_price, c_price = found.prices
+        wave_a_move = start - a_end
+        wave_c_move = b_price - c_price
+        with np.errstate(divide='ignore', invalid='ignore'):
+            wave_b_retracement = (b_price - a_end) / wave_a_move
+            wave_c_extension = wave_c_move / wave_a_move
         
-        # Look for potential Corrective Wave patterns
-        for i in range(len(swing_highs) - 1):
-            for j in range(len(swing_lows)):
-                # Wave A: Initial decline (swing low)
-                wave_a_start_idx = swing_highs[i]
-                wave_a_start_price = highs[wave_a_start_idx]
-                wave_a_end_idx = swing_lows[j]
-                wave_a_end_price = lows[wave_a_end_idx]
-                wave_a_move = wave_a_start_price - wave_a_end_price
-                
-                # Wave B: Retracement (swing high)
-                wave_b_candidates = [idx for idx in swing_highs if idx > wave_a_end_idx]
-                if not wave_b_candidates:
-                    continue
-                    
-                wave_b_idx = wave_b_candidates[0]
-                wave_b_price = highs[wave_b_idx]
-                wave_b_retracement = (wave_b_price - wave_a_end_price) / wave_a_move
-                
-                # Validate Wave B retracement (38.2-78.6%)
-                if not (0.382 <= wave_b_retracement <= 0.786):
-                    continue
-                
-                # Wave C: Final decline (swing low)
-                wave_c_candidates = [idx for idx in swing_lows if idx > wave_b_idx]
-                if not wave_c_candidates:
-                    continue
-                    
-                wave_c_idx = wave_c_candidates[0]
-                wave_c_price = lows[wave_c_idx]
-                wave_c_move = wave_b_price - wave_c_price
-                wave_c_extension = wave_c_move / wave_a_move
-                
-                # Validate Wave C extension (100-161.8%)
-                if not (1.000 <= wave_c_extension <= 1.618):
-                    continue
-                
-                # Create pattern
-                pattern = {
-                    'pattern_type': 'Elliott Corrective Wave',
-                    'waves': {
-                        'WaveA': {'index': wave_a_end_idx, 'price': wave_a_end_price, 'move': wave_a_move},
-                        'WaveB': {'index': wave_b_idx, 'price': wave_b_price, 'retracement': wave_b_retracement},
-                        'WaveC': {'index': wave_c_idx, 'price': wave_c_price, 'move': wave_c_move, 'extension': wave_c_extension}
-                    },
-                    'confidence': self._calculate_corrective_wave_confidence(wave_a_move, wave_b_retracement, wave_c_extension),
-                    'signal': 'BUY' if wave_c_price < wave_a_end_price else 'SELL',
-                    'target': self._calculate_corrective_wave_target(wave_a_move, wave_b_price, wave_c_price),
-                    'stop_loss': self._calculate_corrective_wave_stop_loss(wave_a_start_price, wave_b_price, wave_c_price),
-                    'wave_characteristics': self._analyze_corrective_wave_characteristics(wave_a_move, wave_b_retracement, wave_c_extension)
-                }
-                patterns.append(pattern)
+        confidence = np.array([
+            self._calculate_corrective_wave_confidence(*args)
+            for args in zip(wave_a_move, wave_b_retracement, wave_c_extension)
+        ])
+        keep = best_per_key(found.indices[1], confidence)
         
+        patterns = []
+        for row in keep:
+            ia, ib, ic = (idx[row] for idx in found.indices)
+            ratios = (wave_a_move[row], wave_b_retracement[row], wave_c_extension[row])
+            patterns.append({
+                'pattern_type': 'Elliott Corrective Wave',
+                'waves': {
+                    'WaveA': {'index': ia, 'price': a_end[row], 'move': wave_a_move[row]},
+                    'WaveB': {'index': ib, 'price': b_price[row], 'retracement': wave_b_retracement[row]},
+                    'WaveC': {'index': ic, 'price': c_price[row], 'move': wave_c_move[row], 'extension': wave_c_extension[row]}
+                },
+                'confidence': confidence[row],
+                'signal': 'BUY' if c_price[row] < a_end[row] else 'SELL',
+                'target': self._calculate_corrective_wave_target(wave_a_move[row], b_price[row], c_price[row]),
+                'stop_loss': self._calculate_corrective_wave_stop_loss(start[row], b_price[row], c_price[row]),
+                'wave_characteristics': self._analyze_corrective_wave_characteristics(*ratios)
+            })
         return patterns
     
     def _calculate_impulse_wave_confidence(self, wave1_move: float, wave2_retracement: float,
@@ -394,15 +324,12 @@ class ElliottWaveDetector:
     def detect_all_elliott_waves(self, highs: np.ndarray, lows: np.ndarray, 
                                 prices: np.ndarray) -> Dict[str, List[Dict]]:
         """Tüm Elliott Wave pattern'lerini tespit et"""
-        patterns = {}
-        
-        # Impulse waves
-        patterns['impulse_wave'] = self.detect_elliott_impulse_wave(highs, lows, prices)
-        
-        # Corrective waves
-        patterns['corrective_wave'] = self.detect_elliott_corrective_wave(highs, lows, prices)
-        
-        return patterns
+        # Swing tespiti bir kez: impulse ve corrective aynı aday üreticiyi paylaşır
+        generator = SwingCandidateGenerator(highs, lows)
+        return {
+            'impulse_wave': self._detect_impulse_waves(generator),
+            'corrective_wave': self._detect_corrective_waves(generator)
+        }
     
     def calculate_pattern_score(self, patterns: Dict[str, List[Dict]]) -> float:
         """Pattern'lerin toplam skorunu hesapla (0-100)"""
@@ -16,6 +16,7 @@ from datetime import datetime, timedelta
 import asyncio
 import json
 import time
+_BOOT_STARTED = time.perf_counter()
 import requests
 from enum import Enum
 
@@ -31,10 +32,14 @@ class StrategyType(Enum):
     BREAKOUT = "breakout"
     SCALPING = "scalping"
 try:
-    from monitoring.metrics import track_request, track_prediction, track_error, get_metrics
+    from monitoring.metrics import (
+        track_request, track_prediction, track_error, get_metrics,
+        track_in_flight, endpoint_label, metrics_collector, TimedRoute
+    )
     from prometheus_client import CONTENT_TYPE_LATEST
 except Exception:
     # Monitoring opsiyonel: yoksa no-op fonksiyonlar kullan
+    from contextlib import nullcontext
     def track_request(**kwargs):
         return None
     def track_prediction(**kwargs):
@@ -43,10 +48,21 @@ except Exception:
         return None
     def get_metrics():
         return ""
+    def track_in_flight(method):
+        return nullcontext()
+    def endpoint_label(scope):
+        return getattr(scope.get('route'), 'path', '__unmatched__')
+    metrics_collector = None
+    TimedRoute = None
     CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+from monitoring.request_timing import begin_request, end_request, run_in_executor as timed_run_in_executor
 from middleware.rate_limiter import APIRateLimitMiddleware
 from core.cache import initialize_cache, close_cache, cache_manager, cached_ops, cache_result
 from core.database import initialize_database, close_database, db_manager
+from ai_models.model_pool import model_pool
+from core.compute_pool import compute_pool
+from core.endpoint_cache import endpoint_cache, get_endpoint_cache_stats, invalidate_endpoint_cache
+from core.service_registry import ServiceRegistry
 import pandas as pd
 
 # Realtime WebSocket imports
@@ -62,74 +78,52 @@ except ImportError:
     print("⚠️ Realtime modules not available - running without WebSocket support")
 import numpy as np
 
-# Local imports
-try:
-    from websocket_connector import WebSocketConnector
-    from grey_topsis_ranking import GreyTOPSISRanking
-    from fundamental_analyzer import FundamentalAnalyzer
-    from technical_pattern_engine import TechnicalPatternEngine
-    from ai_ensemble_v2 import AIEnsemble
-    from rl_portfolio_agent import RLPortfolioAgent
-    from sentiment_xai_engine import SentimentXAIEngine
-    from dupont_piotroski_analyzer import DuPontPiotroskiAnalyzer
-    try:
-        from us_aggressive_session_manager import us_aggressive_manager
-    except ImportError:
-        us_aggressive_manager = None
-    
-    # Market Regime Detector
-    try:
-        import sys
-        import os
-        sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-        from market_regime_detector import MarketRegimeDetector
-        market_regime_detector = MarketRegimeDetector()
-        print("✅ Market Regime Detector başlatıldı")
-    except ImportError as e:
-        print(f"⚠️ Market Regime Detector yüklenemedi: {e}")
-        market_regime_detector = None
-    
-    # Broker Paper Trading
-    try:
-        import sys
-        import os
-        sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-        from broker_paper_trading import BrokerPaperTrading
-        broker_paper = BrokerPaperTrading(initial_capital=100.0)
-        print("✅ Broker Paper Trading başlatıldı")
-    except ImportError as e:
-        print(f"⚠️ Broker Paper Trading yüklenemedi: {e}")
-        broker_paper = None
-    from auto_backtest_walkforward import AutoBacktestWalkForward
-    from bist_performance_tracker import BISTPerformanceTracker
-    from accuracy_optimizer import AccuracyOptimizer
-    from firestore_schema import FirestoreSchema
-    from config import config
-    from bist100_scanner import BIST100Scanner
-    from real_time_pipeline import RealTimeDataPipeline
-    from push_notification_service import push_service
-    from deep_learning_models import deep_learning_ensemble
-    from advanced_backtesting_system import backtest_engine, walk_forward_validator, StrategyEngine, StrategyType as BacktestStrategyType, BacktestConfig
-    from crypto_markets_integration import crypto_analyzer, crypto_portfolio_manager
-    from broker_integration_system import (
-        broker_manager, order_manager, risk_manager,
-        BrokerType, OrderSide, OrderType, OrderStatus
-    )
-    from advanced_trading_strategies import (
-        strategy_manager, StrategyType, TradingSignal, MarketData,
-        HFTStrategy, StatisticalArbitrageStrategy, PairsTradingStrategy, MarketMakingStrategy,
-        OrderFlow
-    )
-    from us_aggressive_profile import US_AGGRESSIVE_PROFILE
-    
-    # PRD v2.0 Yeni Modüller (OPTIMIZED)
-    from live_price_layer import LivePriceLayer
-    from mcdm_ranking import OptimizedMCDMRanking as MCDMRanking
-    
-except ImportError as e:
-    print(f"⚠️ Import hatası: {e}")
-    # Eksik modüller için güvenli varsayılanlar
-    RealTimeDataPipeline = None  # type: ignore
+# Local modules: servis kaydı üzerinden tembel yüklenir (import + kurulum ilk
+# kullanımda). eager=True olanlar startup'ta thread'lerde eşzamanlı kurulur.
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+services = ServiceRegistry(globals())
+
+# Analiz motorları
+services.register('topsis_ranking', 'grey_topsis_ranking', 'GreyTOPSISRanking', eager=True)
+services.register('fundamental_analyzer', 'fundamental_analyzer', 'FundamentalAnalyzer', eager=True)
+services.register('technical_engine', 'technical_pattern_engine', 'TechnicalPatternEngine', eager=True)
+services.register('dupont_analyzer', 'dupont_piotroski_analyzer', 'DuPontPiotroskiAnalyzer', eager=True)
+services.register('backtest_engine', 'auto_backtest_walkforward', 'AutoBacktestWalkForward', eager=True)
+services.register('performance_tracker', 'bist_performance_tracker', 'BISTPerformanceTracker', eager=True)
+services.register('accuracy_optimizer', 'accuracy_optimizer', 'AccuracyOptimizer', eager=True)
+services.register('mcdm_ranking', 'mcdm_ranking', 'OptimizedMCDMRanking', eager=True)
+services.register('live_price_layer', 'live_price_layer', 'LivePriceLayer', eager=True,
+                  start=lambda layer: layer.start())
+services.register('websocket_connector', 'real_time_pipeline', 'RealTimeDataPipeline', eager=True,
+                  finnhub_api_key="demo")
+
+# TensorFlow/torch tabanlı ve nadir kullanılan motorlar ilk istekte kurulur
+services.register('ai_ensemble', 'ai_ensemble_v2', 'AIEnsemble')
+services.register('rl_agent', 'rl_portfolio_agent', 'RLPortfolioAgent')
+services.register('sentiment_engine', 'sentiment_xai_engine', 'SentimentXAIEngine')
+services.register('macro_detector', 'macro_regime_detector', 'MacroRegimeDetector')
+services.register('market_regime_detector', 'market_regime_detector', 'MarketRegimeDetector')
+services.register('broker_paper', 'broker_paper_trading', 'BrokerPaperTrading', initial_capital=100.0)
+
+# Modül seviyesindeki singleton'lar, sınıflar ve enum'lar (call=False)
+services.register('us_aggressive_manager', 'us_aggressive_session_manager', 'us_aggressive_manager', call=False)
+services.register('US_AGGRESSIVE_PROFILE', 'us_aggressive_profile', 'US_AGGRESSIVE_PROFILE', call=False)
+services.register('config', 'config', 'config', call=False)
+services.register('BIST100Scanner', 'bist100_scanner', 'BIST100Scanner', call=False)
+services.register('push_service', 'push_notification_service', 'push_service', call=False)
+services.register('deep_learning_ensemble', 'deep_learning_models', 'deep_learning_ensemble', call=False)
+services.register('crypto_analyzer', 'crypto_markets_integration', 'crypto_analyzer', call=False)
+services.register('crypto_portfolio_manager', 'crypto_markets_integration', 'crypto_portfolio_manager', call=False)
+for _name in ('walk_forward_validator', 'StrategyEngine', 'BacktestConfig'):
+    services.register(_name, 'advanced_backtesting_system', _name, call=False)
+for _name in ('broker_manager', 'order_manager', 'risk_manager', 'BrokerType', 'OrderSide', 'OrderType', 'OrderStatus'):
+    services.register(_name, 'broker_integration_system', _name, call=False)
+for _name in ('strategy_manager', 'TradingSignal', 'MarketData', 'HFTStrategy', 'StatisticalArbitrageStrategy',
+              'PairsTradingStrategy', 'MarketMakingStrategy', 'OrderFlow'):
+    services.register(_name, 'advanced_trading_strategies', _name, call=False)
+services.register('StrategyType', 'advanced_trading_strategies', 'StrategyType', call=False, fallback=StrategyType)
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
@@ -143,6 +137,15 @@ try:
 except ImportError as e:
     logger.warning(f"⚠️ Sentry not available: {e}")
 
+# FastAPI app
+app = FastAPI(
+    title="BIST AI Smart Trader API",
+    description="PRD v2.0 - Yapay zekâ destekli yatırım danışmanı",
+    version="2.0.0"
+)
+# Route şablonu etiketleri ve handler/serileştirme süre kırılımı için
+if TimedRoute is not None:
+    app.router.route_class = TimedRoute
 # V3.2: Global exception handler with Sentry
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -163,12 +166,6 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"error": str(exc), "detail": "Internal server error"}
     )
 
-# FastAPI app
-app = FastAPI(
-    title="BIST AI Smart Trader API",
-    description="PRD v2.0 - Yapay zekâ destekli yatırım danışmanı",
-    version="2.0.0"
-)
 # Static ve Templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
@@ -223,16 +220,24 @@ except ImportError as e:
 # Metrics middleware
 @app.middleware("http")
 async def metrics_middleware(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
+    timings, token = begin_request()
+    start_time = time.perf_counter()
+    try:
+        with track_in_flight(request.method):
+            response = await call_next(request)
+    finally:
+        end_request(token)
     
-    # Track metrics
-    duration = time.time() - start_time
+    # Track metrics (route şablonu: kardinalite sınırlı)
+    duration = time.perf_counter() - start_time
+    content_length = response.headers.get('content-length')
     track_request(
         method=request.method,
-        endpoint=str(request.url.path),
+        endpoint=endpoint_label(request.scope),
         status_code=response.status_code,
-        duration=duration
+        duration=duration,
+        response_size=int(content_length) if content_length else None,
+        timings=timings
     )
     
     return response
@@ -248,9 +253,6 @@ async def add_security_headers(request: Request, call_next):
     response.headers["Content-Security-Policy"] = "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'"
     return response
 
-# Global instances
-websocket_connector = None
-
 # Realtime WebSocket endpoints
 if REALTIME_AVAILABLE:
     @app.get("/api/realtime/status")
@@ -342,17 +344,6 @@ else:
             "message": "Realtime modules not available",
             "uptime": datetime.now().isoformat()
         }
-topsis_ranking = None
-fundamental_analyzer = None
-technical_engine = None
-ai_ensemble = None
-rl_agent = None
-sentiment_engine = None
-dupont_analyzer = None
-macro_detector = None
-backtest_engine = None
-performance_tracker = None
-accuracy_optimizer = None
 firestore_schema = None
 
 # LSTM scheduler state
@@ -361,10 +352,6 @@ _lstm_stop_event: Optional[asyncio.Event] = None
 _lstm_interval_min: int = 240
 _lstm_symbol: str = "SISE.IS"
 
-# Pattern scan cache (TTL)
-_pattern_cache: dict = {}
-_pattern_cache_ttl_sec: int = 900  # 15 dakika
-
 async def _lstm_scheduler_loop():
     global _lstm_stop_event, _lstm_interval_min, _lstm_symbol
     try:
@@ -387,7 +374,8 @@ async def _lstm_scheduler_loop():
                         'Volume': df['Volume'].resample('4H').sum()
                     }).dropna()
                     model = LSTMModel()
-                    model.train(df_4h)
+                    if model.train(df_4h):
+                        model_pool.put('lstm', model)
                     logger.info(f"LSTM scheduled training done for {_lstm_symbol}")
                 else:
                     logger.warning(f"LSTM scheduler: no data for {_lstm_symbol}")
@@ -404,119 +392,13 @@ async def _lstm_scheduler_loop():
 @app.on_event("startup")
 async def startup_event():
     """Uygulama başlangıcında çalışır"""
-    global websocket_connector, topsis_ranking, fundamental_analyzer
-    global technical_engine, ai_ensemble, rl_agent, sentiment_engine
-    global dupont_analyzer, macro_detector, backtest_engine, performance_tracker, accuracy_optimizer, firestore_schema
-    global live_price_layer, mcdm_ranking
-    
     try:
         logger.info("🚀 BIST AI Smart Trader başlatılıyor...")
+        logger.info(f"⏱️ fastapi_main import süresi: {(time.perf_counter() - _BOOT_STARTED) * 1000:.0f}ms")
         
-        # Core modules başlat
-        try:
-            topsis_ranking = GreyTOPSISRanking()
-            logger.info("✅ Grey TOPSIS Ranking başlatıldı")
-        except Exception as e:
-            logger.warning(f"Grey TOPSIS Ranking hatası: {e}")
-            topsis_ranking = None
-            
-        try:
-            fundamental_analyzer = FundamentalAnalyzer()
-            logger.info("✅ Fundamental Analyzer başlatıldı")
-        except Exception as e:
-            logger.warning(f"Fundamental Analyzer hatası: {e}")
-            fundamental_analyzer = None
-            
-        try:
-            technical_engine = TechnicalPatternEngine()
-            logger.info("✅ Technical Pattern Engine başlatıldı")
-        except Exception as e:
-            logger.warning(f"Technical Pattern Engine hatası: {e}")
-            technical_engine = None
-            
-        try:
-            ai_ensemble = AIEnsemble()
-            logger.info("✅ AI Ensemble başlatıldı")
-        except Exception as e:
-            logger.warning(f"AI Ensemble hatası: {e}")
-            ai_ensemble = None
-            
-        try:
-            rl_agent = RLPortfolioAgent()
-            logger.info("✅ RL Portfolio Agent başlatıldı")
-        except Exception as e:
-            logger.warning(f"RL Portfolio Agent hatası: {e}")
-            rl_agent = None
-            
-        try:
-            sentiment_engine = SentimentXAIEngine()
-            logger.info("✅ Sentiment XAI Engine başlatıldı")
-        except Exception as e:
-            logger.warning(f"Sentiment XAI Engine hatası: {e}")
-            sentiment_engine = None
-            
-        try:
-            dupont_analyzer = DuPontPiotroskiAnalyzer()
-            logger.info("✅ DuPont & Piotroski Analyzer başlatıldı")
-        except Exception as e:
-            logger.warning(f"DuPont & Piotroski Analyzer hatası: {e}")
-            dupont_analyzer = None
-            
-        try:
-            macro_detector = MacroRegimeDetector()
-            logger.info("✅ Macro Regime Detector başlatıldı")
-        except Exception as e:
-            logger.warning(f"Macro Regime Detector hatası: {e}")
-            macro_detector = None
-            
-        try:
-            backtest_engine = AutoBacktestWalkForward()
-            logger.info("✅ Auto Backtest & Walk Forward Engine başlatıldı")
-        except Exception as e:
-            logger.warning(f"Auto Backtest & Walk Forward Engine hatası: {e}")
-            backtest_engine = None
-            
-        try:
-            performance_tracker = BISTPerformanceTracker()
-            logger.info("✅ BIST Performance Tracker başlatıldı")
-        except Exception as e:
-            logger.warning(f"BIST Performance Tracker hatası: {e}")
-            performance_tracker = None
-            
-        try:
-            accuracy_optimizer = AccuracyOptimizer()
-            logger.info("✅ Accuracy Optimizer başlatıldı")
-        except Exception as e:
-            logger.warning(f"Accuracy Optimizer hatası: {e}")
-            accuracy_optimizer = None
-        
-        # PRD v2.0 Yeni Modüller
-        try:
-            live_price_layer = LivePriceLayer()
-            await live_price_layer.start()
-            logger.info("✅ Live Price Layer başlatıldı")
-        except Exception as e:
-            logger.warning(f"Live Price Layer hatası: {e}")
-            live_price_layer = None
-            
-        try:
-            mcdm_ranking = MCDMRanking()
-            logger.info("✅ MCDM Ranking başlatıldı")
-        except Exception as e:
-            logger.warning(f"MCDM Ranking hatası: {e}")
-            mcdm_ranking = None
-        
-        # WebSocket connector (demo mode) - opsiyonel
-        try:
-            if 'RealTimeDataPipeline' in globals() and RealTimeDataPipeline is not None:
-                websocket_connector = RealTimeDataPipeline(
-                    finnhub_api_key="demo"
-                )
-            else:
-                websocket_connector = None
-        except Exception as e:
-            logger.warning(f"RealTimeDataPipeline başlatılamadı: {e}")
-            websocket_connector = None
+        # Bağımsız motorlar eşzamanlı kurulur; diğerleri ilk kullanımda
+        init_started = time.perf_counter()
+        await services.start_eager()
         
         # Firestore schema (geçici olarak devre dışı)
         # try:
@@ -546,7 +428,19 @@ async def startup_event():
         except Exception as e:
             logger.warning(f"Database başlatma hatası: {e}")
 
-        logger.info("✅ Tüm modüller başlatıldı")
+        # CPU-yoğun taramalar için süreç havuzu (motorlar işçilerde önceden kurulur)
+        try:
+            from analysis.pattern_detection import scan_patterns
+            await compute_pool.start(warm=[scan_patterns.engine])
+        except Exception as e:
+            logger.warning(f"Compute pool başlatma hatası: {e}")
+
+        if metrics_collector is not None:
+            metrics_collector.start_system_sampler()
+
+        services.log_profile()
+        logger.info(f"✅ Tüm modüller başlatıldı ({(time.perf_counter() - init_started) * 1000:.0f}ms, "
+                    f"boot {(time.perf_counter() - _BOOT_STARTED) * 1000:.0f}ms)")
         
     except Exception as e:
         logger.error(f"Startup hatası: {e}")
@@ -583,11 +477,21 @@ async def health_check():
             }
         }
         
-        # Check if critical services are running
-        if ai_ensemble is None:
-            health_status["checks"]["models"] = "initializing"
+        # Bileşen bazında hazır olma durumu (servis kaydı)
+        readiness = services.readiness()
+        health_status["checks"]["services"] = readiness
+        health_status["components"] = services.status()
+        if readiness != "ready":
             health_status["status"] = "degraded"
         
+        # AI modelleri tembel yüklenir: henüz kullanılmadıysa "lazy"
+        models_state = services.specs['ai_ensemble'].state
+        if models_state == "failed":
+            health_status["checks"]["models"] = "error"
+            health_status["status"] = "degraded"
+        elif models_state != "ready":
+            health_status["checks"]["models"] = models_state
+        
         # Check cache status
         try:
             cache_stats = await cache_manager.get_stats()
@@ -630,6 +534,8 @@ async def shutdown_event():
         if _lstm_task is not None and not _lstm_task.done():
             _lstm_task.cancel()
             logger.info("🛑 LSTM scheduler durduruluyor")
+        await model_pool.close()
+        compute_pool.shutdown(wait=False)
         
         # Close cache and database connections
         try:
@@ -844,6 +750,7 @@ async def get_fundamental_analysis(symbol: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/analysis/topsis/ranking")
+@endpoint_cache(ttl=300, stale_ttl=300, max_entries=64)
 async def get_topsis_ranking(sector: Optional[str] = None):
     """BIST100 için TOPSIS sıralama"""
     try:
@@ -961,22 +868,16 @@ async def get_health_summary():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/analysis/patterns/{symbol}")
+@endpoint_cache(ttl=900, stale_ttl=300, max_entries=512)
 async def get_technical_patterns(symbol: str, timeframe: str = "1d", limit: int = 50):
     """Sembol için teknik formasyon tespiti (optimized + cached)"""
     try:
-        # Cache key
-        cache_key = (symbol, timeframe, limit)
-        now = time.time()
-        cached = _pattern_cache.get(cache_key)
-        if cached and now - cached['ts'] < _pattern_cache_ttl_sec:
-            return cached['data']
-        
         # Veri çek (LivePriceLayer varsa ona öncelik, değilse yfinance)
         import pandas as pd
         df = None
         
         try:
-            if 'live_price_layer' in globals() and live_price_layer is not None:
+            if await services.aavailable('live_price_layer'):
                 # Live layer sadece anlık verir; geçmiş için yfinance gerekli
                 df = await _fetch_history_async(symbol, period=f"{limit}d", interval=timeframe)
             else:
@@ -1022,9 +923,6 @@ async def get_technical_patterns(symbol: str, timeframe: str = "1d", limit: int
             'data_source': 'live' if df is not None and not df.empty else 'test_fallback'
         }
         
-        # Cache yaz
-        _pattern_cache[cache_key] = {'ts': now, 'data': resp}
-        
         return resp
         
     except HTTPException:
@@ -1083,6 +981,7 @@ def _create_test_data_with_patterns(symbol: str, limit: int = 50) -> pd.DataFram
         return None
 
 @app.get("/analysis/patterns/scan/bist100")
+@endpoint_cache(ttl=900, stale_ttl=600, max_entries=32)
 async def scan_bist100_patterns(max_symbols: int = 20, period: str = "60d", interval: str = "1d"):
     """BIST100'de teknik formasyon taraması (parallel + cached)"""
     try:
@@ -1093,30 +992,22 @@ async def scan_bist100_patterns(max_symbols: int = 20, period: str = "60d", inte
         
         symbols = [s['symbol'] for s in bist100.get('symbols', [])][:max_symbols]
         
-        # Cache key
-        cache_key = ("BIST_SCAN", tuple(symbols), period, interval)
-        now = time.time()
-        cached = _pattern_cache.get(cache_key)
-        if cached and now - cached['ts'] < _pattern_cache_ttl_sec:
-            return cached['data']
-        
         # Parallel fetch histories
         fetch_tasks = [
             _fetch_history_async(sym, period=period, interval=interval) for sym in symbols
         ]
         histories = await asyncio.gather(*fetch_tasks, return_exceptions=True)
         
-        # Parallel scan
-        scan_tasks = []
+        # Parallel scan (süreç havuzu, OHLC paylaşımlı bellekten)
         valid_pairs = []
         for sym, df in zip(symbols, histories):
             if isinstance(df, Exception) or df is None or df.empty:
                 logger.warning(f"{sym} veri boş/hatalı, atlanıyor")
                 continue
             valid_pairs.append((sym, df))
-            scan_tasks.append(_scan_patterns_async(df, sym))
         
-        scan_results = await asyncio.gather(*scan_tasks, return_exceptions=True)
+        from analysis.pattern_detection import scan_patterns
+        scan_results = await scan_patterns.map([((df, sym), {}) for sym, df in valid_pairs])
         
         # Collect
         all_patterns = []
@@ -1149,7 +1040,6 @@ async def scan_bist100_patterns(max_symbols: int = 20, period: str = "60d", inte
             'timestamp': datetime.now().isoformat()
         }
         
-        _pattern_cache[cache_key] = {'ts': now, 'data': resp}
         return resp
         
     except Exception as e:
@@ -1157,10 +1047,10 @@ async def scan_bist100_patterns(max_symbols: int = 20, period: str = "60d", inte
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/ai/ensemble/prediction/{symbol}")
+@endpoint_cache(ttl=60, stale_ttl=60, max_entries=512)
 async def get_ensemble_prediction(symbol: str, timeframe: str = "1d", limit: int = 100):
     """AI Ensemble tahmin"""
     try:
-        from ai_models.ensemble_manager import AIEnsembleManager
         import yfinance as yf
         
         # Veri çek
@@ -1170,9 +1060,11 @@ async def get_ensemble_prediction(symbol: str, timeframe: str = "1d", limit: int
         if df.empty:
             raise HTTPException(status_code=404, detail=f"{symbol} verisi bulunamadı")
         
-        # AI Ensemble tahmin
-        ensemble_manager = AIEnsembleManager()
-        prediction = ensemble_manager.get_ensemble_prediction(df, symbol)
+        # AI Ensemble tahmin (sıcak havuzdaki manager, event loop dışında)
+        prediction = await timed_run_in_executor(
+            None,
+            lambda: model_pool.timed_predict('ensemble', 'get_ensemble_prediction', symbol=symbol, data=df)
+        )
         
         if not prediction:
             raise HTTPException(status_code=500, detail="Ensemble tahmin yapılamadı")
@@ -1188,6 +1080,7 @@ async def get_ensemble_prediction(symbol: str, timeframe: str = "1d", limit: int
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/ai/ensemble/performance")
+@endpoint_cache(ttl=60, stale_ttl=120, max_entries=8)
 async def get_ensemble_performance():
     """AI Ensemble performance özeti"""
     try:
@@ -1261,6 +1154,7 @@ async def force_optimization(optimization_type: str = "full"):
         
         optimizer = ContinuousOptimizer()
         results = optimizer.force_optimization(optimization_type)
+        await invalidate_endpoint_cache('get_optimization_report')
         
         return {
             'optimization_type': optimization_type,
@@ -1273,6 +1167,7 @@ async def force_optimization(optimization_type: str = "full"):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/ai/optimization/report")
+@endpoint_cache(ttl=300, stale_ttl=300, max_entries=8)
 async def get_optimization_report():
     """Optimizasyon raporu oluştur"""
     try:
@@ -1382,6 +1277,7 @@ async def analyze_symbol_historical_accuracy(symbol: str, force_update: bool = F
         
         analyzer = HistoricalAccuracyAnalyzer()
         analysis = analyzer.analyze_single_symbol(symbol, force_update)
+        await invalidate_endpoint_cache('get_historical_accuracy_report')
         
         return analysis
         
@@ -1397,6 +1293,7 @@ async def analyze_all_symbols_historical_accuracy(force_update: bool = False):
         
         analyzer = HistoricalAccuracyAnalyzer()
         results = analyzer.analyze_all_symbols(force_update)
+        await invalidate_endpoint_cache('get_historical_accuracy_report')
         
         return results
         
@@ -1405,6 +1302,7 @@ async def analyze_all_symbols_historical_accuracy(force_update: bool = False):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/historical/accuracy/report")
+@endpoint_cache(ttl=300, stale_ttl=300, max_entries=8)
 async def get_historical_accuracy_report():
     """Geçmiş doğruluk raporu"""
     try:
@@ -1446,25 +1344,24 @@ async def get_historical_accuracy_summary():
 async def get_ai_models_status():
     """AI modellerin durumu"""
     try:
-        from ai_models.lightgbm_model import LightGBMModel
+        from ai_models.model_pool import loaded_or_none
         from ai_models.timegpt_model import TimeGPTModel
         # LSTM opsiyonel, import hatasına toleranslı
         try:
-            from ai_models.lstm_model import LSTMModel
+            import ai_models.lstm_model  # noqa: F401
             lstm_available = True
         except Exception:
-            LSTMModel = None  # type: ignore
             lstm_available = False
         
-        # Model durumları
-        lightgbm = LightGBMModel()
-        lstm = LSTMModel() if lstm_available else None
+        # Model durumları (sıcak havuzdan; istek başına model kurulmaz)
+        lightgbm = loaded_or_none('lightgbm')
+        lstm = loaded_or_none('lstm') if lstm_available else None
         timegpt = TimeGPTModel()
         
         return {
             'models': {
                 'lightgbm': {
-                    'status': 'trained' if lightgbm.is_trained else 'not_trained',
+                    'status': 'trained' if (lightgbm and lightgbm.is_trained) else 'not_trained',
                     'type': 'Gradient Boosting',
                     'horizon': '1D',
                     'description': 'Günlük yön tahmini'
@@ -1489,6 +1386,80 @@ async def get_ai_models_status():
         logger.error(f"AI model durumu hatası: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/ai/models/latency")
+async def get_ai_models_latency():
+    """Sıcak model havuzu ve model başına p50/p99 inference gecikmesi"""
+    return {
+        'pool': model_pool.stats(),
+        'timestamp': datetime.now().isoformat()
+    }
+
+@app.get("/system/compute-pool")
+async def get_compute_pool_stats():
+    """CPU-yoğun analiz süreç havuzu istatistikleri"""
+    return {
+        'compute_pool': compute_pool.get_stats(),
+        'timestamp': datetime.now().isoformat()
+    }
+
+@app.get("/system/services")
+async def get_service_registry_status():
+    """Servis kaydı: bileşen durumları ve import/init profili"""
+    return {
+        'readiness': services.readiness(),
+        'components': services.status(),
+        'profile': services.profile(),
+        'timestamp': datetime.now().isoformat()
+    }
+
+@app.get("/system/cache/endpoints")
+async def get_endpoint_cache_metrics():
+    """Endpoint önbelleği isabet oranları ve single-flight istatistikleri"""
+    return {
+        'endpoints': get_endpoint_cache_stats(),
+        'timestamp': datetime.now().isoformat()
+    }
+
+@app.get("/ai/lstm/forecast")
+async def get_lstm_forecast(symbols: str = "SISE.IS", period: str = "60d", interval: str = "60m"):
+    """Birden fazla sembol için LSTM multi-step forecast (mikro-batch)"""
+    try:
+        import yfinance as yf
+        from ai_models.model_pool import loaded_or_none, predict_lstm
+        
+        if loaded_or_none('lstm') is None:
+            raise HTTPException(status_code=503, detail="LSTM modeli eğitilmemiş")
+        
+        symbol_list = [s.strip() for s in symbols.split(',') if s.strip()]
+        
+        async def _one(sym: str):
+            df = yf.Ticker(sym).history(period=period, interval=interval)
+            if df.empty:
+                return sym, None
+            df.index = pd.to_datetime(df.index)
+            df_4h = pd.DataFrame({
+                'Open': df['Open'].resample('4H').first(),
+                'High': df['High'].resample('4H').max(),
+                'Low': df['Low'].resample('4H').min(),
+                'Close': df['Close'].resample('4H').last(),
+                'Volume': df['Volume'].resample('4H').sum()
+            }).dropna()
+            return sym, await predict_lstm(df_4h)
+        
+        results = await asyncio.gather(*[_one(sym) for sym in symbol_list])
+        return {
+            'forecasts': {
+                sym: ({'prediction': res[0], 'multi_step': res[1]} if res else None)
+                for sym, res in results
+            },
+            'timestamp': datetime.now().isoformat()
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"LSTM forecast hatası: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/ai/scheduler/lstm/start")
 async def start_lstm_scheduler(symbol: str = "SISE.IS", interval_min: int = 240):
     """LSTM eğitim zamanlayıcısını başlat"""
@@ -1530,23 +1501,33 @@ async def set_timegpt_api_key(api_key: str):
         logger.error(f"TimeGPT key set hatası: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+_HEALTH_MODULES = {
+    "topsis": "topsis_ranking",
+    "fundamental": "fundamental_analyzer",
+    "technical": "technical_engine",
+    "ai_ensemble": "ai_ensemble",
+    "rl_agent": "rl_agent",
+    "sentiment": "sentiment_engine",
+    "dupont_analyzer": "dupont_analyzer",
+    "macro_detector": "macro_detector",
+    "backtest_engine": "backtest_engine",
+    "websocket": "websocket_connector"
+}
+
 @app.get("/health")
 async def health_check():
-    """Sağlık kontrolü"""
+    """Sağlık kontrolü (tembel servisler kurulmaz, durumları raporlanır)"""
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "modules": {
-            "topsis": topsis_ranking is not None,
-            "fundamental": fundamental_analyzer is not None,
-            "technical": technical_engine is not None,
-            "ai_ensemble": ai_ensemble is not None,
-            "rl_agent": rl_agent is not None,
-            "sentiment": sentiment_engine is not None,
-            "dupont_analyzer": dupont_analyzer is not None,
-            "macro_detector": macro_detector is not None,
-            "backtest_engine": backtest_engine is not None,
-            "websocket": websocket_connector is not None
+            name: services.available(service, load=False)
+            for name, service in _HEALTH_MODULES.items()
+        },
+        # lazy: henüz ilk kullanım olmadı (kurulmadı), failed: yüklenemedi
+        "states": {
+            name: services.specs[service].state
+            for name, service in _HEALTH_MODULES.items()
         }
     }
 
@@ -1554,7 +1535,7 @@ async def health_check():
 async def get_prices():
     """Güncel fiyat verileri (PRD v2.0 - Live Price Layer)"""
     try:
-        if 'live_price_layer' not in globals() or live_price_layer is None:
+        if not await services.aavailable('live_price_layer'):
             raise HTTPException(status_code=503, detail="Live Price Layer hazır değil")
         
         prices = await live_price_layer.get_all_prices()
@@ -1568,6 +1549,8 @@ async def get_prices():
             "source": "PRD_v2_0_Live_Price_Layer"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Fiyat verisi hatası: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1576,7 +1559,7 @@ async def get_prices():
 async def get_live_prices():
     """Canlı fiyat verileri - WebSocket real-time"""
     try:
-        if 'live_price_layer' not in globals() or live_price_layer is None:
+        if not await services.aavailable('live_price_layer'):
             raise HTTPException(status_code=503, detail="Live Price Layer hazır değil")
         
         # Real-time prices from cache
@@ -1592,6 +1575,8 @@ async def get_live_prices():
             "timestamp": datetime.now().isoformat()
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Canlı fiyat hatası: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1600,7 +1585,7 @@ async def get_live_prices():
 async def get_symbol_price(symbol: str):
     """Belirli sembol fiyatı"""
     try:
-        if websocket_connector is None:
+        if not await services.aavailable('websocket_connector'):
             raise HTTPException(status_code=503, detail="WebSocket connector hazır değil")
         
         price = websocket_connector.get_price(symbol)
@@ -1772,7 +1757,7 @@ async def get_signals(
 async def get_stock_ranking(top_n: int = 10):
     """Grey TOPSIS + Entropi ile hisse sıralaması (Legacy)"""
     try:
-        if topsis_ranking is None:
+        if not await services.aavailable('topsis_ranking'):
             raise HTTPException(status_code=503, detail="TOPSIS ranking hazır değil")
         
         # Test verisi ile ranking
@@ -1794,15 +1779,18 @@ async def get_stock_ranking(top_n: int = 10):
             "timestamp": datetime.now().isoformat()
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Ranking hatası: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/ranking/mcdm")
+@endpoint_cache(ttl=300, stale_ttl=300, max_entries=64)
 async def get_mcdm_ranking(market: str = "BIST", top_n: int = 10):
     """PRD v2.0 - MCDM Ranking (Grey TOPSIS + Entropi)"""
     try:
-        if 'mcdm_ranking' not in globals() or mcdm_ranking is None:
+        if not await services.aavailable('mcdm_ranking'):
             raise HTTPException(status_code=503, detail="MCDM Ranking hazır değil")
         
         if market.upper() == "BIST":
@@ -1864,7 +1852,7 @@ async def export_mcdm_ranking(market: str, format: str = "csv"):
 async def get_user_portfolio(user_id: str):
     """Kullanıcı portföyü"""
     try:
-        if rl_agent is None:
+        if not await services.aavailable('rl_agent'):
             raise HTTPException(status_code=503, detail="RL Agent hazır değil")
         
         # Basit portföy (placeholder)
@@ -1886,6 +1874,8 @@ async def get_user_portfolio(user_id: str):
         
         return portfolio
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Portfolio hatası: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1954,7 +1944,7 @@ async def get_cache_stats():
 async def get_dupont_piotroski_analysis(symbol: str):
     """DuPont & Piotroski F-Score analizi"""
     try:
-        if dupont_analyzer is None:
+        if not await services.aavailable('dupont_analyzer'):
             raise HTTPException(status_code=503, detail="DuPont analyzer hazır değil")
         
         analysis = dupont_analyzer.get_comprehensive_analysis(symbol)
@@ -1977,7 +1967,7 @@ async def get_dupont_piotroski_analysis(symbol: str):
 async def get_macro_regime_analysis(symbols: Optional[str] = None):
     """Makro piyasa rejimi analizi"""
     try:
-        if macro_detector is None:
+        if not await services.aavailable('macro_detector'):
             raise HTTPException(status_code=503, detail="Macro detector hazır değil")
         
         # Sembolleri parse et
@@ -2011,7 +2001,7 @@ async def run_backtest_analysis(
 ):
     """Backtest ve walk forward analizi çalıştır"""
     try:
-        if backtest_engine is None:
+        if not await services.aavailable('backtest_engine'):
             raise HTTPException(status_code=503, detail="Backtest engine hazır değil")
         
         # Veri al
@@ -2041,6 +2031,7 @@ async def run_backtest_analysis(
         report = backtest_engine.generate_backtest_report(
             symbol, backtest_result, walk_forward_result, optimization_result
         )
+        await invalidate_endpoint_cache('get_backtest_report')
         
         return {
             "symbol": symbol,
@@ -2058,10 +2049,11 @@ async def run_backtest_analysis(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/backtest/{symbol}")
+@endpoint_cache(ttl=60, max_entries=256, shared=False)
 async def get_backtest_report(symbol: str):
     """Mevcut backtest raporunu getir"""
     try:
-        if backtest_engine is None:
+        if not await services.aavailable('backtest_engine'):
             raise HTTPException(status_code=503, detail="Backtest engine hazır değil")
         
         # Cache'den rapor al
@@ -2085,7 +2077,7 @@ async def get_backtest_report(symbol: str):
 async def get_all_performance(force_update: bool = False):
     """Tüm hisseler için performans metrikleri"""
     try:
-        if performance_tracker is None:
+        if not await services.aavailable('performance_tracker'):
             raise HTTPException(status_code=503, detail="Performance tracker hazır değil")
         
         performance = performance_tracker.get_all_performance(force_update)
@@ -2108,7 +2100,7 @@ async def get_all_performance(force_update: bool = False):
 async def get_performance_summary():
     """Genel performans özeti"""
     try:
-        if performance_tracker is None:
+        if not await services.aavailable('performance_tracker'):
             raise HTTPException(status_code=503, detail="Performance tracker hazır değil")
         
         summary = performance_tracker.get_performance_summary()
@@ -2130,7 +2122,7 @@ async def get_performance_summary():
 async def get_top_performers(metric: str, top_n: int = 10):
     """En iyi performans gösteren hisseler"""
     try:
-        if performance_tracker is None:
+        if not await services.aavailable('performance_tracker'):
             raise HTTPException(status_code=503, detail="Performance tracker hazır değil")
         
         top_stocks = performance_tracker.get_top_performers(metric, top_n)
@@ -2154,7 +2146,7 @@ async def get_top_performers(metric: str, top_n: int = 10):
 async def get_stock_performance(symbol: str):
     """Tek hisse için performans metrikleri"""
     try:
-        if performance_tracker is None:
+        if not await services.aavailable('performance_tracker'):
             raise HTTPException(status_code=503, detail="Performance tracker hazır değil")
         
         metrics = performance_tracker.calculate_performance_metrics(symbol)
@@ -2177,7 +2169,7 @@ async def get_stock_performance(symbol: str):
 async def export_performance_csv():
     """Performans verilerini CSV olarak export et"""
     try:
-        if performance_tracker is None:
+        if not await services.aavailable('performance_tracker'):
             raise HTTPException(status_code=503, detail="Performance tracker hazır değil")
         
         filename = f"bist_performance_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
@@ -2203,7 +2195,7 @@ async def export_performance_csv():
 async def train_accuracy_model(symbol: str):
     """Hisse için doğruluk modeli eğit"""
     try:
-        if accuracy_optimizer is None:
+        if not await services.aavailable('accuracy_optimizer'):
             raise HTTPException(status_code=503, detail="Accuracy optimizer hazır değil")
         
         training_result = accuracy_optimizer.train_ensemble_model(symbol)
@@ -2226,7 +2218,7 @@ async def train_accuracy_model(symbol: str):
 async def get_accuracy_prediction(symbol: str):
     """Hisse için doğruluk tabanlı sinyal tahmini"""
     try:
-        if accuracy_optimizer is None:
+        if not await services.aavailable('accuracy_optimizer'):
             raise HTTPException(status_code=503, detail="Accuracy optimizer hazır değil")
         
         prediction = accuracy_optimizer.predict_signal(symbol)
@@ -2246,10 +2238,11 @@ async def get_accuracy_prediction(symbol: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/accuracy/report")
+@endpoint_cache(ttl=120, stale_ttl=120, max_entries=8)
 async def get_accuracy_report():
     """Genel doğruluk raporu"""
     try:
-        if accuracy_optimizer is None:
+        if not await services.aavailable('accuracy_optimizer'):
             raise HTTPException(status_code=503, detail="Accuracy optimizer hazır değil")
         
         report = accuracy_optimizer.get_accuracy_report()
@@ -2271,7 +2264,7 @@ async def get_accuracy_report():
 async def optimize_ensemble_weights():
     """Ensemble ağırlıklarını optimize et"""
     try:
-        if accuracy_optimizer is None:
+        if not await services.aavailable('accuracy_optimizer'):
             raise HTTPException(status_code=503, detail="Accuracy optimizer hazır değil")
         
         optimization_result = accuracy_optimizer.optimize_ensemble_weights()
@@ -2293,7 +2286,7 @@ async def optimize_ensemble_weights():
 async def get_feature_importance(symbol: str):
     """Hisse için özellik önem sıralaması"""
     try:
-        if accuracy_optimizer is None:
+        if not await services.aavailable('accuracy_optimizer'):
             raise HTTPException(status_code=503, detail="Accuracy optimizer hazır değil")
         
         if symbol not in accuracy_optimizer.feature_importance:
@@ -2366,6 +2359,9 @@ async def train_lightgbm(symbol: str = "SISE.IS", period: str = "360d", interval
         if not result:
             raise HTTPException(status_code=500, detail="LightGBM eğitim başarısız")
         
+        # Yeni modeli sıcak havuza koy (sonraki tahminler yeniden yüklemez)
+        model_pool.put('lightgbm', model)
+        
         return {
             'symbol': symbol,
             'result': result,
@@ -2403,6 +2399,9 @@ async def train_lstm(symbol: str = "SISE.IS", period: str = "60d", interval: str
         if not result:
             raise HTTPException(status_code=500, detail="LSTM eğitim başarısız")
         
+        # Yeni modeli sıcak havuza koy (sonraki tahminler yeniden yüklemez)
+        model_pool.put('lstm', model)
+        
         return {
             'symbol': symbol,
             'result': result,
@@ -2551,16 +2550,19 @@ async def explain_lightgbm(symbol: str, period: str = "360d", interval: str = "1
         import shap
         import numpy as np
         from ai_models.lightgbm_model import LightGBMModel
+        from ai_models.model_pool import loaded_or_none
         
         # Veri
         df = yf.Ticker(symbol).history(period=period, interval=interval)
         if df.empty:
             raise HTTPException(status_code=404, detail=f"{symbol} için veri yok")
         
-        model = LightGBMModel()
-        # Model yüklü değilse eğitelim (hızlıca)
-        if not model.load_model():
-            model.train(df)
+        model = loaded_or_none('lightgbm')
+        # Model yüklü değilse eğitelim (hızlıca) ve havuza koyalım
+        if model is None:
+            model = LightGBMModel()
+            if model.train(df):
+                model_pool.put('lightgbm', model)
         if not model.is_trained:
             raise HTTPException(status_code=500, detail="Model yüklenemedi/eğitilemedi")
         
@@ -2609,6 +2611,7 @@ async def send_notification(
     data: Optional[Dict] = None
 ):
     """Push notification gönder"""
+    await services.aload('push_service')
     try:
         success = push_service.send_notification(
             title=title,
@@ -2635,6 +2638,7 @@ async def send_trading_signal_notification(
     market: str = "BIST"
 ):
     """Trading sinyali bildirimi gönder"""
+    await services.aload('push_service')
     try:
         success = push_service.send_trading_signal(
             symbol=symbol,
@@ -2659,6 +2663,7 @@ async def send_robot_alert(
     data: Optional[Dict] = None
 ):
     """Robot uyarısı gönder"""
+    await services.aload('push_service')
     try:
         success = push_service.send_robot_alert(
             alert_type=alert_type,
@@ -2682,6 +2687,7 @@ async def send_performance_update(
     total_trades: int
 ):
     """Performans güncellemesi gönder"""
+    await services.aload('push_service')
     try:
         success = push_service.send_performance_update(
             profit=profit,
@@ -2705,6 +2711,7 @@ async def send_market_alert(
     message: str
 ):
     """Market uyarısı gönder"""
+    await services.aload('push_service')
     try:
         success = push_service.send_market_alert(
             market=market,
@@ -2724,6 +2731,7 @@ async def send_market_alert(
 @app.get("/notifications/status")
 async def get_notification_status():
     """Push notification servis durumu"""
+    await services.aload('push_service')
     return {
         "enabled": push_service.enabled,
         "fcm_configured": bool(push_service.fcm_server_key),
@@ -2738,6 +2746,7 @@ async def train_deep_learning_models(
     news_data: Optional[List[Dict]] = None
 ):
     """Deep Learning modellerini eğit"""
+    await services.aload('deep_learning_ensemble')
     try:
         # Veri çek
         import yfinance as yf
@@ -2771,6 +2780,7 @@ async def predict_with_deep_learning(
     news_data: Optional[List[Dict]] = None
 ):
     """Deep Learning ile tahmin yap"""
+    await services.aload('deep_learning_ensemble')
     try:
         # Veri çek
         import yfinance as yf
@@ -2803,6 +2813,7 @@ async def analyze_news_sentiment(
     extract_keywords: bool = True
 ):
     """Haber metninin sentiment analizini yap"""
+    await services.aload('deep_learning_ensemble')
     try:
         analyzer = deep_learning_ensemble.nlp_analyzer
         
@@ -2829,6 +2840,7 @@ async def analyze_news_sentiment(
 @app.get("/deep-learning/status")
 async def get_deep_learning_status():
     """Deep Learning modellerinin durumu"""
+    await services.aload('deep_learning_ensemble')
     return {
         "transformer_trained": deep_learning_ensemble.transformer.is_trained,
         "lstm_trained": deep_learning_ensemble.lstm.is_trained,
@@ -2849,6 +2861,7 @@ async def run_backtest(
     slippage: float = 0.0005
 ):
     """Backtest çalıştır"""
+    await services.aload('BacktestConfig', 'StrategyEngine', 'StrategyType')
     try:
         # Veri çek
         import yfinance as yf
@@ -2916,6 +2929,7 @@ async def run_walk_forward_validation(
     test_period: int = 63
 ):
     """Walk-forward validation çalıştır"""
+    await services.aload('StrategyEngine', 'StrategyType')
     try:
         # Veri çek
         import yfinance as yf
@@ -2957,6 +2971,7 @@ async def run_walk_forward_validation(
 @app.get("/backtesting/strategies")
 async def get_available_strategies():
     """Mevcut stratejileri listele"""
+    await services.aload('StrategyType')
     strategies = [
         {
             "name": strategy.value,
@@ -2979,6 +2994,7 @@ async def compare_strategies(
     initial_capital: float = 100000.0
 ):
     """Stratejileri karşılaştır"""
+    await services.aload('BacktestConfig', 'StrategyEngine', 'StrategyType')
     try:
         # Veri çek
         import yfinance as yf
@@ -3046,6 +3062,7 @@ def _get_strategy_description(strategy: StrategyType) -> str:
 @app.get("/crypto/market-overview")
 async def get_crypto_market_overview():
     """Kripto market genel bakış"""
+    await services.aload('crypto_analyzer')
     try:
         result = crypto_analyzer.analyze_crypto_market()
         
@@ -3064,6 +3081,7 @@ async def get_crypto_technical_analysis(
     days: int = 30
 ):
     """Kripto teknik analizi"""
+    await services.aload('crypto_analyzer')
     try:
         result = crypto_analyzer.analyze_crypto_technical(symbol.upper(), days)
         
@@ -3079,6 +3097,7 @@ async def get_crypto_technical_analysis(
 @app.get("/crypto/top-cryptos")
 async def get_top_cryptocurrencies(limit: int = 50):
     """En büyük kripto paraları listele"""
+    await services.aload('crypto_analyzer')
     try:
         cryptos = crypto_analyzer.data_provider.get_top_cryptos(limit)
         
@@ -3111,6 +3130,7 @@ async def get_top_cryptocurrencies(limit: int = 50):
 @app.get("/crypto/fear-greed-index")
 async def get_crypto_fear_greed_index():
     """Crypto Fear & Greed Index"""
+    await services.aload('crypto_analyzer')
     try:
         result = crypto_analyzer.data_provider.get_crypto_fear_greed_index()
         
@@ -3130,6 +3150,7 @@ async def get_crypto_price_history(
     days: int = 30
 ):
     """Kripto fiyat geçmişi"""
+    await services.aload('crypto_analyzer')
     try:
         df = crypto_analyzer.data_provider.get_crypto_price_history(symbol.upper(), days)
         
@@ -3163,6 +3184,7 @@ async def get_crypto_price_history(
 @app.get("/crypto/portfolio")
 async def get_crypto_portfolio():
     """Kripto portföy durumu"""
+    await services.aload('crypto_portfolio_manager')
     try:
         result = crypto_portfolio_manager.get_portfolio_value()
         
@@ -3182,6 +3204,7 @@ async def add_crypto_to_portfolio(
     price: Optional[float] = None
 ):
     """Portföye kripto ekle"""
+    await services.aload('crypto_portfolio_manager')
     try:
         success = crypto_portfolio_manager.add_crypto(symbol, quantity, price)
         
@@ -3204,6 +3227,7 @@ async def remove_crypto_from_portfolio(
     quantity: Optional[float] = None
 ):
     """Portföyden kripto çıkar"""
+    await services.aload('crypto_portfolio_manager')
     try:
         success = crypto_portfolio_manager.remove_crypto(symbol, quantity)
         
@@ -3244,6 +3268,7 @@ async def get_crypto_exchanges():
 @app.get("/broker/status")
 async def get_broker_status():
     """Broker durumu"""
+    await services.aload('broker_manager')
     try:
         brokers = broker_manager.get_available_brokers()
         active_broker = broker_manager.active_broker_type.value if broker_manager.active_broker_type else None
@@ -3262,6 +3287,7 @@ async def get_broker_status():
 @app.post("/broker/connect")
 async def connect_broker(broker_type: str):
     """Broker'a bağlan"""
+    await services.aload('BrokerType', 'broker_manager')
     try:
         try:
             broker_enum = BrokerType(broker_type)
@@ -3286,6 +3312,7 @@ async def connect_broker(broker_type: str):
 @app.post("/broker/disconnect")
 async def disconnect_broker():
     """Broker bağlantısını kes"""
+    await services.aload('broker_manager')
     try:
         success = await broker_manager.disconnect_broker()
         
@@ -3302,6 +3329,7 @@ async def disconnect_broker():
 @app.get("/broker/account")
 async def get_account_info():
     """Hesap bilgilerini al"""
+    await services.aload('broker_manager')
     try:
         if not broker_manager.active_broker:
             raise HTTPException(status_code=400, detail="Aktif broker yok")
@@ -3331,6 +3359,7 @@ async def get_account_info():
 @app.get("/broker/positions")
 async def get_positions():
     """Pozisyonları al"""
+    await services.aload('broker_manager')
     try:
         if not broker_manager.active_broker:
             raise HTTPException(status_code=400, detail="Aktif broker yok")
@@ -3364,6 +3393,7 @@ async def get_positions():
 @app.get("/broker/quote/{symbol}")
 async def get_quote(symbol: str):
     """Anlık fiyat al"""
+    await services.aload('broker_manager')
     try:
         if not broker_manager.active_broker:
             raise HTTPException(status_code=400, detail="Aktif broker yok")
@@ -3387,6 +3417,7 @@ async def place_market_order(
     quantity: float
 ):
     """Market order gönder"""
+    await services.aload('OrderSide', 'broker_manager', 'order_manager', 'risk_manager')
     try:
         if not broker_manager.active_broker:
             raise HTTPException(status_code=400, detail="Aktif broker yok")
@@ -3435,6 +3466,7 @@ async def place_limit_order(
     price: float
 ):
     """Limit order gönder"""
+    await services.aload('OrderSide', 'broker_manager', 'order_manager', 'risk_manager')
     try:
         if not broker_manager.active_broker:
             raise HTTPException(status_code=400, detail="Aktif broker yok")
@@ -3481,6 +3513,7 @@ async def place_stop_order(
     stop_price: float
 ):
     """Stop order gönder"""
+    await services.aload('OrderSide', 'broker_manager', 'order_manager', 'risk_manager')
     try:
         if not broker_manager.active_broker:
             raise HTTPException(status_code=400, detail="Aktif broker yok")
@@ -3522,6 +3555,7 @@ async def place_stop_order(
 @app.post("/broker/order/cancel/{order_id}")
 async def cancel_order(order_id: str):
     """Order iptal et"""
+    await services.aload('broker_manager', 'order_manager')
     try:
         if not broker_manager.active_broker:
             raise HTTPException(status_code=400, detail="Aktif broker yok")
@@ -3541,6 +3575,7 @@ async def cancel_order(order_id: str):
 @app.get("/broker/order/status/{order_id}")
 async def get_order_status(order_id: str):
     """Order durumu al"""
+    await services.aload('broker_manager', 'order_manager')
     try:
         if not broker_manager.active_broker:
             raise HTTPException(status_code=400, detail="Aktif broker yok")
@@ -3561,6 +3596,7 @@ async def get_order_status(order_id: str):
 @app.get("/broker/orders/history")
 async def get_order_history(limit: int = 100):
     """Order geçmişini al"""
+    await services.aload('broker_manager', 'order_manager')
     try:
         if not broker_manager.active_broker:
             raise HTTPException(status_code=400, detail="Aktif broker yok")
@@ -3597,6 +3633,7 @@ async def get_order_history(limit: int = 100):
 @app.get("/broker/orders/active")
 async def get_active_orders():
     """Aktif order'ları al"""
+    await services.aload('broker_manager', 'order_manager')
     try:
         if not broker_manager.active_broker:
             raise HTTPException(status_code=400, detail="Aktif broker yok")
@@ -3633,6 +3670,7 @@ async def get_active_orders():
 @app.get("/broker/risk/check")
 async def check_risk():
     """Risk durumu kontrol et"""
+    await services.aload('broker_manager', 'risk_manager')
     try:
         if not broker_manager.active_broker:
             raise HTTPException(status_code=400, detail="Aktif broker yok")
@@ -3659,6 +3697,7 @@ async def check_risk():
 @app.get("/strategies/list")
 async def get_strategies():
     """Mevcut stratejileri listele"""
+    await services.aload('strategy_manager')
     try:
         strategies = [
             {
@@ -3693,6 +3732,8 @@ async def add_strategy(
     symbols: str = '["AAPL", "GOOGL"]'
 ):
     """Strateji ekle"""
+    await services.aload('HFTStrategy', 'MarketMakingStrategy', 'PairsTradingStrategy',
+                         'StatisticalArbitrageStrategy', 'strategy_manager')
     try:
         import json
         symbols_list = json.loads(symbols)
@@ -3724,6 +3765,7 @@ async def add_strategy(
 @app.delete("/strategies/remove/{strategy_name}")
 async def remove_strategy(strategy_name: str):
     """Strateji kaldır"""
+    await services.aload('strategy_manager')
     try:
         strategy_manager.remove_strategy(strategy_name)
         
@@ -3740,6 +3782,7 @@ async def remove_strategy(strategy_name: str):
 @app.post("/strategies/start")
 async def start_strategies():
     """Stratejileri başlat"""
+    await services.aload('strategy_manager')
     try:
         if not strategy_manager.is_running:
             # Background task olarak başlat
@@ -3758,6 +3801,7 @@ async def start_strategies():
 @app.post("/strategies/stop")
 async def stop_strategies():
     """Stratejileri durdur"""
+    await services.aload('strategy_manager')
     try:
         await strategy_manager.stop()
         
@@ -3774,6 +3818,7 @@ async def stop_strategies():
 @app.get("/strategies/metrics")
 async def get_strategy_metrics():
     """Strateji metriklerini al"""
+    await services.aload('strategy_manager')
     try:
         metrics = strategy_manager.get_strategy_metrics()
         
@@ -3804,6 +3849,7 @@ async def get_strategy_metrics():
 @app.get("/strategies/positions")
 async def get_strategy_positions():
     """Strateji pozisyonlarını al"""
+    await services.aload('strategy_manager')
     try:
         positions = strategy_manager.get_positions()
         
@@ -3829,6 +3875,7 @@ async def add_market_data(
     momentum: float = 0.0
 ):
     """Market verisi ekle"""
+    await services.aload('MarketData', 'OrderFlow', 'strategy_manager')
     try:
         # OrderFlow enum mapping
         order_flow_map = {
@@ -3869,6 +3916,7 @@ async def get_strategy_signals(symbol: Optional[str] = None, flat: bool = False)
     - symbol: Belirli bir sembol için filtre (opsiyonel)
     - flat: True ise düz liste döndür (symbol, action, confidence, price, quantity, timestamp, strategy)
     """
+    await services.aload('strategy_manager')
     try:
         # Düğümlü sözlük (mevcut davranış)
         signals = {}
@@ -3964,6 +4012,8 @@ async def backtest_strategy(
     initial_capital: float = 100000.0
 ):
     """Strateji backtest"""
+    await services.aload('HFTStrategy', 'MarketMakingStrategy', 'PairsTradingStrategy',
+                         'StatisticalArbitrageStrategy')
     try:
         # Mock backtest implementation
         # Gerçek implementasyonda historical data kullanılacak
@@ -4011,6 +4061,7 @@ async def backtest_strategy(
 @app.post("/strategies/apply-us-aggressive")
 async def apply_us_aggressive_profile():
     """US Agresif profilini uygula ve HFT stratejisini tanımla"""
+    await services.aload('HFTStrategy', 'US_AGGRESSIVE_PROFILE', 'strategy_manager')
     try:
         profile = US_AGGRESSIVE_PROFILE
         symbols = profile.get("symbols", ["SPY", "QQQ"])  # güvenlik
@@ -4051,18 +4102,13 @@ async def global_exception_handler(request, exc):
 async def _fetch_history_async(symbol: str, period: str, interval: str):
     import yfinance as yf
     import pandas as pd
-    loop = asyncio.get_running_loop()
     def _fetch():
         return yf.Ticker(symbol).history(period=period, interval=interval)
-    return await loop.run_in_executor(None, _fetch)
+    return await timed_run_in_executor(None, _fetch)
 
 async def _scan_patterns_async(df, symbol: str):
-    from analysis.pattern_detection import TechnicalPatternEngine
-    engine = TechnicalPatternEngine()
-    loop = asyncio.get_running_loop()
-    def _scan():
-        return engine.scan_all_patterns(df, symbol)
-    return await loop.run_in_executor(None, _scan)
+    from analysis.pattern_detection import scan_patterns
+    return await scan_patterns(df, symbol)
 
 # ============================================================================
 # BROKER PAPER TRADING ENDPOINTS
@@ -4071,6 +4117,7 @@ async def _scan_patterns_async(df, symbol: str):
 @app.get("/broker/portfolio")
 async def get_broker_portfolio():
     """Broker portföy özetini al"""
+    await services.aload('broker_paper')
     if not broker_paper:
         raise HTTPException(status_code=503, detail="Broker Paper Trading yüklenemedi")
     
@@ -4087,6 +4134,7 @@ async def get_broker_portfolio():
 @app.get("/broker/positions")
 async def get_broker_positions():
     """Broker pozisyonlarını al"""
+    await services.aload('broker_paper')
     if not broker_paper:
         raise HTTPException(status_code=503, detail="Broker Paper Trading yüklenemedi")
     
@@ -4104,6 +4152,7 @@ async def get_broker_positions():
 @app.get("/broker/trades")
 async def get_broker_trades(limit: int = 50):
     """Broker işlemlerini al"""
+    await services.aload('broker_paper')
     if not broker_paper:
         raise HTTPException(status_code=503, detail="Broker Paper Trading yüklenemedi")
     
@@ -4129,6 +4178,7 @@ async def place_broker_order(
     confidence: float = 1.0
 ):
     """Broker emri ver"""
+    await services.aload('broker_paper')
     if not broker_paper:
         raise HTTPException(status_code=503, detail="Broker Paper Trading yüklenemedi")
     
@@ -4169,6 +4219,7 @@ async def place_broker_order(
 @app.post("/broker/reset-circuit-breaker")
 async def reset_broker_circuit_breaker():
     """Broker circuit breaker'ı sıfırla"""
+    await services.aload('broker_paper')
     if not broker_paper:
         raise HTTPException(status_code=503, detail="Broker Paper Trading yüklenemedi")
     
@@ -4186,6 +4237,7 @@ async def reset_broker_circuit_breaker():
 @app.post("/broker/save-state")
 async def save_broker_state():
     """Broker durumunu kaydet"""
+    await services.aload('broker_paper')
     if not broker_paper:
         raise HTTPException(status_code=503, detail="Broker Paper Trading yüklenemedi")
     
@@ -4207,6 +4259,7 @@ async def save_broker_state():
 @app.get("/market-regime/current")
 async def get_current_market_regime():
     """Güncel piyasa rejimini al"""
+    await services.aload('market_regime_detector')
     if not market_regime_detector:
         raise HTTPException(status_code=503, detail="Market Regime Detector yüklenemedi")
     
@@ -4228,6 +4281,7 @@ async def get_current_market_regime():
 @app.get("/market-regime/history")
 async def get_market_regime_history(days: int = 7):
     """Piyasa rejimi geçmişini al"""
+    await services.aload('market_regime_detector')
     if not market_regime_detector:
         raise HTTPException(status_code=503, detail="Market Regime Detector yüklenemedi")
     
@@ -4254,6 +4308,7 @@ async def get_market_regime_history(days: int = 7):
 @app.get("/market-regime/summary")
 async def get_market_regime_summary():
     """Piyasa rejimi özetini al"""
+    await services.aload('market_regime_detector')
     if not market_regime_detector:
         raise HTTPException(status_code=503, detail="Market Regime Detector yüklenemedi")
     
@@ -4273,7 +4328,7 @@ async def test_us_aggressive():
     return {
         "success": True,
         "message": "US Aggressive test endpoint çalışıyor",
-        "manager_loaded": us_aggressive_manager is not None,
+        "manager_loaded": await services.aavailable('us_aggressive_manager'),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -4315,6 +4370,7 @@ async def test_signals():
 @app.post("/us-aggressive/start-session")
 async def start_us_aggressive_session():
     """US Aggressive seansını başlat ($100 -> $1000 hedefi)"""
+    await services.aload('us_aggressive_manager')
     if not us_aggressive_manager:
         raise HTTPException(status_code=503, detail="US Aggressive Session Manager yüklenemedi")
     
@@ -4333,6 +4389,7 @@ async def start_us_aggressive_session():
 @app.post("/us-aggressive/stop-session")
 async def stop_us_aggressive_session():
     """US Aggressive seansını durdur"""
+    await services.aload('us_aggressive_manager')
     if not us_aggressive_manager:
         raise HTTPException(status_code=503, detail="US Aggressive Session Manager yüklenemedi")
     
@@ -4350,6 +4407,7 @@ async def stop_us_aggressive_session():
 @app.get("/us-aggressive/status")
 async def get_us_aggressive_status():
     """US Aggressive seans durumu"""
+    await services.aload('us_aggressive_manager')
     if not us_aggressive_manager:
         raise HTTPException(status_code=503, detail="US Aggressive Session Manager yüklenemedi")
     
@@ -4367,6 +4425,7 @@ async def get_us_aggressive_status():
 @app.post("/us-aggressive/reset-circuit-breaker")
 async def reset_us_aggressive_circuit_breaker():
     """Devre kesiciyi sıfırla"""
+    await services.aload('us_aggressive_manager')
     if not us_aggressive_manager:
         raise HTTPException(status_code=503, detail="US Aggressive Session Manager yüklenemedi")
     
@@ -4390,6 +4449,7 @@ async def record_us_aggressive_trade(
     pnl: float
 ):
     """US Aggressive işlem kaydı"""
+    await services.aload('us_aggressive_manager')
     if not us_aggressive_manager:
         raise HTTPException(status_code=503, detail="US Aggressive Session Manager yüklenemedi")
     
@@ -4407,6 +4467,7 @@ async def record_us_aggressive_trade(
 @app.get("/us-aggressive/can-trade")
 async def can_us_aggressive_trade():
     """US Aggressive işlem yapılabilir mi kontrol et"""
+    await services.aload('us_aggressive_manager')
     if not us_aggressive_manager:
         raise HTTPException(status_code=503, detail="US Aggressive Session Manager yüklenemedi")
     
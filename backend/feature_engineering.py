@@ -21,6 +21,8 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+import indicator_library as indicators
+
 @dataclass
 class TechnicalIndicator:
     """Teknik indikatör"""
@@ -137,13 +139,7 @@ class FeatureEngineering:
         Returns:
             pd.Series: RSI değerleri
         """
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return indicators.calculate_rsi(prices, period)
     
     def calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.Series]:
         """
@@ -158,12 +154,7 @@ class FeatureEngineering:
         Returns:
             Dict: MACD bileşenleri
         """
-        ema_fast = self.calculate_ema(prices, fast)
-        ema_slow = self.calculate_ema(prices, slow)
-        
-        macd_line = ema_fast - ema_slow
-        signal_line = self.calculate_ema(macd_line, signal)
-        histogram = macd_line - signal_line
+        macd_line, signal_line, histogram = indicators.calculate_macd(prices, fast, slow, signal)
         
         return {
             "MACD": macd_line,
@@ -236,16 +227,7 @@ class FeatureEngineering:
         Returns:
             pd.Series: ATR değerleri
         """
-        prev_close = close.shift(1)
-        
-        tr1 = high - low
-        tr2 = abs(high - prev_close)
-        tr3 = abs(low - prev_close)
-        
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
-        
-        return atr
+        return indicators.calculate_atr(high, low, close, period)
     
     def calculate_cci(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 20) -> pd.Series:
         """
@@ -14,7 +14,10 @@ import warnings
 import json
 import logging
 import random
+import time
+import threading
 from collections import defaultdict
+from functools import partial
 from sklearn.decomposition import PCA
 from sklearn.feature_selection import SelectKBest, f_classif, mutual_info_classif, RFE
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler
@@ -22,6 +25,11 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import mutual_info_score
 # talib import edilemedi, basit teknik indikatör hesaplama fonksiyonları kullanılacak
 
+try:
+    from core.feature_store import feature_store
+except ImportError:
+    from backend.core.feature_store import feature_store
+
 # Logging ayarları
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -77,6 +85,152 @@ class DimensionalityReduction:
     reconstruction_error: float
     created_at: datetime
 
+Node = Tuple[Any, ...]
+
+
+class FeaturePlan:
+    """
+    Özellik planı: istenen çıktı sütunları ve bunların dayandığı ilkel (primitive)
+    hesaplamaların DAG'ı. Aynı ilkel (ör. close.rolling(20).mean()) kaç yöntemde
+    istenirse istensin tek kez hesaplanır; çıktılar önceden ayrılmış float32
+    bloğa yazılır ve frame tek adımda kurulur.
+    """
+    
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self.columns: List[str] = list(data.columns)
+        self.outputs: Dict[str, Node] = {}
+        self.nodes: Dict[Node, Tuple[Callable, Tuple[Node, ...]]] = {}
+        self.requests = 0
+    
+    # ------------------------------------------------------------------
+    # Plan kurma
+    # ------------------------------------------------------------------
+    def has(self, *names: str) -> bool:
+        return all(name in self.columns for name in names)
+    
+    def numeric_columns(self) -> List[str]:
+        return [c for c in self.columns if c in self.outputs or pd.api.types.is_numeric_dtype(self.data[c])]
+    
+    def _node(self, key: Node, fn: Callable, deps: Tuple[Node, ...] = ()) -> Node:
+        self.requests += 1
+        if key not in self.nodes:
+            self.nodes[key] = (fn, deps)
+        return key
+    
+    def col(self, name: str) -> Node:
+        """Görünür sütun: daha önce planlanmış çıktı ya da girdi sütunu"""
+        if name in self.outputs:
+            self.requests += 1
+            return self.outputs[name]
+        return self._node(('col', name), lambda: self.data[name])
+    
+    def rolling(self, src: Node, window: int, op: str) -> Node:
+        return self._node(('rolling', src, window, op), lambda s: getattr(s.rolling(window=window), op)(), (src,))
+    
+    def ewm(self, src: Node, span: int) -> Node:
+        return self._node(('ewm', src, span), lambda s: s.ewm(span=span).mean(), (src,))
+    
+    def shift(self, src: Node, periods: int) -> Node:
+        return self._node(('shift', src, periods), lambda s: s.shift(periods), (src,))
+    
+    def pct_change(self, src: Node, periods: int = 1) -> Node:
+        return self._node(('pct_change', src, periods), lambda s: s.pct_change(periods), (src,))
+    
+    def diff(self, src: Node, periods: int = 1) -> Node:
+        return self._node(('diff', src, periods), lambda s: s.diff(periods), (src,))
+    
+    def expr(self, label: str, fn: Callable, *deps: Node) -> Node:
+        """Bağımlılıklar üzerinde eleman bazlı ifade; label + deps düğümü tanımlar"""
+        return self._node(('expr', label, deps), fn, deps)
+    
+    def add(self, name: str, node: Node):
+        """Çıktı sütunu; aynı ad yeniden eklenirse pandas atamasındaki gibi yeri korunur"""
+        if name not in self.columns:
+            self.columns.append(name)
+        self.outputs[name] = node
+    
+    # ------------------------------------------------------------------
+    # Yürütme
+    # ------------------------------------------------------------------
+    def _order(self) -> List[Node]:
+        order: List[Node] = []
+        seen = set()
+        
+        def visit(key: Node):
+            if key in seen:
+                return
+            seen.add(key)
+            for dep in self.nodes[key][1]:
+                visit(dep)
+            order.append(key)
+        
+        for key in self.outputs.values():
+            visit(key)
+        return order
+    
+    def execute(self) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Planı çalıştır: (frame, rapor)"""
+        started = time.perf_counter()
+        order = self._order()
+        names = list(self.outputs)
+        
+        # Her ara sonuç son tüketicisi hesaplanınca bırakılır
+        refs: Dict[Node, int] = defaultdict(int)
+        for key in order:
+            for dep in self.nodes[key][1]:
+                refs[dep] += 1
+        rows: Dict[Node, List[int]] = defaultdict(list)
+        for row, name in enumerate(names):
+            rows[self.outputs[name]].append(row)
+            refs[self.outputs[name]] += 1
+        
+        block = np.empty((len(names), len(self.data)), dtype=np.float32)
+        memo: Dict[Node, Any] = {}
+        sizes: Dict[Node, int] = {}
+        live = peak = 0
+        
+        def release(key: Node):
+            nonlocal live
+            refs[key] -= 1
+            if refs[key] == 0:
+                memo.pop(key, None)
+                live -= sizes.pop(key, 0)
+        
+        for key in order:
+            fn, deps = self.nodes[key]
+            value = fn(*(memo[dep] for dep in deps))
+            memo[key] = value
+            # Girdi sütunları kopya değil, bellek hesabına girmez
+            sizes[key] = 0 if key[0] == 'col' else int(getattr(value, 'nbytes', 0))
+            live += sizes[key]
+            peak = max(peak, live)
+            for row in rows.get(key, ()):
+                block[row] = np.asarray(value, dtype=np.float32)
+                release(key)
+            for dep in deps:
+                release(dep)
+        
+        # (n_features, n_rows) bloğun transpozu tek float32 blok olarak alınır
+        features = pd.DataFrame(block.T, index=self.data.index, columns=names, copy=False)
+        overlap = [name for name in names if name in self.data.columns]
+        base = self.data.drop(columns=overlap) if overlap else self.data
+        result = pd.concat([base, features], axis=1)
+        if overlap:
+            result = result[self.columns]
+        
+        report = {
+            'build_ms': round((time.perf_counter() - started) * 1000, 3),
+            'peak_bytes': int(block.nbytes + peak),
+            'output_bytes': int(block.nbytes),
+            'n_features': len(names),
+            'primitives': len(self.nodes),
+            'requests': self.requests,
+            'reused': self.requests - len(self.nodes),
+        }
+        return result, report
+
+
 class FeatureEngineeringPipeline:
     """Feature Engineering Pipeline ana sınıfı"""
     
@@ -88,6 +242,7 @@ class FeatureEngineeringPipeline:
         self.scalers = {}
         self.feature_importances = {}
         self.feature_correlations = {}
+        self.build_reports = {}
         
         # Varsayılan özellik setlerini tanımla
         self._add_default_feature_sets()
@@ -153,6 +308,17 @@ class FeatureEngineeringPipeline:
             "fourier_features": self._create_fourier_features,
             "wavelet_features": self._create_wavelet_features
         }
+        # engineer_features tüm yöntemleri tek planda birleştirir
+        self.feature_planners = {
+            "technical_indicators": self._plan_technical_indicators,
+            "statistical_features": self._plan_statistical_features,
+            "lag_features": self._plan_lag_features,
+            "rolling_features": self._plan_rolling_features,
+            "interaction_features": self._plan_interaction_features,
+            "polynomial_features": self._plan_polynomial_features,
+            "fourier_features": self._plan_fourier_features,
+            "wavelet_features": self._plan_wavelet_features
+        }
     
     def create_feature_set(self, name: str, description: str, features: List[str], 
                           feature_type: str) -> str:
@@ -179,237 +345,287 @@ class FeatureEngineeringPipeline:
             logger.error(f"Error creating feature set: {e}")
             return None
     
-    def _calculate_technical_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Teknik indikatörleri hesapla (basit implementasyon)"""
-        try:
-            result = data.copy()
-            
-            # RSI (Relative Strength Index)
-            if 'close' in data.columns:
-                delta = data['close'].diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                rs = gain / loss
-                result['rsi'] = 100 - (100 / (1 + rs))
-            
-            # MACD (Moving Average Convergence Divergence)
-            if 'close' in data.columns:
-                ema_12 = data['close'].ewm(span=12).mean()
-                ema_26 = data['close'].ewm(span=26).mean()
-                result['macd'] = ema_12 - ema_26
-                result['macd_signal'] = result['macd'].ewm(span=9).mean()
-                result['macd_hist'] = result['macd'] - result['macd_signal']
-            
-            # EMA (Exponential Moving Average)
-            if 'close' in data.columns:
-                result['ema_20'] = data['close'].ewm(span=20).mean()
-                result['ema_50'] = data['close'].ewm(span=50).mean()
-            
-            # Bollinger Bands
-            if 'close' in data.columns:
-                sma_20 = data['close'].rolling(window=20).mean()
-                std_20 = data['close'].rolling(window=20).std()
-                result['bb_upper'] = sma_20 + (std_20 * 2)
-                result['bb_middle'] = sma_20
-                result['bb_lower'] = sma_20 - (std_20 * 2)
-                result['bb_width'] = (result['bb_upper'] - result['bb_lower']) / result['bb_middle']
-            
-            # Stochastic Oscillator
-            if all(col in data.columns for col in ['high', 'low', 'close']):
-                low_14 = data['low'].rolling(window=14).min()
-                high_14 = data['high'].rolling(window=14).max()
-                result['stoch_k'] = 100 * ((data['close'] - low_14) / (high_14 - low_14))
-                result['stoch_d'] = result['stoch_k'].rolling(window=3).mean()
-            
-            # Williams %R
-            if all(col in data.columns for col in ['high', 'low', 'close']):
-                high_14 = data['high'].rolling(window=14).max()
-                low_14 = data['low'].rolling(window=14).min()
-                result['williams_r'] = -100 * ((high_14 - data['close']) / (high_14 - low_14))
-            
-            return result
+    # ------------------------------------------------------------------
+    # Özellik planlayıcıları: her yöntem çıktılarını FeaturePlan'a ekler
+    # ------------------------------------------------------------------
+    def _plan_technical_indicators(self, plan: FeaturePlan):
+        """Teknik indikatörler (RSI, MACD, EMA, Bollinger, Stochastic, Williams %R)"""
+        if not plan.has('close'):
+            return
+        close = plan.col('close')
+        
+        # RSI (Relative Strength Index)
+        delta = plan.diff(close)
+        gain = plan.rolling(plan.expr('gain', lambda d: d.where(d > 0, 0), delta), 14, 'mean')
+        loss = plan.rolling(plan.expr('loss', lambda d: -d.where(d < 0, 0), delta), 14, 'mean')
+        plan.add('rsi', plan.expr('rsi', lambda g, l: 100 - (100 / (1 + g / l)), gain, loss))
+        
+        # MACD (Moving Average Convergence Divergence)
+        macd = plan.expr('sub', lambda a, b: a - b, plan.ewm(close, 12), plan.ewm(close, 26))
+        plan.add('macd', macd)
+        macd_signal = plan.ewm(plan.col('macd'), 9)
+        plan.add('macd_signal', macd_signal)
+        plan.add('macd_hist', plan.expr('sub', lambda a, b: a - b, plan.col('macd'), plan.col('macd_signal')))
+        
+        # EMA (Exponential Moving Average)
+        plan.add('ema_20', plan.ewm(close, 20))
+        plan.add('ema_50', plan.ewm(close, 50))
+        
+        # Bollinger Bands
+        sma_20 = plan.rolling(close, 20, 'mean')
+        std_20 = plan.rolling(close, 20, 'std')
+        plan.add('bb_upper', plan.expr('band_upper', lambda m, s: m + (s * 2), sma_20, std_20))
+        plan.add('bb_middle', sma_20)
+        plan.add('bb_lower', plan.expr('band_lower', lambda m, s: m - (s * 2), sma_20, std_20))
+        plan.add('bb_width', plan.expr('band_width', lambda u, l, m: (u - l) / m,
+                                       plan.col('bb_upper'), plan.col('bb_lower'), plan.col('bb_middle')))
+        
+        if not plan.has('high', 'low'):
+            return
+        low_14 = plan.rolling(plan.col('low'), 14, 'min')
+        high_14 = plan.rolling(plan.col('high'), 14, 'max')
+        
+        # Stochastic Oscillator
+        plan.add('stoch_k', plan.expr('stoch_k', lambda c, lo, hi: 100 * ((c - lo) / (hi - lo)), close, low_14, high_14))
+        plan.add('stoch_d', plan.rolling(plan.col('stoch_k'), 3, 'mean'))
+        
+        # Williams %R
+        plan.add('williams_r', plan.expr('williams_r', lambda c, lo, hi: -100 * ((hi - c) / (hi - lo)), close, low_14, high_14))
+    
+    def _plan_statistical_features(self, plan: FeaturePlan, window: int = 20):
+        """İstatistiksel özellikler"""
+        if plan.has('close'):
+            close = plan.col('close')
+            # Rolling statistics
+            mean = plan.rolling(close, window, 'mean')
+            std = plan.rolling(close, window, 'std')
+            plan.add('price_mean', mean)
+            plan.add('price_std', std)
+            plan.add('price_skew', plan.rolling(close, window, 'skew'))
+            plan.add('price_kurt', plan.rolling(close, window, 'kurt'))
+            
+            # Price changes
+            change = plan.pct_change(close)
+            plan.add('price_change', change)
+            plan.add('price_change_abs', plan.expr('abs', lambda s: s.abs(), change))
+            
+            # Volatility
+            plan.add('volatility', plan.expr('div', lambda a, b: a / b, std, mean))
         
+        if plan.has('volume'):
+            volume = plan.col('volume')
+            # Volume statistics
+            volume_mean = plan.rolling(volume, window, 'mean')
+            plan.add('volume_mean', volume_mean)
+            plan.add('volume_std', plan.rolling(volume, window, 'std'))
+            plan.add('volume_ratio', plan.expr('div', lambda a, b: a / b, volume, volume_mean))
+    
+    def _plan_lag_features(self, plan: FeaturePlan, lags: List[int] = [1, 2, 3, 5, 10]):
+        """Lag özellikleri"""
+        for lag in lags:
+            if plan.has('close'):
+                close = plan.col('close')
+                plan.add(f'close_lag_{lag}', plan.shift(close, lag))
+                plan.add(f'price_change_lag_{lag}', plan.shift(plan.pct_change(close), lag))
+            
+            if plan.has('volume'):
+                volume = plan.col('volume')
+                plan.add(f'volume_lag_{lag}', plan.shift(volume, lag))
+                plan.add(f'volume_change_lag_{lag}', plan.shift(plan.pct_change(volume), lag))
+    
+    def _plan_rolling_features(self, plan: FeaturePlan, windows: List[int] = [5, 10, 20]):
+        """Rolling özellikleri"""
+        for window in windows:
+            if plan.has('close'):
+                close = plan.col('close')
+                low = plan.rolling(close, window, 'min')
+                high = plan.rolling(close, window, 'max')
+                plan.add(f'price_ma_{window}', plan.rolling(close, window, 'mean'))
+                plan.add(f'price_std_{window}', plan.rolling(close, window, 'std'))
+                plan.add(f'price_min_{window}', low)
+                plan.add(f'price_max_{window}', high)
+                
+                # Price position within range
+                plan.add(f'price_position_{window}',
+                         plan.expr('position', lambda c, lo, hi: (c - lo) / (hi - lo), close, low, high))
+            
+            if plan.has('volume'):
+                volume = plan.col('volume')
+                plan.add(f'volume_ma_{window}', plan.rolling(volume, window, 'mean'))
+                plan.add(f'volume_std_{window}', plan.rolling(volume, window, 'std'))
+    
+    def _plan_interaction_features(self, plan: FeaturePlan):
+        """Etkileşim özellikleri"""
+        mul = lambda a, b: a * b
+        
+        # Price-Volume interactions
+        if plan.has('close', 'volume'):
+            close, volume = plan.col('close'), plan.col('volume')
+            plan.add('price_volume', plan.expr('mul', mul, close, volume))
+            plan.add('price_volume_ratio', plan.expr('div', lambda a, b: a / b, close, volume))
+            
+            # Normalized price-volume
+            plan.add('norm_price_volume',
+                     plan.expr('demeaned_mul', lambda a, b: (a - a.mean()) * (b - b.mean()), close, volume))
+        
+        # Technical indicator interactions
+        if plan.has('rsi', 'macd'):
+            rsi, macd = plan.col('rsi'), plan.col('macd')
+            plan.add('rsi_macd', plan.expr('mul', mul, rsi, macd))
+            plan.add('rsi_macd_ratio', plan.expr('safe_div', lambda a, b: a / (b + 1e-8), rsi, macd))
+        
+        # Trend interactions
+        if plan.has('ema_20', 'ema_50'):
+            fast, slow = plan.col('ema_20'), plan.col('ema_50')
+            plan.add('ema_trend', plan.expr('rel_diff', lambda a, b: (a - b) / b, fast, slow))
+            plan.add('ema_cross', plan.expr('gt', lambda a, b: (a > b).astype(int), fast, slow))
+    
+    def _plan_polynomial_features(self, plan: FeaturePlan, degree: int = 2):
+        """Polinom özellikleri"""
+        for col in plan.numeric_columns()[:5]:  # Limit to first 5 columns to avoid explosion
+            source = plan.col(col)
+            if degree >= 2:
+                plan.add(f'{col}_squared', plan.expr('pow2', lambda s: s ** 2, source))
+            if degree >= 3:
+                plan.add(f'{col}_cubed', plan.expr('pow3', lambda s: s ** 3, source))
+    
+    def _plan_fourier_features(self, plan: FeaturePlan, n_components: int = 5):
+        """Fourier özellikleri (sayısal index üzerinden)"""
+        if not plan.has('close'):
+            return
+        if not pd.api.types.is_numeric_dtype(plan.data.index):
+            logger.error("Error creating Fourier features: index is not numeric")
+            return
+        index = plan.data.index
+        for i in range(1, n_components + 1):
+            window = 5 * i
+            # Simple Fourier-like features using rolling windows
+            plan.add(f'fourier_sin_{i}', plan.expr(f'sin_{window}', lambda w=window: np.sin(2 * np.pi * index / w)))
+            plan.add(f'fourier_cos_{i}', plan.expr(f'cos_{window}', lambda w=window: np.cos(2 * np.pi * index / w)))
+    
+    def _plan_wavelet_features(self, plan: FeaturePlan):
+        """Wavelet özellikleri (basit implementasyon)"""
+        if not plan.has('close'):
+            return
+        close = plan.col('close')
+        # Simple wavelet-like features using rolling differences
+        diff_1 = plan.diff(close)
+        plan.add('wavelet_diff_1', diff_1)
+        plan.add('wavelet_diff_2', plan.diff(diff_1))
+        
+        # Rolling wavelet-like features
+        plan.add('wavelet_ma_5', plan.rolling(close, 5, 'mean'))
+        plan.add('wavelet_ma_10', plan.rolling(close, 10, 'mean'))
+        plan.add('wavelet_ratio', plan.expr('div', lambda a, b: a / b, plan.col('wavelet_ma_5'), plan.col('wavelet_ma_10')))
+    
+    def _plan_multi_timeframe_features(self, plan: FeaturePlan,
+                                       timeframes: List[str] = ["1m", "5m", "15m", "1h", "1d"]):
+        """Çoklu zaman dilimi özellikleri"""
+        # Simüle edilmiş çoklu zaman dilimi verisi
+        for timeframe in timeframes:
+            # Her zaman dilimi için farklı rolling window'lar
+            if timeframe == "1m":
+                windows = [1, 2, 3, 5]
+            elif timeframe == "5m":
+                windows = [5, 10, 15, 20]
+            elif timeframe == "15m":
+                windows = [15, 30, 45, 60]
+            elif timeframe == "1h":
+                windows = [60, 120, 180, 240]
+            else:  # 1d
+                windows = [240, 480, 720, 1440]
+            
+            for window in windows:
+                if plan.has('close'):
+                    close = plan.col('close')
+                    plan.add(f'price_{timeframe}_{window}', plan.rolling(close, window, 'mean'))
+                    plan.add(f'volatility_{timeframe}_{window}', plan.rolling(close, window, 'std'))
+                
+                if plan.has('volume'):
+                    plan.add(f'volume_{timeframe}_{window}', plan.rolling(plan.col('volume'), window, 'mean'))
+    
+    def _build(self, data: pd.DataFrame, planners: List[Callable[[FeaturePlan], None]], name: str) -> pd.DataFrame:
+        """Planlayıcıları tek plana topla, çalıştır ve raporu kaydet"""
+        plan = FeaturePlan(data)
+        for planner in planners:
+            planner(plan)
+        result, report = plan.execute()
+        self.build_reports[name] = report
+        logger.info(f"Feature set {name}: {report['n_features']} features, {report['primitives']} primitives "
+                    f"({report['reused']} reused), {report['build_ms']:.1f}ms, peak {report['peak_bytes'] / 1e6:.2f}MB")
+        return result
+    
+    def _run_method(self, name: str, planner: Callable[[FeaturePlan], None], data: pd.DataFrame) -> pd.DataFrame:
+        try:
+            return self._build(data, [planner], name)
         except Exception as e:
-            logger.error(f"Error calculating technical indicators: {e}")
+            logger.error(f"Error creating {name}: {e}")
             return data
     
+    def _calculate_technical_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Teknik indikatörleri hesapla (basit implementasyon)"""
+        return self._run_method("technical_indicators", self._plan_technical_indicators, data)
+    
     def _calculate_statistical_features(self, data: pd.DataFrame, window: int = 20) -> pd.DataFrame:
         """İstatistiksel özellikleri hesapla"""
-        try:
-            result = data.copy()
-            
-            if 'close' in data.columns:
-                # Rolling statistics
-                result['price_mean'] = data['close'].rolling(window=window).mean()
-                result['price_std'] = data['close'].rolling(window=window).std()
-                result['price_skew'] = data['close'].rolling(window=window).skew()
-                result['price_kurt'] = data['close'].rolling(window=window).kurt()
-                
-                # Price changes
-                result['price_change'] = data['close'].pct_change()
-                result['price_change_abs'] = data['close'].pct_change().abs()
-                
-                # Volatility
-                result['volatility'] = data['close'].rolling(window=window).std() / data['close'].rolling(window=window).mean()
-            
-            if 'volume' in data.columns:
-                # Volume statistics
-                result['volume_mean'] = data['volume'].rolling(window=window).mean()
-                result['volume_std'] = data['volume'].rolling(window=window).std()
-                result['volume_ratio'] = data['volume'] / data['volume'].rolling(window=window).mean()
-            
-            return result
-        
-        except Exception as e:
-            logger.error(f"Error calculating statistical features: {e}")
-            return data
+        return self._run_method("statistical_features", partial(self._plan_statistical_features, window=window), data)
     
     def _create_lag_features(self, data: pd.DataFrame, lags: List[int] = [1, 2, 3, 5, 10]) -> pd.DataFrame:
         """Lag özellikleri oluştur"""
-        try:
-            result = data.copy()
-            
-            for lag in lags:
-                if 'close' in data.columns:
-                    result[f'close_lag_{lag}'] = data['close'].shift(lag)
-                    result[f'price_change_lag_{lag}'] = data['close'].pct_change().shift(lag)
-                
-                if 'volume' in data.columns:
-                    result[f'volume_lag_{lag}'] = data['volume'].shift(lag)
-                    result[f'volume_change_lag_{lag}'] = data['volume'].pct_change().shift(lag)
-            
-            return result
-        
-        except Exception as e:
-            logger.error(f"Error creating lag features: {e}")
-            return data
+        return self._run_method("lag_features", partial(self._plan_lag_features, lags=lags), data)
     
     def _create_rolling_features(self, data: pd.DataFrame, windows: List[int] = [5, 10, 20]) -> pd.DataFrame:
         """Rolling özellikleri oluştur"""
-        try:
-            result = data.copy()
-            
-            for window in windows:
-                if 'close' in data.columns:
-                    result[f'price_ma_{window}'] = data['close'].rolling(window=window).mean()
-                    result[f'price_std_{window}'] = data['close'].rolling(window=window).std()
-                    result[f'price_min_{window}'] = data['close'].rolling(window=window).min()
-                    result[f'price_max_{window}'] = data['close'].rolling(window=window).max()
-                    
-                    # Price position within range
-                    result[f'price_position_{window}'] = (data['close'] - result[f'price_min_{window}']) / (result[f'price_max_{window}'] - result[f'price_min_{window}'])
-                
-                if 'volume' in data.columns:
-                    result[f'volume_ma_{window}'] = data['volume'].rolling(window=window).mean()
-                    result[f'volume_std_{window}'] = data['volume'].rolling(window=window).std()
-            
-            return result
-        
-        except Exception as e:
-            logger.error(f"Error creating rolling features: {e}")
-            return data
+        return self._run_method("rolling_features", partial(self._plan_rolling_features, windows=windows), data)
     
     def _create_interaction_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """Etkileşim özellikleri oluştur"""
-        try:
-            result = data.copy()
-            
-            # Price-Volume interactions
-            if all(col in data.columns for col in ['close', 'volume']):
-                result['price_volume'] = data['close'] * data['volume']
-                result['price_volume_ratio'] = data['close'] / data['volume']
-                
-                # Normalized price-volume
-                result['norm_price_volume'] = (data['close'] - data['close'].mean()) * (data['volume'] - data['volume'].mean())
-            
-            # Technical indicator interactions
-            if all(col in data.columns for col in ['rsi', 'macd']):
-                result['rsi_macd'] = data['rsi'] * data['macd']
-                result['rsi_macd_ratio'] = data['rsi'] / (data['macd'] + 1e-8)
-            
-            # Trend interactions
-            if all(col in data.columns for col in ['ema_20', 'ema_50']):
-                result['ema_trend'] = (data['ema_20'] - data['ema_50']) / data['ema_50']
-                result['ema_cross'] = (data['ema_20'] > data['ema_50']).astype(int)
-            
-            return result
-        
-        except Exception as e:
-            logger.error(f"Error creating interaction features: {e}")
-            return data
+        return self._run_method("interaction_features", self._plan_interaction_features, data)
     
     def _create_polynomial_features(self, data: pd.DataFrame, degree: int = 2) -> pd.DataFrame:
         """Polinom özellikleri oluştur"""
-        try:
-            result = data.copy()
-            
-            # Select numerical columns
-            numerical_cols = data.select_dtypes(include=[np.number]).columns
-            
-            for col in numerical_cols[:5]:  # Limit to first 5 columns to avoid explosion
-                if degree >= 2:
-                    result[f'{col}_squared'] = data[col] ** 2
-                if degree >= 3:
-                    result[f'{col}_cubed'] = data[col] ** 3
-            
-            return result
-        
-        except Exception as e:
-            logger.error(f"Error creating polynomial features: {e}")
-            return data
+        return self._run_method("polynomial_features", partial(self._plan_polynomial_features, degree=degree), data)
     
     def _create_fourier_features(self, data: pd.DataFrame, n_components: int = 5) -> pd.DataFrame:
         """Fourier özellikleri oluştur"""
-        try:
-            result = data.copy()
-            
-            if 'close' in data.columns:
-                # Simple Fourier-like features using rolling windows
-                for i in range(1, n_components + 1):
-                    window = 5 * i
-                    result[f'fourier_sin_{i}'] = np.sin(2 * np.pi * data.index / window)
-                    result[f'fourier_cos_{i}'] = np.cos(2 * np.pi * data.index / window)
-            
-            return result
-        
-        except Exception as e:
-            logger.error(f"Error creating Fourier features: {e}")
-            return data
+        return self._run_method("fourier_features", partial(self._plan_fourier_features, n_components=n_components), data)
     
     def _create_wavelet_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """Wavelet özellikleri oluştur (basit implementasyon)"""
+        return self._run_method("wavelet_features", self._plan_wavelet_features, data)
+    
+    def _apply_methods(self, data: pd.DataFrame, methods: List[str]) -> pd.DataFrame:
+        """Yöntemleri tek plan olarak uygula (ortak ilkel hesaplamalar bir kez yapılır)"""
+        planners = [self.feature_planners[method] for method in methods if method in self.feature_planners]
+        return self._build(data, planners, "+".join(methods))
+    
+    def _stored_features(self, data: pd.DataFrame, methods: List[str], symbol: str, interval: str) -> pd.DataFrame:
+        """Yöntem kombinasyonu başına feature store seti üzerinden hesapla"""
+        feature_set = "pipeline:" + "+".join(methods)
+        if feature_set not in feature_store.specs:
+            feature_store.register(feature_set, partial(_pipeline_features, methods=methods),
+                                   version=1, warmup=300)
+        previous = getattr(_active_pipeline, 'pipeline', None)
+        _active_pipeline.pipeline = self
         try:
-            result = data.copy()
-            
-            if 'close' in data.columns:
-                # Simple wavelet-like features using rolling differences
-                result['wavelet_diff_1'] = data['close'].diff()
-                result['wavelet_diff_2'] = data['close'].diff().diff()
-                
-                # Rolling wavelet-like features
-                result['wavelet_ma_5'] = data['close'].rolling(window=5).mean()
-                result['wavelet_ma_10'] = data['close'].rolling(window=10).mean()
-                result['wavelet_ratio'] = result['wavelet_ma_5'] / result['wavelet_ma_10']
-            
-            return result
-        
-        except Exception as e:
-            logger.error(f"Error creating wavelet features: {e}")
-            return data
+            return feature_store.materialize(symbol, interval, feature_set, data)
+        finally:
+            _active_pipeline.pipeline = previous
     
-    def engineer_features(self, data: pd.DataFrame, methods: List[str] = None) -> pd.DataFrame:
-        """Özellik mühendisliği uygula"""
+    def engineer_features(self, data: pd.DataFrame, methods: List[str] = None,
+                          symbol: Optional[str] = None, interval: str = "1d") -> pd.DataFrame:
+        """Özellik mühendisliği uygula (symbol verilirse feature store üzerinden)"""
         try:
             if methods is None:
                 methods = list(self.feature_methods.keys())
             
-            result = data.copy()
+            if symbol is not None:
+                result = self._stored_features(data, methods, symbol, interval)
+            else:
+                result = self._apply_methods(data, methods)
             
             for method in methods:
                 if method in self.feature_methods:
-                    logger.info(f"Applying {method} feature engineering")
-                    result = self.feature_methods[method](result)
-                    
                     # Engineered feature kaydet
                     engineered_feature = EngineeredFeature(
                         feature_id=f"ENG_{method}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
@@ -427,7 +643,7 @@ class FeatureEngineeringPipeline:
                     self.engineered_features[engineered_feature.feature_id] = engineered_feature
             
             # NaN değerleri temizle
-            result = result.fillna(method='ffill').fillna(method='bfill').fillna(0)
+            result = result.ffill().bfill().fillna(0)
             
             logger.info(f"Feature engineering completed. Original: {len(data.columns)}, Final: {len(result.columns)}")
             return result
@@ -541,30 +757,8 @@ class FeatureEngineeringPipeline:
                                      timeframes: List[str] = ["1m", "5m", "15m", "1h", "1d"]) -> pd.DataFrame:
         """Çoklu zaman dilimi özellikleri oluştur"""
         try:
-            result = data.copy()
-            
-            # Simüle edilmiş çoklu zaman dilimi verisi
-            for timeframe in timeframes:
-                # Her zaman dilimi için farklı rolling window'lar
-                if timeframe == "1m":
-                    windows = [1, 2, 3, 5]
-                elif timeframe == "5m":
-                    windows = [5, 10, 15, 20]
-                elif timeframe == "15m":
-                    windows = [15, 30, 45, 60]
-                elif timeframe == "1h":
-                    windows = [60, 120, 180, 240]
-                else:  # 1d
-                    windows = [240, 480, 720, 1440]
-                
-                for window in windows:
-                    if 'close' in data.columns:
-                        result[f'price_{timeframe}_{window}'] = data['close'].rolling(window=window).mean()
-                        result[f'volatility_{timeframe}_{window}'] = data['close'].rolling(window=window).std()
-                    
-                    if 'volume' in data.columns:
-                        result[f'volume_{timeframe}_{window}'] = data['volume'].rolling(window=window).mean()
-            
+            result = self._build(data, [partial(self._plan_multi_timeframe_features, timeframes=timeframes)],
+                                 "multi_timeframe")
             logger.info(f"Multi-timeframe features created for {len(timeframes)} timeframes")
             return result
         
@@ -625,7 +819,8 @@ class FeatureEngineeringPipeline:
                 "feature_types": {},
                 "engineering_methods": {},
                 "selection_methods": {},
-                "reduction_methods": {}
+                "reduction_methods": {},
+                "build_reports": dict(self.build_reports)
             }
             
             # Özellik tipleri
@@ -655,6 +850,16 @@ class FeatureEngineeringPipeline:
             return {}
 
 
+# Store kaydı örneğe bağlanmaz: hesap, materialize çağıran örnek üzerinden yapılır
+_active_pipeline = threading.local()
+
+
+def _pipeline_features(data: pd.DataFrame, methods: List[str]) -> pd.DataFrame:
+    """Feature store hesap fonksiyonu (build raporu çağıran pipeline'a yazılır)"""
+    pipeline = getattr(_active_pipeline, 'pipeline', None) or FeatureEngineeringPipeline()
+    return pipeline._apply_methods(data, methods)
+
+
 def test_feature_engineering_pipeline():
     """Feature Engineering Pipeline test fonksiyonu"""
     print("\n🧪 Feature Engineering Pipeline Test Başlıyor...")
@@ -14,7 +14,12 @@ import warnings
 import json
 import logging
 import random
+import ast
+import os
+import time
 from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 import re
@@ -23,6 +28,111 @@ import re
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sembolik ifadelerde izin verilen fonksiyon/sabitler (vektörel NumPy karşılıkları)
+_SAFE_FUNCTIONS = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'log': np.log, 'exp': np.exp, 'abs': np.abs,
+    'sqrt': np.sqrt, 'pi': np.pi, 'e': np.e
+}
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd
+)
+_COMMUTATIVE_OPS = (ast.Add, ast.Mult)
+
+
+def _canonical_node(node: ast.AST) -> ast.AST:
+    """Değişmeli operatörlerin operandlarını sıralayarak ağacı normalize et"""
+    if isinstance(node, ast.BinOp):
+        left, right = _canonical_node(node.left), _canonical_node(node.right)
+        if isinstance(node.op, _COMMUTATIVE_OPS) and ast.dump(left) > ast.dump(right):
+            left, right = right, left
+        return ast.BinOp(left=left, op=node.op, right=right)
+    if isinstance(node, ast.UnaryOp):
+        return ast.UnaryOp(op=node.op, operand=_canonical_node(node.operand))
+    if isinstance(node, ast.Call):
+        return ast.Call(func=node.func, args=[_canonical_node(a) for a in node.args], keywords=[])
+    return node
+
+
+@lru_cache(maxsize=4096)
+def canonicalize_expression(expression: str) -> str:
+    """'(b + a)' ve 'a+b' gibi eşdeğer yazımları tek anahtara indir"""
+    tree = ast.parse(expression, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"İzin verilmeyen ifade öğesi: {type(node).__name__}")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in _SAFE_FUNCTIONS):
+            raise ValueError("İzin verilmeyen fonksiyon çağrısı")
+    return ast.unparse(_canonical_node(tree.body))
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(expression: str) -> Callable[[Dict[str, Any]], Any]:
+    """
+    İfadeyi bir kez derleyip vektörel callable döndür
+
+    Dönen fonksiyon skaler ya da tüm feature sütunlarını (np.ndarray) alabilir.
+    """
+    code = compile(canonicalize_expression(expression), '<symbolic>', 'eval')
+
+    def _evaluate(variables: Dict[str, Any]) -> Any:
+        namespace = dict(_SAFE_FUNCTIONS)
+        namespace.update(variables)
+        with np.errstate(all='ignore'):
+            return eval(code, {"__builtins__": {}}, namespace)
+
+    return _evaluate
+
+
+def _expression_fitness(expression: str, columns: Dict[str, np.ndarray], target: np.ndarray) -> float:
+    """Tüm satırlar üzerinden fitness = 1 / (1 + MSE)"""
+    try:
+        prediction = np.broadcast_to(np.asarray(compile_expression(expression)(columns), dtype=float), target.shape)
+        if not np.all(np.isfinite(prediction)):
+            return 0.0
+        return float(1.0 / (1.0 + np.mean((prediction - target) ** 2)))
+    except Exception:
+        return 0.0
+
+
+# Process pool worker state: veri her worker'a bir kez gönderilir
+_WORKER_COLUMNS: Dict[str, np.ndarray] = {}
+_WORKER_TARGET: Optional[np.ndarray] = None
+
+
+def _init_fitness_worker(columns: Dict[str, np.ndarray], target: np.ndarray):
+    global _WORKER_COLUMNS, _WORKER_TARGET
+    _WORKER_COLUMNS = columns
+    _WORKER_TARGET = target
+
+
+def _evaluate_fitness_chunk(expressions: List[str]) -> List[float]:
+    return [_expression_fitness(expr, _WORKER_COLUMNS, _WORKER_TARGET) for expr in expressions]
+
+
+@lru_cache(maxsize=1024)
+def _strategy_base_fitness(entry_condition: str, exit_condition: str,
+                           position_sizing: str, risk_management: str) -> float:
+    """Stratejinin deterministik fitness kısmı (aynı kurallar tekrar hesaplanmaz)"""
+    fitness_score = 0.0
+    
+    # Entry/exit condition complexity (daha basit = daha iyi)
+    fitness_score += max(0, 10 - len(entry_condition.split()))
+    fitness_score += max(0, 10 - len(exit_condition.split()))
+    
+    # Risk management quality
+    if 'stop_loss' in risk_management.lower():
+        fitness_score += 5
+    if 'trailing' in risk_management.lower():
+        fitness_score += 3
+    
+    # Position sizing quality
+    if 'risk_per_trade' in position_sizing:
+        fitness_score += 3
+    
+    return fitness_score
+
 @dataclass
 class SymbolicConfig:
     """Sembolik AI konfigürasyonu"""
@@ -73,6 +183,12 @@ class GeneticProgrammingSymbolicAI:
         self.crossover_rate = 0.8
         self.elite_size = 10
         
+        # Paralel fitness değerlendirme (1 = seri)
+        self.n_jobs = max(1, (os.cpu_count() or 1) - 1)
+        self.parallel_min_population = 64
+        self.fitness_cache: Dict[str, float] = {}
+        self.fitness_cache_hits = 0
+        
         # Sembolik AI parametreleri
         self.max_expression_length = 50
         self.max_complexity = 20
@@ -182,18 +298,19 @@ class GeneticProgrammingSymbolicAI:
             }
         }
     
-    def create_symbolic_expression(self, complexity: int = 5) -> str:
+    def create_symbolic_expression(self, complexity: int = 5, variables: Optional[List[str]] = None) -> str:
         """Sembolik ifade oluştur"""
+        variables = variables or self.variables
         try:
             if complexity <= 0:
-                return random.choice(self.variables)
+                return random.choice(variables)
             
             # Rastgele operatör seç
             operator = random.choice(self.operators)
             
             if operator in ['sin', 'cos', 'tan', 'log', 'exp']:
                 # Unary operator
-                operand = self.create_symbolic_expression(complexity - 1)
+                operand = self.create_symbolic_expression(complexity - 1, variables)
                 return f"{operator}({operand})"
             
             elif operator in ['+', '-', '*', '/']:
@@ -201,42 +318,32 @@ class GeneticProgrammingSymbolicAI:
                 left_complexity = complexity // 2
                 right_complexity = complexity - left_complexity - 1
                 
-                left_operand = self.create_symbolic_expression(left_complexity)
-                right_operand = self.create_symbolic_expression(right_complexity)
+                left_operand = self.create_symbolic_expression(left_complexity, variables)
+                right_operand = self.create_symbolic_expression(right_complexity, variables)
                 
                 return f"({left_operand} {operator} {right_operand})"
             
             elif operator == '**':
                 # Power operator
                 base_complexity = complexity - 1
-                base = self.create_symbolic_expression(base_complexity)
+                base = self.create_symbolic_expression(base_complexity, variables)
                 exponent = random.choice([2, 3, 0.5])
                 
                 return f"({base} ** {exponent})"
             
             else:
                 # Fallback to variable
-                return random.choice(self.variables)
+                return random.choice(variables)
         
         except Exception as e:
             logger.error(f"Error creating symbolic expression: {e}")
-            return random.choice(self.variables)
+            return random.choice(variables)
     
     def evaluate_symbolic_expression(self, expression: str, variables: Dict[str, float]) -> float:
         """Sembolik ifadeyi değerlendir"""
         try:
-            # Güvenli eval için sadece matematiksel operatörlere izin ver
-            allowed_names = {
-                'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
-                'log': np.log, 'exp': np.exp, 'abs': np.abs,
-                'sqrt': np.sqrt, 'pi': np.pi, 'e': np.e
-            }
-            
-            # Variables ekle
-            allowed_names.update(variables)
-            
-            # Expression'ı değerlendir
-            result = eval(expression, {"__builtins__": {}}, allowed_names)
+            # Derlenmiş (önbellekli) ifade; sadece matematiksel operatörlere izin verilir
+            result = compile_expression(expression)(variables)
             
             # NaN ve infinity kontrolü
             if np.isnan(result) or np.isinf(result):
@@ -403,25 +510,10 @@ class GeneticProgrammingSymbolicAI:
         """Trading stratejisini değerlendir"""
         try:
             # Basit fitness hesaplama (gerçek implementasyonda daha karmaşık)
-            fitness_score = 0.0
-            
-            # Entry condition complexity
-            entry_complexity = len(strategy.entry_condition.split())
-            fitness_score += max(0, 10 - entry_complexity)  # Daha basit = daha iyi
-            
-            # Exit condition complexity
-            exit_complexity = len(strategy.exit_condition.split())
-            fitness_score += max(0, 10 - exit_complexity)
-            
-            # Risk management quality
-            if 'stop_loss' in strategy.risk_management.lower():
-                fitness_score += 5
-            if 'trailing' in strategy.risk_management.lower():
-                fitness_score += 3
-            
-            # Position sizing quality
-            if 'risk_per_trade' in strategy.position_sizing:
-                fitness_score += 3
+            fitness_score = _strategy_base_fitness(
+                strategy.entry_condition, strategy.exit_condition,
+                strategy.position_sizing, strategy.risk_management
+            )
             
             # Random component for diversity
             fitness_score += random.uniform(0, 2)
@@ -450,10 +542,12 @@ class GeneticProgrammingSymbolicAI:
             # Evolution loop
             best_fitness_history = []
             
+            empty_history = pd.DataFrame()
+            
             for generation in range(generations):
-                # Evaluate fitness
+                # Evaluate fitness (kural metinleri önbellekli, sadece rastgele bileşen yeniden hesaplanır)
                 for strategy in population:
-                    self.evaluate_trading_strategy(strategy, pd.DataFrame())
+                    self.evaluate_trading_strategy(strategy, empty_history)
                 
                 # Sort by fitness
                 population.sort(key=lambda x: x.fitness_score, reverse=True)
@@ -507,19 +601,69 @@ class GeneticProgrammingSymbolicAI:
             logger.error(f"Error running genetic algorithm: {e}")
             return []
     
+    def _evaluate_population_fitness(self, expressions: List[SymbolicExpression],
+                                     columns: Dict[str, np.ndarray], target: np.ndarray,
+                                     executor: Optional[ProcessPoolExecutor]):
+        """Bir nesli değerlendir: önbellekte olmayan ifadeler pool'a dağıtılır"""
+        keys = []
+        pending = {}
+        for expr in expressions:
+            try:
+                key = canonicalize_expression(expr.expression)
+            except (SyntaxError, ValueError):
+                key = None
+            keys.append(key)
+            if key is None:
+                continue
+            if key in self.fitness_cache:
+                self.fitness_cache_hits += 1
+            elif key not in pending:
+                pending[key] = expr.expression
+        
+        if pending:
+            unique = list(pending.values())
+            if executor is not None:
+                chunk_size = max(1, len(unique) // (self.n_jobs * 4))
+                chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+                scores = [score for chunk_scores in executor.map(_evaluate_fitness_chunk, chunks)
+                          for score in chunk_scores]
+            else:
+                scores = [_expression_fitness(e, columns, target) for e in unique]
+            self.fitness_cache.update(zip(pending.keys(), scores))
+        
+        for expr, key in zip(expressions, keys):
+            expr.fitness_score = self.fitness_cache.get(key, 0.0) if key is not None else 0.0
+    
     def perform_symbolic_regression(self, X: pd.DataFrame, y: pd.Series,
                                   config: SymbolicConfig) -> Dict[str, Any]:
         """Sembolik regresyon yap"""
+        executor = None
         try:
             max_depth = config.parameters['max_depth']
             population_size = config.parameters['population_size']
             generations = config.parameters['generations']
+            variable_names = list(X.columns)
+            
+            # Feature sütunları bir kez float dizilere çevrilir; ifadeler tüm satırlarda vektörel çalışır
+            columns = {col: X[col].to_numpy(dtype=float) for col in variable_names}
+            target = y.to_numpy(dtype=float)
+            
+            # Önbellek veri penceresine bağlı: yeni veri gelince sıfırla
+            self.fitness_cache = {}
+            self.fitness_cache_hits = 0
+            
+            if self.n_jobs > 1 and population_size >= self.parallel_min_population:
+                executor = ProcessPoolExecutor(
+                    max_workers=self.n_jobs,
+                    initializer=_init_fitness_worker,
+                    initargs=(columns, target)
+                )
             
             # Initial population of expressions
             expressions = []
             for i in range(population_size):
                 complexity = random.randint(1, max_depth)
-                expression_str = self.create_symbolic_expression(complexity)
+                expression_str = self.create_symbolic_expression(complexity, variable_names)
                 
                 symbolic_expr = SymbolicExpression(
                     expression_id=f"EXPR_{i}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
@@ -535,26 +679,11 @@ class GeneticProgrammingSymbolicAI:
             # Evolution loop
             best_expressions = []
             
+            start_time = time.perf_counter()
+            
             for generation in range(generations):
                 # Evaluate fitness
-                for expr in expressions:
-                    try:
-                        # Create variables dict
-                        variables = {}
-                        for i, col in enumerate(X.columns):
-                            variables[col] = X.iloc[0, i]  # Use first row for simplicity
-                        
-                        # Evaluate expression
-                        prediction = self.evaluate_symbolic_expression(expr.expression, variables)
-                        
-                        # Calculate fitness (simplified)
-                        if prediction != 0:
-                            expr.fitness_score = 1.0 / (1.0 + abs(prediction - y.iloc[0]))
-                        else:
-                            expr.fitness_score = 0.0
-                    
-                    except Exception as e:
-                        expr.fitness_score = 0.0
+                self._evaluate_population_fitness(expressions, columns, target, executor)
                 
                 # Sort by fitness
                 expressions.sort(key=lambda x: x.fitness_score, reverse=True)
@@ -573,7 +702,7 @@ class GeneticProgrammingSymbolicAI:
                     # Random selection and mutation
                     parent = random.choice(elite)
                     complexity = max(1, parent.complexity + random.randint(-1, 1))
-                    new_expr = self.create_symbolic_expression(complexity)
+                    new_expr = self.create_symbolic_expression(complexity, variable_names)
                     
                     symbolic_expr = SymbolicExpression(
                         expression_id=f"EXPR_NEW_{len(new_expressions)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
@@ -588,6 +717,8 @@ class GeneticProgrammingSymbolicAI:
                 
                 expressions = new_expressions[:population_size]
             
+            elapsed = time.perf_counter() - start_time
+            
             # Store best expressions
             for expr in best_expressions:
                 self.symbolic_expressions[expr.expression_id] = expr
@@ -597,12 +728,20 @@ class GeneticProgrammingSymbolicAI:
             return {
                 'best_expressions': best_expressions,
                 'generations': generations,
-                'population_size': population_size
+                'population_size': population_size,
+                'generations_per_sec': generations / elapsed if elapsed > 0 else 0.0,
+                'fitness_cache_size': len(self.fitness_cache),
+                'fitness_cache_hits': self.fitness_cache_hits,
+                'parallel_workers': self.n_jobs if executor is not None else 1
             }
         
         except Exception as e:
             logger.error(f"Error in symbolic regression: {e}")
             return {}
+        
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
     
     def get_symbolic_ai_summary(self) -> Dict[str, Any]:
         """Sembolik AI özeti getir"""
@@ -636,6 +775,40 @@ class GeneticProgrammingSymbolicAI:
             return {}
 
 
+def benchmark_symbolic_regression(population_sizes: Tuple[int, ...] = (100, 500, 2000),
+                                  n_rows: int = 5000, generations: int = 10,
+                                  n_jobs_options: Tuple[int, ...] = (1, 4)) -> List[Dict[str, Any]]:
+    """Sembolik regresyon generations/sec benchmark'ı"""
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame({f'feature{i}': rng.standard_normal(n_rows) for i in range(1, 6)})
+    y = pd.Series(np.sin(X['feature1']) + X['feature2'] * X['feature3'] + rng.normal(0, 0.1, n_rows))
+    
+    results = []
+    for population_size in population_sizes:
+        for n_jobs in n_jobs_options:
+            symbolic_ai = GeneticProgrammingSymbolicAI()
+            symbolic_ai.n_jobs = n_jobs
+            config = SymbolicConfig(
+                config_id="BENCHMARK",
+                name="Benchmark",
+                method_type="symbolic_regression",
+                parameters={'max_depth': 8, 'population_size': population_size, 'generations': generations},
+                constraints={},
+                created_at=datetime.now()
+            )
+            result = symbolic_ai.perform_symbolic_regression(X, y, config)
+            results.append({
+                'population_size': population_size,
+                'n_jobs': n_jobs,
+                'n_rows': n_rows,
+                'generations_per_sec': round(result.get('generations_per_sec', 0.0), 3),
+                'fitness_cache_hits': result.get('fitness_cache_hits', 0)
+            })
+            print(f"   📊 pop={population_size:5d} n_jobs={n_jobs}: "
+                  f"{results[-1]['generations_per_sec']:.2f} gen/s")
+    return results
+
+
 def test_genetic_programming_symbolic_ai():
     """Genetic Programming & Symbolic AI test fonksiyonu"""
     print("\n🧪 Genetic Programming & Symbolic AI Test Başlıyor...")
@@ -10,6 +10,13 @@ from typing import Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from swing_pattern_core import (HARMONIC_IDEALS, HARMONIC_SPECS, SwingCandidateGenerator,
+                                    best_per_key, find_swing_points)
+except ImportError:
+    from backend.swing_pattern_core import (HARMONIC_IDEALS, HARMONIC_SPECS, SwingCandidateGenerator,
+                                            best_per_key, find_swing_points)
+
 class HarmonicPatternDetector:
     """Harmonic pattern tespit edici - Accuracy boost için"""
     
@@ -41,19 +48,7 @@ class HarmonicPatternDetector:
         Returns:
             Tuple of swing highs and lows indices
         """
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(window, len(highs) - window):
-            # Swing high detection
-            if all(highs[i] >= highs[j] for j in range(i-window, i+window+1)):
-                swing_highs.append(i)
-            
-            # Swing low detection
-            if all(lows[i] <= lows[j] for j in range(i-window, i+window+1)):
-                swing_lows.append(i)
-        
-        return np.array(swing_highs), np.array(swing_lows)
+        return find_swing_points(highs, lows, window)
     
     def calculate_fibonacci_retracement(self, start_price: float, end_price: float, 
                                       ratio: float) -> float:
@@ -82,145 +77,68 @@ class HarmonicPatternDetector:
         - CD: 127.2-161.8% extension of BC
         - D: 78.6% retracement of XA
         """
-        patterns = []
-        swing_highs, swing_lows = self.find_swing_points(highs, lows)
+        return self._detect_harmonic_pattern('gartley', highs, lows)
+    
+    def _detect_harmonic_pattern(self, key: str, highs: np.ndarray, lows: np.ndarray,
+                                 generator: Optional[SwingCandidateGenerator] = None) -> List[Dict]:
+        """
+        Ortak XABCD aday üretici üzerinden pattern tespiti
         
-        # Need at least 5 swing points for Gartley
-        if len(swing_highs) < 3 or len(swing_lows) < 2:
-            return patterns
+        B/C/D binary search ile bulunur, oranlar tüm adaylar için vektörel
+        doğrulanır; aynı B-C-D bacaklarını paylaşan adaylardan en güvenilir olan kalır.
+        """
+        spec = HARMONIC_SPECS[key]
+        generator = generator or SwingCandidateGenerator(highs, lows)
+        found = generator.generate(spec)
+        if not len(found):
+            return []
         
-        # Look for potential Gartley patterns
-        for i in range(len(swing_highs) - 2):
-            for j in range(len(swing_lows) - 1):
-                # Point X (swing low)
-                x_idx = swing_lows[j]
-                x_price = lows[x_idx]
-                
-                # Point A (swing high)
-                a_idx = swing_highs[i]
-                a_price = highs[a_idx]
-                
-                # Point B (swing low after A)
-                b_candidates = [idx for idx in swing_lows if idx > a_idx]
-                if not b_candidates:
-                    continue
-                    
-                b_idx = b_candidates[0]
-                b_price = lows[b_idx]
-                
-                # Point C (swing high after B)
-                c_candidates = [idx for idx in swing_highs if idx > b_idx]
-                if not c_candidates:
-                    continue
-                    
-                c_idx = c_candidates[0]
-                c_price = highs[c_idx]
-                
-                # Point D (swing low after C)
-                d_candidates = [idx for idx in swing_lows if idx > c_idx]
-                if not d_candidates:
-                    continue
-                    
-                d_idx = d_candidates[0]
-                d_price = lows[d_idx]
-                
-                # Validate Gartley pattern ratios
-                if self._validate_gartley_ratios(x_price, a_price, b_price, c_price, d_price):
-                    pattern = {
-                        'pattern_type': 'Gartley',
-                        'points': {
-                            'X': {'index': x_idx, 'price': x_price, 'type': 'low'},
-                            'A': {'index': a_idx, 'price': a_price, 'type': 'high'},
-                            'B': {'index': b_idx, 'price': b_price, 'type': 'low'},
-                            'C': {'index': c_idx, 'price': c_price, 'type': 'high'},
-                            'D': {'index': d_idx, 'price': d_price, 'type': 'low'}
-                        },
-                        'confidence': self._calculate_gartley_confidence(x_price, a_price, b_price, c_price, d_price),
-                        'signal': 'BUY' if d_price < b_price else 'SELL',
-                        'target': self._calculate_gartley_target(x_price, a_price, b_price, c_price, d_price),
-                        'stop_loss': self._calculate_gartley_stop_loss(x_price, a_price, b_price, c_price, d_price)
-                    }
-                    patterns.append(pattern)
+        x, (a, b, c, d) = found.free_price, found.prices
+        confidence = self._harmonic_confidence(key, x, a, b, c, d)
+        keep = best_per_key(found.indices[1], confidence)
         
+        patterns = []
+        for row in keep:
+            xi, (ai, bi, ci, di) = found.free_index[row], [p[row] for p in found.indices]
+            xp, ap, bp, cp, dp = x[row], a[row], b[row], c[row], d[row]
+            patterns.append({
+                'pattern_type': spec.name,
+                'points': {
+                    'X': {'index': xi, 'price': xp, 'type': 'low'},
+                    'A': {'index': ai, 'price': ap, 'type': 'high'},
+                    'B': {'index': bi, 'price': bp, 'type': 'low'},
+                    'C': {'index': ci, 'price': cp, 'type': 'high'},
+                    'D': {'index': di, 'price': dp, 'type': 'low'}
+                },
+                'confidence': confidence[row],
+                'signal': 'BUY' if dp < bp else 'SELL',
+                'target': self._calculate_gartley_target(xp, ap, bp, cp, dp),
+                'stop_loss': self._calculate_gartley_stop_loss(xp, ap, bp, cp, dp)
+            })
         return patterns
     
-    def _validate_gartley_ratios(self, x_price: float, a_price: float, 
-                                b_price: float, c_price: float, d_price: float) -> bool:
-        """Gartley pattern oranlarını validate et"""
-        try:
-            # XA move
-            xa_move = a_price - x_price
-            
-            # AB retracement (should be 61.8%)
-            ab_move = a_price - b_price
+    def _harmonic_confidence(self, key: str, x: np.ndarray, a: np.ndarray, b: np.ndarray,
+                             c: np.ndarray, d: np.ndarray) -> np.ndarray:
+        """Güven skoru (0-100): ideal AB/AD oranından sapma, BC/CD aralık uyumu (vektörel)"""
+        ab_ideal, ad_ideal = HARMONIC_IDEALS[key]
+        spec = HARMONIC_SPECS[key]
+        bc_range, cd_range = spec.ratios[1], spec.ratios[2]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xa_move = a - x
+            ab_move = a - b
+            bc_move = c - b
             ab_ratio = ab_move / xa_move
-            if not self.is_within_tolerance(ab_ratio, 0.618, 0.08):
-                return False
-            
-            # BC retracement (should be 38.2-88.6%)
-            bc_move = c_price - b_price
             bc_ratio = bc_move / ab_move
-            if not (0.382 <= bc_ratio <= 0.886):
-                return False
-            
-            # CD extension (should be 127.2-161.8%)
-            cd_move = c_price - d_price
-            cd_ratio = cd_move / bc_move
-            if not (1.272 <= cd_ratio <= 1.618):
-                return False
-            
-            # D retracement (should be 78.6%)
-            d_retracement = (a_price - d_price) / xa_move
-            if not self.is_within_tolerance(d_retracement, 0.786, 0.08):
-                return False
-            
-            return True
+            cd_ratio = (c - d) / bc_move
+            d_ratio = (a - d) / xa_move
             
-        except ZeroDivisionError:
-            return False
-    
-    def _calculate_gartley_confidence(self, x_price: float, a_price: float,
-                                    b_price: float, c_price: float, d_price: float) -> float:
-        """Gartley pattern güven skorunu hesapla (0-100)"""
-        try:
-            confidence = 100.0
-            
-            # XA move validation
-            xa_move = a_price - x_price
-            if xa_move <= 0:
-                confidence -= 20
-            
-            # AB ratio accuracy
-            ab_move = a_price - b_price
-            ab_ratio = ab_move / xa_move
-            ab_error = abs(ab_ratio - 0.618) / 0.618
-            confidence -= ab_error * 50
-            
-            # BC ratio accuracy
-            bc_move = c_price - b_price
-            bc_ratio = bc_move / ab_move
-            if 0.382 <= bc_ratio <= 0.886:
-                confidence += 10
-            else:
-                confidence -= 20
-            
-            # CD ratio accuracy
-            cd_move = c_price - d_price
-            cd_ratio = cd_move / bc_move
-            if 1.272 <= cd_ratio <= 1.618:
-                confidence += 10
-            else:
-                confidence -= 20
-            
-            # D retracement accuracy
-            d_retracement = (a_price - d_price) / xa_move
-            d_error = abs(d_retracement - 0.786) / 0.786
-            confidence -= d_error * 50
-            
-            return max(0, min(100, confidence))
-            
-        except ZeroDivisionError:
-            return 0.0
+            confidence = np.full(len(x), 100.0)
+            confidence -= np.where(xa_move <= 0, 20, 0)
+            confidence -= np.abs(ab_ratio - ab_ideal) / ab_ideal * 50
+            confidence += np.where((bc_range.low <= bc_ratio) & (bc_ratio <= bc_range.high), 10, -20)
+            confidence += np.where((cd_range.low <= cd_ratio) & (cd_ratio <= cd_range.high), 10, -20)
+            confidence -= np.abs(d_ratio - ad_ideal) / ad_ideal * 50
+        return np.clip(np.nan_to_num(confidence, nan=0.0), 0, 100)
     
     def _calculate_gartley_target(self, x_price: float, a_price: float,
                                  b_price: float, c_price: float, d_price: float) -> float:
@@ -258,9 +176,7 @@ class HarmonicPatternDetector:
         - CD: 161.8-224% extension of BC
         - D: 127.2% extension of XA
         """
-        # Implementation similar to Gartley but with different ratios
-        # TODO: Implement Butterfly pattern detection
-        return []
+        return self._detect_harmonic_pattern('butterfly', highs, lows)
     
     def detect_bat_pattern(self, highs: np.ndarray, lows: np.ndarray, 
                           prices: np.ndarray) -> List[Dict]:
@@ -274,25 +190,29 @@ class HarmonicPatternDetector:
         - CD: 161.8-261.8% extension of BC
         - D: 88.6% retracement of XA
         """
-        # Implementation similar to Gartley but with different ratios
-        # TODO: Implement Bat pattern detection
-        return []
+        return self._detect_harmonic_pattern('bat', highs, lows)
+    
+    def detect_crab_pattern(self, highs: np.ndarray, lows: np.ndarray, 
+                           prices: np.ndarray) -> List[Dict]:
+        """
+        Crab Pattern tespit et
+        
+        Crab Pattern:
+        - XA: Initial move
+        - AB: 38.2-61.8% retracement of XA
+        - BC: 38.2-88.6% retracement of AB
+        - CD: 224-361.8% extension of BC
+        - D: 161.8% extension of XA
+        """
+        return self._detect_harmonic_pattern('crab', highs, lows)
     
     def detect_all_harmonic_patterns(self, highs: np.ndarray, lows: np.ndarray, 
                                    prices: np.ndarray) -> Dict[str, List[Dict]]:
         """Tüm harmonic pattern'leri tespit et"""
-        patterns = {}
-        
-        # Gartley patterns
-        patterns['gartley'] = self.detect_gartley_pattern(highs, lows, prices)
-        
-        # Butterfly patterns (TODO)
-        patterns['butterfly'] = self.detect_butterfly_pattern(highs, lows, prices)
-        
-        # Bat patterns (TODO)
-        patterns['bat'] = self.detect_bat_pattern(highs, lows, prices)
-        
-        return patterns
+        # Swing tespiti bir kez: tüm varyantlar aynı aday üreticiyi paylaşır
+        generator = SwingCandidateGenerator(highs, lows)
+        return {key: self._detect_harmonic_pattern(key, highs, lows, generator)
+                for key in ('gartley', 'butterfly', 'bat', 'crab')}
     
     def calculate_pattern_score(self, patterns: Dict[str, List[Dict]]) -> float:
         """Pattern'lerin toplam skorunu hesapla (0-100)"""
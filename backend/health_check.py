@@ -15,6 +15,11 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
+try:
+    from db.async_sqlite import get_database
+except ImportError:
+    from backend.db.async_sqlite import get_database
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -44,16 +49,14 @@ class HealthChecker:
     async def check_database(self) -> Dict[str, Any]:
         """Check database connectivity"""
         try:
-            # Try to connect to database
-            import sqlite3
-            conn = sqlite3.connect('bist_ai.db')
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            conn.close()
+            # Paylaşılan reader havuzu üzerinden; event loop bloklanmaz
+            start_time = time.time()
+            await get_database('bist_ai.db').fetchone("SELECT 1")
+            response_time = time.time() - start_time
             
             return {
                 "status": "healthy",
-                "response_time": 0.001,
+                "response_time": round(response_time, 4),
                 "error": None
             }
         except Exception as e:
@@ -274,7 +277,8 @@ class HealthChecker:
             
             return {
                 "timestamp": datetime.now().isoformat(),
-                "metrics": metrics
+                "metrics": metrics,
+                "database": get_database('bist_ai.db').get_stats()
             }
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -14,6 +14,8 @@ import json
 import os
 from pathlib import Path
 
+from indicator_library import calculate_rsi
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -343,12 +345,7 @@ class HistoricalAccuracyAnalyzer:
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """RSI hesapla"""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
+            return calculate_rsi(prices, period)
         except:
             return pd.Series([50] * len(prices))
     
@@ -0,0 +1,343 @@
+"""
+Indicator Library - Paylaşılan RSI / MACD / ATR çekirdeği
+
+İki mod:
+- Batch: pandas Series veya (zaman x sembol) DataFrame paneli üzerinde
+  vektörel hesap; tüm semboller tek çağrıda
+- Streaming: sembol başına O(1) durum, her yeni bar'da artımlı güncelleme
+  (canlı sinyal üretimi geçmişi yeniden hesaplamaz)
+
+Batch sonuçları (symbol, interval, indicator, params, son bar) anahtarıyla
+önbelleğe alınır; son bar anahtarı kapanış değerini de içerir (açık bar
+yerinde güncellenince önbellek bayatlamaz). Formüller repo genelindeki eski kopyalarla birebir aynıdır:
+RSI rolling ortalama kazanç/kayıp, MACD `ewm(span=...)` (adjust=True),
+ATR rolling ortalama true range.
+"""
+
+import copy
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+# Streaming mod pandas gerektirmez (pandas'sız çalışan websocket sunucuları)
+try:
+    import pandas as pd
+    Frame = Union[pd.Series, pd.DataFrame]
+except ImportError:
+    pd = None
+    Frame = Any
+
+
+# ----------------------------------------------------------------------
+# Batch mod (Series veya zaman x sembol paneli)
+# ----------------------------------------------------------------------
+def calculate_rsi(prices: Frame, period: int = 14) -> Frame:
+    """RSI: rolling ortalama kazanç / kayıp"""
+    delta = prices.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+def calculate_ema(prices: Frame, span: int) -> Frame:
+    return prices.ewm(span=span).mean()
+
+
+def calculate_macd(prices: Frame, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[Frame, Frame, Frame]:
+    """MACD çizgisi, sinyal çizgisi ve histogram"""
+    macd_line = calculate_ema(prices, fast) - calculate_ema(prices, slow)
+    signal_line = calculate_ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def calculate_true_range(high: Frame, low: Frame, close: Frame) -> Frame:
+    """max(H-L, |H-C₋₁|, |L-C₋₁|); ilk bar için yalnızca H-L"""
+    prev_close = close.shift(1)
+    return np.fmax(np.fmax(high - low, (high - prev_close).abs()), (low - prev_close).abs())
+
+
+def calculate_atr(high: Frame, low: Frame, close: Frame, period: int = 14) -> Frame:
+    """ATR: rolling ortalama true range"""
+    return calculate_true_range(high, low, close).rolling(window=period).mean()
+
+
+# ----------------------------------------------------------------------
+# Streaming mod (sembol başına O(1) durum)
+# ----------------------------------------------------------------------
+class StreamingEMA:
+    """pandas `ewm(span, adjust=True)` ile aynı sonucu veren artımlı EMA"""
+
+    __slots__ = ('decay', 'numerator', 'denominator')
+
+    def __init__(self, span: int):
+        self.decay = 1.0 - 2.0 / (span + 1.0)
+        self.numerator = 0.0
+        self.denominator = 0.0
+
+    def update(self, value: float) -> float:
+        self.numerator = value + self.decay * self.numerator
+        self.denominator = 1.0 + self.decay * self.denominator
+        return self.numerator / self.denominator
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.numerator / self.denominator if self.denominator else None
+
+
+class StreamingRSI:
+    """Rolling ortalama RSI; pencere toplamları her bar'da güncellenir"""
+
+    __slots__ = ('period', 'prev_price', 'gains', 'losses', 'gain_sum', 'loss_sum', 'value')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_price: Optional[float] = None
+        self.gains: Deque[float] = deque(maxlen=period)
+        self.losses: Deque[float] = deque(maxlen=period)
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, price: float) -> Optional[float]:
+        if self.prev_price is not None:
+            delta = price - self.prev_price
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            if len(self.gains) == self.period:
+                self.gain_sum -= self.gains[0]
+                self.loss_sum -= self.losses[0]
+            self.gains.append(gain)
+            self.losses.append(loss)
+            self.gain_sum += gain
+            self.loss_sum += loss
+            if len(self.gains) == self.period:
+                # Kayan toplamda birikebilecek küçük negatif kalıntıları sıfırla
+                gain_sum, loss_sum = max(self.gain_sum, 0.0), max(self.loss_sum, 0.0)
+                if loss_sum == 0:
+                    self.value = 100.0 if gain_sum > 0 else None
+                else:
+                    self.value = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+        self.prev_price = price
+        return self.value
+
+
+class StreamingMACD:
+    """Artımlı MACD (macd, signal, histogram)"""
+
+    __slots__ = ('fast', 'slow', 'signal', 'value')
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+        self.value: Optional[Tuple[float, float, float]] = None
+
+    def update(self, price: float) -> Tuple[float, float, float]:
+        macd_line = self.fast.update(price) - self.slow.update(price)
+        signal_line = self.signal.update(macd_line)
+        self.value = (macd_line, signal_line, macd_line - signal_line)
+        return self.value
+
+
+class StreamingATR:
+    """Rolling ortalama true range"""
+
+    __slots__ = ('period', 'prev_close', 'ranges', 'range_sum', 'value')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.ranges: Deque[float] = deque(maxlen=period)
+        self.range_sum = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        tr = high - low
+        if self.prev_close is not None:
+            tr = max(tr, abs(high - self.prev_close), abs(low - self.prev_close))
+        if len(self.ranges) == self.period:
+            self.range_sum -= self.ranges[0]
+        self.ranges.append(tr)
+        self.range_sum += tr
+        self.prev_close = close
+        if len(self.ranges) == self.period:
+            self.value = self.range_sum / self.period
+        return self.value
+
+
+class IndicatorState:
+    """Tek sembolün streaming indikatör durumu"""
+
+    __slots__ = ('rsi', 'macd', 'atr', 'last_bar', '_before_last')
+
+    def __init__(self, rsi_period: int = 14, macd_params: Tuple[int, int, int] = (12, 26, 9), atr_period: int = 14):
+        self.rsi = StreamingRSI(rsi_period)
+        self.macd = StreamingMACD(*macd_params)
+        self.atr = StreamingATR(atr_period)
+        self.last_bar: Any = None
+        self._before_last: Optional[tuple] = None
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None,
+               timestamp: Any = None) -> Dict[str, Any]:
+        """Yeni bar ekle; zaman damgası son bar ile aynıysa (açık bar) son bar'ı değiştir"""
+        high = close if high is None else high
+        low = close if low is None else low
+        if timestamp is not None:
+            if timestamp == self.last_bar and self._before_last is not None:
+                self.rsi, self.macd, self.atr = copy.deepcopy(self._before_last)
+            else:
+                self._before_last = copy.deepcopy((self.rsi, self.macd, self.atr))
+        self._apply(close, high, low, timestamp)
+        return self.snapshot()
+
+    def _apply(self, close: float, high: float, low: float, timestamp: Any = None):
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.atr.update(high, low, close)
+        self.last_bar = timestamp
+
+    def snapshot(self) -> Dict[str, Any]:
+        macd_value = self.macd.value or (None, None, None)
+        return {
+            'rsi': self.rsi.value,
+            'macd': macd_value[0],
+            'macd_signal': macd_value[1],
+            'macd_histogram': macd_value[2],
+            'atr': self.atr.value,
+            'last_bar': self.last_bar
+        }
+
+
+# ----------------------------------------------------------------------
+# Motor: memoize edilmiş batch + sembol başına streaming durum
+# ----------------------------------------------------------------------
+class IndicatorEngine:
+    """Paylaşılan indikatör motoru"""
+
+    def __init__(self, cache_size: int = 512):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @staticmethod
+    def _last_bar(*frames: Frame) -> tuple:
+        """Uzunluk, son zaman damgası ve son satır değerleri"""
+        data = frames[-1]
+        if not len(data):
+            return 0, None
+        values = tuple(np.asarray(frame.iloc[-1], dtype=float).tobytes() for frame in frames)
+        return len(data), data.index[-1], values
+
+    def _memoize(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return self._cache[key]
+            self.cache_misses += 1
+
+        result = compute()
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def calculate_rsi(self, prices: Frame, period: int = 14, symbol: Optional[str] = None, interval: str = '1d') -> Frame:
+        if symbol is None:
+            return calculate_rsi(prices, period)
+        key = (symbol, interval, 'rsi', (period,), self._last_bar(prices))
+        return self._memoize(key, lambda: calculate_rsi(prices, period))
+
+    def calculate_macd(self, prices: Frame, fast: int = 12, slow: int = 26, signal: int = 9,
+             symbol: Optional[str] = None, interval: str = '1d') -> Tuple[Frame, Frame, Frame]:
+        if symbol is None:
+            return calculate_macd(prices, fast, slow, signal)
+        key = (symbol, interval, 'macd', (fast, slow, signal), self._last_bar(prices))
+        return self._memoize(key, lambda: calculate_macd(prices, fast, slow, signal))
+
+    def calculate_atr(self, high: Frame, low: Frame, close: Frame, period: int = 14,
+            symbol: Optional[str] = None, interval: str = '1d') -> Frame:
+        if symbol is None:
+            return calculate_atr(high, low, close, period)
+        key = (symbol, interval, 'atr', (period,), self._last_bar(high, low, close))
+        return self._memoize(key, lambda: calculate_atr(high, low, close, period))
+
+    # ------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------
+    def state(self, symbol: str, interval: str = '1d') -> IndicatorState:
+        key = (symbol, interval)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states.setdefault(key, IndicatorState())
+        return state
+
+    def update(self, symbol: str, close: float, high: Optional[float] = None, low: Optional[float] = None,
+               timestamp: Any = None, interval: str = '1d') -> Dict[str, Any]:
+        """Yeni bar ile sembol durumunu O(1) güncelle (aynı zaman damgası son bar'ı günceller)"""
+        state = self.state(symbol, interval)
+        if timestamp is not None and state.last_bar is not None and timestamp < state.last_bar:
+            return state.snapshot()
+        return state.update(close, high, low, timestamp)
+
+    def seed(self, symbol: str, data: "pd.DataFrame", interval: str = '1d') -> Dict[str, Any]:
+        """Geçmiş OHLC ile streaming durumunu bir kez ısıt"""
+        state = IndicatorState()
+        highs = data['High'].to_numpy(dtype=float) if 'High' in data else data['Close'].to_numpy(dtype=float)
+        lows = data['Low'].to_numpy(dtype=float) if 'Low' in data else data['Close'].to_numpy(dtype=float)
+        bars = list(zip(data.index, data['Close'].to_numpy(dtype=float), highs, lows))
+        for ts, close, high, low in bars[:-1]:
+            state._apply(close, high, low, ts)
+        for ts, close, high, low in bars[-1:]:
+            # Son bar açık olabilir: geri alınabilir şekilde besle
+            state.update(close, high, low, ts)
+        self._states[(symbol, interval)] = state
+        return state.snapshot()
+
+    def sync(self, symbol: str, data: "pd.DataFrame", interval: str = '1d') -> Dict[str, Any]:
+        """
+        Streaming durumunu OHLC DataFrame'i ile eşitle
+
+        İlk çağrıda geçmiş bir kez işlenir; sonraki çağrılarda son işlenen bar
+        (yerinde güncellenmiş olabilir) ve sonrası beslenir (tick başına O(yeni bar)).
+        """
+        state = self._states.get((symbol, interval))
+        if state is None or state.last_bar is None or len(data) == 0:
+            return self.seed(symbol, data, interval)
+        if data.index[0] > state.last_bar:
+            # Süreklilik yok (farklı veri kaynağı/aralık): baştan ısıt
+            return self.seed(symbol, data, interval)
+        new_bars = data[data.index >= state.last_bar]
+        for ts, row in zip(new_bars.index, new_bars.itertuples(index=False)):
+            row = row._asdict()
+            state.update(row['Close'], row.get('High'), row.get('Low'), ts)
+        return state.snapshot()
+
+    def reset(self, symbol: Optional[str] = None):
+        with self._lock:
+            if symbol is None:
+                self._states.clear()
+                self._cache.clear()
+            else:
+                for key in [k for k in self._states if k[0] == symbol]:
+                    del self._states[key]
+                for key in [k for k in self._cache if k[0] == symbol]:
+                    del self._cache[key]
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._cache),
+            'streaming_symbols': len(self._states),
+            'hits': self.cache_hits,
+            'misses': self.cache_misses
+        }
+
+
+# Paylaşılan örnek
+indicator_engine = IndicatorEngine()
@@ -16,6 +16,9 @@ from typing import Dict, List, Tuple, Optional, Union, Any, Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import warnings
+
+from indicator_library import calculate_rsi
+
 warnings.filterwarnings('ignore')
 
 @dataclass
@@ -394,11 +397,7 @@ class InteractiveAnalysis:
     def _calculate_rsi(self, data: pd.DataFrame, window: int = 14, column: str = 'Close') -> pd.DataFrame:
         """RSI hesapla"""
         result = data.copy()
-        delta = result[column].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / loss
-        result[f'RSI_{window}'] = 100 - (100 / (1 + rs))
+        result[f'RSI_{window}'] = calculate_rsi(result[column], window)
         return result
     
     def _calculate_macd(self, data: pd.DataFrame, fast: int = 12, slow: int = 26, 
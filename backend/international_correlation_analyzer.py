@@ -13,6 +13,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 import yfinance as yf
 
+from correlation_engine import correlation_engine
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -207,23 +209,21 @@ class InternationalCorrelationAnalyzer:
                 logger.error(f"❌ {symbol} veri alınamadı")
                 return None
             
-            # Calculate correlations
-            correlations = {}
+            # Calculate correlations (tüm piyasalar tek maskeli moment hesabında)
+            turkish_returns = turkish_data['Close'].pct_change().dropna()
+            market_returns = {
+                market_name: market_data['Close'].pct_change().dropna()
+                for market_name, market_data in international_data.items()
+            }
             
-            for market_name, market_data in international_data.items():
-                try:
-                    # Use closing prices
-                    turkish_returns = turkish_data['Close'].pct_change().dropna()
-                    market_returns = market_data['Close'].pct_change().dropna()
-                    
-                    correlation = self.calculate_correlation(turkish_returns, market_returns)
-                    correlations[market_name] = correlation
-                    
-                    logger.info(f"   {market_name}: {correlation:.3f}")
-                    
-                except Exception as e:
-                    logger.error(f"❌ {market_name} korelasyon hatası: {e}")
-                    correlations[market_name] = 0.0
+            try:
+                correlations = correlation_engine.correlate_with(turkish_returns, market_returns, min_periods=10)
+            except Exception as e:
+                logger.error(f"❌ Korelasyon hatası: {e}")
+                correlations = {market_name: 0.0 for market_name in market_returns}
+            
+            for market_name, correlation in correlations.items():
+                logger.info(f"   {market_name}: {correlation:.3f}")
             
             # Analyze correlation strength
             avg_correlation = np.mean(list(correlations.values()))
@@ -338,7 +338,7 @@ class LightGBMPipeline:
             # Tahmin
             predictions = self.model.predict(features)
             
-            logger.info(f"✅ {len(features)} örnek için tahmin tamamlandı")
+            logger.debug(f"✅ {len(features)} örnek için tahmin tamamlandı")
             return predictions
             
         except Exception as e:
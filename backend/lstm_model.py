@@ -21,6 +21,8 @@ from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
 import warnings
 warnings.filterwarnings('ignore')
 
+from ai_models.sequence_builder import build_sequences, materialize
+
 # Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -83,17 +85,11 @@ class LSTMModel:
             features_scaled = self.scaler.fit_transform(features)
             
             # Sequence'ler oluştur
-            X, y = [], []
             sequence_length = self.params['sequence_length']
             
-            for i in range(sequence_length, len(features_scaled)):
-                # Input sequence
-                X.append(features_scaled[i-sequence_length:i])
-                # Target: bir sonraki close fiyatı
-                y.append(features_scaled[i, 3])  # Close price index = 3
-            
-            X = np.array(X)
-            y = np.array(y)
+            # Target: bir sonraki close fiyatı (Close price index = 3)
+            X, y = build_sequences(features_scaled, features_scaled[:, 3], sequence_length)
+            X = materialize(X)
             
             logger.info(f"✅ {len(X)} sequence oluşturuldu")
             logger.info(f"📊 X shape: {X.shape}, y shape: {y.shape}")
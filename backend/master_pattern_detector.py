@@ -25,8 +25,8 @@ except ImportError:
     print("⚠️ Pattern detector modules not found, using simulated versions")
     # Fallback to simulated detectors
     class HarmonicPatternDetector:
-        def detect_all_harmonic_patterns(self, highs, lows, prices):
-            return {'gartley': [], 'butterfly': [], 'bat': []}
+        def detect_gartley_pattern(self, highs, lows, prices):
+            return []
     
     class ButterflyPatternDetector:
         def detect_all_butterfly_patterns(self, highs, lows, prices):
@@ -118,9 +118,10 @@ class MasterPatternDetector:
         
         all_patterns = {}
         
-        # 1. Harmonic Patterns (Gartley, Butterfly, Bat)
+        # 1. Harmonic Patterns (Gartley; Butterfly/Bat kendi detektörlerinde skorlanır,
+        #    burada tekrar sayılmaz - harmonic_score gartley ağırlığını taşır)
         print("  📊 Detecting Harmonic Patterns...")
-        harmonic_patterns = self.harmonic_detector.detect_all_harmonic_patterns(highs, lows, prices)
+        harmonic_patterns = {'gartley': self.harmonic_detector.detect_gartley_pattern(highs, lows, prices)}
         all_patterns['harmonic'] = harmonic_patterns
         
         # 2. Butterfly Patterns
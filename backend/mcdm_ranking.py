@@ -10,16 +10,16 @@ from typing import Dict, List, Tuple, Optional, Any
 import logging
 from datetime import datetime, timedelta
 import yfinance as yf
-from sklearn.preprocessing import MinMaxScaler, RobustScaler
 import warnings
 import asyncio
 import gc
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from functools import lru_cache
 import json
 import os
-from dataclasses import dataclass, asdict
+import hashlib
+import threading
+from dataclasses import dataclass, asdict, field
 from collections import defaultdict, deque
 import sys
 
@@ -36,6 +36,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Karar matrisi sütun sırası ve tipleri (1: benefit, 0: cost)
+CRITERIA_COLUMNS = [
+    'net_profit_margin', 'roe', 'roa', 'gross_margin',
+    'current_ratio', 'quick_ratio', 'cash_ratio',
+    'debt_to_equity', 'debt_to_assets', 'interest_coverage'
+]
+CRITERIA_TYPES = np.array([1, 1, 1, 1, 1, 1, 1, 0, 0, 1])
+
 @dataclass
 class FinancialMetrics:
     """Optimized financial metrics structure"""
@@ -55,6 +63,14 @@ class FinancialMetrics:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
     
+    def as_row(self) -> List[float]:
+        """Karar matrisi satırı (CRITERIA_COLUMNS sırasıyla)"""
+        return [float(getattr(self, column)) for column in CRITERIA_COLUMNS]
+    
+    def fingerprint(self) -> str:
+        """Metrik değerlerinin özeti (timestamp hariç)"""
+        return hashlib.blake2b(np.asarray(self.as_row()).tobytes(), digest_size=8).hexdigest()
+    
     def validate(self) -> bool:
         """Validate financial metrics"""
         return all(
@@ -76,10 +92,29 @@ class RankingResult:
     score_change_7d: Optional[float] = None
     score_change_30d: Optional[float] = None
     volatility: Optional[float] = None
+    grey_grade: Optional[float] = None
     
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+@dataclass
+class MarketDecisionMatrix:
+    """
+    Pazar başına bellekte tutulan karar matrisi; yalnızca değişen satırlar güncellenir
+
+    Pazar matrisi o pazarda istenmiş tüm sembollerin birleşimidir; sıralama
+    isteğin sembollerine ait satırlardan oluşan görünüm üzerinde yapılır.
+    """
+    market: str
+    symbols: List[str] = field(default_factory=list)
+    values: np.ndarray = field(default_factory=lambda: np.empty((0, len(CRITERIA_COLUMNS))))
+    index: Dict[str, int] = field(default_factory=dict)
+    metrics: Dict[str, FinancialMetrics] = field(default_factory=dict)
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    fetched_at: Dict[str, float] = field(default_factory=dict)
+    fingerprint: str = ''
+    version: int = 0
+
 class OptimizedMCDMRanking:
     """
     Çok-Kriterli Finansal Sıralama - PRD v2.0 P0-2 (OPTIMIZED)
@@ -133,6 +168,12 @@ class OptimizedMCDMRanking:
         self.min_data_quality = 0.7  # Minimum data quality threshold
         self.max_retries = 3
         
+        # Pazar başına karar matrisi ve son sıralama (matris özeti ile)
+        self.metrics_ttl = 3600  # Sembol başına temel veri tazeleme süresi (sn)
+        self._matrices: Dict[str, MarketDecisionMatrix] = {}
+        self._market_rankings: Dict[str, Tuple[Any, Dict]] = {}
+        self._lock = threading.RLock()
+        
         # Load historical data if exists
         self._load_historical_data()
         
@@ -155,9 +196,8 @@ class OptimizedMCDMRanking:
         except Exception as e:
             logger.warning(f"Could not save historical data: {e}")
     
-    @lru_cache(maxsize=1000)
-    def _get_cached_financial_data(self, symbol: str) -> Optional[FinancialMetrics]:
-        """Get cached financial data with LRU cache"""
+    def _fetch_financial_data(self, symbol: str) -> Optional[FinancialMetrics]:
+        """Fetch financial data (önbellek: MarketDecisionMatrix)"""
         try:
             ticker = yf.Ticker(symbol)
             info = ticker.info
@@ -190,46 +230,110 @@ class OptimizedMCDMRanking:
             return None
     
     def _fetch_financial_data_parallel(self, symbols: List[str]) -> Dict[str, FinancialMetrics]:
-        """Fetch financial data in parallel with error handling"""
+        """Fetch financial data in parallel with bounded retries"""
         data = {}
-        failed_symbols = []
+        pending = list(symbols)
         
-        try:
-            # Submit tasks to thread pool
-            future_to_symbol = {
-                self.executor.submit(self._get_cached_financial_data, symbol): symbol
-                for symbol in symbols
-            }
-            
-            # Collect results with timeout
-            for future in as_completed(future_to_symbol, timeout=60):
-                symbol = future_to_symbol[future]
-                try:
-                    result = future.result(timeout=10)
-                    if result:
-                        data[symbol] = result
-                    else:
+        for attempt in range(self.max_retries):
+            failed_symbols = []
+            try:
+                # Submit tasks to thread pool
+                future_to_symbol = {
+                    self.executor.submit(self._fetch_financial_data, symbol): symbol
+                    for symbol in pending
+                }
+                
+                # Collect results with timeout
+                for future in as_completed(future_to_symbol, timeout=60):
+                    symbol = future_to_symbol[future]
+                    try:
+                        result = future.result(timeout=10)
+                        if result:
+                            data[symbol] = result
+                        else:
+                            failed_symbols.append(symbol)
+                    except Exception as e:
+                        logger.warning(f"Failed to fetch data for {symbol}: {e}")
                         failed_symbols.append(symbol)
-                except Exception as e:
-                    logger.warning(f"Failed to fetch data for {symbol}: {e}")
-                    failed_symbols.append(symbol)
-            
-            # Retry failed symbols
-            if failed_symbols and len(failed_symbols) < len(symbols) * 0.3:  # Less than 30% failed
-                retry_data = self._fetch_financial_data_parallel(failed_symbols)
-                data.update(retry_data)
-            
-        except Exception as e:
-            logger.error(f"Parallel data fetch error: {e}")
+                
+            except Exception as e:
+                logger.error(f"Parallel data fetch error: {e}")
+                failed_symbols = [symbol for symbol in pending if symbol not in data]
+            
+            # Yalnızca az sayıda başarısız sembol varsa tekrar dene (<%30)
+            if not failed_symbols or len(failed_symbols) >= len(pending) * 0.3:
+                break
+            pending = failed_symbols
         
         return data
     
+    def _refresh_decision_matrix(self, market: str, symbols: List[str]) -> MarketDecisionMatrix:
+        """
+        Pazarın karar matrisini tazele, istenen sembollerin görünümünü döndür
+        
+        Yalnızca TTL'i dolan/eksik semboller çekilir; özeti değişen satırlar
+        yerinde güncellenir, yeni semboller eklenir (istekte olmayanlar
+        korunur). Görünüm özeti değişmezse sıralama bellekten döner.
+        Çağıran self._lock'u tutmalıdır.
+        """
+        store = self._matrices.setdefault(market, MarketDecisionMatrix(market=market))
+        now = time.time()
+        
+        stale = [s for s in symbols if now - store.fetched_at.get(s, 0) > self.metrics_ttl]
+        changed_rows = {}
+        if stale:
+            fetched = self._fetch_financial_data_parallel(stale)
+            for symbol in stale:
+                # Başarısız semboller de TTL boyunca yeniden denenmez (eski satır korunur)
+                store.fetched_at[symbol] = now
+                metrics = fetched.get(symbol)
+                if metrics is None:
+                    continue
+                fingerprint = metrics.fingerprint()
+                store.metrics[symbol] = metrics
+                if store.fingerprints.get(symbol) != fingerprint:
+                    store.fingerprints[symbol] = fingerprint
+                    changed_rows[symbol] = metrics.as_row()
+            logger.info(f"{market}: {len(stale)} sembol tazelendi, {len(changed_rows)} satır değişti")
+        
+        if changed_rows:
+            added = {}
+            for symbol, row in changed_rows.items():
+                position = store.index.get(symbol)
+                if position is None:
+                    added[symbol] = row
+                else:
+                    store.values[position] = row
+            if added:
+                for symbol in added:
+                    store.index[symbol] = len(store.symbols)
+                    store.symbols.append(symbol)
+                store.values = np.vstack([store.values, np.array(list(added.values()), dtype=np.float64)])
+            store.version += 1
+        
+        valid_symbols = list(dict.fromkeys(s for s in symbols if s in store.index))
+        view = MarketDecisionMatrix(
+            market=market, symbols=valid_symbols,
+            values=store.values[[store.index[s] for s in valid_symbols]].reshape(len(valid_symbols), len(CRITERIA_COLUMNS)),
+            metrics=store.metrics, fingerprints=store.fingerprints, fetched_at=store.fetched_at,
+            version=store.version
+        )
+        view.index = {s: i for i, s in enumerate(valid_symbols)}
+        view.fingerprint = hashlib.blake2b(
+            '|'.join(f"{s}:{store.fingerprints[s]}" for s in valid_symbols).encode(), digest_size=16
+        ).hexdigest()
+        return view
+    
     def calculate_entropy_weights(self, data: pd.DataFrame) -> np.ndarray:
-        """Entropi yöntemi ile kriter ağırlıklarını hesapla (optimized)"""
+        """Entropi yöntemi ile kriter ağırlıklarını hesapla (tek matris işlemi)"""
         try:
-            # Use RobustScaler for better outlier handling
-            scaler = RobustScaler()
-            normalized_data = scaler.fit_transform(data)
+            values = np.asarray(data, dtype=np.float64)
+            n_alternatives, n_criteria = values.shape
+            
+            # Robust scaling (medyan / IQR) for better outlier handling
+            q25, median, q75 = np.percentile(values, [25, 50, 75], axis=0)
+            iqr = q75 - q25
+            normalized_data = (values - median) / np.where(iqr == 0, 1.0, iqr)
             
             # Avoid division by zero and handle edge cases
             normalized_data = np.where(
@@ -238,22 +342,15 @@ class OptimizedMCDMRanking:
                 normalized_data
             )
             
-            # Calculate entropy with numerical stability
-            n_criteria = normalized_data.shape[1]
-            entropy = np.zeros(n_criteria)
-            
-            for j in range(n_criteria):
-                column = normalized_data[:, j]
-                # Normalize to probabilities
-                pij = column / np.sum(column)
+            # Entropy for all criteria at once
+            with np.errstate(divide='ignore', invalid='ignore'):
+                pij = normalized_data / normalized_data.sum(axis=0)
                 pij = np.where(pij < 1e-10, 1e-10, pij)
+                entropy = -(pij * np.log(pij)).sum(axis=0) / np.log(n_alternatives)
                 
-                # Calculate entropy
-                entropy[j] = -np.sum(pij * np.log(pij)) / np.log(len(pij))
-            
-            # Calculate weights with validation
-            diversity = 1 - entropy
-            weights = diversity / np.sum(diversity)
+                # Calculate weights with validation
+                diversity = 1 - entropy
+                weights = diversity / diversity.sum()
             
             # Validate weights
             if np.any(np.isnan(weights)) or np.any(np.isinf(weights)):
@@ -287,26 +384,17 @@ class OptimizedMCDMRanking:
                 logger.error("Dimension mismatch in TOPSIS calculation")
                 return np.array([]), np.array([])
             
-            # Normalize decision matrix with numerical stability
-            normalized_matrix = np.zeros_like(data, dtype=np.float64)
+            # Normalize decision matrix (all columns at once)
+            values = np.asarray(data, dtype=np.float64)
+            benefit = np.asarray(criteria_types) == 1
             
-            for j in range(n_criteria):
-                column = data.iloc[:, j].values
-                
-                if criteria_types[j] == 1:  # Benefit criteria
-                    # Vector normalization with stability
-                    norm_factor = np.sqrt(np.sum(column**2))
-                    if norm_factor < 1e-10:
-                        norm_factor = 1e-10
-                    normalized_matrix[:, j] = column / norm_factor
-                else:  # Cost criteria
-                    # Min-max normalization for cost criteria
-                    min_val = np.min(column)
-                    max_val = np.max(column)
-                    if max_val - min_val < 1e-10:
-                        normalized_matrix[:, j] = 1.0
-                    else:
-                        normalized_matrix[:, j] = min_val / column
+            # Benefit: vector normalization, Cost: min / x
+            norm_factor = np.maximum(np.sqrt((values ** 2).sum(axis=0)), 1e-10)
+            col_min = values.min(axis=0)
+            flat = (values.max(axis=0) - col_min) < 1e-10
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cost_norm = np.where(flat, 1.0, col_min / values)
+            normalized_matrix = np.where(benefit, values / norm_factor, cost_norm)
             
             # Weighted normalized matrix
             weighted_matrix = normalized_matrix * weights
@@ -326,11 +414,10 @@ class OptimizedMCDMRanking:
                 return np.array([]), np.array([])
             
             # Check for zero or negative values in cost criteria
-            for j in range(n_criteria):
-                if criteria_types[j] == 0:  # Cost criteria
-                    if ideal_worst[j] <= 0:
-                        logger.warning(f"Invalid cost criteria value at index {j}, using fallback")
-                        ideal_worst[j] = 1e-10
+            invalid_cost = ~benefit & (ideal_worst <= 0)
+            if invalid_cost.any():
+                logger.warning(f"Invalid cost criteria value at index {np.flatnonzero(invalid_cost).tolist()}, using fallback")
+                ideal_worst = np.where(invalid_cost, 1e-10, ideal_worst)
             
             # Distance to ideal solutions with stability
             d_best = np.sqrt(np.sum((weighted_matrix - ideal_best)**2, axis=1))
@@ -355,168 +442,153 @@ class OptimizedMCDMRanking:
             logger.error(f"Grey TOPSIS calculation error: {e}")
             return np.array([]), np.array([])
     
-    def prepare_decision_matrix(self, symbols: List[str]) -> Tuple[pd.DataFrame, List[str], np.ndarray]:
-        """Karar matrisi hazırla (optimized)"""
+    @staticmethod
+    def grey_relational_grades(data: pd.DataFrame, weights: np.ndarray,
+                               criteria_types: np.ndarray, rho: float = 0.5) -> np.ndarray:
+        """
+        Grey relational grade (ideal diziye yakınlık), tek matris işlemi
+        
+        Min-max normalize (cost kriterleri ters), ideal = 1; katsayı
+        (Δmin + ρΔmax) / (Δ + ρΔmax), ağırlıklı ortalama ile derece.
+        """
+        values = np.asarray(data, dtype=np.float64)
+        if values.size == 0:
+            return np.array([])
+        col_min = values.min(axis=0)
+        span = values.max(axis=0) - col_min
+        span = np.where(span < 1e-10, 1.0, span)
+        scaled = (values - col_min) / span
+        scaled = np.where(np.asarray(criteria_types) == 1, scaled, 1.0 - scaled)
+        
+        delta = np.abs(1.0 - scaled)
+        delta_min, delta_max = delta.min(), delta.max()
+        if delta_max < 1e-10:
+            return np.ones(values.shape[0])
+        coefficients = (delta_min + rho * delta_max) / (delta + rho * delta_max)
+        return coefficients @ (np.asarray(weights) / np.sum(weights))
+    
+    def prepare_decision_matrix(self, symbols: List[str], market: str = 'CUSTOM') -> Tuple[pd.DataFrame, List[str], np.ndarray]:
+        """Karar matrisi hazırla (pazar matrisi üzerinden, yalnızca eskiyen semboller çekilir)"""
         try:
-            # Fetch financial data in parallel
-            financial_data = self._fetch_financial_data_parallel(symbols)
-            
-            if not financial_data:
-                logger.warning("No financial data available")
-                return pd.DataFrame(), [], np.array([])
-            
-            # Prepare data matrix
-            data_list = []
-            valid_symbols = []
-            
-            for symbol in symbols:
-                if symbol in financial_data:
-                    metrics = financial_data[symbol]
-                    data_list.append([
-                        metrics.net_profit_margin,
-                        metrics.roe,
-                        metrics.roa,
-                        metrics.gross_margin,
-                        metrics.current_ratio,
-                        metrics.quick_ratio,
-                        metrics.cash_ratio,
-                        metrics.debt_to_equity,
-                        metrics.debt_to_assets,
-                        metrics.interest_coverage
-                    ])
-                    valid_symbols.append(symbol)
-            
-            if not data_list:
-                logger.warning("No valid data for decision matrix")
-                return pd.DataFrame(), [], np.array([])
-            
-            # Create decision matrix with validation
-            decision_matrix = pd.DataFrame(
-                data_list, 
-                columns=[
-                    'net_profit_margin', 'roe', 'roa', 'gross_margin',
-                    'current_ratio', 'quick_ratio', 'cash_ratio',
-                    'debt_to_equity', 'debt_to_assets', 'interest_coverage'
-                ],
-                index=valid_symbols
-            )
-            
-            # Data quality check
-            data_quality = 1 - (decision_matrix.isnull().sum().sum() / (len(decision_matrix) * len(decision_matrix.columns)))
-            
-            if data_quality < self.min_data_quality:
-                logger.warning(f"Low data quality: {data_quality:.2f} < {self.min_data_quality}")
-            
-            # Handle missing values
-            decision_matrix = decision_matrix.fillna(0)
-            
-            # Additional data validation for BIST
-            logger.info(f"Decision matrix shape: {decision_matrix.shape}")
-            logger.info(f"Data quality: {data_quality:.2f}")
-            
-            # Check for zero or negative values that could cause TOPSIS issues
-            for col in decision_matrix.columns:
-                col_data = decision_matrix[col]
-                zero_count = (col_data == 0).sum()
-                negative_count = (col_data < 0).sum()
-                if zero_count > 0 or negative_count > 0:
-                    logger.warning(f"Column {col}: {zero_count} zeros, {negative_count} negatives")
-            
-            # Replace problematic values
-            decision_matrix = decision_matrix.replace([np.inf, -np.inf], 0)
-            decision_matrix = decision_matrix.clip(lower=1e-10)  # Ensure no zero values
-            
-            # Criteria types (1: benefit, 0: cost)
-            criteria_types = np.array([1, 1, 1, 1, 1, 1, 1, 0, 0, 1])
-            
-            return decision_matrix, valid_symbols, criteria_types
-            
+            with self._lock:
+                store = self._refresh_decision_matrix(market, symbols)
+                return self._decision_frame(store)
         except Exception as e:
             logger.error(f"Decision matrix preparation error: {e}")
             return pd.DataFrame(), [], np.array([])
     
+    def _decision_frame(self, store: MarketDecisionMatrix) -> Tuple[pd.DataFrame, List[str], np.ndarray]:
+        """Bellekteki matristen temizlenmiş karar matrisi"""
+        if not store.symbols:
+            logger.warning("No valid data for decision matrix")
+            return pd.DataFrame(), [], np.array([])
+        
+        values = store.values
+        
+        # Data quality check
+        data_quality = 1 - np.isnan(values).sum() / values.size
+        if data_quality < self.min_data_quality:
+            logger.warning(f"Low data quality: {data_quality:.2f} < {self.min_data_quality}")
+        
+        logger.info(f"Decision matrix shape: {values.shape}")
+        logger.info(f"Data quality: {data_quality:.2f}")
+        
+        # Check for zero or negative values that could cause TOPSIS issues
+        zero_counts = (values == 0).sum(axis=0)
+        negative_counts = (values < 0).sum(axis=0)
+        for j in np.flatnonzero(zero_counts + negative_counts):
+            logger.warning(f"Column {CRITERIA_COLUMNS[j]}: {zero_counts[j]} zeros, {negative_counts[j]} negatives")
+        
+        # Handle missing / problematic values, ensure no zero values
+        clean = np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0).clip(min=1e-10)
+        
+        decision_matrix = pd.DataFrame(clean, columns=CRITERIA_COLUMNS, index=store.symbols)
+        return decision_matrix, list(store.symbols), CRITERIA_TYPES
+    
     def calculate_ranking(self, symbols: List[str], market: str = 'BIST') -> Dict:
-        """Finansal sıralama hesapla (optimized)"""
+        """Finansal sıralama hesapla (matris özeti değişmediyse bellekten)"""
         try:
-            start_time = time.time()
-            
-            # Check cache first
-            cache_key = f"{market}_{len(symbols)}"
-            if cache_key in self.ranking_history:
-                last_update = self.last_update.get(cache_key, 0)
-                if time.time() - last_update < 3600:  # 1 hour cache
+            with self._lock:
+                start_time = time.time()
+                
+                store = self._refresh_decision_matrix(market, symbols)
+                
+                # Matris değişmediyse aynı sonuç
+                cached = self._market_rankings.get(market)
+                if cached is not None and store.symbols and cached[0] == store.fingerprint:
                     self.cache_hits += 1
-                    logger.info(f"Using cached ranking for {market}")
-                    return self.ranking_history[cache_key]
-            
-            self.cache_misses += 1
-            
-            # Prepare decision matrix
-            decision_matrix, valid_symbols, criteria_types = self.prepare_decision_matrix(symbols)
-            
-            if decision_matrix.empty:
-                logger.warning(f"{market} için veri bulunamadı")
-                return {}
-            
-            # Calculate entropy weights
-            weights = self.calculate_entropy_weights(decision_matrix)
-            
-            # Apply Grey TOPSIS
-            closeness, ranking = self.grey_topsis(
-                decision_matrix, 
-                weights, 
-                criteria_types
-            )
-            
-            if len(closeness) == 0:
-                logger.error(f"TOPSIS calculation failed for {market}")
-                return {}
-            
-            # Create results with enhanced information
-            results = {
-                'market': market,
-                'timestamp': datetime.now().isoformat(),
-                'total_symbols': len(valid_symbols),
-                'data_quality': 1 - (decision_matrix.isnull().sum().sum() / (len(decision_matrix) * len(decision_matrix.columns))),
-                'weights': weights.tolist(),
-                'ranking': []
-            }
-            
-            for i, rank_idx in enumerate(ranking):
-                symbol = valid_symbols[rank_idx]
-                score = closeness[rank_idx]
+                    return cached[1]
+                
+                self.cache_misses += 1
+                
+                # Prepare decision matrix
+                decision_matrix, valid_symbols, criteria_types = self._decision_frame(store)
                 
-                # Get financial data for details
-                financial_data = self._get_cached_financial_data(symbol)
+                if decision_matrix.empty:
+                    logger.warning(f"{market} için veri bulunamadı")
+                    return {}
                 
-                ranking_result = RankingResult(
-                    rank=i + 1,
-                    symbol=symbol,
-                    score=round(score, 4),
-                    market=market,
-                    financial_metrics=financial_data.to_dict() if financial_data else {},
-                    score_change_7d=self._calculate_score_change(symbol, market, 7),
-                    score_change_30d=self._calculate_score_change(symbol, market, 30),
-                    volatility=self._calculate_volatility(symbol, market)
+                # Calculate entropy weights
+                weights = self.calculate_entropy_weights(decision_matrix)
+                
+                # Apply Grey TOPSIS
+                closeness, ranking = self.grey_topsis(
+                    decision_matrix, 
+                    weights, 
+                    criteria_types
                 )
                 
-                results['ranking'].append(ranking_result.to_dict())
-            
-            # Store in history with cache management
-            self.ranking_history[cache_key] = results
-            self.last_update[cache_key] = time.time()
-            
-            # Clean up old cache entries
-            self._cleanup_cache()
-            
-            # Calculate processing time
-            processing_time = (time.time() - start_time)
-            logger.info(f"{market} sıralama tamamlandı: {processing_time:.2f}s")
-            
-            # Save historical data
-            self._save_historical_data()
-            
-            return results
+                if len(closeness) == 0:
+                    logger.error(f"TOPSIS calculation failed for {market}")
+                    return {}
+                
+                grey_grades = self.grey_relational_grades(decision_matrix, weights, criteria_types)
+                
+                # Create results with enhanced information
+                results = {
+                    'market': market,
+                    'timestamp': datetime.now().isoformat(),
+                    'total_symbols': len(valid_symbols),
+                    'data_quality': float(1 - np.isnan(store.values).sum() / store.values.size),
+                    'weights': weights.tolist(),
+                    'ranking': []
+                }
+                
+                for i, rank_idx in enumerate(ranking):
+                    symbol = valid_symbols[rank_idx]
+                    financial_data = store.metrics.get(symbol)
+                    
+                    ranking_result = RankingResult(
+                        rank=i + 1,
+                        symbol=symbol,
+                        score=round(float(closeness[rank_idx]), 4),
+                        market=market,
+                        financial_metrics=financial_data.to_dict() if financial_data else {},
+                        score_change_7d=self._calculate_score_change(symbol, market, 7),
+                        score_change_30d=self._calculate_score_change(symbol, market, 30),
+                        volatility=self._calculate_volatility(symbol, market),
+                        grey_grade=round(float(grey_grades[rank_idx]), 4)
+                    )
+                    
+                    results['ranking'].append(ranking_result.to_dict())
+                
+                # Store in history with cache management
+                cache_key = f"{market}_{len(symbols)}"
+                self.ranking_history[cache_key] = results
+                self.last_update[cache_key] = time.time()
+                self._market_rankings[market] = (store.fingerprint, results)
+                
+                # Clean up old cache entries
+                self._cleanup_cache()
+                
+                # Calculate processing time
+                processing_time = (time.time() - start_time)
+                logger.info(f"{market} sıralama tamamlandı: {processing_time:.2f}s")
+                
+                # Save historical data
+                self._save_historical_data()
+                
+                return results
             
         except Exception as e:
             logger.error(f"{market} sıralama hatası: {e}")
@@ -570,7 +642,7 @@ class OptimizedMCDMRanking:
     def get_combined_ranking(self) -> Dict:
         """BIST + ABD birleşik sıralama (optimized)"""
         try:
-            # Get individual rankings
+            # Get individual rankings (bellekteki pazar hesaplamaları paylaşılır)
             bist_results = self.get_bist_ranking()
             us_results = self.get_us_ranking()
             
@@ -578,6 +650,11 @@ class OptimizedMCDMRanking:
                 logger.warning("Individual rankings not available for combined ranking")
                 return {}
             
+            key = (self._market_rankings['BIST'][0], self._market_rankings['US'][0])
+            cached = self._market_rankings.get('COMBINED')
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            
             # Combine rankings efficiently
             combined_ranking = []
             
@@ -591,7 +668,8 @@ class OptimizedMCDMRanking:
                     'financial_metrics': item['financial_metrics'],
                     'score_change_7d': item.get('score_change_7d'),
                     'score_change_30d': item.get('score_change_30d'),
-                    'volatility': item.get('volatility')
+                    'volatility': item.get('volatility'),
+                    'grey_grade': item.get('grey_grade')
                 })
             
             # Add US stocks
@@ -604,7 +682,8 @@ class OptimizedMCDMRanking:
                     'financial_metrics': item['financial_metrics'],
                     'score_change_7d': item.get('score_change_7d'),
                     'score_change_30d': item.get('score_change_30d'),
-                    'volatility': item.get('volatility')
+                    'volatility': item.get('volatility'),
+                    'grey_grade': item.get('grey_grade')
                 })
             
             # Sort by score efficiently
@@ -614,13 +693,15 @@ class OptimizedMCDMRanking:
             for i, item in enumerate(combined_ranking):
                 item['rank'] = i + 1
             
-            return {
+            results = {
                 'market': 'COMBINED',
                 'timestamp': datetime.now().isoformat(),
                 'total_symbols': len(combined_ranking),
                 'data_quality': min(bist_results.get('data_quality', 0), us_results.get('data_quality', 0)),
                 'ranking': combined_ranking
             }
+            self._market_rankings['COMBINED'] = (key, results)
+            return results
             
         except Exception as e:
             logger.error(f"Combined ranking error: {e}")
@@ -719,6 +800,7 @@ class OptimizedMCDMRanking:
             'cache_misses': self.cache_misses,
             'cache_hit_rate': round(self.cache_hits / max(self.cache_hits + self.cache_misses, 1) * 100, 2),
             'total_rankings': len(self.ranking_history),
+            'matrix_versions': {market: store.version for market, store in self._matrices.items()},
             'last_update': {k: datetime.fromtimestamp(v).isoformat() for k, v in self.last_update.items()},
             'memory_usage_mb': sum(sys.getsizeof(v) for v in self.ranking_history.values()) / 1024 / 1024
         }
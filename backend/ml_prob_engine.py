@@ -15,6 +15,11 @@ from sklearn.calibration import CalibratedClassifierCV
 from sklearn.metrics import roc_auc_score, brier_score_loss
 from sklearn.model_selection import TimeSeriesSplit
 
+try:
+    from core.feature_store import feature_store
+except ImportError:
+    from backend.core.feature_store import feature_store
+
 
 def fetch(symbol: str, period: str = "2y", interval: str = "1d", use_mock: bool = False) -> pd.DataFrame:
     """Download OHLCV with yfinance; fallback to mock if requested/failed."""
@@ -74,20 +79,8 @@ def _mock_prices(n_days: int = 520, seed: int = 42) -> pd.DataFrame:
     return df
 
 
-def make_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Enhanced feature engineering with robust data cleaning - PRD v2.0 compliant."""
-    
-    # PRD v2.0: MultiIndex columns fix
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
-        print("🔧 MultiIndex columns fixed")
-    
-    # Ensure required columns exist
-    required_cols = ['Close', 'High', 'Low', 'Volume']
-    missing_cols = [col for col in required_cols if col not in df.columns]
-    if missing_cols:
-        raise ValueError(f"Missing required columns: {missing_cols}")
-    
+def raw_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Causal indicator block (row t uses bars up to t only); stored by the feature store."""
     c = df['Close'].astype(float)
     h = df['High'].astype(float)
     l = df['Low'].astype(float)
@@ -127,6 +120,36 @@ def make_features(df: pd.DataFrame) -> pd.DataFrame:
     out['high_52w'] = h.rolling(252).max()
     out['low_52w'] = l.rolling(252).min()
     out['price_position'] = (c - out['low_52w']) / (out['high_52w'] - out['low_52w'])
+    return out
+
+
+# EMA200 (alpha = 2/201) kuyruk hatası (199/201)^n: rtol 1e-6 için ~1300 bar gerekir
+feature_store.register('ml_prob', raw_features, version=1, warmup=1400, cumulative=('obv',),
+                       description='ml_prob_engine.make_features indicator block')
+
+
+def make_features(df: pd.DataFrame, symbol: Optional[str] = None, interval: str = "1d") -> pd.DataFrame:
+    """Enhanced feature engineering with robust data cleaning - PRD v2.0 compliant.
+
+    With a symbol the indicator block comes from the feature store (computed once,
+    appended incrementally); cleaning below runs on the requested window as before.
+    """
+    
+    # PRD v2.0: MultiIndex columns fix
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+        print("🔧 MultiIndex columns fixed")
+    
+    # Ensure required columns exist
+    required_cols = ['Close', 'High', 'Low', 'Volume']
+    missing_cols = [col for col in required_cols if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"Missing required columns: {missing_cols}")
+    
+    if symbol is not None:
+        out = feature_store.materialize(symbol, interval, 'ml_prob', df)
+    else:
+        out = raw_features(df)
     
     # PRD v2.0: Robust data cleaning
     out = out.replace([np.inf, -np.inf], np.nan)
@@ -491,7 +514,7 @@ def test_calibration_quality(y_true: pd.Series, y_pred: np.ndarray) -> float:
 def prob_up(symbol: str, horizon: int = 1, use_mock: bool = False, use_meta: bool = True) -> Optional[Dict]:
     """Get probability of price increase with enhanced labeling."""
     df = fetch(symbol, use_mock=use_mock)
-    feats = make_features(df)
+    feats = make_features(df, symbol=None if use_mock else symbol)
     
     if feats.empty:
         return None
@@ -1,13 +1,26 @@
 #!/usr/bin/env python3
 """
 Prometheus Metrics for BIST AI Smart Trader
+- HTTP metrikleri route şablonuyla etiketlenir (/api/price/{symbol}), ham path ile değil
+- Endpoint etiket sayısı sınırlıdır; sistem metrikleri arka planda örneklenir
 """
 
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from contextlib import contextmanager
+from typing import Optional
+import os
+import threading
 import time
 import psutil
 import logging
 
+from fastapi.routing import APIRoute
+
+try:
+    from monitoring.request_timing import RequestTimings, record_route, timed_endpoint
+except ImportError:
+    from backend.monitoring.request_timing import RequestTimings, record_route, timed_endpoint
+
 logger = logging.getLogger(__name__)
 
 # Metrics tanımları
@@ -23,6 +36,25 @@ REQUEST_DURATION = Histogram(
     ['method', 'endpoint']
 )
 
+REQUESTS_IN_FLIGHT = Gauge(
+    'http_requests_in_flight',
+    'HTTP requests currently being served',
+    ['method']
+)
+
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes',
+    'HTTP response size in bytes',
+    ['method', 'endpoint'],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+)
+
+REQUEST_PHASE_DURATION = Histogram(
+    'http_request_phase_seconds',
+    'Request latency breakdown: handler, executor pools, serialization',
+    ['endpoint', 'phase']
+)
+
 ACTIVE_CONNECTIONS = Gauge(
     'active_connections',
     'Number of active connections'
@@ -50,22 +82,86 @@ MEMORY_USAGE = Gauge(
     'Memory usage in bytes'
 )
 
+PROCESS_MEMORY = Gauge(
+    'process_resident_memory_sampled_bytes',
+    'Resident memory of the API process in bytes'
+)
+
 ERROR_COUNT = Counter(
     'errors_total',
     'Total errors',
     ['error_type', 'endpoint']
 )
 
+UNMATCHED_ENDPOINT = '__unmatched__'
+OVERFLOW_ENDPOINT = '__other__'
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that records handler and total route time for the latency breakdown"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Bağımlılık analizi bittikten sonra sarılır; imza/annotation çözümü etkilenmez
+        self.dependant.call = timed_endpoint(self.dependant.call)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            start = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                record_route(time.perf_counter() - start)
+        return timed_handler
+
+
 class MetricsCollector:
     """Prometheus metrics collector"""
     
-    def __init__(self):
+    def __init__(self, max_endpoints: int = None, sample_interval: float = None):
         self.start_time = time.time()
+        self.process = psutil.Process()
+        self.max_endpoints = max_endpoints or int(os.getenv('METRICS_MAX_ENDPOINTS', 500))
+        self.sample_interval = sample_interval or float(os.getenv('METRICS_SAMPLE_INTERVAL', 15))
+        self._endpoints = set()
+        self._endpoints_lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+        self._sampler_stop = threading.Event()
+    
+    def endpoint_label(self, scope: dict) -> str:
+        """Eşleşen route şablonu; eşleşmeyen path'ler ve limit aşımı tek etikette toplanır"""
+        path = getattr(scope.get('route'), 'path', None)
+        if path is None:
+            return UNMATCHED_ENDPOINT
+        if path in self._endpoints:
+            return path
+        with self._endpoints_lock:
+            if len(self._endpoints) >= self.max_endpoints:
+                return OVERFLOW_ENDPOINT
+            self._endpoints.add(path)
+        return path
+    
+    @contextmanager
+    def track_in_flight(self, method: str):
+        gauge = REQUESTS_IN_FLIGHT.labels(method=method)
+        gauge.inc()
+        try:
+            yield
+        finally:
+            gauge.dec()
         
-    def track_request(self, method: str, endpoint: str, status_code: int, duration: float):
+    def track_request(self, method: str, endpoint: str, status_code: int, duration: float,
+                      response_size: Optional[int] = None, timings: Optional[RequestTimings] = None):
         """HTTP request tracking"""
         REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=str(status_code)).inc()
         REQUEST_DURATION.labels(method=method, endpoint=endpoint).observe(duration)
+        if response_size is not None:
+            RESPONSE_SIZE.labels(method=method, endpoint=endpoint).observe(response_size)
+        if timings is not None:
+            for phase, seconds in timings.phases():
+                REQUEST_PHASE_DURATION.labels(endpoint=endpoint, phase=phase).observe(seconds)
         
     def track_prediction(self, model_name: str, symbol: str, accuracy: float = None):
         """Prediction tracking"""
@@ -89,23 +185,51 @@ class MetricsCollector:
             MEMORY_USAGE.set(memory.used)
             
             # Process specific metrics
-            process = psutil.Process()
-            process_memory = process.memory_info().rss
+            PROCESS_MEMORY.set(self.process.memory_info().rss)
             
         except Exception as e:
             logger.error(f"System metrics update error: {e}")
     
+    def start_system_sampler(self):
+        """psutil örneklemesi scrape yolundan çıkarılır; arka planda sabit aralıkla"""
+        if self._sampler is not None and self._sampler.is_alive():
+            return
+        self._sampler_stop.clear()
+        
+        def loop():
+            while not self._sampler_stop.is_set():
+                self.update_system_metrics()
+                self._sampler_stop.wait(self.sample_interval)
+        
+        self._sampler = threading.Thread(target=loop, name='metrics-sampler', daemon=True)
+        self._sampler.start()
+    
+    def stop_system_sampler(self):
+        self._sampler_stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=1)
+            self._sampler = None
+    
     def get_metrics(self) -> str:
         """Prometheus metrics string"""
-        self.update_system_metrics()
+        self.start_system_sampler()
         return generate_latest()
 
 # Global metrics instance
 metrics_collector = MetricsCollector()
 
-def track_request(method: str, endpoint: str, status_code: int, duration: float):
+def track_request(method: str, endpoint: str, status_code: int, duration: float,
+                  response_size: Optional[int] = None, timings: Optional[RequestTimings] = None):
     """Global request tracking function"""
-    metrics_collector.track_request(method, endpoint, status_code, duration)
+    metrics_collector.track_request(method, endpoint, status_code, duration, response_size, timings)
+
+def track_in_flight(method: str):
+    """Context manager for the in-flight gauge"""
+    return metrics_collector.track_in_flight(method)
+
+def endpoint_label(scope: dict) -> str:
+    """Bounded route-template label for a request scope"""
+    return metrics_collector.endpoint_label(scope)
 
 def track_prediction(model_name: str, symbol: str, accuracy: float = None):
     """Global prediction tracking function"""
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Request timing breakdown for BIST AI Smart Trader
+
+Per-request phases, bound to the request through a context variable:
+- handler: time inside the endpoint function
+- executor: time spent waiting on thread/process pools (subset of handler)
+- serialization: route time outside the handler (validation + response encoding)
+
+Recording outside a request context is a no-op, so library code can
+call record_executor() unconditionally.
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from functools import partial, wraps
+from typing import Any, Callable, Optional, Tuple
+
+
+@dataclass
+class RequestTimings:
+    handler: float = 0.0
+    executor: float = 0.0
+    route: float = 0.0
+
+    @property
+    def serialization(self) -> float:
+        return max(0.0, self.route - self.handler)
+
+    def phases(self):
+        """(phase, seconds) pairs for phases that were observed"""
+        if self.route <= 0.0:
+            return []
+        return [
+            ('handler', self.handler),
+            ('executor', self.executor),
+            ('serialization', self.serialization),
+        ]
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar('request_timings', default=None)
+
+
+def begin_request() -> Tuple[RequestTimings, Token]:
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token: Token):
+    _current.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def record_executor(seconds: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.executor += seconds
+
+
+def record_handler(seconds: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.handler += seconds
+
+
+def record_route(seconds: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.route += seconds
+
+
+async def run_in_executor(executor, fn: Callable, *args, **kwargs) -> Any:
+    """loop.run_in_executor that counts the wait towards the executor phase"""
+    start = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(fn, *args, **kwargs))
+    finally:
+        record_executor(time.perf_counter() - start)
+
+
+def timed_endpoint(fn: Callable) -> Callable:
+    """Wrap an endpoint callable so its run time is recorded as the handler phase"""
+    if asyncio.iscoroutinefunction(fn):
+        @wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                record_handler(time.perf_counter() - start)
+        return async_wrapper
+
+    @wraps(fn)
+    def sync_wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record_handler(time.perf_counter() - start)
+    return sync_wrapper
@@ -1,14 +1,23 @@
 """
 Push Bildirim Kuyruk Yöneticisi
 FCM, Email, Telegram, Discord webhook'larını kuyrukla ve stabilize et
+
+- Kanal başına async worker'lar (sınırlı eşzamanlılık): yavaş SMTP diğer
+  kanalları bekletmez
+- Öncelik şeritleri: kritik risk uyarıları kuyruğun önüne geçer
+- Kanal destekliyorsa batch gönderim (FCM multicast)
+- Aynı sembol için bekleyen uyarıların birleştirilmesi (coalescing)
+- Backpressure metrikleri: kuyruk derinliği, en eski mesajın yaşı
 """
 
 import asyncio
+import itertools
 import logging
-import queue
+import random
 import threading
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import time
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 import json
 import requests
@@ -16,6 +25,15 @@ from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Öncelik sırası (küçük değer önce işlenir)
+PRIORITY_RANKS = {
+    'critical': 0,
+    'urgent': 0,
+    'high': 1,
+    'normal': 2,
+    'low': 3
+}
+
 @dataclass
 class NotificationMessage:
     """Bildirim mesajı"""
@@ -23,12 +41,78 @@ class NotificationMessage:
     body: str
     data: Dict[str, Any]
     channels: List[str]  # ['fcm', 'email', 'telegram', 'discord']
-    priority: str = 'normal'  # 'low', 'normal', 'high', 'urgent'
+    priority: str = 'normal'  # 'low', 'normal', 'high', 'urgent', 'critical'
     timestamp: datetime = None
     
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
+    
+    @property
+    def rank(self) -> int:
+        return PRIORITY_RANKS.get(self.priority, PRIORITY_RANKS['normal'])
+    
+    def coalesce_key(self) -> Optional[Tuple]:
+        """Aynı sembol + sinyal türü için bekleyen mesajlar birleştirilir"""
+        symbol = (self.data or {}).get('symbol')
+        if not symbol:
+            return None
+        return (symbol, (self.data or {}).get('signal') or (self.data or {}).get('alert_type') or self.title)
+
+@dataclass
+class _QueuedMessage:
+    """Kanal kuyruğundaki (güncellenebilir) kayıt"""
+    message: NotificationMessage
+    enqueued_at: float
+    coalesce_key: Optional[Tuple] = None
+    coalesced: int = 0
+    cancelled: bool = False
+
+@dataclass
+class ChannelState:
+    """Kanal başına kuyruk, eşzamanlılık ve metrikler"""
+    name: str
+    concurrency: int
+    batch_size: int = 1
+    queue: Optional[asyncio.PriorityQueue] = None
+    pending: Dict[Tuple, _QueuedMessage] = field(default_factory=dict)
+    live: Dict[int, _QueuedMessage] = field(default_factory=dict)
+    sent: int = 0
+    failed: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    batches: int = 0
+    in_flight: int = 0
+    max_latency_ms: float = 0.0
+
+class LocalChannel:
+    """
+    Yük testi için yerel kanal: ağ yerine gecikme simüle eder ve mesajları
+    kaydeder. Batch destekliyorsa tek çağrıda birden fazla mesaj alır.
+    """
+    
+    def __init__(self, name: str, latency_ms: float = 50.0, failure_rate: float = 0.0,
+                 batch_latency_ms: float = None, keep_messages: bool = False):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.batch_latency_ms = latency_ms if batch_latency_ms is None else batch_latency_ms
+        self.failure_rate = failure_rate
+        self.keep_messages = keep_messages
+        self.delivered = 0
+        self.calls = 0
+        self.messages: List[NotificationMessage] = []
+        self._lock = threading.Lock()
+    
+    def __call__(self, messages: List[NotificationMessage]):
+        latency = self.latency_ms if len(messages) == 1 else self.batch_latency_ms
+        time.sleep(latency / 1000.0)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise ConnectionError(f"{self.name} simüle hata")
+        with self._lock:
+            self.calls += 1
+            self.delivered += len(messages)
+            if self.keep_messages:
+                self.messages.extend(messages)
 
 class NotificationQueueManager:
     """Bildirim kuyruk yöneticisi"""
@@ -36,36 +120,58 @@ class NotificationQueueManager:
     def __init__(self, max_workers: int = 4, max_queue_size: int = 1000):
         self.max_workers = max_workers
         self.max_queue_size = max_queue_size
-        self.notification_queue = queue.Queue(maxsize=max_queue_size)
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.executor: Optional[ThreadPoolExecutor] = None
         self.running = False
-        self.worker_threads = []
+        
+        # Ayrı thread'de çalışan event loop (senkron çağıranlar için thread-safe giriş)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._workers: List[asyncio.Task] = []
+        self._sequence = itertools.count()
         
         # Kanal konfigürasyonları
         self.channel_configs = {
             'fcm': {
                 'enabled': True,
                 'server_key': None,  # FCM server key
-                'url': 'https://fcm.googleapis.com/fcm/send'
+                'url': 'https://fcm.googleapis.com/fcm/send',
+                'concurrency': 8,
+                'batch_size': 500  # FCM multicast üst sınırı
             },
             'email': {
                 'enabled': True,
                 'smtp_server': 'smtp.gmail.com',
                 'smtp_port': 587,
                 'username': None,
-                'password': None
+                'password': None,
+                'concurrency': 2,
+                'batch_size': 1
             },
             'telegram': {
                 'enabled': True,
                 'bot_token': None,
-                'chat_id': None
+                'chat_id': None,
+                'concurrency': 4,
+                'batch_size': 1
             },
             'discord': {
                 'enabled': True,
-                'webhook_url': None
+                'webhook_url': None,
+                'concurrency': 4,
+                'batch_size': 10  # Discord: mesaj başına 10 embed
             }
         }
         
+        # Kanal göndericileri: mesaj listesi alan senkron fonksiyonlar (executor'da çalışır)
+        self.senders: Dict[str, Callable[[List[NotificationMessage]], None]] = {
+            'fcm': self._send_fcm_batch,
+            'email': self._each(self._send_email),
+            'telegram': self._each(self._send_telegram),
+            'discord': self._send_discord_batch
+        }
+        
+        self.channels: Dict[str, ChannelState] = {}
+        
         # İstatistikler
         self.stats = {
             'total_sent': 0,
@@ -74,25 +180,52 @@ class NotificationQueueManager:
             'active_workers': 0
         }
     
+    @staticmethod
+    def _each(send: Callable[[NotificationMessage], None]) -> Callable[[List[NotificationMessage]], None]:
+        def _send_all(messages: List[NotificationMessage]):
+            for message in messages:
+                send(message)
+        return _send_all
+    
     def start(self):
         """Kuyruk yöneticisini başlat"""
         if self.running:
             logger.warning("⚠️ Notification queue manager zaten çalışıyor")
             return
         
+        # Her kanal worker'ının bloklayan gönderimi için bir thread
+        total_workers = sum(max(1, int(c.get('concurrency', 1))) for c in self.channel_configs.values())
+        self.executor = ThreadPoolExecutor(max_workers=max(self.max_workers, total_workers),
+                                           thread_name_prefix="NotificationSender")
+        
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        
+        def _run_loop():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._start_workers())
+            ready.set()
+            self._loop.run_forever()
+        
+        self._loop_thread = threading.Thread(target=_run_loop, name="NotificationLoop", daemon=True)
+        self._loop_thread.start()
+        ready.wait(timeout=5)
         self.running = True
         
-        # Worker thread'leri başlat
-        for i in range(self.max_workers):
-            worker_thread = threading.Thread(
-                target=self._worker_loop,
-                name=f"NotificationWorker-{i}",
-                daemon=True
+        total = sum(state.concurrency for state in self.channels.values())
+        logger.info(f"✅ Notification queue manager başlatıldı ({total} kanal worker'ı)")
+    
+    async def _start_workers(self):
+        for name, config in self.channel_configs.items():
+            state = ChannelState(
+                name=name,
+                concurrency=max(1, int(config.get('concurrency', 1))),
+                batch_size=max(1, int(config.get('batch_size', 1))),
+                queue=asyncio.PriorityQueue()
             )
-            worker_thread.start()
-            self.worker_threads.append(worker_thread)
-        
-        logger.info(f"✅ Notification queue manager başlatıldı ({self.max_workers} worker)")
+            self.channels[name] = state
+            for i in range(state.concurrency):
+                self._workers.append(asyncio.create_task(self._channel_worker(state), name=f"{name}-worker-{i}"))
     
     def stop(self):
         """Kuyruk yöneticisini durdur"""
@@ -101,68 +234,144 @@ class NotificationQueueManager:
         
         self.running = False
         
-        # Worker thread'leri bekle
-        for thread in self.worker_threads:
-            thread.join(timeout=5)
+        async def _cancel():
+            for task in self._workers:
+                task.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers.clear()
+        
+        asyncio.run_coroutine_threadsafe(_cancel(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
         
         self.executor.shutdown(wait=True)
         logger.info("🛑 Notification queue manager durduruldu")
     
-    def _worker_loop(self):
-        """Worker thread döngüsü"""
-        while self.running:
-            try:
-                # Kuyruktan mesaj al
-                message = self.notification_queue.get(timeout=1)
-                if message is None:
-                    continue
-                
-                # Mesajı işle
-                self._process_message(message)
-                
-                # Kuyruk işaretini temizle
-                self.notification_queue.task_done()
-                
-            except queue.Empty:
+    # ------------------------------------------------------------------
+    # Kuyruklama
+    # ------------------------------------------------------------------
+    def _enqueue(self, message: NotificationMessage) -> bool:
+        """Mesajı kanal kuyruklarına ekle (loop thread'inde çalışır)"""
+        accepted = False
+        key = message.coalesce_key()
+        for channel in message.channels:
+            state = self.channels.get(channel)
+            if state is None or not self.channel_configs[channel]['enabled']:
                 continue
-            except Exception as e:
-                logger.error(f"❌ Worker loop hatası: {e}")
-    
-    def _process_message(self, message: NotificationMessage):
-        """Mesajı işle ve gönder"""
-        try:
-            self.stats['active_workers'] += 1
             
-            # Her kanal için mesaj gönder
-            for channel in message.channels:
-                if channel in self.channel_configs and self.channel_configs[channel]['enabled']:
-                    try:
-                        self._send_to_channel(channel, message)
-                        self.stats['total_sent'] += 1
-                    except Exception as e:
-                        logger.error(f"❌ {channel} kanalına gönderim hatası: {e}")
-                        self.stats['total_failed'] += 1
+            # Bekleyen aynı uyarı varsa birleştir; öncelik hiçbir zaman düşmez
+            if key is not None and key in state.pending:
+                entry = state.pending[key]
+                entry.coalesced += 1
+                state.coalesced += 1
+                if message.rank < entry.message.rank:
+                    # Daha yüksek öncelik: eski kaydı iptal edip öne al
+                    entry.cancelled = True
+                    del state.live[id(entry)]
+                    entry = _QueuedMessage(message, entry.enqueued_at, key, entry.coalesced)
+                    state.pending[key] = entry
+                    state.live[id(entry)] = entry
+                    state.queue.put_nowait((message.rank, next(self._sequence), entry))
+                elif message.rank == entry.message.rank:
+                    entry.message = message
+                else:
+                    # Daha düşük öncelik: bekleyen (ör. kritik) mesaj korunur, yeni data eksik alanları tamamlar
+                    entry.message = replace(entry.message, data={**message.data, **entry.message.data})
+                accepted = True
+                continue
             
-            # İstatistikleri güncelle
-            self.stats['queue_size'] = self.notification_queue.qsize()
+            # Backpressure: dolu kuyruk yalnızca kritik mesajları kabul eder
+            if len(state.live) >= self.max_queue_size and message.rank > 0:
+                state.dropped += 1
+                continue
             
-        except Exception as e:
-            logger.error(f"❌ Mesaj işleme hatası: {e}")
-        finally:
-            self.stats['active_workers'] -= 1
+            entry = _QueuedMessage(message, time.monotonic(), key)
+            if key is not None:
+                state.pending[key] = entry
+            state.live[id(entry)] = entry
+            state.queue.put_nowait((message.rank, next(self._sequence), entry))
+            accepted = True
+        return accepted
+    
+    async def enqueue(self, message: NotificationMessage) -> bool:
+        """Async çağıranlar için kuyruklama"""
+        if asyncio.get_running_loop() is self._loop:
+            return self._enqueue(message)
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._enqueue_async(message), self._loop))
+    
+    async def _enqueue_async(self, message: NotificationMessage) -> bool:
+        return self._enqueue(message)
     
-    def _send_to_channel(self, channel: str, message: NotificationMessage):
-        """Belirli kanala mesaj gönder"""
-        if channel == 'fcm':
-            self._send_fcm(message)
-        elif channel == 'email':
-            self._send_email(message)
-        elif channel == 'telegram':
-            self._send_telegram(message)
-        elif channel == 'discord':
-            self._send_discord(message)
+    # ------------------------------------------------------------------
+    # Kanal worker'ları
+    # ------------------------------------------------------------------
+    def _take(self, state: ChannelState, entry: _QueuedMessage):
+        state.live.pop(id(entry), None)
+        if entry.coalesce_key is not None and state.pending.get(entry.coalesce_key) is entry:
+            del state.pending[entry.coalesce_key]
     
-    def _send_fcm(self, message: NotificationMessage):
+    async def _channel_worker(self, state: ChannelState):
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, entry = await state.queue.get()
+            if entry.cancelled:
+                continue
+            self._take(state, entry)
+            batch = [entry]
+            
+            # Batch destekleyen kanallarda aynı öncelikteki bekleyenleri topla
+            while len(batch) < state.batch_size and not state.queue.empty():
+                rank, seq, nxt = state.queue.get_nowait()
+                if nxt.cancelled:
+                    continue
+                if rank != entry.message.rank:
+                    state.queue.put_nowait((rank, seq, nxt))
+                    break
+                self._take(state, nxt)
+                batch.append(nxt)
+            
+            messages = [e.message for e in batch]
+            state.in_flight += len(batch)
+            self.stats['active_workers'] += 1
+            try:
+                await loop.run_in_executor(self.executor, self.senders[state.name], messages)
+                state.sent += len(batch)
+                state.batches += 1
+                self.stats['total_sent'] += len(batch)
+                now = time.monotonic()
+                state.max_latency_ms = max(state.max_latency_ms,
+                                           max((now - e.enqueued_at) * 1000 for e in batch))
+            except Exception as e:
+                logger.error(f"❌ {state.name} kanalına gönderim hatası: {e}")
+                state.failed += len(batch)
+                self.stats['total_failed'] += len(batch)
+            finally:
+                state.in_flight -= len(batch)
+                self.stats['active_workers'] -= 1
+    
+    def _send_fcm_batch(self, messages: List[NotificationMessage]):
+        """FCM multicast: başlık, gövde ve data'sı aynı mesajlar tek istekte birden fazla cihaza"""
+        config = self.channel_configs['fcm']
+        if not config['server_key']:
+            logger.warning("⚠️ FCM server key yok")
+            return
+        
+        # Token'ı olan aynı içerikli mesajları grupla (token hariç data da aynı olmalı), diğerleri topic'e
+        groups: Dict[Tuple[str, str, str], List[NotificationMessage]] = {}
+        for message in messages:
+            if not message.data.get('fcm_token'):
+                self._send_fcm(message)
+                continue
+            data = {k: v for k, v in message.data.items() if k != 'fcm_token'}
+            key = (message.title, message.body, json.dumps(data, sort_keys=True, default=str))
+            groups.setdefault(key, []).append(message)
+        
+        for group in groups.values():
+            self._send_fcm(group[0], registration_ids=[m.data['fcm_token'] for m in group])
+    
+    def _send_fcm(self, message: NotificationMessage, registration_ids: List[str] = None):
         """FCM push notification gönder"""
         config = self.channel_configs['fcm']
         if not config['server_key']:
@@ -175,13 +384,18 @@ class NotificationQueueManager:
         }
         
         payload = {
-            'to': '/topics/trading_signals',
             'notification': {
                 'title': message.title,
                 'body': message.body
             },
             'data': message.data
         }
+        if registration_ids:
+            # Alıcı token'ları adreslemede; tek bir kullanıcının token'ı payload'a girmez
+            payload['data'] = {k: v for k, v in message.data.items() if k != 'fcm_token'}
+            payload['registration_ids'] = registration_ids
+        else:
+            payload['to'] = '/topics/trading_signals'
         
         response = requests.post(config['url'], headers=headers, json=payload, timeout=10)
         response.raise_for_status()
@@ -240,13 +454,7 @@ class NotificationQueueManager:
         
         logger.info(f"✅ Telegram bildirimi gönderildi: {message.title}")
     
-    def _send_discord(self, message: NotificationMessage):
-        """Discord webhook gönder"""
-        config = self.channel_configs['discord']
-        if not config['webhook_url']:
-            logger.warning("⚠️ Discord webhook URL eksik")
-            return
-        
+    def _discord_embed(self, message: NotificationMessage) -> Dict[str, Any]:
         # Discord embed formatı
         embed = {
             'title': message.title,
@@ -263,19 +471,31 @@ class NotificationQueueManager:
                 'value': str(value),
                 'inline': True
             })
+        return embed
+    
+    def _send_discord(self, message: NotificationMessage):
+        """Discord webhook gönder"""
+        self._send_discord_batch([message])
+    
+    def _send_discord_batch(self, messages: List[NotificationMessage]):
+        """Discord webhook gönder (istek başına 10 embed'e kadar)"""
+        config = self.channel_configs['discord']
+        if not config['webhook_url']:
+            logger.warning("⚠️ Discord webhook URL eksik")
+            return
         
         payload = {
-            'embeds': [embed]
+            'embeds': [self._discord_embed(message) for message in messages]
         }
         
         response = requests.post(config['webhook_url'], json=payload, timeout=10)
         response.raise_for_status()
         
-        logger.info(f"✅ Discord bildirimi gönderildi: {message.title}")
+        logger.info(f"✅ Discord bildirimi gönderildi: {len(messages)} mesaj")
     
     def queue_notification(self, title: str, body: str, data: Dict[str, Any], 
                           channels: List[str] = None, priority: str = 'normal'):
-        """Bildirim kuyruğa ekle"""
+        """Bildirim kuyruğa ekle (thread-safe, bloklamaz)"""
         if not self.running:
             logger.warning("⚠️ Notification queue manager çalışmıyor")
             return False
@@ -286,27 +506,71 @@ class NotificationQueueManager:
         message = NotificationMessage(
             title=title,
             body=body,
-            data=data,
+            data=data or {},
             channels=channels,
             priority=priority
         )
         
         try:
-            self.notification_queue.put(message, timeout=5)
-            logger.info(f"✅ Bildirim kuyruğa eklendi: {title}")
-            return True
-        except queue.Full:
-            logger.error(f"❌ Bildirim kuyruğu dolu: {title}")
+            future = asyncio.run_coroutine_threadsafe(self._enqueue_async(message), self._loop)
+            accepted = future.result(timeout=5)
+        except Exception as e:
+            logger.error(f"❌ Bildirim kuyruğa eklenemedi: {title} ({e})")
             return False
+        
+        if accepted:
+            logger.debug(f"✅ Bildirim kuyruğa eklendi: {title}")
+        else:
+            logger.error(f"❌ Bildirim kuyruğu dolu: {title}")
+        return accepted
+    
+    def queue_risk_alert(self, title: str, body: str, data: Dict[str, Any], channels: List[str] = None):
+        """Kritik risk uyarısı: tüm kuyrukların önüne geçer"""
+        return self.queue_notification(title, body, data, channels, priority='critical')
+    
+    def get_channel_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Kanal başına backpressure metrikleri"""
+        now = time.monotonic()
+        metrics = {}
+        for name, state in list(self.channels.items()):
+            live = state.live.copy().values()
+            oldest = min((e.enqueued_at for e in live), default=None)
+            metrics[name] = {
+                'queue_depth': len(live),
+                'oldest_message_age_sec': round(now - oldest, 3) if oldest is not None else 0.0,
+                'in_flight': state.in_flight,
+                'concurrency': state.concurrency,
+                'batch_size': state.batch_size,
+                'sent': state.sent,
+                'failed': state.failed,
+                'coalesced': state.coalesced,
+                'dropped': state.dropped,
+                'batches': state.batches,
+                'max_latency_ms': round(state.max_latency_ms, 1)
+            }
+        return metrics
     
     def get_stats(self) -> Dict[str, Any]:
         """İstatistikleri döndür"""
+        channels = self.get_channel_metrics()
         return {
             **self.stats,
-            'queue_size': self.notification_queue.qsize(),
+            'queue_size': sum(c['queue_depth'] for c in channels.values()),
+            'channels': channels,
             'running': self.running
         }
     
+    def use_local_channels(self, latency_ms: Dict[str, float] = None, failure_rate: float = 0.0,
+                           keep_messages: bool = False) -> Dict[str, LocalChannel]:
+        """Gerçek kanalları yük testi için yerel kanallarla değiştir"""
+        latency_ms = latency_ms or {'fcm': 80.0, 'email': 400.0, 'telegram': 60.0, 'discord': 60.0}
+        channels = {}
+        for name in self.channel_configs:
+            channels[name] = LocalChannel(name, latency_ms.get(name, 50.0), failure_rate,
+                                          keep_messages=keep_messages)
+            self.senders[name] = channels[name]
+        return channels
+    
     def configure_channel(self, channel: str, config: Dict[str, Any]):
         """Kanal konfigürasyonunu güncelle"""
         if channel in self.channel_configs:
@@ -315,5 +579,44 @@ class NotificationQueueManager:
         else:
             logger.warning(f"⚠️ Bilinmeyen kanal: {channel}")
 
+def benchmark_notification_queue(n_messages: int = 2000, n_symbols: int = 50,
+                                 critical_every: int = 100) -> Dict[str, Any]:
+    """Yerel kanallarla sinyal patlaması (piyasa açılışı) yük testi"""
+    manager = NotificationQueueManager()
+    local = manager.use_local_channels()
+    manager.start()
+    
+    critical_sent_at = []
+    start = time.perf_counter()
+    for i in range(n_messages):
+        symbol = f"SYM{i % n_symbols}"
+        if critical_every and i % critical_every == 0:
+            manager.queue_risk_alert(f"Risk {symbol}", "Stop seviyesi aşıldı", {'symbol': symbol, 'alert_type': 'risk'})
+            critical_sent_at.append(time.perf_counter())
+        else:
+            manager.queue_notification(f"Sinyal {symbol}", "BUY", {'symbol': symbol, 'signal': 'BUY', 'seq': i})
+    enqueue_elapsed = time.perf_counter() - start
+    peak = manager.get_channel_metrics()
+    
+    # Kuyruklar boşalana kadar bekle
+    while any(m['queue_depth'] or m['in_flight'] for m in manager.get_channel_metrics().values()):
+        time.sleep(0.05)
+    drain_elapsed = time.perf_counter() - start
+    final = manager.get_channel_metrics()
+    manager.stop()
+    
+    result = {
+        'messages': n_messages,
+        'enqueue_per_sec': round(n_messages / enqueue_elapsed) if enqueue_elapsed > 0 else 0,
+        'drain_seconds': round(drain_elapsed, 2),
+        'peak_queue_depth': {name: m['queue_depth'] for name, m in peak.items()},
+        'delivered': {name: ch.delivered for name, ch in local.items()},
+        'channel_calls': {name: ch.calls for name, ch in local.items()},
+        'coalesced': {name: m['coalesced'] for name, m in final.items()},
+        'max_latency_ms': {name: m['max_latency_ms'] for name, m in final.items()}
+    }
+    logger.info(f"📊 Notification queue benchmark: {result}")
+    return result
+
 # Global instance
 notification_manager = NotificationQueueManager()
@@ -0,0 +1,218 @@
+"""
+Options Pricing - Vektörel Black-Scholes çekirdeği
+
+- S/K/T/σ dizileri broadcast edilir; fiyat ve tüm Greeks tek çağrıda
+- Implied volatility: vektörel Newton, braket dışına çıkan adımlarda bisection
+- Strateji P&L eğrileri (fiyat x bacak) broadcast ile tek geçişte
+
+Greeks ölçekleri OptionsGreeks.calculate_greeks ile aynıdır:
+theta günlük (/365), vega ve rho %1 başına (/100).
+"""
+
+import time
+from typing import Dict, Iterable, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.special import ndtr
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def _is_call(option_type: Union[str, ArrayLike]) -> np.ndarray:
+    """'call'/'put' (tekil veya dizi) ya da bool dizisi -> bool maske"""
+    if isinstance(option_type, str):
+        return np.asarray(option_type.lower() == 'call')
+    arr = np.asarray(option_type)
+    if arr.dtype == bool:
+        return arr
+    return np.char.lower(arr.astype(str)) == 'call'
+
+
+def black_scholes(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, sigma: ArrayLike,
+                  option_type: Union[str, ArrayLike] = 'call', q: ArrayLike = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Fiyat ve Greeks (price, delta, gamma, theta, vega, rho)
+
+    Tüm girdiler numpy broadcast kurallarıyla birleşir; ör. T[:, None] ve
+    K[None, :] tüm vade x strike zincirini tek çağrıda fiyatlar. T <= 0 olan
+    elemanlar içsel değere düşer.
+    """
+    S, K, T, r, sigma, q, call = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (S, K, T, r, sigma, q)), _is_call(option_type)
+    )
+    live = T > 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        T_ = np.where(live, T, 1.0)
+        sqrt_T = np.sqrt(T_)
+        vol_sqrt_T = sigma * sqrt_T
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T_) / vol_sqrt_T
+        d2 = d1 - vol_sqrt_T
+
+        disc_r = np.exp(-r * T_)
+        disc_q = np.exp(-q * T_)
+        pdf_d1 = _norm_pdf(d1)
+        sign = np.where(call, 1.0, -1.0)
+        N_d1 = ndtr(sign * d1)
+        N_d2 = ndtr(sign * d2)
+
+        price = sign * (S * disc_q * N_d1 - K * disc_r * N_d2)
+        delta = sign * disc_q * N_d1
+        gamma = disc_q * pdf_d1 / (S * vol_sqrt_T)
+        theta = (-S * disc_q * pdf_d1 * sigma / (2 * sqrt_T)
+                 - sign * r * K * disc_r * N_d2
+                 + sign * q * S * disc_q * N_d1) / 365
+        vega = S * disc_q * sqrt_T * pdf_d1 / 100
+        rho = sign * K * T_ * disc_r * N_d2 / 100
+
+    intrinsic = np.where(call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+    expired_delta = np.where(call, (S > K).astype(np.float64), -(S < K).astype(np.float64))
+    zero = np.zeros_like(S)
+
+    return {
+        'price': np.where(live, price, intrinsic),
+        'delta': np.where(live, delta, expired_delta),
+        'gamma': np.where(live, gamma, zero),
+        'theta': np.where(live, theta, zero),
+        'vega': np.where(live, vega, zero),
+        'rho': np.where(live, rho, zero),
+    }
+
+
+def price_chain(S: float, strikes: ArrayLike, expiries: ArrayLike, r: float, sigma: ArrayLike,
+                q: float = 0.0) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Tüm vade x strike zinciri (call + put) tek çağrıda
+
+    sigma skaler ya da (vade x strike) volatilite yüzeyi olabilir.
+    Dönüş: {'call': {...}, 'put': {...}}, her dizi (len(expiries), len(strikes)).
+    """
+    K = np.asarray(strikes, dtype=np.float64)[np.newaxis, :]
+    T = np.asarray(expiries, dtype=np.float64)[:, np.newaxis]
+    # Call ve put aynı d1/d2'yi paylaşır: tek çağrı, ilk eksen tip
+    is_call = np.array([True, False])[:, np.newaxis, np.newaxis]
+    result = black_scholes(S, K[np.newaxis], T[np.newaxis], r, sigma, is_call, q)
+    return {
+        'call': {name: values[0] for name, values in result.items()},
+        'put': {name: values[1] for name, values in result.items()},
+    }
+
+
+def implied_volatility(price: ArrayLike, S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike,
+                       option_type: Union[str, ArrayLike] = 'call', q: ArrayLike = 0.0,
+                       tol: float = 1e-6, max_iter: int = 50,
+                       vol_bounds: Tuple[float, float] = (1e-4, 5.0)) -> np.ndarray:
+    """
+    Vektörel implied volatility
+
+    Her eleman için Newton adımı atılır; adım [lo, hi] braketinin dışına
+    düşerse veya vega çok küçükse bisection kullanılır. Arbitraj sınırları
+    dışındaki, σ'ya duyarsız (alt sınırdaki) fiyatlar ve T <= 0 için NaN döner.
+    """
+    arrays = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (price, S, K, T, r, q)), _is_call(option_type)
+    )
+    shape = arrays[0].shape
+    price, S, K, T, r, q, call = (a.ravel() for a in arrays)
+
+    lo = np.full(price.shape, vol_bounds[0])
+    hi = np.full(price.shape, vol_bounds[1])
+    lower = black_scholes(S, K, T, r, lo, call, q)['price']
+    upper = black_scholes(S, K, T, r, hi, call, q)['price']
+    # Alt sınıra tol kadar yakın fiyatlarda (derin ITM/OTM, vega ~ 0) σ belirlenemez
+    valid = (T > 0) & (price > lower + tol) & (price <= upper + tol)
+
+    # Brenner-Subrahmanyam ATM yaklaşımı başlangıç noktası
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.sqrt(2 * np.pi / np.where(T > 0, T, 1.0)) * price / S
+    sigma = np.clip(np.nan_to_num(sigma, nan=0.3), vol_bounds[0] * 10, vol_bounds[1] / 2)
+
+    active = valid.copy()
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        s_i = sigma[idx]
+        res = black_scholes(S[idx], K[idx], T[idx], r[idx], s_i, call[idx], q[idx])
+        diff = res['price'] - price[idx]
+        vega = res['vega'] * 100
+
+        # Braketi daralt: fiyat σ'ya göre monoton artan
+        lo_i = np.where(diff < 0, s_i, lo[idx])
+        hi_i = np.where(diff > 0, s_i, hi[idx])
+        lo[idx], hi[idx] = lo_i, hi_i
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = s_i - diff / vega
+        use_newton = (vega > 1e-10) & (newton > lo_i) & (newton < hi_i)
+        step = np.where(use_newton, newton, 0.5 * (lo_i + hi_i))
+
+        converged = np.abs(diff) < tol
+        sigma[idx] = np.where(converged, s_i, step)
+        active[idx] = ~converged & (hi_i - lo_i > tol * 1e-3)
+
+    return np.where(valid, sigma, np.nan).reshape(shape)
+
+
+def payoff_grid(prices: ArrayLike, legs: Iterable[Dict]) -> np.ndarray:
+    """
+    Strateji P&L eğrisi (vadede), fiyat x bacak broadcast ile
+
+    Bacak: {'type': 'call'|'put'|'stock', 'strike': K, 'premium': p, 'quantity': +1/-1}
+    Hisse bacağında 'strike' giriş fiyatıdır. Uzun opsiyon: içsel - prim,
+    kısa opsiyon (quantity < 0): prim - içsel.
+    """
+    legs = list(legs)
+    P = np.asarray(prices, dtype=np.float64)[:, np.newaxis]
+    if not legs:
+        return np.zeros(P.shape[0])
+
+    kinds = np.array([leg['type'] for leg in legs])
+    strikes = np.array([leg.get('strike', 0.0) for leg in legs], dtype=np.float64)[np.newaxis, :]
+    premiums = np.array([leg.get('premium', 0.0) for leg in legs], dtype=np.float64)[np.newaxis, :]
+    quantity = np.array([leg.get('quantity', 1.0) for leg in legs], dtype=np.float64)[np.newaxis, :]
+
+    value = np.select(
+        [kinds == 'call', kinds == 'put'],
+        [np.maximum(P - strikes, 0.0), np.maximum(strikes - P, 0.0)],
+        default=P - strikes
+    )
+    return ((value - premiums) * quantity).sum(axis=1)
+
+
+def benchmark_options_pricing(n_strikes: int = 200, n_expiries: int = 50, repeats: int = 5) -> Dict:
+    """Tüm zincir (call + put) fiyat + Greeks ve IV çözücü hızı (opsiyon/sn)"""
+    S, r = 100.0, 0.05
+    strikes = np.linspace(50, 150, n_strikes)
+    expiries = np.linspace(7, 365, n_expiries) / 365.0
+    n_options = 2 * n_strikes * n_expiries
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        chain = price_chain(S, strikes, expiries, r, 0.3)
+    pricing_elapsed = (time.perf_counter() - start) / repeats
+
+    K = np.broadcast_to(strikes, (n_expiries, n_strikes))
+    T = np.broadcast_to(expiries[:, np.newaxis], (n_expiries, n_strikes))
+    start = time.perf_counter()
+    iv = implied_volatility(chain['call']['price'], S, K, T, r, 'call')
+    iv_elapsed = time.perf_counter() - start
+
+    solved = ~np.isnan(iv)
+    return {
+        'options': n_options,
+        'pricing_options_per_sec': round(n_options / pricing_elapsed),
+        'iv_options_per_sec': round(iv.size / iv_elapsed),
+        'iv_solved_ratio': round(float(solved.mean()), 4),
+        'iv_max_error': float(np.max(np.abs(iv[solved] - 0.3))) if solved.any() else None,
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark_options_pricing())
@@ -17,6 +17,7 @@ from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.neural_network import MLPClassifier
 from sklearn.svm import SVC
 from sklearn.model_selection import cross_val_score
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -57,123 +58,174 @@ class QuantumOptimizationResult:
 class QuantumAnnealingOptimizer:
     """Kuantum annealing optimizasyonu"""
     
-    def __init__(self, n_qubits: int = 8):
+    def __init__(self, n_qubits: int = 8, population_size: int = 32):
         self.n_qubits = n_qubits
+        self.population_size = population_size
         self.temperature = 1.0
         self.cooling_rate = 0.95
         self.min_temperature = 0.01
+        self.max_sweeps = 1000
+        self.last_run_stats: Dict[str, float] = {}
+        
+        # Binary -> decimal dönüşümü için bit ağırlıkları (MSB önce)
+        self._bit_weights = 2 ** np.arange(n_qubits - 1, -1, -1, dtype=np.int64)
     
     def quantum_energy_function(self, state: np.ndarray, data: np.ndarray) -> float:
         """Kuantum enerji fonksiyonu"""
+        return float(self.quantum_energy_batch(np.atleast_2d(state), data)[0])
+    
+    def quantum_energy_batch(self, states: np.ndarray, data: np.ndarray) -> np.ndarray:
+        """
+        Bir state popülasyonunun enerjisini tek matris işlemiyle hesapla
+        
+        Args:
+            states: (P, n_qubits) binary state matrisi
+            data: Fiyat serisi
+            
+        Returns:
+            (P,) enerji vektörü (düşük = iyi)
+        """
+        n_states = len(states)
         try:
-            # Convert binary state to parameters
-            params = self._binary_to_parameters(state)
-            
             # Calculate energy based on prediction accuracy
             if len(data) < 10:
-                return 1.0
+                return np.ones(n_states)
             
-            # Simple prediction model
-            predictions = self._quantum_predict(data, params)
+            params = self._states_to_parameters(states)
+            predictions = self._quantum_predict_batch(data, params)
             actual = data[1:]  # Next day prices
             
-            if len(predictions) != len(actual):
-                return 1.0
-            
             # Calculate energy (lower is better)
-            mse = np.mean((predictions - actual)**2)
-            energy = mse / np.var(actual) if np.var(actual) > 0 else 1.0
-            
-            return min(1.0, energy)
-            
-        except:
-            return 1.0
+            var = np.var(actual)
+            if var <= 0:
+                return np.ones(n_states)
+            mse = np.mean((predictions - actual) ** 2, axis=1)
+            energy = np.minimum(1.0, mse / var)
+            return np.where(np.isfinite(energy), energy, 1.0)
+            
+        except Exception:
+            return np.ones(n_states)
+    
+    def _states_to_parameters(self, states: np.ndarray) -> np.ndarray:
+        """(P, n_qubits) binary state'leri (P, 4) parametre matrisine çevir"""
+        decimal = np.asarray(states, dtype=np.int64) @ self._bit_weights[-states.shape[1]:]
+        
+        # Normalize to parameter ranges: momentum, volatility, trend, volume (0-1)
+        divisors = np.array([1, 100, 10000, 1000000], dtype=np.int64)
+        return ((decimal[:, np.newaxis] // divisors) % 100) / 100.0
     
     def _binary_to_parameters(self, binary_state: np.ndarray) -> Dict:
         """Binary state'i parametrelere çevir"""
         try:
-            # Convert binary to decimal
-            decimal = int(''.join(map(str, binary_state)), 2)
-            
-            # Normalize to parameter ranges
-            params = {
-                'momentum': (decimal % 100) / 100.0,  # 0-1
-                'volatility': ((decimal // 100) % 100) / 100.0,  # 0-1
-                'trend': ((decimal // 10000) % 100) / 100.0,  # 0-1
-                'volume': ((decimal // 1000000) % 100) / 100.0  # 0-1
-            }
-            
-            return params
+            values = self._states_to_parameters(np.atleast_2d(binary_state))[0]
+            return dict(zip(['momentum', 'volatility', 'trend', 'volume'], values.tolist()))
         except:
             return {'momentum': 0.5, 'volatility': 0.5, 'trend': 0.5, 'volume': 0.5}
     
     def _quantum_predict(self, data: np.ndarray, params: Dict) -> np.ndarray:
         """Kuantum tahmin"""
         try:
-            predictions = []
-            
-            for i in range(len(data) - 1):
-                # Quantum-inspired prediction
-                current_price = data[i]
-                
-                # Momentum component
-                momentum = params['momentum'] * (data[i] - data[i-1]) if i > 0 else 0
-                
-                # Volatility component
-                volatility = params['volatility'] * np.random.normal(0, 0.02)
-                
-                # Trend component
-                trend = params['trend'] * np.mean(data[max(0, i-5):i+1]) * 0.001
-                
-                # Volume component (simulated)
-                volume_effect = params['volume'] * np.random.normal(0, 0.01)
-                
-                # Combined prediction
-                next_price = current_price + momentum + volatility + trend + volume_effect
-                predictions.append(next_price)
-            
-            return np.array(predictions)
+            param_row = np.array([[params['momentum'], params['volatility'], params['trend'], params['volume']]])
+            return self._quantum_predict_batch(data, param_row)[0]
         except:
             return data[:-1]
     
+    def _quantum_predict_batch(self, data: np.ndarray, params: np.ndarray) -> np.ndarray:
+        """
+        Tüm parametre setleri için bir sonraki fiyat tahmini (P, len(data) - 1)
+        
+        Tahmin = fiyat + momentum + volatilite gürültüsü + trend + hacim gürültüsü
+        """
+        data = np.asarray(data, dtype=float)
+        current = data[:-1]
+        n = len(current)
+        
+        # Momentum component: data[i] - data[i-1], i=0 için 0
+        price_diff = np.concatenate(([0.0], np.diff(current)))
+        
+        # Trend component: data[max(0, i-5):i+1] ortalaması (cumsum ile O(n))
+        csum = np.concatenate(([0.0], np.cumsum(current)))
+        idx = np.arange(n)
+        lo = np.maximum(0, idx - 5)
+        trailing_mean = (csum[idx + 1] - csum[lo]) / (idx + 1 - lo)
+        
+        # Volatility ve volume componentleri (simüle gürültü)
+        volatility_noise = np.random.normal(0, 0.02, (len(params), n))
+        volume_noise = np.random.normal(0, 0.01, (len(params), n))
+        
+        momentum, volatility, trend, volume = (params[:, k:k + 1] for k in range(4))
+        return (current
+                + momentum * price_diff
+                + volatility * volatility_noise
+                + trend * trailing_mean * 0.001
+                + volume * volume_noise)
+    
     def quantum_annealing(self, data: np.ndarray) -> Tuple[np.ndarray, float]:
-        """Kuantum annealing optimizasyonu"""
+        """
+        Kuantum annealing optimizasyonu
+        
+        population_size kadar bağımsız zincir paralel yürür; her sweep'te tüm
+        komşu state'lerin enerjisi tek batch'te hesaplanır.
+        """
         try:
-            # Initialize random state
-            current_state = np.random.randint(0, 2, self.n_qubits)
-            current_energy = self.quantum_energy_function(current_state, data)
+            n_chains = self.population_size
             
-            best_state = current_state.copy()
-            best_energy = current_energy
+            # Initialize random states
+            current_states = np.random.randint(0, 2, (n_chains, self.n_qubits))
+            current_energy = self.quantum_energy_batch(current_states, data)
             
-            iterations = 0
-            max_iterations = 1000
+            best_idx = int(np.argmin(current_energy))
+            best_state = current_states[best_idx].copy()
+            best_energy = float(current_energy[best_idx])
             
-            while self.temperature > self.min_temperature and iterations < max_iterations:
-                # Generate neighbor state
-                neighbor_state = current_state.copy()
-                flip_index = np.random.randint(0, self.n_qubits)
-                neighbor_state[flip_index] = 1 - neighbor_state[flip_index]
+            temperature = self.temperature
+            sweeps = 0
+            sweep_times = []
+            rows = np.arange(n_chains)
+            
+            while temperature > self.min_temperature and sweeps < self.max_sweeps:
+                sweep_start = time.perf_counter()
+                
+                # Generate neighbor states (her zincirde bir qubit flip)
+                neighbor_states = current_states.copy()
+                flip_index = np.random.randint(0, self.n_qubits, n_chains)
+                neighbor_states[rows, flip_index] = 1 - neighbor_states[rows, flip_index]
                 
-                # Calculate neighbor energy
-                neighbor_energy = self.quantum_energy_function(neighbor_state, data)
+                # Calculate neighbor energies
+                neighbor_energy = self.quantum_energy_batch(neighbor_states, data)
                 
                 # Quantum tunneling probability
                 delta_energy = neighbor_energy - current_energy
-                tunneling_prob = np.exp(-delta_energy / self.temperature)
+                tunneling_prob = np.exp(-np.clip(delta_energy, 0, None) / temperature)
                 
                 # Accept or reject
-                if neighbor_energy < current_energy or np.random.random() < tunneling_prob:
-                    current_state = neighbor_state
-                    current_energy = neighbor_energy
-                    
-                    if current_energy < best_energy:
-                        best_state = current_state.copy()
-                        best_energy = current_energy
+                accept = (delta_energy < 0) | (np.random.random(n_chains) < tunneling_prob)
+                current_states[accept] = neighbor_states[accept]
+                current_energy[accept] = neighbor_energy[accept]
+                
+                sweep_best = int(np.argmin(current_energy))
+                if current_energy[sweep_best] < best_energy:
+                    best_state = current_states[sweep_best].copy()
+                    best_energy = float(current_energy[sweep_best])
                 
                 # Cool down
-                self.temperature *= self.cooling_rate
-                iterations += 1
+                temperature *= self.cooling_rate
+                sweeps += 1
+                sweep_times.append(time.perf_counter() - sweep_start)
+            
+            total = float(np.sum(sweep_times)) if sweep_times else 0.0
+            self.last_run_stats = {
+                'sweeps': sweeps,
+                'population_size': n_chains,
+                'states_evaluated': sweeps * n_chains,
+                'mean_sweep_ms': (total / sweeps * 1000.0) if sweeps else 0.0,
+                'total_ms': total * 1000.0,
+                'states_per_sec': (sweeps * n_chains / total) if total > 0 else 0.0
+            }
+            logger.info(
+                f"⚛️ Annealing: {sweeps} sweep x {n_chains} state, "
+                f"{self.last_run_stats['mean_sweep_ms']:.3f} ms/sweep"
+            )
             
             return best_state, best_energy
             
@@ -296,21 +348,26 @@ class QuantumEntanglementAnalyzer:
             n_symbols = len(symbols)
             entanglement_matrix = np.zeros((n_symbols, n_symbols))
             
-            for i, symbol1 in enumerate(symbols):
-                for j, symbol2 in enumerate(symbols):
-                    if i != j and symbol1 in data_dict and symbol2 in data_dict:
-                        # Calculate correlation as entanglement strength
-                        data1 = data_dict[symbol1]
-                        data2 = data_dict[symbol2]
-                        
-                        if len(data1) == len(data2) and len(data1) > 1:
-                            correlation = np.corrcoef(data1, data2)[0, 1]
-                            if not np.isnan(correlation):
-                                entanglement_matrix[i, j] = abs(correlation)
-                        else:
-                            entanglement_matrix[i, j] = 0.1  # Default weak entanglement
-                    elif i == j:
-                        entanglement_matrix[i, j] = 1.0  # Self-entanglement
+            present = np.array([s in data_dict for s in symbols])
+            lengths = np.array([len(data_dict[s]) if s in data_dict else -1 for s in symbols])
+            
+            # Farklı uzunluktaki seriler arasında varsayılan zayıf entanglement
+            both_present = present[:, np.newaxis] & present[np.newaxis, :]
+            entanglement_matrix[both_present] = 0.1
+            
+            # Aynı uzunluktaki seriler tek np.corrcoef çağrısıyla (genelde tek grup)
+            for length in np.unique(lengths[present]):
+                if length <= 1:
+                    continue
+                group = np.flatnonzero(present & (lengths == length))
+                if len(group) < 2:
+                    continue
+                stacked = np.vstack([np.asarray(data_dict[symbols[k]], dtype=float) for k in group])
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    correlation = np.abs(np.corrcoef(stacked))
+                entanglement_matrix[np.ix_(group, group)] = np.nan_to_num(correlation, nan=0.0)
+            
+            np.fill_diagonal(entanglement_matrix, 1.0)  # Self-entanglement
             
             return entanglement_matrix
             
@@ -396,6 +453,7 @@ class QuantumInspiredOptimizer:
             if symbols and len(symbols) > 1:
                 data_dict = {s: yf.Ticker(s).history(period="1y")['Close'].values for s in symbols if s != symbol}
                 if data_dict:
+                    data_dict[symbol] = prices
                     entanglement_matrix = self.entanglement_analyzer.create_entanglement_matrix(symbols, data_dict)
                     symbol_index = symbols.index(symbol)
                     entangled_signal, entangled_confidence = self.entanglement_analyzer.analyze_entangled_signals(
@@ -427,7 +485,7 @@ class QuantumInspiredOptimizer:
                 quantum_signal=quantum_signal,
                 quantum_probability=quantum_probability,
                 quantum_confidence=quantum_confidence,
-                optimization_iterations=1000,  # Fixed for quantum annealing
+                optimization_iterations=int(self.quantum_annealer.last_run_stats.get('states_evaluated', 0)),
                 convergence_rate=1.0 - quantum_fitness,
                 quantum_advantage=quantum_advantage,
                 timestamp=datetime.now()
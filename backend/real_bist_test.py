@@ -9,6 +9,9 @@ import pandas as pd
 import yfinance as yf
 from datetime import datetime, timedelta
 import warnings
+
+from indicator_library import calculate_rsi
+
 warnings.filterwarnings('ignore')
 
 # Import our working system
@@ -115,14 +118,6 @@ def test_real_bist_data():
     
     return results
 
-def calculate_rsi(prices, window=14):
-    """RSI hesapla"""
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
-
 def calculate_macd(prices, fast=12, slow=26, signal=9):
     """MACD hesapla"""
     ema_fast = prices.ewm(span=fast).mean()
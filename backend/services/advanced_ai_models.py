@@ -12,6 +12,11 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from indicator_library import calculate_rsi
+except ImportError:
+    from backend.indicator_library import calculate_rsi
+
 # AI Model imports
 try:
     import lightgbm as lgb
@@ -92,12 +97,7 @@ class AdvancedAIModels:
     
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """RSI hesaplama"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return calculate_rsi(prices, period)
     
     def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series]:
         """MACD hesaplama"""
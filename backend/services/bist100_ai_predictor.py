@@ -12,6 +12,11 @@ from typing import Dict, List, Optional, Tuple
 import yfinance as yf
 import logging
 
+try:
+    from indicator_library import calculate_rsi
+except ImportError:
+    from backend.indicator_library import calculate_rsi
+
 # Mock AI models for demonstration
 class MockAIModel:
     def __init__(self, name: str, accuracy: float):
@@ -138,12 +143,7 @@ class BIST100AIPredictor:
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
         """Calculate RSI indicator"""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi.iloc[-1]
+            return calculate_rsi(prices, period).iloc[-1]
         except:
             return 50
     
@@ -16,16 +16,209 @@ from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import sqlite3
 import os
+import atexit
+import threading
+from collections import deque
+
+try:
+    from db.async_sqlite import get_database
+except ImportError:
+    from backend.db.async_sqlite import get_database
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sabit etiketler bir kez serileştirilir
+_SOURCE_LABELS = {
+    source: json.dumps({'source': source})
+    for source in ('system', 'process', 'application')
+}
+
+
+def _sqlite_timestamp(moment: Optional[datetime] = None) -> str:
+    """CURRENT_TIMESTAMP ile aynı biçim (UTC, saniye hassasiyeti)"""
+    return (moment or datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class MetricsWriteBehind:
+    """
+    Telemetri için write-behind kuyruğu
+
+    Metrikler bellekteki halka tampona eklenir; ayrı bir thread kalıcı WAL
+    bağlantısıyla periyodik olarak executemany ile yazar. Aynı thread ham
+    verileri 1 dakikalık, 1 dakikalıkları 1 saatlik özetlere indirger.
+    API event loop'u disk I/O için hiç beklemez.
+    """
+
+    def __init__(self, db_path: str, buffer_size: int = 50000, flush_interval: float = 1.0,
+                 rollup_interval: float = 300.0, raw_retention_hours: int = 24,
+                 minute_retention_days: int = 7):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.rollup_interval = rollup_interval
+        self.raw_retention = timedelta(hours=raw_retention_hours)
+        self.minute_retention = timedelta(days=minute_retention_days)
+
+        self._metrics: deque = deque(maxlen=buffer_size)
+        self._performance: deque = deque(maxlen=buffer_size)
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._last_rollup = 0.0
+
+        self.stats = {
+            'flushes': 0,
+            'rows_written': 0,
+            'dropped': 0,
+            'rollups': 0,
+            'last_flush_ms': 0.0
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+                self._thread.start()
+
+    def enqueue_metrics(self, rows: List[tuple]):
+        """(metric_name, metric_value, metric_type, labels, timestamp) satırları"""
+        self._ensure_started()
+        overflow = len(self._metrics) + len(rows) - self._metrics.maxlen
+        if overflow > 0:
+            self.stats['dropped'] += overflow
+        self._metrics.extend(rows)
+
+    def enqueue_performance(self, row: tuple):
+        """(endpoint, method, response_time, status_code, user_id, timestamp) satırı"""
+        self._ensure_started()
+        if len(self._performance) == self._performance.maxlen:
+            self.stats['dropped'] += 1
+        self._performance.append(row)
+
+    def pending(self) -> int:
+        return len(self._metrics) + len(self._performance)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    @staticmethod
+    def _drain(buffer: deque) -> List[tuple]:
+        rows = []
+        try:
+            while True:
+                rows.append(buffer.popleft())
+        except IndexError:
+            return rows
+
+    def _flush(self, conn: sqlite3.Connection):
+        metrics = self._drain(self._metrics)
+        performance = self._drain(self._performance)
+        if not metrics and not performance:
+            return
+
+        start = time.perf_counter()
+        with conn:
+            if metrics:
+                conn.executemany(
+                    'INSERT INTO metrics (metric_name, metric_value, metric_type, labels, timestamp) '
+                    'VALUES (?, ?, ?, ?, ?)', metrics
+                )
+            if performance:
+                conn.executemany(
+                    'INSERT INTO performance_logs (endpoint, method, response_time, status_code, user_id, timestamp) '
+                    'VALUES (?, ?, ?, ?, ?, ?)', performance
+                )
+        self.stats['flushes'] += 1
+        self.stats['rows_written'] += len(metrics) + len(performance)
+        self.stats['last_flush_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+    def _rollup(self, conn: sqlite3.Connection):
+        """raw -> 1m -> 1h indirgeme; indirgenen satırlar kaynak tablodan silinir"""
+        now = datetime.utcnow()
+        raw_cutoff = _sqlite_timestamp(now - self.raw_retention)
+        minute_cutoff = _sqlite_timestamp(now - self.minute_retention)
+        with conn:
+            conn.execute('''
+                INSERT INTO metrics_1m (metric_name, metric_type, labels, bucket, count, sum, min, max)
+                SELECT metric_name, metric_type, labels, strftime('%Y-%m-%d %H:%M:00', timestamp) AS bucket,
+                       COUNT(*), SUM(metric_value), MIN(metric_value), MAX(metric_value)
+                FROM metrics WHERE timestamp < ?
+                GROUP BY metric_name, metric_type, labels, bucket
+                ON CONFLICT(metric_name, labels, bucket) DO UPDATE SET
+                    count = metrics_1m.count + excluded.count,
+                    sum = metrics_1m.sum + excluded.sum,
+                    min = MIN(metrics_1m.min, excluded.min),
+                    max = MAX(metrics_1m.max, excluded.max)
+            ''', (raw_cutoff,))
+            conn.execute('DELETE FROM metrics WHERE timestamp < ?', (raw_cutoff,))
+
+            conn.execute('''
+                INSERT INTO metrics_1h (metric_name, metric_type, labels, bucket, count, sum, min, max)
+                SELECT metric_name, metric_type, labels, strftime('%Y-%m-%d %H:00:00', bucket) AS hour_bucket,
+                       SUM(count), SUM(sum), MIN(min), MAX(max)
+                FROM metrics_1m WHERE bucket < ?
+                GROUP BY metric_name, metric_type, labels, hour_bucket
+                ON CONFLICT(metric_name, labels, bucket) DO UPDATE SET
+                    count = metrics_1h.count + excluded.count,
+                    sum = metrics_1h.sum + excluded.sum,
+                    min = MIN(metrics_1h.min, excluded.min),
+                    max = MAX(metrics_1h.max, excluded.max)
+            ''', (minute_cutoff,))
+            conn.execute('DELETE FROM metrics_1m WHERE bucket < ?', (minute_cutoff,))
+        self.stats['rollups'] += 1
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            while not self._stopped.is_set():
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                try:
+                    self._flush(conn)
+                    if time.monotonic() - self._last_rollup >= self.rollup_interval:
+                        self._last_rollup = time.monotonic()
+                        self._rollup(conn)
+                except Exception as e:
+                    logger.error(f"❌ Metrics write-behind error: {e}")
+            # Kapanışta kalan tamponu yaz
+            self._flush(conn)
+        finally:
+            conn.close()
+
+    def flush(self):
+        """Yazıcı thread'ini hemen uyandır"""
+        self._wakeup.set()
+
+    def close(self, timeout: float = 5.0):
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+
 class MonitoringService:
     def __init__(self, db_path: str = "bist_ai.db"):
         self.db_path = db_path
         self.init_database()
         
+        # Telemetri yazımları event loop dışında, toplu olarak yapılır
+        self.writer = MetricsWriteBehind(db_path)
+        atexit.register(self.writer.close)
+        
+        # Okuma/yazma sorguları paylaşılan async SQLite katmanından
+        self.db = get_database(db_path)
+        atexit.register(self.db.close)
+        
         # Metrics configuration
         self.metrics_config = {
             'collection_interval': 30,  # seconds
@@ -57,6 +250,7 @@ class MonitoringService:
         """Initialize monitoring database"""
         try:
             conn = sqlite3.connect(self.db_path)
+            conn.execute('PRAGMA journal_mode=WAL')
             cursor = conn.cursor()
             
             # Create metrics table
@@ -100,8 +294,25 @@ class MonitoringService:
                 )
             ''')
             
+            # Downsampled rollup tables (raw -> 1m -> 1h)
+            for table in ('metrics_1m', 'metrics_1h'):
+                cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        metric_name TEXT NOT NULL,
+                        metric_type TEXT NOT NULL,
+                        labels TEXT NOT NULL DEFAULT '',
+                        bucket TIMESTAMP NOT NULL,
+                        count INTEGER NOT NULL,
+                        sum REAL NOT NULL,
+                        min REAL NOT NULL,
+                        max REAL NOT NULL,
+                        UNIQUE(metric_name, labels, bucket)
+                    )
+                ''')
+            
             # Create indexes
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_name_timestamp ON metrics(metric_name, timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON metrics(timestamp)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_status ON alerts(status)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_performance_timestamp ON performance_logs(timestamp)')
             
@@ -184,36 +395,19 @@ class MonitoringService:
             return {}
 
     async def store_metrics(self, metrics: Dict[str, Any]):
-        """Store metrics in database"""
+        """Queue metrics for the write-behind writer (no disk I/O on the event loop)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            timestamp = datetime.now()
-            
-            # Store system metrics
-            for metric_name, value in metrics['system'].items():
-                cursor.execute('''
-                    INSERT INTO metrics (metric_name, metric_value, metric_type, labels)
-                    VALUES (?, ?, ?, ?)
-                ''', (metric_name, value, 'gauge', json.dumps({'source': 'system'})))
-            
-            # Store process metrics
-            for metric_name, value in metrics['process'].items():
-                cursor.execute('''
-                    INSERT INTO metrics (metric_name, metric_value, metric_type, labels)
-                    VALUES (?, ?, ?, ?)
-                ''', (metric_name, value, 'gauge', json.dumps({'source': 'process'})))
-            
-            # Store counter metrics
-            for metric_name, value in metrics['counters'].items():
-                cursor.execute('''
-                    INSERT INTO metrics (metric_name, metric_value, metric_type, labels)
-                    VALUES (?, ?, ?, ?)
-                ''', (metric_name, value, 'counter', json.dumps({'source': 'application'})))
-            
-            conn.commit()
-            conn.close()
+            timestamp = _sqlite_timestamp()
+            rows = []
+            for source, metric_type, values in (
+                ('system', 'gauge', metrics['system']),
+                ('process', 'gauge', metrics['process']),
+                ('application', 'counter', metrics['counters'])
+            ):
+                labels = _SOURCE_LABELS[source]
+                rows.extend((name, value, metric_type, labels, timestamp) for name, value in values.items())
+            
+            self.writer.enqueue_metrics(rows)
             
         except Exception as e:
             logger.error(f"❌ Failed to store metrics: {e}")
@@ -269,37 +463,32 @@ class MonitoringService:
 
     async def create_alert(self, alert_data: Dict[str, Any]):
         """Create a new alert"""
-        try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
+        def insert_if_new(conn: sqlite3.Connection) -> bool:
             # Check if alert already exists and is active
-            cursor.execute('''
+            existing_alert = conn.execute('''
                 SELECT id FROM alerts 
                 WHERE alert_name = ? AND status = 'active'
-            ''', (alert_data['alert_name'],))
-            
-            existing_alert = cursor.fetchone()
-            
-            if not existing_alert:
-                cursor.execute('''
-                    INSERT INTO alerts 
-                    (alert_name, alert_level, message, metric_name, metric_value, threshold)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    alert_data['alert_name'],
-                    alert_data['alert_level'],
-                    alert_data['message'],
-                    alert_data['metric_name'],
-                    alert_data['metric_value'],
-                    alert_data['threshold']
-                ))
-                
-                conn.commit()
+            ''', (alert_data['alert_name'],)).fetchone()
+            if existing_alert:
+                return False
+            conn.execute('''
+                INSERT INTO alerts 
+                (alert_name, alert_level, message, metric_name, metric_value, threshold)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                alert_data['alert_name'],
+                alert_data['alert_level'],
+                alert_data['message'],
+                alert_data['metric_name'],
+                alert_data['metric_value'],
+                alert_data['threshold']
+            ))
+            return True
+        
+        try:
+            if await self.db.write(insert_if_new, 'alerts.create'):
                 logger.warning(f"🚨 Alert created: {alert_data['alert_name']} - {alert_data['message']}")
             
-            conn.close()
-            
         except Exception as e:
             logger.error(f"❌ Failed to create alert: {e}")
 
@@ -307,17 +496,9 @@ class MonitoringService:
                            status_code: int, user_id: str = None):
         """Log API performance metrics"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO performance_logs 
-                (endpoint, method, response_time, status_code, user_id)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (endpoint, method, response_time, status_code, user_id))
-            
-            conn.commit()
-            conn.close()
+            self.writer.enqueue_performance(
+                (endpoint, method, response_time, status_code, user_id, _sqlite_timestamp())
+            )
             
             # Update counters
             self.counters['requests_total'] += 1
@@ -330,40 +511,62 @@ class MonitoringService:
             logger.error(f"❌ Failed to log performance: {e}")
 
     async def get_metrics(self, metric_name: str = None, hours: int = 24) -> List[Dict[str, Any]]:
-        """Get metrics from database"""
+        """
+        Get metrics from database
+
+        Ham satırlar raw_retention_hours (varsayılan 24) boyunca tutulur, sonra
+        1m/1h özetlere indirgenir. hours bu süreyi aşarsa eski kısım özetlerden
+        döner: metric_value kovanın ortalaması, timestamp kova başlangıcıdır ve
+        satırda resolution ('1m' / '1h'), count, min, max bulunur. Ham satırlarda
+        resolution 'raw' olur.
+        """
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
             # Calculate time range
             start_time = datetime.now() - timedelta(hours=hours)
-            
-            if metric_name:
-                cursor.execute('''
-                    SELECT * FROM metrics 
-                    WHERE metric_name = ? AND timestamp >= ?
-                    ORDER BY timestamp DESC
-                ''', (metric_name, start_time))
-            else:
-                cursor.execute('''
-                    SELECT * FROM metrics 
-                    WHERE timestamp >= ?
-                    ORDER BY timestamp DESC
-                ''', (start_time,))
-            
-            metrics = []
-            for row in cursor.fetchall():
-                metric = {
-                    'id': row['id'],
+            name_filter = 'metric_name = ? AND ' if metric_name else ''
+            params = (metric_name,) if metric_name else ()
+            
+            rows = await self.db.fetchall(f'''
+                SELECT * FROM metrics 
+                WHERE {name_filter}timestamp >= ?
+                ORDER BY timestamp DESC
+            ''', (*params, start_time))
+            
+            metrics = [{
+                'id': row['id'],
+                'metric_name': row['metric_name'],
+                'metric_value': row['metric_value'],
+                'metric_type': row['metric_type'],
+                'labels': json.loads(row['labels']) if row['labels'] else {},
+                'timestamp': row['timestamp'],
+                'resolution': 'raw'
+            } for row in rows]
+            
+            if timedelta(hours=hours) <= self.writer.raw_retention:
+                return metrics
+            
+            # Saklama süresinden eski kısım: indirgenen satırlar ham tablodan silinmiştir,
+            # ham / 1m / 1h tablolarındaki satırlar ayrıktır
+            bucket_start = _sqlite_timestamp(datetime.utcnow() - timedelta(hours=hours))
+            for resolution in ('1m', '1h'):
+                rollups = await self.db.fetchall(f'''
+                    SELECT metric_name, metric_type, labels, bucket, count, sum, min, max
+                    FROM metrics_{resolution}
+                    WHERE {name_filter}bucket >= ?
+                    ORDER BY bucket DESC
+                ''', (*params, bucket_start))
+                metrics.extend({
+                    'id': None,
                     'metric_name': row['metric_name'],
-                    'metric_value': row['metric_value'],
+                    'metric_value': row['sum'] / row['count'] if row['count'] else 0,
                     'metric_type': row['metric_type'],
                     'labels': json.loads(row['labels']) if row['labels'] else {},
-                    'timestamp': row['timestamp']
-                }
-                metrics.append(metric)
-            
-            conn.close()
+                    'timestamp': row['bucket'],
+                    'resolution': resolution,
+                    'count': row['count'],
+                    'min': row['min'],
+                    'max': row['max']
+                } for row in rollups)
             
             return metrics
             
@@ -374,34 +577,24 @@ class MonitoringService:
     async def get_alerts(self, status: str = 'active') -> List[Dict[str, Any]]:
         """Get alerts from database"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            rows = await self.db.fetchall('''
                 SELECT * FROM alerts 
                 WHERE status = ?
                 ORDER BY created_at DESC
             ''', (status,))
             
-            alerts = []
-            for row in cursor.fetchall():
-                alert = {
-                    'id': row['id'],
-                    'alert_name': row['alert_name'],
-                    'alert_level': row['alert_level'],
-                    'message': row['message'],
-                    'metric_name': row['metric_name'],
-                    'metric_value': row['metric_value'],
-                    'threshold': row['threshold'],
-                    'status': row['status'],
-                    'created_at': row['created_at'],
-                    'resolved_at': row['resolved_at']
-                }
-                alerts.append(alert)
-            
-            conn.close()
-            
-            return alerts
+            return [{
+                'id': row['id'],
+                'alert_name': row['alert_name'],
+                'alert_level': row['alert_level'],
+                'message': row['message'],
+                'metric_name': row['metric_name'],
+                'metric_value': row['metric_value'],
+                'threshold': row['threshold'],
+                'status': row['status'],
+                'created_at': row['created_at'],
+                'resolved_at': row['resolved_at']
+            } for row in rows]
             
         except Exception as e:
             logger.error(f"❌ Failed to get alerts: {e}")
@@ -410,21 +603,15 @@ class MonitoringService:
     async def resolve_alert(self, alert_id: int) -> Dict[str, Any]:
         """Resolve an alert"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            result = await self.db.execute('''
                 UPDATE alerts 
                 SET status = 'resolved', resolved_at = CURRENT_TIMESTAMP
                 WHERE id = ?
             ''', (alert_id,))
             
-            if cursor.rowcount == 0:
+            if result.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Alert not found")
             
-            conn.commit()
-            conn.close()
-            
             logger.info(f"✅ Alert {alert_id} resolved")
             
             return {'message': 'Alert resolved successfully', 'id': alert_id}
@@ -437,14 +624,11 @@ class MonitoringService:
 
     async def get_performance_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get performance summary"""
-        try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            start_time = datetime.now() - timedelta(hours=hours)
-            
+        start_time = datetime.now() - timedelta(hours=hours)
+        
+        def summarize(conn: sqlite3.Connection):
             # Get performance statistics
-            cursor.execute('''
+            stats = conn.execute('''
                 SELECT 
                     COUNT(*) as total_requests,
                     AVG(response_time) as avg_response_time,
@@ -453,34 +637,32 @@ class MonitoringService:
                     COUNT(CASE WHEN status_code >= 400 THEN 1 END) as error_requests
                 FROM performance_logs 
                 WHERE timestamp >= ?
-            ''', (start_time,))
-            
-            stats = cursor.fetchone()
-            
-            # Calculate error rate
-            total_requests = stats['total_requests'] or 0
-            error_requests = stats['error_requests'] or 0
-            error_rate = (error_requests / total_requests) if total_requests > 0 else 0
+            ''', (start_time,)).fetchone()
             
             # Get top endpoints by response time
-            cursor.execute('''
+            top_rows = conn.execute('''
                 SELECT endpoint, AVG(response_time) as avg_response_time, COUNT(*) as request_count
                 FROM performance_logs 
                 WHERE timestamp >= ?
                 GROUP BY endpoint
                 ORDER BY avg_response_time DESC
                 LIMIT 10
-            ''', (start_time,))
-            
-            top_endpoints = []
-            for row in cursor.fetchall():
-                top_endpoints.append({
-                    'endpoint': row['endpoint'],
-                    'avg_response_time': row['avg_response_time'],
-                    'request_count': row['request_count']
-                })
+            ''', (start_time,)).fetchall()
+            return stats, top_rows
+        
+        try:
+            stats, top_rows = await self.db.read(summarize, 'performance.summary')
             
-            conn.close()
+            # Calculate error rate
+            total_requests = stats['total_requests'] or 0
+            error_requests = stats['error_requests'] or 0
+            error_rate = (error_requests / total_requests) if total_requests > 0 else 0
+            
+            top_endpoints = [{
+                'endpoint': row['endpoint'],
+                'avg_response_time': row['avg_response_time'],
+                'request_count': row['request_count']
+            } for row in top_rows]
             
             summary = {
                 'time_range_hours': hours,
@@ -502,34 +684,70 @@ class MonitoringService:
 
     async def cleanup_old_metrics(self):
         """Clean up old metrics based on retention policy"""
-        try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            retention_days = self.metrics_config['retention_days']
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
-            
+        retention_days = self.metrics_config['retention_days']
+        cutoff_date = datetime.now() - timedelta(days=retention_days)
+        
+        def purge(conn: sqlite3.Connection):
             # Delete old metrics
-            cursor.execute('DELETE FROM metrics WHERE timestamp < ?', (cutoff_date,))
-            metrics_deleted = cursor.rowcount
+            metrics_deleted = conn.execute('DELETE FROM metrics WHERE timestamp < ?', (cutoff_date,)).rowcount
+            metrics_deleted += conn.execute(
+                'DELETE FROM metrics_1h WHERE bucket < ?',
+                (_sqlite_timestamp(datetime.utcnow() - timedelta(days=retention_days)),)
+            ).rowcount
             
             # Delete old performance logs
-            cursor.execute('DELETE FROM performance_logs WHERE timestamp < ?', (cutoff_date,))
-            logs_deleted = cursor.rowcount
+            logs_deleted = conn.execute('DELETE FROM performance_logs WHERE timestamp < ?', (cutoff_date,)).rowcount
             
             # Delete resolved alerts older than 7 days
             alert_cutoff = datetime.now() - timedelta(days=7)
-            cursor.execute('DELETE FROM alerts WHERE status = "resolved" AND resolved_at < ?', (alert_cutoff,))
-            alerts_deleted = cursor.rowcount
-            
-            conn.commit()
-            conn.close()
+            alerts_deleted = conn.execute(
+                'DELETE FROM alerts WHERE status = "resolved" AND resolved_at < ?', (alert_cutoff,)
+            ).rowcount
+            return metrics_deleted, logs_deleted, alerts_deleted
+        
+        try:
+            metrics_deleted, logs_deleted, alerts_deleted = await self.db.write(purge, 'metrics.cleanup')
             
             logger.info(f"🧹 Cleanup completed: {metrics_deleted} metrics, {logs_deleted} logs, {alerts_deleted} alerts deleted")
             
         except Exception as e:
             logger.error(f"❌ Failed to cleanup old metrics: {e}")
 
+    async def get_metric_rollups(self, metric_name: str, resolution: str = '1m', hours: int = 24) -> List[Dict[str, Any]]:
+        """Get downsampled metrics (resolution: '1m' or '1h')"""
+        if resolution not in ('1m', '1h'):
+            raise HTTPException(status_code=400, detail="resolution must be '1m' or '1h'")
+        try:
+            start_time = _sqlite_timestamp(datetime.utcnow() - timedelta(hours=hours))
+            rows = await self.db.fetchall(f'''
+                SELECT metric_name, labels, bucket, count, sum, min, max
+                FROM metrics_{resolution}
+                WHERE metric_name = ? AND bucket >= ?
+                ORDER BY bucket DESC
+            ''', (metric_name, start_time))
+            
+            return [{
+                'metric_name': row['metric_name'],
+                'labels': json.loads(row['labels']) if row['labels'] else {},
+                'bucket': row['bucket'],
+                'count': row['count'],
+                'avg': row['sum'] / row['count'] if row['count'] else 0,
+                'min': row['min'],
+                'max': row['max']
+            } for row in rows]
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to get metric rollups: {e}")
+            return []
+
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Write-behind queue statistics"""
+        return {**self.writer.stats, 'pending': self.writer.pending()}
+
+    def get_db_stats(self) -> Dict[str, Any]:
+        """Query timings and slow-query log of the shared SQLite layer"""
+        return self.db.get_stats()
+
     async def start_metrics_collection(self):
         """Start continuous metrics collection"""
         logger.info("📊 Starting metrics collection")
@@ -565,6 +783,18 @@ async def get_metrics_endpoint(metric_name: str = None, hours: int = 24):
 async def get_system_metrics_endpoint():
     return await monitoring_service.collect_system_metrics()
 
+@app.get("/api/metrics/rollups")
+async def get_metric_rollups_endpoint(metric_name: str, resolution: str = '1m', hours: int = 24):
+    return await monitoring_service.get_metric_rollups(metric_name, resolution, hours)
+
+@app.get("/api/metrics/writer")
+async def get_writer_stats_endpoint():
+    return monitoring_service.get_writer_stats()
+
+@app.get("/api/metrics/db")
+async def get_db_stats_endpoint():
+    return monitoring_service.get_db_stats()
+
 @app.get("/api/alerts")
 async def get_alerts_endpoint(status: str = 'active'):
     return await monitoring_service.get_alerts(status)
@@ -8,8 +8,10 @@ import asyncio
 import logging
 import json
 import sqlite3
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -20,6 +22,11 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import os
 
+try:
+    from db.async_sqlite import AsyncSQLite, get_database
+except ImportError:
+    from backend.db.async_sqlite import AsyncSQLite, get_database
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -40,13 +47,142 @@ class WebPushSubscription(BaseModel):
     keys: Dict[str, str]
     user_id: str
 
+class NotificationWriter:
+    """
+    Bildirim DB yazımları için batch'li async kuyruk
+
+    Insert ve durum güncellemeleri kısa bir pencerede toplanır ve paylaşılan
+    SQLite katmanının writer thread'inde tek transaction içinde yazılır;
+    event loop SQLite için hiç bloklanmaz. Batch başarısız olursa satır satır
+    (savepoint ile) yeniden yazılır; yalnız hatalı satırın çağıranı hata alır.
+    """
+
+    def __init__(self, db: AsyncSQLite, max_batch_size: int = 256, max_wait_ms: float = 2.0):
+        self.db = db
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.stats = {'batches': 0, 'inserts': 0, 'status_updates': 0, 'batch_retries': 0, 'failed_rows': 0}
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def insert(self, row: Tuple) -> int:
+        """Bildirim satırını kuyruğa ekle, atanan id'yi bekle"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(('insert', row, future))
+        return await future
+
+    async def update_status(self, notification_id: int, status: str):
+        """Teslim durumunu kuyruğa ekle (sonucu beklenmez)"""
+        self._ensure_worker()
+        await self._queue.put(('status', (status, notification_id), None))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000.0
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await self.db.write(lambda conn: self._write_batch(conn, batch), 'notifications.batch')
+            except Exception as e:
+                logger.warning(f"⚠️ Notification batch write failed, retrying row by row: {e}")
+                try:
+                    results = await self.db.write(lambda conn: self._write_rows(conn, batch), 'notifications.rows')
+                except Exception as e:
+                    logger.error(f"❌ Notification batch write failed: {e}")
+                    results = [e] * len(batch)
+
+            for (kind, row, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    if future is not None and not future.done():
+                        future.set_exception(result)
+                    elif kind == 'status':
+                        logger.error(f"❌ Notification status update failed {row}: {result}")
+                elif future is not None and not future.done():
+                    future.set_result(result)
+
+    _INSERT_SQL = '''
+        INSERT INTO notifications 
+        (user_id, title, message, type, category, priority, symbol, data)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    _STATUS_SQL = '''
+        UPDATE notifications 
+        SET delivery_status = ?, sent_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    '''
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Tuple]) -> List[Optional[int]]:
+        ids: List[Optional[int]] = []
+        statuses = []
+        for kind, row, _ in batch:
+            if kind == 'insert':
+                ids.append(conn.execute(self._INSERT_SQL, row).lastrowid)
+            else:
+                statuses.append(row)
+                ids.append(None)
+        if statuses:
+            conn.executemany(self._STATUS_SQL, statuses)
+
+        self.stats['batches'] += 1
+        self.stats['inserts'] += len(batch) - len(statuses)
+        self.stats['status_updates'] += len(statuses)
+        return ids
+
+    def _write_rows(self, conn: sqlite3.Connection, batch: List[Tuple]) -> List[Any]:
+        """Her satır kendi savepoint'inde: hatalı satır geri alınır, sonucu exception olur"""
+        results: List[Any] = []
+        for kind, row, _ in batch:
+            conn.execute('SAVEPOINT notification_row')
+            try:
+                if kind == 'insert':
+                    results.append(conn.execute(self._INSERT_SQL, row).lastrowid)
+                    self.stats['inserts'] += 1
+                else:
+                    conn.execute(self._STATUS_SQL, row)
+                    results.append(None)
+                    self.stats['status_updates'] += 1
+            except Exception as e:
+                conn.execute('ROLLBACK TO notification_row')
+                results.append(e)
+                self.stats['failed_rows'] += 1
+            conn.execute('RELEASE notification_row')
+
+        self.stats['batches'] += 1
+        self.stats['batch_retries'] += 1
+        return results
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
 class NotificationService:
     def __init__(self, db_path: str = "bist_ai.db"):
         self.db_path = db_path
         self.init_database()
         
-        # WebSocket connections
-        self.active_connections: List[WebSocket] = []
+        # WebSocket connections indexed by user_id
+        self.connections: Dict[str, Set[WebSocket]] = defaultdict(set)
+        self.send_timeout = 2.0  # seconds per connection
+        
+        # Shared async SQLite layer + batched writes
+        self.db = get_database(db_path)
+        self.writer = NotificationWriter(self.db)
         
         # Web Push configuration
         self.vapid_private_key = os.getenv('VAPID_PRIVATE_KEY', 'your-vapid-private-key')
@@ -74,6 +210,25 @@ class NotificationService:
         
         logger.info("🔔 Notification Service initialized")
 
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        """All connected sockets (across users)"""
+        return [ws for sockets in self.connections.values() for ws in sockets]
+
+    def connection_count(self) -> int:
+        return sum(len(sockets) for sockets in self.connections.values())
+
+    def register_connection(self, user_id: str, websocket: WebSocket):
+        self.connections[user_id].add(websocket)
+
+    def unregister_connection(self, user_id: str, websocket: WebSocket):
+        sockets = self.connections.get(user_id)
+        if sockets is None:
+            return
+        sockets.discard(websocket)
+        if not sockets:
+            del self.connections[user_id]
+
     def init_database(self):
         """Initialize notification database"""
         try:
@@ -152,15 +307,8 @@ class NotificationService:
     async def create_notification(self, notification_data: NotificationCreate) -> Dict[str, Any]:
         """Create a new notification"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Insert notification
-            cursor.execute('''
-                INSERT INTO notifications 
-                (user_id, title, message, type, category, priority, symbol, data)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            # Insert notification (batched, off the event loop)
+            notification_id = await self.writer.insert((
                 notification_data.user_id or 'default_user',
                 notification_data.title,
                 notification_data.message,
@@ -171,10 +319,6 @@ class NotificationService:
                 json.dumps(notification_data.data) if notification_data.data else None
             ))
             
-            notification_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            
             result = {
                 'id': notification_id,
                 'user_id': notification_data.user_id or 'default_user',
@@ -218,8 +362,17 @@ class NotificationService:
             logger.error(f"❌ Failed to send notification: {e}")
             await self.update_delivery_status(notification['id'], 'failed')
 
-    async def send_websocket_notification(self, notification: Dict[str, Any]):
-        """Send notification via WebSocket"""
+    async def _send_to_connection(self, user_id: str, websocket: WebSocket, payload: str) -> bool:
+        try:
+            await asyncio.wait_for(websocket.send_text(payload), timeout=self.send_timeout)
+            return True
+        except Exception as e:
+            logger.error(f"❌ WebSocket send failed: {e}")
+            self.unregister_connection(user_id, websocket)
+            return False
+
+    async def send_websocket_notification(self, notification: Dict[str, Any], broadcast: bool = None):
+        """Send notification to the owner's WebSocket connections (system notifications go to everyone)"""
         try:
             message = {
                 'type': 'notification',
@@ -227,40 +380,41 @@ class NotificationService:
                 'timestamp': datetime.now().isoformat()
             }
             
-            # Send to all active connections
-            disconnected_clients = []
-            for connection in self.active_connections:
-                try:
-                    await connection.send_text(json.dumps(message))
-                except Exception as e:
-                    logger.error(f"❌ WebSocket send failed: {e}")
-                    disconnected_clients.append(connection)
+            if broadcast is None:
+                broadcast = notification.get('category') == 'system'
+            if broadcast:
+                targets = [(uid, ws) for uid, sockets in self.connections.items() for ws in sockets]
+            else:
+                user_id = notification.get('user_id')
+                targets = [(user_id, ws) for ws in self.connections.get(user_id, ())]
             
-            # Remove disconnected clients
-            for client in disconnected_clients:
-                self.active_connections.remove(client)
+            if not targets:
+                return 0
             
-            logger.info(f"📡 WebSocket notification sent to {len(self.active_connections)} clients")
+            # Encode once, fan out concurrently
+            payload = json.dumps(message, default=str)
+            results = await asyncio.gather(
+                *(self._send_to_connection(uid, ws, payload) for uid, ws in targets)
+            )
+            delivered = sum(results)
+            
+            logger.debug(f"📡 WebSocket notification sent to {delivered}/{len(targets)} clients")
+            return delivered
             
         except Exception as e:
             logger.error(f"❌ WebSocket notification failed: {e}")
+            return 0
 
     async def send_web_push_notification(self, user_id: str, notification: Dict[str, Any]):
         """Send notification via Web Push"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
             # Get user's Web Push subscriptions
-            cursor.execute('''
+            subscriptions = await self.db.fetchall('''
                 SELECT endpoint, p256dh, auth 
                 FROM web_push_subscriptions 
                 WHERE user_id = ? AND is_active = TRUE
             ''', (user_id,))
             
-            subscriptions = cursor.fetchall()
-            conn.close()
-            
             if not subscriptions:
                 logger.info(f"No Web Push subscriptions found for user {user_id}")
                 return
@@ -295,17 +449,7 @@ class NotificationService:
     async def update_delivery_status(self, notification_id: int, status: str):
         """Update notification delivery status"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE notifications 
-                SET delivery_status = ?, sent_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (status, notification_id))
-            
-            conn.commit()
-            conn.close()
+            await self.writer.update_status(notification_id, status)
             
         except Exception as e:
             logger.error(f"❌ Failed to update delivery status: {e}")
@@ -313,10 +457,7 @@ class NotificationService:
     async def get_notifications(self, user_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
         """Get notifications for a user"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            rows = await self.db.fetchall('''
                 SELECT * FROM notifications 
                 WHERE user_id = ?
                 ORDER BY created_at DESC
@@ -324,7 +465,7 @@ class NotificationService:
             ''', (user_id, limit, offset))
             
             notifications = []
-            for row in cursor.fetchall():
+            for row in rows:
                 notification = {
                     'id': row['id'],
                     'user_id': row['user_id'],
@@ -342,8 +483,6 @@ class NotificationService:
                 }
                 notifications.append(notification)
             
-            conn.close()
-            
             return notifications
             
         except Exception as e:
@@ -353,21 +492,15 @@ class NotificationService:
     async def mark_notification_read(self, notification_id: int, user_id: str) -> Dict[str, Any]:
         """Mark notification as read"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            written = await self.db.execute('''
                 UPDATE notifications 
                 SET is_read = TRUE 
                 WHERE id = ? AND user_id = ?
             ''', (notification_id, user_id))
             
-            if cursor.rowcount == 0:
+            if written.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Notification not found")
             
-            conn.commit()
-            conn.close()
-            
             logger.info(f"✅ Notification {notification_id} marked as read")
             
             return {'message': 'Notification marked as read', 'id': notification_id}
@@ -381,11 +514,8 @@ class NotificationService:
     async def subscribe_web_push(self, subscription_data: WebPushSubscription) -> Dict[str, Any]:
         """Subscribe user to Web Push notifications"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
             # Insert or update subscription
-            cursor.execute('''
+            await self.db.execute('''
                 INSERT OR REPLACE INTO web_push_subscriptions 
                 (user_id, endpoint, p256dh, auth, is_active)
                 VALUES (?, ?, ?, ?, TRUE)
@@ -396,9 +526,6 @@ class NotificationService:
                 subscription_data.keys.get('auth', '')
             ))
             
-            conn.commit()
-            conn.close()
-            
             logger.info(f"✅ Web Push subscription added for user {subscription_data.user_id}")
             
             return {'message': 'Web Push subscription successful'}
@@ -461,20 +588,73 @@ class NotificationService:
         
         return await self.create_notification(notification_data)
 
-    async def websocket_endpoint(self, websocket: WebSocket):
+    async def websocket_endpoint(self, websocket: WebSocket, user_id: str = 'default_user'):
         """Handle WebSocket connections for real-time notifications"""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.register_connection(user_id, websocket)
         
-        logger.info(f"🔗 WebSocket connected. Total connections: {len(self.active_connections)}")
+        logger.info(f"🔗 WebSocket connected ({user_id}). Total connections: {self.connection_count()}")
         
         try:
             while True:
                 # Keep connection alive
                 await websocket.receive_text()
         except WebSocketDisconnect:
-            self.active_connections.remove(websocket)
-            logger.info(f"🔌 WebSocket disconnected. Total connections: {len(self.active_connections)}")
+            self.unregister_connection(user_id, websocket)
+            logger.info(f"🔌 WebSocket disconnected ({user_id}). Total connections: {self.connection_count()}")
+
+
+async def benchmark_notification_delivery(n_sockets: int = 5000, n_users: int = 500,
+                                          n_messages: int = 200, send_latency_ms: float = 1.0) -> Dict[str, Any]:
+    """WebSocket teslim throughput benchmark'ı (simüle soketler, DB yok)"""
+
+    class _SimulatedSocket:
+        __slots__ = ('received',)
+
+        def __init__(self):
+            self.received = 0
+
+        async def send_text(self, payload: str):
+            await asyncio.sleep(send_latency_ms / 1000.0)
+            self.received += 1
+
+    service = NotificationService.__new__(NotificationService)
+    service.connections = defaultdict(set)
+    service.send_timeout = 2.0
+    sockets = [_SimulatedSocket() for _ in range(n_sockets)]
+    for i, ws in enumerate(sockets):
+        service.register_connection(f"user_{i % n_users}", ws)
+
+    start = time.perf_counter()
+    delivered = 0
+    for i in range(n_messages):
+        delivered += await service.send_websocket_notification({
+            'id': i,
+            'user_id': f"user_{i % n_users}",
+            'title': 'benchmark',
+            'message': 'benchmark',
+            'category': 'signal'
+        })
+    routed_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    broadcast_delivered = await service.send_websocket_notification(
+        {'id': -1, 'user_id': 'system', 'title': 'benchmark', 'message': 'broadcast', 'category': 'system'}
+    )
+    broadcast_elapsed = time.perf_counter() - start
+
+    result = {
+        'sockets': n_sockets,
+        'users': n_users,
+        'messages': n_messages,
+        'routed_deliveries': delivered,
+        'routed_messages_per_sec': round(n_messages / routed_elapsed, 1) if routed_elapsed > 0 else 0,
+        'broadcast_deliveries': broadcast_delivered,
+        'broadcast_ms': round(broadcast_elapsed * 1000, 2),
+        'broadcast_deliveries_per_sec': round(broadcast_delivered / broadcast_elapsed) if broadcast_elapsed > 0 else 0
+    }
+    logger.info(f"📊 Notification delivery benchmark: {result}")
+    return result
 
 # Global notification service instance
 notification_service = NotificationService()
@@ -526,8 +706,13 @@ async def create_price_alert_endpoint(
     return await notification_service.create_price_alert(symbol, price, change, user_id)
 
 @app.websocket("/ws/notifications")
-async def websocket_notifications_endpoint(websocket: WebSocket):
-    await notification_service.websocket_endpoint(websocket)
+async def websocket_notifications_endpoint(websocket: WebSocket, user_id: str = "default_user"):
+    await notification_service.websocket_endpoint(websocket, user_id)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await notification_service.writer.close()
+    notification_service.db.close()
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8003)
\ No newline at end of file
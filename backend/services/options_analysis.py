@@ -9,84 +9,47 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 import logging
-from scipy.stats import norm
 import math
 
+try:
+    from options_pricing import black_scholes, implied_volatility, payoff_grid, price_chain
+except ImportError:
+    from backend.options_pricing import black_scholes, implied_volatility, payoff_grid, price_chain
+
 class OptionsGreeks:
-    """Black-Scholes Greeks Calculator"""
+    """Black-Scholes Greeks Calculator (vektörel çekirdek üzerinde skaler arayüz)"""
     
     @staticmethod
     def black_scholes_call(S: float, K: float, T: float, r: float, sigma: float) -> float:
         """Black-Scholes call option price"""
-        if T <= 0:
-            return max(S - K, 0)
-        
-        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        
-        call_price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-        return call_price
+        return float(black_scholes(S, K, T, r, sigma, 'call')['price'])
     
     @staticmethod
     def black_scholes_put(S: float, K: float, T: float, r: float, sigma: float) -> float:
         """Black-Scholes put option price"""
-        if T <= 0:
-            return max(K - S, 0)
-        
-        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        
-        put_price = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-        return put_price
+        return float(black_scholes(S, K, T, r, sigma, 'put')['price'])
+    
+    @staticmethod
+    def round_greeks(result: Dict[str, np.ndarray]) -> List[Dict]:
+        """Vektörel sonucu eleman başına yuvarlanmış Greeks sözlüklerine çevir"""
+        columns = {
+            'delta': np.round(np.ravel(result['delta']), 4).tolist(),
+            'gamma': np.round(np.ravel(result['gamma']), 6).tolist(),
+            'theta': np.round(np.ravel(result['theta']), 4).tolist(),
+            'vega': np.round(np.ravel(result['vega']), 4).tolist(),
+            'rho': np.round(np.ravel(result['rho']), 4).tolist()
+        }
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
     
     @staticmethod
     def calculate_greeks(S: float, K: float, T: float, r: float, sigma: float, option_type: str = 'call') -> Dict:
         """Calculate all Greeks for an option"""
-        if T <= 0:
-            return {
-                'delta': 1.0 if option_type == 'call' and S > K else 0.0,
-                'gamma': 0.0,
-                'theta': 0.0,
-                'vega': 0.0,
-                'rho': 0.0
-            }
-        
-        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        
-        # Delta
-        if option_type == 'call':
-            delta = norm.cdf(d1)
-        else:
-            delta = norm.cdf(d1) - 1
-        
-        # Gamma
-        gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
-        
-        # Theta
-        if option_type == 'call':
-            theta = (-S * norm.pdf(d1) * sigma / (2 * np.sqrt(T)) - 
-                    r * K * np.exp(-r * T) * norm.cdf(d2)) / 365
-        else:
-            theta = (-S * norm.pdf(d1) * sigma / (2 * np.sqrt(T)) + 
-                    r * K * np.exp(-r * T) * norm.cdf(-d2)) / 365
-        
-        # Vega
-        vega = S * np.sqrt(T) * norm.pdf(d1) / 100
-        
-        # Rho
-        if option_type == 'call':
-            rho = K * T * np.exp(-r * T) * norm.cdf(d2) / 100
-        else:
-            rho = -K * T * np.exp(-r * T) * norm.cdf(-d2) / 100
-        
-        return {
-            'delta': round(delta, 4),
-            'gamma': round(gamma, 6),
-            'theta': round(theta, 4),
-            'vega': round(vega, 4),
-            'rho': round(rho, 4)
-        }
+        return OptionsGreeks.round_greeks(black_scholes(S, K, T, r, sigma, option_type))[0]
+    
+    @staticmethod
+    def implied_volatility(price: float, S: float, K: float, T: float, r: float, option_type: str = 'call') -> float:
+        """Implied volatility (Newton + bisection)"""
+        return float(implied_volatility(price, S, K, T, r, option_type))
 
 class OptionsAnalyzer:
     """Options analysis engine"""
@@ -147,6 +110,35 @@ class OptionsAnalyzer:
         
         return days_to_expiry / 365.0
     
+    def _chain_rows(self, S: float, strikes: np.ndarray, result: Dict[str, np.ndarray], option_type: str) -> List[Dict]:
+        """Bir vadenin vektörel sonucunu zincir satırlarına çevir"""
+        prices = np.asarray(result['price'])
+        if option_type == 'call':
+            intrinsic = np.maximum(S - strikes, 0)
+            moneyness = np.where(S > strikes, 'ITM', np.where(S < strikes, 'OTM', 'ATM'))
+        else:
+            intrinsic = np.maximum(strikes - S, 0)
+            moneyness = np.where(S < strikes, 'ITM', np.where(S > strikes, 'OTM', 'ATM'))
+        
+        return [
+            {
+                'strike': strike,
+                'price': price,
+                'intrinsic_value': intr,
+                'time_value': time_value,
+                'moneyness': money,
+                'greeks': greeks
+            }
+            for strike, price, intr, time_value, money, greeks in zip(
+                strikes.tolist(),
+                np.round(prices, 2).tolist(),
+                intrinsic.tolist(),
+                np.round(prices - intrinsic, 2).tolist(),
+                moneyness.tolist(),
+                self.greeks_calculator.round_greeks(result)
+            )
+        ]
+    
     async def analyze_option_chain(self, symbol: str, expiration_date: str) -> Dict:
         """Analyze complete option chain"""
         try:
@@ -159,52 +151,63 @@ class OptionsAnalyzer:
             r = self.risk_free_rate
             
             T = self.calculate_time_to_expiry(expiration_date)
-            strikes = self.get_strike_prices(S)
+            strikes = np.asarray(self.get_strike_prices(S))
             
-            option_chain = {
+            # Call + put tek çağrıda
+            chain = price_chain(S, strikes, [T], r, sigma)
+            
+            return {
                 'symbol': symbol,
                 'underlying_price': S,
                 'expiration_date': expiration_date,
                 'time_to_expiry': T,
                 'risk_free_rate': r,
                 'volatility': sigma,
-                'calls': [],
-                'puts': [],
+                'calls': self._chain_rows(S, strikes, {k: v[0] for k, v in chain['call'].items()}, 'call'),
+                'puts': self._chain_rows(S, strikes, {k: v[0] for k, v in chain['put'].items()}, 'put'),
                 'last_update': datetime.now().isoformat()
             }
             
-            # Calculate call options
-            for strike in strikes:
-                call_price = self.greeks_calculator.black_scholes_call(S, strike, T, r, sigma)
-                call_greeks = self.greeks_calculator.calculate_greeks(S, strike, T, r, sigma, 'call')
-                
-                option_chain['calls'].append({
-                    'strike': strike,
-                    'price': round(call_price, 2),
-                    'intrinsic_value': max(S - strike, 0),
-                    'time_value': round(call_price - max(S - strike, 0), 2),
-                    'moneyness': 'ITM' if S > strike else 'OTM' if S < strike else 'ATM',
-                    'greeks': call_greeks
-                })
+        except Exception as e:
+            self.logger.error(f"Error analyzing option chain for {symbol}: {e}")
+            return {"error": str(e)}
+    
+    async def analyze_full_chain(self, symbol: str) -> Dict:
+        """Tüm vadeler x strike'lar tek fiyatlama çağrısında"""
+        try:
+            if symbol not in self.underlying_assets:
+                return {"error": f"Symbol {symbol} not supported"}
             
-            # Calculate put options
-            for strike in strikes:
-                put_price = self.greeks_calculator.black_scholes_put(S, strike, T, r, sigma)
-                put_greeks = self.greeks_calculator.calculate_greeks(S, strike, T, r, sigma, 'put')
-                
-                option_chain['puts'].append({
-                    'strike': strike,
-                    'price': round(put_price, 2),
-                    'intrinsic_value': max(strike - S, 0),
-                    'time_value': round(put_price - max(strike - S, 0), 2),
-                    'moneyness': 'ITM' if S < strike else 'OTM' if S > strike else 'ATM',
-                    'greeks': put_greeks
-                })
+            underlying = self.underlying_assets[symbol]
+            S = underlying['price']
+            sigma = underlying['volatility']
+            r = self.risk_free_rate
+            
+            expirations = self.get_expiration_dates()
+            expiries = np.array([self.calculate_time_to_expiry(exp) for exp in expirations])
+            strikes = np.asarray(self.get_strike_prices(S))
+            
+            chain = price_chain(S, strikes, expiries, r, sigma)
             
-            return option_chain
+            return {
+                'symbol': symbol,
+                'underlying_price': S,
+                'risk_free_rate': r,
+                'volatility': sigma,
+                'expirations': [
+                    {
+                        'expiration_date': exp,
+                        'time_to_expiry': float(expiries[i]),
+                        'calls': self._chain_rows(S, strikes, {k: v[i] for k, v in chain['call'].items()}, 'call'),
+                        'puts': self._chain_rows(S, strikes, {k: v[i] for k, v in chain['put'].items()}, 'put')
+                    }
+                    for i, exp in enumerate(expirations)
+                ],
+                'last_update': datetime.now().isoformat()
+            }
             
         except Exception as e:
-            self.logger.error(f"Error analyzing option chain for {symbol}: {e}")
+            self.logger.error(f"Error analyzing full option chain for {symbol}: {e}")
             return {"error": str(e)}
     
     async def get_volatility_surface(self, symbol: str) -> Dict:
@@ -220,40 +223,28 @@ class OptionsAnalyzer:
             strikes = self.get_strike_prices(S, 15)
             expirations = self.get_expiration_dates()[:6]  # First 6 expirations
             
-            volatility_surface = {
+            # Volatility smile/skew simulation (strike ekseni)
+            j = np.arange(len(strikes))
+            moneyness = np.asarray(strikes) / S
+            smile = np.select(
+                [moneyness < 0.9, moneyness > 1.1],  # Deep OTM puts / Deep OTM calls
+                [1.2 + 0.1 * np.sin(j * 0.5), 1.1 + 0.05 * np.sin(j * 0.3)],
+                default=1.0 + 0.02 * np.sin(j * 0.2)  # ATM and near ATM
+            )
+            
+            # Time decay effect (vade ekseni), broadcast ile matris
+            term = 1 + 0.1 * np.arange(len(expirations)) / len(expirations)
+            vol_matrix = base_vol * smile[np.newaxis, :] * term[:, np.newaxis]
+            
+            return {
                 'symbol': symbol,
                 'underlying_price': S,
                 'strikes': strikes,
                 'expirations': expirations,
-                'volatility_matrix': [],
+                'volatility_matrix': np.round(vol_matrix, 4).tolist(),
                 'last_update': datetime.now().isoformat()
             }
             
-            # Generate volatility matrix (smile/skew effect)
-            for i, exp_date in enumerate(expirations):
-                T = self.calculate_time_to_expiry(exp_date)
-                vol_row = []
-                
-                for j, strike in enumerate(strikes):
-                    # Volatility smile/skew simulation
-                    moneyness = strike / S
-                    
-                    if moneyness < 0.9:  # Deep OTM puts
-                        vol = base_vol * (1.2 + 0.1 * np.sin(j * 0.5))
-                    elif moneyness > 1.1:  # Deep OTM calls
-                        vol = base_vol * (1.1 + 0.05 * np.sin(j * 0.3))
-                    else:  # ATM and near ATM
-                        vol = base_vol * (1.0 + 0.02 * np.sin(j * 0.2))
-                    
-                    # Time decay effect
-                    vol *= (1 + 0.1 * i / len(expirations))
-                    
-                    vol_row.append(round(vol, 4))
-                
-                volatility_surface['volatility_matrix'].append(vol_row)
-            
-            return volatility_surface
-            
         except Exception as e:
             self.logger.error(f"Error getting volatility surface for {symbol}: {e}")
             return {"error": str(e)}
@@ -303,23 +294,42 @@ class OptionsAnalyzer:
             self.logger.error(f"Error analyzing strategy for {symbol}: {e}")
             return {"error": str(e)}
     
+    def _price_legs(self, S: float, sigma: float, r: float, T: float,
+                    legs: List[Tuple[str, float]]) -> Tuple[List[float], List[Dict]]:
+        """Strateji bacaklarını (tip, strike) tek çağrıda fiyatla"""
+        result = black_scholes(S, [strike for _, strike in legs], T, r, sigma, [kind for kind, _ in legs])
+        return result['price'].tolist(), self.greeks_calculator.round_greeks(result)
+    
+    @staticmethod
+    def _pnl_points(price_range: np.ndarray, legs: List[Dict]) -> List[Dict]:
+        """Fiyat aralığı x bacak P&L eğrisi (broadcast)"""
+        pnl = payoff_grid(price_range, legs)
+        return [{'price': p, 'pnl': pl} for p, pl in zip(price_range.tolist(), pnl.tolist())]
+    
+    @staticmethod
+    def _combine_greeks(*weighted: Tuple[float, Dict]) -> Dict:
+        """Bacak Greeks'lerinin ağırlıklı toplamı (+1 uzun, -1 kısa)"""
+        return {
+            'delta': round(sum(w * g['delta'] for w, g in weighted), 4),
+            'gamma': round(sum(w * g['gamma'] for w, g in weighted), 6),
+            'theta': round(sum(w * g['theta'] for w, g in weighted), 4),
+            'vega': round(sum(w * g['vega'] for w, g in weighted), 4),
+            'rho': round(sum(w * g['rho'] for w, g in weighted), 4)
+        }
+    
     def _analyze_long_call(self, S: float, sigma: float, r: float, params: Dict) -> Dict:
         """Analyze long call strategy"""
         strike = params.get('strike', S)
         expiration = params.get('expiration', '2024-01-15')
         T = self.calculate_time_to_expiry(expiration)
         
-        call_price = self.greeks_calculator.black_scholes_call(S, strike, T, r, sigma)
-        call_greeks = self.greeks_calculator.calculate_greeks(S, strike, T, r, sigma, 'call')
+        (call_price,), (call_greeks,) = self._price_legs(S, sigma, r, T, [('call', strike)])
         
         # Profit/Loss analysis
         price_range = np.linspace(S * 0.7, S * 1.3, 50)
-        pnl = []
-        
-        for price in price_range:
-            intrinsic = max(price - strike, 0)
-            pnl_value = intrinsic - call_price
-            pnl.append(pnl_value)
+        profit_loss = self._pnl_points(price_range, [
+            {'type': 'call', 'strike': strike, 'premium': call_price, 'quantity': 1}
+        ])
         
         return {
             'analysis': {
@@ -329,7 +339,7 @@ class OptionsAnalyzer:
                 'max_loss': call_price
             },
             'greeks': call_greeks,
-            'profit_loss': [{'price': float(p), 'pnl': float(pl)} for p, pl in zip(price_range, pnl)],
+            'profit_loss': profit_loss,
             'breakeven_points': [strike + call_price],
             'max_profit': float('inf'),
             'max_loss': call_price
@@ -341,17 +351,13 @@ class OptionsAnalyzer:
         expiration = params.get('expiration', '2024-01-15')
         T = self.calculate_time_to_expiry(expiration)
         
-        put_price = self.greeks_calculator.black_scholes_put(S, strike, T, r, sigma)
-        put_greeks = self.greeks_calculator.calculate_greeks(S, strike, T, r, sigma, 'put')
+        (put_price,), (put_greeks,) = self._price_legs(S, sigma, r, T, [('put', strike)])
         
         # Profit/Loss analysis
         price_range = np.linspace(S * 0.7, S * 1.3, 50)
-        pnl = []
-        
-        for price in price_range:
-            intrinsic = max(strike - price, 0)
-            pnl_value = intrinsic - put_price
-            pnl.append(pnl_value)
+        profit_loss = self._pnl_points(price_range, [
+            {'type': 'put', 'strike': strike, 'premium': put_price, 'quantity': 1}
+        ])
         
         return {
             'analysis': {
@@ -361,7 +367,7 @@ class OptionsAnalyzer:
                 'max_loss': put_price
             },
             'greeks': put_greeks,
-            'profit_loss': [{'price': float(p), 'pnl': float(pl)} for p, pl in zip(price_range, pnl)],
+            'profit_loss': profit_loss,
             'breakeven_points': [strike - put_price],
             'max_profit': strike - put_price,
             'max_loss': put_price
@@ -373,24 +379,18 @@ class OptionsAnalyzer:
         expiration = params.get('expiration', '2024-01-15')
         T = self.calculate_time_to_expiry(expiration)
         
-        call_price = self.greeks_calculator.black_scholes_call(S, strike, T, r, sigma)
-        call_greeks = self.greeks_calculator.calculate_greeks(S, strike, T, r, sigma, 'call')
+        (call_price,), (call_greeks,) = self._price_legs(S, sigma, r, T, [('call', strike)])
         
-        # Covered call Greeks (stock + short call)
-        total_delta = 1.0 - call_greeks['delta']  # Long stock, short call
-        total_gamma = -call_greeks['gamma']
-        total_theta = -call_greeks['theta']
-        total_vega = -call_greeks['vega']
+        # Covered call Greeks (long stock + short call)
+        stock_greeks = {'delta': 1.0, 'gamma': 0.0, 'theta': 0.0, 'vega': 0.0, 'rho': 0.0}
+        greeks = self._combine_greeks((1, stock_greeks), (-1, call_greeks))
         
         # Profit/Loss analysis
         price_range = np.linspace(S * 0.8, S * 1.2, 50)
-        pnl = []
-        
-        for price in price_range:
-            stock_pnl = price - S
-            call_pnl = call_price - max(price - strike, 0)
-            total_pnl = stock_pnl + call_pnl
-            pnl.append(total_pnl)
+        profit_loss = self._pnl_points(price_range, [
+            {'type': 'stock', 'strike': S, 'quantity': 1},
+            {'type': 'call', 'strike': strike, 'premium': call_price, 'quantity': -1}
+        ])
         
         return {
             'analysis': {
@@ -399,14 +399,8 @@ class OptionsAnalyzer:
                 'max_profit': strike - S + call_price,
                 'max_loss': 'Unlimited (if stock falls)'
             },
-            'greeks': {
-                'delta': round(total_delta, 4),
-                'gamma': round(total_gamma, 6),
-                'theta': round(total_theta, 4),
-                'vega': round(total_vega, 4),
-                'rho': round(-call_greeks['rho'], 4)
-            },
-            'profit_loss': [{'price': float(p), 'pnl': float(pl)} for p, pl in zip(price_range, pnl)],
+            'greeks': greeks,
+            'profit_loss': profit_loss,
             'breakeven_points': [S - call_price],
             'max_profit': strike - S + call_price,
             'max_loss': float('-inf')
@@ -418,24 +412,18 @@ class OptionsAnalyzer:
         expiration = params.get('expiration', '2024-01-15')
         T = self.calculate_time_to_expiry(expiration)
         
-        put_price = self.greeks_calculator.black_scholes_put(S, strike, T, r, sigma)
-        put_greeks = self.greeks_calculator.calculate_greeks(S, strike, T, r, sigma, 'put')
+        (put_price,), (put_greeks,) = self._price_legs(S, sigma, r, T, [('put', strike)])
         
-        # Protective put Greeks (stock + long put)
-        total_delta = 1.0 + put_greeks['delta']
-        total_gamma = put_greeks['gamma']
-        total_theta = put_greeks['theta']
-        total_vega = put_greeks['vega']
+        # Protective put Greeks (long stock + long put)
+        stock_greeks = {'delta': 1.0, 'gamma': 0.0, 'theta': 0.0, 'vega': 0.0, 'rho': 0.0}
+        greeks = self._combine_greeks((1, stock_greeks), (1, put_greeks))
         
         # Profit/Loss analysis
         price_range = np.linspace(S * 0.8, S * 1.2, 50)
-        pnl = []
-        
-        for price in price_range:
-            stock_pnl = price - S
-            put_pnl = max(strike - price, 0) - put_price
-            total_pnl = stock_pnl + put_pnl
-            pnl.append(total_pnl)
+        profit_loss = self._pnl_points(price_range, [
+            {'type': 'stock', 'strike': S, 'quantity': 1},
+            {'type': 'put', 'strike': strike, 'premium': put_price, 'quantity': 1}
+        ])
         
         return {
             'analysis': {
@@ -444,14 +432,8 @@ class OptionsAnalyzer:
                 'max_profit': 'Unlimited (if stock rises)',
                 'max_loss': S - strike + put_price
             },
-            'greeks': {
-                'delta': round(total_delta, 4),
-                'gamma': round(total_gamma, 6),
-                'theta': round(total_theta, 4),
-                'vega': round(total_vega, 4),
-                'rho': round(put_greeks['rho'], 4)
-            },
-            'profit_loss': [{'price': float(p), 'pnl': float(pl)} for p, pl in zip(price_range, pnl)],
+            'greeks': greeks,
+            'profit_loss': profit_loss,
             'breakeven_points': [S + put_price],
             'max_profit': float('inf'),
             'max_loss': S - strike + put_price
@@ -463,29 +445,20 @@ class OptionsAnalyzer:
         expiration = params.get('expiration', '2024-01-15')
         T = self.calculate_time_to_expiry(expiration)
         
-        call_price = self.greeks_calculator.black_scholes_call(S, strike, T, r, sigma)
-        put_price = self.greeks_calculator.black_scholes_put(S, strike, T, r, sigma)
-        
-        call_greeks = self.greeks_calculator.calculate_greeks(S, strike, T, r, sigma, 'call')
-        put_greeks = self.greeks_calculator.calculate_greeks(S, strike, T, r, sigma, 'put')
+        (call_price, put_price), (call_greeks, put_greeks) = self._price_legs(
+            S, sigma, r, T, [('call', strike), ('put', strike)]
+        )
         
         # Straddle Greeks (long call + long put)
-        total_delta = call_greeks['delta'] + put_greeks['delta']
-        total_gamma = call_greeks['gamma'] + put_greeks['gamma']
-        total_theta = call_greeks['theta'] + put_greeks['theta']
-        total_vega = call_greeks['vega'] + put_greeks['vega']
-        
+        greeks = self._combine_greeks((1, call_greeks), (1, put_greeks))
         total_cost = call_price + put_price
         
         # Profit/Loss analysis
         price_range = np.linspace(S * 0.7, S * 1.3, 50)
-        pnl = []
-        
-        for price in price_range:
-            call_pnl = max(price - strike, 0) - call_price
-            put_pnl = max(strike - price, 0) - put_price
-            total_pnl = call_pnl + put_pnl
-            pnl.append(total_pnl)
+        profit_loss = self._pnl_points(price_range, [
+            {'type': 'call', 'strike': strike, 'premium': call_price, 'quantity': 1},
+            {'type': 'put', 'strike': strike, 'premium': put_price, 'quantity': 1}
+        ])
         
         return {
             'analysis': {
@@ -495,14 +468,8 @@ class OptionsAnalyzer:
                 'max_profit': 'Unlimited (in both directions)',
                 'max_loss': total_cost
             },
-            'greeks': {
-                'delta': round(total_delta, 4),
-                'gamma': round(total_gamma, 6),
-                'theta': round(total_theta, 4),
-                'vega': round(total_vega, 4),
-                'rho': round(call_greeks['rho'] + put_greeks['rho'], 4)
-            },
-            'profit_loss': [{'price': float(p), 'pnl': float(pl)} for p, pl in zip(price_range, pnl)],
+            'greeks': greeks,
+            'profit_loss': profit_loss,
             'breakeven_points': [strike - total_cost, strike + total_cost],
             'max_profit': float('inf'),
             'max_loss': total_cost
@@ -515,29 +482,20 @@ class OptionsAnalyzer:
         expiration = params.get('expiration', '2024-01-15')
         T = self.calculate_time_to_expiry(expiration)
         
-        call_price = self.greeks_calculator.black_scholes_call(S, call_strike, T, r, sigma)
-        put_price = self.greeks_calculator.black_scholes_put(S, put_strike, T, r, sigma)
-        
-        call_greeks = self.greeks_calculator.calculate_greeks(S, call_strike, T, r, sigma, 'call')
-        put_greeks = self.greeks_calculator.calculate_greeks(S, put_strike, T, r, sigma, 'put')
+        (call_price, put_price), (call_greeks, put_greeks) = self._price_legs(
+            S, sigma, r, T, [('call', call_strike), ('put', put_strike)]
+        )
         
         # Strangle Greeks (long call + long put)
-        total_delta = call_greeks['delta'] + put_greeks['delta']
-        total_gamma = call_greeks['gamma'] + put_greeks['gamma']
-        total_theta = call_greeks['theta'] + put_greeks['theta']
-        total_vega = call_greeks['vega'] + put_greeks['vega']
-        
+        greeks = self._combine_greeks((1, call_greeks), (1, put_greeks))
         total_cost = call_price + put_price
         
         # Profit/Loss analysis
         price_range = np.linspace(S * 0.7, S * 1.3, 50)
-        pnl = []
-        
-        for price in price_range:
-            call_pnl = max(price - call_strike, 0) - call_price
-            put_pnl = max(put_strike - price, 0) - put_price
-            total_pnl = call_pnl + put_pnl
-            pnl.append(total_pnl)
+        profit_loss = self._pnl_points(price_range, [
+            {'type': 'call', 'strike': call_strike, 'premium': call_price, 'quantity': 1},
+            {'type': 'put', 'strike': put_strike, 'premium': put_price, 'quantity': 1}
+        ])
         
         return {
             'analysis': {
@@ -547,14 +505,8 @@ class OptionsAnalyzer:
                 'max_profit': 'Unlimited (in both directions)',
                 'max_loss': total_cost
             },
-            'greeks': {
-                'delta': round(total_delta, 4),
-                'gamma': round(total_gamma, 6),
-                'theta': round(total_theta, 4),
-                'vega': round(total_vega, 4),
-                'rho': round(call_greeks['rho'] + put_greeks['rho'], 4)
-            },
-            'profit_loss': [{'price': float(p), 'pnl': float(pl)} for p, pl in zip(price_range, pnl)],
+            'greeks': greeks,
+            'profit_loss': profit_loss,
             'breakeven_points': [put_strike - total_cost, call_strike + total_cost],
             'max_profit': float('inf'),
             'max_loss': total_cost
@@ -570,32 +522,23 @@ class OptionsAnalyzer:
         expiration = params.get('expiration', '2024-01-15')
         T = self.calculate_time_to_expiry(expiration)
         
-        # Calculate option prices
-        call_short_price = self.greeks_calculator.black_scholes_call(S, call_strike_short, T, r, sigma)
-        call_long_price = self.greeks_calculator.black_scholes_call(S, call_strike_long, T, r, sigma)
-        put_short_price = self.greeks_calculator.black_scholes_put(S, put_strike_short, T, r, sigma)
-        put_long_price = self.greeks_calculator.black_scholes_put(S, put_strike_long, T, r, sigma)
+        # Calculate option prices (4 bacak tek çağrıda)
+        (call_short_price, call_long_price, put_short_price, put_long_price), _ = self._price_legs(
+            S, sigma, r, T, [('call', call_strike_short), ('call', call_strike_long),
+                             ('put', put_strike_short), ('put', put_strike_long)]
+        )
         
         # Net credit received
         net_credit = call_short_price - call_long_price + put_short_price - put_long_price
         
         # Profit/Loss analysis
         price_range = np.linspace(S * 0.9, S * 1.1, 50)
-        pnl = []
-        
-        for price in price_range:
-            # Call spread P&L
-            call_spread_pnl = (call_short_price - call_long_price) - (
-                max(price - call_strike_short, 0) - max(price - call_strike_long, 0)
-            )
-            
-            # Put spread P&L
-            put_spread_pnl = (put_short_price - put_long_price) - (
-                max(put_strike_short - price, 0) - max(put_strike_long - price, 0)
-            )
-            
-            total_pnl = call_spread_pnl + put_spread_pnl
-            pnl.append(total_pnl)
+        profit_loss = self._pnl_points(price_range, [
+            {'type': 'call', 'strike': call_strike_short, 'premium': call_short_price, 'quantity': -1},
+            {'type': 'call', 'strike': call_strike_long, 'premium': call_long_price, 'quantity': 1},
+            {'type': 'put', 'strike': put_strike_short, 'premium': put_short_price, 'quantity': -1},
+            {'type': 'put', 'strike': put_strike_long, 'premium': put_long_price, 'quantity': 1}
+        ])
         
         return {
             'analysis': {
@@ -611,7 +554,7 @@ class OptionsAnalyzer:
                 'vega': 0.0,
                 'rho': 0.0
             },
-            'profit_loss': [{'price': float(p), 'pnl': float(pl)} for p, pl in zip(price_range, pnl)],
+            'profit_loss': profit_loss,
             'breakeven_points': [put_strike_short - net_credit, call_strike_short + net_credit],
             'max_profit': net_credit,
             'max_loss': (call_strike_long - call_strike_short) - net_credit
@@ -14,6 +14,11 @@ from dataclasses import dataclass
 from enum import Enum
 import json
 
+try:
+    from correlation_engine import correlation_engine
+except ImportError:
+    from backend.correlation_engine import correlation_engine
+
 class OptimizationMethod(Enum):
     MEAN_VARIANCE = "Mean Variance"
     RISK_PARITY = "Risk Parity"
@@ -93,7 +98,7 @@ class PortfolioOptimizer:
             
             # Calculate returns and correlations
             returns_matrix = self._calculate_returns_matrix(symbols)
-            correlation_matrix = returns_matrix.corr()
+            correlation_matrix = correlation_engine.correlation_matrix(returns_matrix)
             covariance_matrix = returns_matrix.cov()
             
             # Calculate expected returns and volatilities
@@ -20,6 +20,11 @@ except ImportError:
     TALIB_AVAILABLE = False
     logging.warning("⚠️ ta-lib bulunamadı, basit teknik analiz implementasyonu kullanılacak")
 
+try:
+    from candlestick_engine import CandleFeatures, CandlestickEngine
+except ImportError:
+    from backend.candlestick_engine import CandleFeatures, CandlestickEngine
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -154,11 +159,8 @@ class TechnicalFormationEngine:
             df['ATR'] = true_range.rolling(14).mean()
             
             # Basit candlestick patternleri
-            df['bullish_engulfing'] = self._detect_bullish_engulfing(df)
-            df['bearish_engulfing'] = self._detect_bearish_engulfing(df)
-            df['hammer'] = self._detect_hammer(df)
-            df['shooting_star'] = self._detect_shooting_star(df)
-            df['doji'] = self._detect_doji(df)
+            for name, column in self._candlestick_columns(df).items():
+                df[name] = column
             
             return df
             
@@ -166,104 +168,47 @@ class TechnicalFormationEngine:
             logger.error(f"❌ Basit teknik indikatör hatası: {e}")
             return df
     
+    def _candle_features(self, df: pd.DataFrame) -> CandleFeatures:
+        """Gövde/gölge kolonları (tüm mum formasyonları için bir kez)"""
+        return CandleFeatures.from_arrays(df['Open'], df['High'], df['Low'], df['Close'])
+
+    def _candlestick_columns(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """Basit candlestick formasyonlarını tek geçişte hesapla"""
+        try:
+            f = self._candle_features(df)
+            with np.errstate(invalid='ignore'):
+                masks = {
+                    'bullish_engulfing': CandlestickEngine.bullish_engulfing(f, min_body_ratio=1.1),
+                    'bearish_engulfing': CandlestickEngine.bearish_engulfing(f, min_body_ratio=1.1),
+                    'hammer': CandlestickEngine.hammer(f),
+                    'shooting_star': CandlestickEngine.shooting_star(f),
+                    'doji': CandlestickEngine.doji(f)
+                }
+            return {name: pd.Series(mask.astype(int), index=df.index) for name, mask in masks.items()}
+        except Exception as e:
+            logger.error(f"❌ Candlestick tespit hatası: {e}")
+            return {name: pd.Series([0] * len(df)) for name in
+                    ('bullish_engulfing', 'bearish_engulfing', 'hammer', 'shooting_star', 'doji')}
+
     def _detect_bullish_engulfing(self, df: pd.DataFrame) -> pd.Series:
         """Bullish Engulfing pattern tespiti"""
-        try:
-            prev_open = df['Open'].shift(1)
-            prev_close = df['Close'].shift(1)
-            prev_body = abs(prev_close - prev_open)
-            curr_body = abs(df['Close'] - df['Open'])
-            
-            condition = (
-                (prev_close < prev_open) &  # Önceki mum düşüş
-                (df['Close'] > df['Open']) &  # Mevcut mum yükseliş
-                (df['Open'] < prev_close) &  # Mevcut açılış önceki kapanıştan düşük
-                (df['Close'] > prev_open) &  # Mevcut kapanış önceki açılıştan yüksek
-                (curr_body > prev_body * 1.1)  # Mevcut gövde öncekinden %10 daha büyük
-            )
-            
-            return condition.astype(int)
-            
-        except Exception as e:
-            logger.error(f"❌ Bullish Engulfing tespit hatası: {e}")
-            return pd.Series([0] * len(df))
+        return self._candlestick_columns(df)['bullish_engulfing']
     
     def _detect_bearish_engulfing(self, df: pd.DataFrame) -> pd.Series:
         """Bearish Engulfing pattern tespiti"""
-        try:
-            prev_open = df['Open'].shift(1)
-            prev_close = df['Close'].shift(1)
-            prev_body = abs(prev_close - prev_open)
-            curr_body = abs(df['Close'] - df['Open'])
-            
-            condition = (
-                (prev_close > prev_open) &  # Önceki mum yükseliş
-                (df['Close'] < df['Open']) &  # Mevcut mum düşüş
-                (df['Open'] > prev_close) &  # Mevcut açılış önceki kapanıştan yüksek
-                (df['Close'] < prev_open) &  # Mevcut kapanış önceki açılıştan düşük
-                (curr_body > prev_body * 1.1)  # Mevcut gövde öncekinden %10 daha büyük
-            )
-            
-            return condition.astype(int)
-            
-        except Exception as e:
-            logger.error(f"❌ Bearish Engulfing tespit hatası: {e}")
-            return pd.Series([0] * len(df))
+        return self._candlestick_columns(df)['bearish_engulfing']
     
     def _detect_hammer(self, df: pd.DataFrame) -> pd.Series:
         """Hammer pattern tespiti"""
-        try:
-            body = abs(df['Close'] - df['Open'])
-            upper_shadow = df['High'] - np.maximum(df['Open'], df['Close'])
-            lower_shadow = np.minimum(df['Open'], df['Close']) - df['Low']
-            
-            condition = (
-                (lower_shadow > body * 2) &  # Alt gölge gövdeden 2 kat uzun
-                (upper_shadow < body * 0.5) &  # Üst gölge gövdenin yarısından kısa
-                (body > 0)  # Pozitif gövde
-            )
-            
-            return condition.astype(int)
-            
-        except Exception as e:
-            logger.error(f"❌ Hammer tespit hatası: {e}")
-            return pd.Series([0] * len(df))
+        return self._candlestick_columns(df)['hammer']
     
     def _detect_shooting_star(self, df: pd.DataFrame) -> pd.Series:
         """Shooting Star pattern tespiti"""
-        try:
-            body = abs(df['Close'] - df['Open'])
-            upper_shadow = df['High'] - np.maximum(df['Open'], df['Close'])
-            lower_shadow = np.minimum(df['Open'], df['Close']) - df['Low']
-            
-            condition = (
-                (upper_shadow > body * 2) &  # Üst gölge gövdeden 2 kat uzun
-                (lower_shadow < body * 0.5) &  # Alt gölge gövdenin yarısından kısa
-                (body > 0)  # Pozitif gövde
-            )
-            
-            return condition.astype(int)
-            
-        except Exception as e:
-            logger.error(f"❌ Shooting Star tespit hatası: {e}")
-            return pd.Series([0] * len(df))
+        return self._candlestick_columns(df)['shooting_star']
     
     def _detect_doji(self, df: pd.DataFrame) -> pd.Series:
         """Doji pattern tespiti"""
-        try:
-            body = abs(df['Close'] - df['Open'])
-            total_range = df['High'] - df['Low']
-            
-            condition = (
-                (body < total_range * 0.1) &  # Gövde toplam aralığın %10'undan küçük
-                (total_range > 0)  # Pozitif aralık
-            )
-            
-            return condition.astype(int)
-            
-        except Exception as e:
-            logger.error(f"❌ Doji tespit hatası: {e}")
-            return pd.Series([0] * len(df))
+        return self._candlestick_columns(df)['doji']
     
     def detect_ema_cross(self, df: pd.DataFrame) -> List[Dict]:
         """EMA kesişim formasyonlarını tespit et"""
@@ -0,0 +1,186 @@
+"""
+Signal Recorder - production_websocket sunucuları için kalıcı sinyal kaydı
+
+- RollingAccuracy: sabit pencerede O(1) başarı oranı (her tick'te sum() yok)
+- SignalRecorder: tek kalıcı WAL bağlantısı, tick başına tek executemany,
+  tamamlanan saatlerin (saat, sembol) özetlerine periyodik rollup ve
+  saklama süresi dolan ham satırların temizlenmesi
+- broadcast: mesaj bir kez JSON'a çevrilir, istemcilere eşzamanlı gönderilir
+
+Haftalarca açık kalan sunucularda bellek ve tick süresi sabit kalır.
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import deque
+from typing import Any, Deque, Iterable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+RETENTION_DAYS = float(os.getenv("AI_SIGNAL_RETENTION_DAYS", "30"))
+SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "2.0"))
+
+_ROLLUP_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_ai_signals_timestamp ON ai_signals(timestamp);
+CREATE TABLE IF NOT EXISTS ai_signal_rollups (
+    bucket TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    signals INTEGER NOT NULL,
+    successes INTEGER NOT NULL,
+    avg_confidence REAL,
+    PRIMARY KEY (bucket, symbol)
+);
+"""
+
+_BUCKET_FORMAT = "%Y-%m-%dT%H"
+
+
+class RollingAccuracy:
+    """Son `window` sonucun başarı oranı; ekleme ve okuma O(1)"""
+
+    def __init__(self, window: int):
+        self.results: Deque[int] = deque(maxlen=window)
+        self.hits = 0
+
+    def append(self, success: int):
+        if len(self.results) == self.results.maxlen:
+            self.hits -= self.results[0]
+        self.results.append(success)
+        self.hits += success
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __bool__(self) -> bool:
+        return bool(self.results)
+
+    @property
+    def percent(self) -> float:
+        return round(self.hits / len(self.results) * 100, 2) if self.results else 0
+
+
+class SignalRecorder:
+    """ai_signals tablosuna toplu yazım ve saatlik rollup"""
+
+    def __init__(self, db_path: str, columns: Sequence[str], retention_days: float = RETENTION_DAYS):
+        self.db_path = db_path
+        self.columns = tuple(columns)
+        self.retention_days = retention_days
+        self.insert_sql = (
+            f"INSERT INTO ai_signals ({', '.join(self.columns)}) "
+            f"VALUES ({', '.join('?' * len(self.columns))})"
+        )
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._watermark: Optional[str] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+        return self._conn
+
+    def ensure_schema(self, create_table_sql: str):
+        """Sunucunun ai_signals şeması + timestamp index'i + rollup tablosu"""
+        with self._lock, self.conn:
+            self.conn.execute(create_table_sql)
+            self.conn.executescript(_ROLLUP_SCHEMA)
+            row = self.conn.execute("SELECT MAX(bucket) FROM ai_signal_rollups").fetchone()
+            self._watermark = row[0]
+
+    def write(self, rows: Iterable[Sequence[Any]]) -> int:
+        """Bir tick'in sinyalleri: tek transaction, tek executemany"""
+        rows = list(rows)
+        if not rows:
+            return 0
+        with self._lock, self.conn:
+            self.conn.executemany(self.insert_sql, rows)
+        return len(rows)
+
+    def rollup(self) -> int:
+        """Tamamlanmış saatleri özetle, saklama süresini aşan ham satırları sil"""
+        now = datetime.datetime.now()
+        current = now.strftime(_BUCKET_FORMAT)
+        with self._lock, self.conn:
+            since = ""
+            if self._watermark:
+                # Son özetlenen saat yeniden hesaplanmaz (ham satırları silinmiş olabilir)
+                since = (datetime.datetime.strptime(self._watermark, _BUCKET_FORMAT)
+                         + datetime.timedelta(hours=1)).strftime(_BUCKET_FORMAT)
+            if since >= current:
+                return 0
+            cursor = self.conn.execute(
+                """
+                INSERT OR REPLACE INTO ai_signal_rollups (bucket, symbol, signals, successes, avg_confidence)
+                SELECT substr(timestamp, 1, 13), symbol, COUNT(*), SUM(success), AVG(confidence)
+                FROM ai_signals
+                WHERE timestamp >= ? AND timestamp < ?
+                GROUP BY substr(timestamp, 1, 13), symbol
+                """,
+                (since, current),
+            )
+            rolled = cursor.rowcount
+            self._watermark = self.conn.execute("SELECT MAX(bucket) FROM ai_signal_rollups").fetchone()[0]
+
+            pruned = 0
+            if self.retention_days > 0:
+                cutoff = (now - datetime.timedelta(days=self.retention_days)).isoformat()
+                pruned = self.conn.execute(
+                    "DELETE FROM ai_signals WHERE timestamp < ? AND timestamp < ?", (cutoff, current)
+                ).rowcount
+        if rolled or pruned:
+            logger.info(f"🗂️ Rollup: {rolled} saat/sembol özeti, {pruned} eski sinyal silindi")
+        return rolled
+
+    async def rollup_async(self) -> int:
+        """Rollup'ı event loop'u bloklamadan çalıştır"""
+        return await asyncio.to_thread(self.rollup)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+async def _drop(ws: Any, timeout: float):
+    """Bağlantıyı kapat: yavaş istemcinin kapanış el sıkışması beklenmez, transport kesilir"""
+    try:
+        transport = getattr(ws, 'transport', None)
+        if transport is not None:
+            transport.abort()
+        else:
+            await asyncio.wait_for(ws.close(), timeout)
+    except Exception as e:
+        logger.debug(f"WebSocket kapatma hatası: {e}")
+
+
+async def broadcast(clients: set, message: Any, timeout: float = SEND_TIMEOUT) -> int:
+    """Mesajı bir kez kodla, tüm istemcilere eşzamanlı gönder; hata/zaman aşımındakileri çıkarıp kapat"""
+    if not clients:
+        return 0
+    data = json.dumps(message, ensure_ascii=False)
+    targets = list(clients)
+    results = await asyncio.gather(
+        *(asyncio.wait_for(ws.send(data), timeout) for ws in targets),
+        return_exceptions=True,
+    )
+    sent = 0
+    dropped = []
+    for ws, result in zip(targets, results):
+        if isinstance(result, BaseException):
+            clients.discard(ws)
+            dropped.append(ws)
+        else:
+            sent += 1
+    if dropped:
+        await asyncio.gather(*(_drop(ws, timeout) for ws in dropped))
+    return sent
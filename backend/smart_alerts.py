@@ -15,6 +15,10 @@ import pandas as pd
 from typing import Dict, List, Tuple, Optional, Union, Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+import heapq
+import itertools
+import time
 import json
 import asyncio
 from enum import Enum
@@ -62,6 +66,55 @@ class AlertRule:
     actions: List[str]
     is_active: bool = True
     priority: int = 1
+    asset: Optional[str] = None  # None: tüm varlıklar
+    
+    # Alan atamaları (rule.priority = ...) sayılır; kural indeksi bayatlığını buradan anlar
+    _edits = 0
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        AlertRule._edits += 1
+
+def compile_rule_conditions(rule: AlertRule) -> Callable[[Dict], bool]:
+    """Kural koşullarını tek seferde derlenmiş bir predicate'e dönüştür"""
+    conditions = rule.conditions
+    checks: List[Callable[[Dict], bool]] = []
+    
+    if rule.type == AlertType.PRICE:
+        if "price_change_pct" in conditions:
+            min_change = conditions["price_change_pct"]
+            checks.append(lambda data: data.get("price_change_pct", 0) >= min_change)
+        # volume_increase: volume verisi uyarıda yok (basit yaklaşım)
+    
+    elif rule.type == AlertType.PATTERN:
+        if "pattern_types" in conditions:
+            try:
+                allowed = frozenset(conditions["pattern_types"])
+            except TypeError:
+                allowed = tuple(conditions["pattern_types"])
+            checks.append(lambda data: data.get("pattern_type") in allowed)
+        if "confidence_threshold" in conditions:
+            min_confidence = conditions["confidence_threshold"]
+            checks.append(lambda data: data.get("confidence", 0) >= min_confidence)
+    
+    elif rule.type == AlertType.RISK:
+        if "var_threshold" in conditions:
+            min_value = conditions["var_threshold"]
+            checks.append(lambda data: data.get("current_value", 0) >= min_value)
+    
+    elif rule.type == AlertType.NEWS:
+        if "sentiment_threshold" in conditions:
+            min_sentiment = conditions["sentiment_threshold"]
+            checks.append(lambda data: abs(data.get("sentiment_score", 0)) >= min_sentiment)
+        if "impact_threshold" in conditions:
+            min_impact = conditions["impact_threshold"]
+            checks.append(lambda data: data.get("impact_score", 0) >= min_impact)
+    
+    if not checks:
+        return lambda data: True
+    if len(checks) == 1:
+        return checks[0]
+    return lambda data: all(check(data) for check in checks)
 
 class SmartAlerts:
     """
@@ -84,9 +137,25 @@ class SmartAlerts:
         """
         self.notification_callback = notification_callback
         self.alerts: List[Alert] = []
-        self.alert_rules: List[AlertRule] = []
+        self._alert_rules: List[AlertRule] = []
         self.alert_counter = 0
         
+        # Kural indeksi: (AlertType, asset) -> öncelik sıralı (kural, predicate)
+        self._rule_index: Dict[Tuple[AlertType, Optional[str]], List[Tuple[AlertRule, Callable]]] = {}
+        self._merged_rules: Dict[Tuple[AlertType, str], List[Tuple[AlertRule, Callable]]] = {}
+        # Kural listesi sürümü: her ekleme/güncelleme/silme artırır, indeks buna göre tazelenir
+        self._rules_version = 0
+        self._indexed_version: Tuple[int, int] = (-1, -1)
+        # İndekslendiği andaki koşulların kopyası (rule.conditions yerinde düzenlenirse)
+        self._indexed_conditions: Dict[int, Dict] = {}
+        
+        # Uyarı indeksleri ve süre dolumu heap'i
+        self._alerts_by_id: Dict[str, Alert] = {}
+        self._active_alerts: Dict[str, Alert] = {}
+        self._active_by_asset: Dict[str, Dict[str, Alert]] = defaultdict(dict)
+        self._expiry_heap: List[Tuple[datetime, int, str]] = []
+        self._expiry_seq = itertools.count()
+        
         # Varsayılan uyarı kuralları
         self._setup_default_rules()
         
@@ -145,7 +214,7 @@ class SmartAlerts:
             )
         ]
         
-        self.alert_rules.extend(default_rules)
+        self.add_rules(default_rules)
     
     def create_price_alert(self, asset: str, price: float, 
                           alert_type: str = "breakout",
@@ -203,7 +272,7 @@ class SmartAlerts:
             expires_at=datetime.now() + timedelta(days=1)
         )
         
-        self.alerts.append(alert)
+        self._register_alert(alert)
         self._process_alert(alert)
         
         return alert
@@ -269,7 +338,7 @@ class SmartAlerts:
             expires_at=datetime.now() + timedelta(hours=6)
         )
         
-        self.alerts.append(alert)
+        self._register_alert(alert)
         self._process_alert(alert)
         
         return alert
@@ -331,7 +400,7 @@ class SmartAlerts:
             expires_at=datetime.now() + timedelta(hours=12)
         )
         
-        self.alerts.append(alert)
+        self._register_alert(alert)
         self._process_alert(alert)
         
         return alert
@@ -399,7 +468,7 @@ class SmartAlerts:
             expires_at=datetime.now() + timedelta(hours=2)
         )
         
-        self.alerts.append(alert)
+        self._register_alert(alert)
         self._process_alert(alert)
         
         return alert
@@ -455,7 +524,7 @@ class SmartAlerts:
             expires_at=datetime.now() + timedelta(hours=4)
         )
         
-        self.alerts.append(alert)
+        self._register_alert(alert)
         self._process_alert(alert)
         
         return alert
@@ -478,68 +547,96 @@ class SmartAlerts:
         # Uyarıyı geçmişe ekle
         self.alert_history.append(alert)
     
+    def _register_alert(self, alert: Alert):
+        """Uyarıyı listeye ve indekslere ekle"""
+        self.alerts.append(alert)
+        self._alerts_by_id[alert.id] = alert
+        if alert.is_active:
+            self._active_alerts[alert.id] = alert
+            self._active_by_asset[alert.asset][alert.id] = alert
+        if alert.expires_at is not None:
+            heapq.heappush(self._expiry_heap, (alert.expires_at, next(self._expiry_seq), alert.id))
+    
+    @property
+    def alert_rules(self) -> Tuple[AlertRule, ...]:
+        """Kuralların salt okunur görünümü (ekleme/silme add/update/remove yollarından)"""
+        return tuple(self._alert_rules)
+    
+    @alert_rules.setter
+    def alert_rules(self, rules: List[AlertRule]):
+        self._alert_rules = list(rules)
+        self._rules_version += 1
+    
+    def add_rule(self, rule: AlertRule):
+        """Kural ekle (indeks ilk eşleştirmede yeniden kurulur)"""
+        self._alert_rules.append(rule)
+        self._rules_version += 1
+    
+    def add_rules(self, rules: List[AlertRule]):
+        """Toplu kural ekle (tek sürüm artışı)"""
+        self._alert_rules.extend(rules)
+        self._rules_version += 1
+    
+    def update_rule(self, rule_id: str, **changes) -> bool:
+        """Kural alanlarını güncelle (öncelik, koşullar, varlık, ...)"""
+        for rule in self._alert_rules:
+            if rule.id == rule_id:
+                for name, value in changes.items():
+                    setattr(rule, name, value)
+                self._rules_version += 1
+                return True
+        return False
+    
+    def remove_rule(self, rule_id: str):
+        """Kuralı kaldır (indeks ilk eşleştirmede yeniden kurulur)"""
+        self._alert_rules = [r for r in self._alert_rules if r.id != rule_id]
+        self._rules_version += 1
+    
+    def rebuild_rule_index(self):
+        """Kuralları (tür, varlık) anahtarıyla indeksle ve önceliğe göre sırala"""
+        index: Dict[Tuple[AlertType, Optional[str]], List[Tuple[AlertRule, Callable]]] = defaultdict(list)
+        # Stabil sıralama: eşit öncelikte ekleme sırası korunur
+        for rule in sorted(self._alert_rules, key=lambda r: r.priority, reverse=True):
+            index[(rule.type, rule.asset)].append((rule, compile_rule_conditions(rule)))
+        self._rule_index = dict(index)
+        self._merged_rules = {}
+        self._indexed_conditions = {id(rule): dict(rule.conditions) for rule in self._alert_rules}
+        self._indexed_version = (self._rules_version, AlertRule._edits)
+    
+    def _rules_for(self, alert_type: AlertType, asset: str) -> List[Tuple[AlertRule, Callable]]:
+        """Genel + varlığa özel kuralların öncelik sıralı birleşimi (önbellekli)"""
+        if self._indexed_version != (self._rules_version, AlertRule._edits):
+            self.rebuild_rule_index()
+        
+        key = (alert_type, asset)
+        merged = self._merged_rules.get(key)
+        if merged is not None and any(rule.conditions != self._indexed_conditions.get(id(rule))
+                                      for rule, _ in merged):
+            self.rebuild_rule_index()
+            merged = None
+        if merged is None:
+            general = self._rule_index.get((alert_type, None), [])
+            specific = self._rule_index.get(key, []) if asset is not None else []
+            if not specific:
+                merged = general
+            else:
+                order = {id(rule): i for i, rule in enumerate(self._alert_rules)}
+                merged = sorted(general + specific,
+                                key=lambda item: (-item[0].priority, order.get(id(item[0]), 0)))
+            self._merged_rules[key] = merged
+        return merged
+    
     def _find_matching_rules(self, alert: Alert) -> List[AlertRule]:
-        """Uyarıya uygun kuralları bul"""
-        matching_rules = []
-        
-        for rule in self.alert_rules:
-            if not rule.is_active:
-                continue
-                
-            if rule.type != alert.type:
-                continue
-            
-            # Kural koşullarını kontrol et
-            if self._check_rule_conditions(rule, alert):
-                matching_rules.append(rule)
-        
-        # Önceliğe göre sırala
-        matching_rules.sort(key=lambda x: x.priority, reverse=True)
-        
-        return matching_rules
+        """Uyarıya uygun kuralları bul (indeksli, öncelik sıralı)"""
+        data = alert.data
+        return [
+            rule for rule, predicate in self._rules_for(alert.type, alert.asset)
+            if rule.is_active and predicate(data)
+        ]
     
     def _check_rule_conditions(self, rule: AlertRule, alert: Alert) -> bool:
         """Kural koşullarını kontrol et"""
-        conditions = rule.conditions
-        
-        if rule.type == AlertType.PRICE:
-            # Fiyat koşulları
-            if "price_change_pct" in conditions:
-                if alert.data.get("price_change_pct", 0) < conditions["price_change_pct"]:
-                    return False
-            
-            if "volume_increase" in conditions:
-                # Volume kontrolü (basit yaklaşım)
-                pass
-        
-        elif rule.type == AlertType.PATTERN:
-            # Formasyon koşulları
-            if "pattern_types" in conditions:
-                if alert.data.get("pattern_type") not in conditions["pattern_types"]:
-                    return False
-            
-            if "confidence_threshold" in conditions:
-                if alert.data.get("confidence", 0) < conditions["confidence_threshold"]:
-                    return False
-        
-        elif rule.type == AlertType.RISK:
-            # Risk koşulları
-            if "var_threshold" in conditions:
-                if alert.data.get("current_value", 0) < conditions["var_threshold"]:
-                    return False
-        
-        elif rule.type == AlertType.NEWS:
-            # Haber koşulları
-            if "sentiment_threshold" in conditions:
-                sentiment = abs(alert.data.get("sentiment_score", 0))
-                if sentiment < conditions["sentiment_threshold"]:
-                    return False
-            
-            if "impact_threshold" in conditions:
-                if alert.data.get("impact_score", 0) < conditions["impact_threshold"]:
-                    return False
-        
-        return True
+        return compile_rule_conditions(rule)(alert.data)
     
     def _execute_rule_actions(self, rule: AlertRule, alert: Alert):
         """Kural aksiyonlarını çalıştır"""
@@ -599,51 +696,55 @@ class SmartAlerts:
                          alert_type: Optional[AlertType] = None,
                          severity: Optional[AlertSeverity] = None) -> List[Alert]:
         """Aktif uyarıları getir"""
-        filtered_alerts = [alert for alert in self.alerts if alert.is_active]
-        
         if asset:
-            filtered_alerts = [a for a in filtered_alerts if a.asset == asset]
-        
-        if alert_type:
-            filtered_alerts = [a for a in filtered_alerts if a.type == alert_type]
-        
-        if severity:
-            filtered_alerts = [a for a in filtered_alerts if a.severity == severity]
+            candidates = self._active_by_asset.get(asset, {}).values()
+        else:
+            candidates = self._active_alerts.values()
         
-        return filtered_alerts
+        return [
+            a for a in candidates
+            if a.is_active
+            and (alert_type is None or a.type == alert_type)
+            and (severity is None or a.severity == severity)
+        ]
     
     def mark_alert_as_read(self, alert_id: str):
         """Uyarıyı okundu olarak işaretle"""
-        for alert in self.alerts:
-            if alert.id == alert_id:
-                alert.is_read = True
-                break
+        alert = self._alerts_by_id.get(alert_id)
+        if alert is not None:
+            alert.is_read = True
     
     def deactivate_alert(self, alert_id: str):
         """Uyarıyı deaktif et"""
-        for alert in self.alerts:
-            if alert.id == alert_id:
-                alert.is_active = False
-                break
+        alert = self._alerts_by_id.get(alert_id)
+        if alert is None:
+            return
+        alert.is_active = False
+        self._active_alerts.pop(alert_id, None)
+        by_asset = self._active_by_asset.get(alert.asset)
+        if by_asset is not None:
+            by_asset.pop(alert_id, None)
+            if not by_asset:
+                del self._active_by_asset[alert.asset]
     
     def cleanup_expired_alerts(self):
-        """Süresi dolmuş uyarıları temizle"""
+        """Süresi dolmuş uyarıları temizle (heap: yalnızca süresi dolanlar işlenir)"""
         current_time = datetime.now()
-        expired_alerts = []
+        expired_count = 0
         
-        for alert in self.alerts:
-            if alert.expires_at and alert.expires_at < current_time:
-                expired_alerts.append(alert.id)
+        while self._expiry_heap and self._expiry_heap[0][0] < current_time:
+            _, _, alert_id = heapq.heappop(self._expiry_heap)
+            alert = self._alerts_by_id.get(alert_id)
+            if alert is not None and alert.is_active:
+                self.deactivate_alert(alert_id)
+                expired_count += 1
         
-        for alert_id in expired_alerts:
-            self.deactivate_alert(alert_id)
-        
-        if expired_alerts:
-            print(f"🧹 {len(expired_alerts)} süresi dolmuş uyarı temizlendi")
+        if expired_count:
+            print(f"🧹 {expired_count} süresi dolmuş uyarı temizlendi")
     
     def generate_alerts_summary(self) -> Dict:
         """Uyarı özeti oluştur"""
-        active_alerts = [a for a in self.alerts if a.is_active]
+        active_alerts = [a for a in self._active_alerts.values() if a.is_active]
         
         summary = {
             "total_active_alerts": len(active_alerts),
@@ -653,27 +754,15 @@ class SmartAlerts:
             "recent_alerts": []
         }
         
-        # Tür bazında grupla
-        for alert_type in AlertType:
-            summary["alerts_by_type"][alert_type.value] = len(
-                [a for a in active_alerts if a.type == alert_type]
-            )
-        
-        # Önem derecesi bazında grupla
-        for severity in AlertSeverity:
-            summary["alerts_by_severity"][severity.value] = len(
-                [a for a in active_alerts if a.severity == severity]
-            )
-        
-        # Varlık bazında grupla
-        assets = set(a.asset for a in active_alerts)
-        for asset in assets:
-            summary["alerts_by_asset"][asset] = len(
-                [a for a in active_alerts if a.asset == asset]
-            )
+        # Tek geçişte grupla
+        by_type = Counter(a.type for a in active_alerts)
+        by_severity = Counter(a.severity for a in active_alerts)
+        summary["alerts_by_type"] = {t.value: by_type.get(t, 0) for t in AlertType}
+        summary["alerts_by_severity"] = {sv.value: by_severity.get(sv, 0) for sv in AlertSeverity}
+        summary["alerts_by_asset"] = dict(Counter(a.asset for a in active_alerts))
         
         # Son uyarılar
-        recent_alerts = sorted(active_alerts, key=lambda x: x.timestamp, reverse=True)[:5]
+        recent_alerts = heapq.nlargest(5, active_alerts, key=lambda x: x.timestamp)
         summary["recent_alerts"] = [
             {
                 "id": a.id,
@@ -767,5 +856,44 @@ def test_smart_alerts():
     print("\n✅ Smart Alerts Test Tamamlandı!")
     return smart_alerts
 
+def benchmark_alert_matching(n_alerts: int = 10000, n_assets: int = 500, rules_per_asset: int = 2) -> Dict:
+    """Tick kaynaklı uyarı patlamasında kural eşleştirme süresi (µs / uyarı)"""
+    smart_alerts = SmartAlerts()
+    assets = [f"SYM{i}.IS" for i in range(n_assets)]
+    smart_alerts.add_rules([
+        AlertRule(
+            id=f"{asset}_price_{j}",
+            name=f"{asset} fiyat {j}",
+            type=AlertType.PRICE,
+            conditions={"price_change_pct": 1.0 + j},
+            actions=["log"],
+            priority=j + 1,
+            asset=asset
+        )
+        for asset in assets for j in range(rules_per_asset)
+    ])
+    smart_alerts.rebuild_rule_index()
+    
+    rng = np.random.default_rng(42)
+    alerts = [
+        Alert(id=f"bench_{i}", type=AlertType.PRICE, severity=AlertSeverity.INFO, title="", message="",
+              asset=assets[i % n_assets], timestamp=datetime.now(),
+              data={"price_change_pct": float(rng.uniform(0, 6))})
+        for i in range(n_alerts)
+    ]
+    
+    start = time.perf_counter()
+    matched = sum(len(smart_alerts._find_matching_rules(alert)) for alert in alerts)
+    elapsed = time.perf_counter() - start
+    
+    result = {
+        "alerts": n_alerts,
+        "rules": len(smart_alerts.alert_rules),
+        "matched_rules": matched,
+        "us_per_alert": round(elapsed / n_alerts * 1e6, 2)
+    }
+    print(f"⚡ Kural eşleştirme: {result}")
+    return result
+
 if __name__ == "__main__":
     test_smart_alerts()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+🚀 SWING PATTERN CORE - BIST AI Smart Trader
+Harmonic (Gartley/Butterfly/Bat/Crab) ve Elliott (impulse/corrective) dedektörleri
+için ortak aday üretici
+
+- Swing noktaları kayan pencere max/min ile tek geçişte bulunur
+- "İndeksten sonraki swing" sıralı swing dizisinde binary search (np.searchsorted)
+- Zincirden bağımsız oranlar (BC, CD, Wave4 ...) tüm anchor'lar için tek seferde
+- Serbest noktaya (X / Wave1 başlangıcı) bağlı oranlar fiyat aralığına çevrilir:
+  adaylar sıralı fiyatlarda binary search ile bulunur, kesin kontrol vektörel yapılır
+- Aynı bacakları paylaşan (örtüşen) adaylardan en yüksek skorlu olanı kalır
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Hareket: (i, j) -> price[i] - price[j]; 0 = anchor, 1.. = anchor'dan sonraki swing'ler
+Move = Tuple[int, int]
+
+
+def find_swing_points(highs: np.ndarray, lows: np.ndarray,
+                      window: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Swing high ve low noktalarını bul (pencere içindeki max/min, eşitlik dahil)
+
+    Returns:
+        Tuple of swing highs and lows indices (sıralı)
+    """
+    highs = np.asarray(highs)
+    lows = np.asarray(lows)
+    size = 2 * window + 1
+    if len(highs) < size:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+
+    center = slice(window, len(highs) - window)
+    # NaN karşılaştırmaları False döner: NaN içeren pencere swing üretmez
+    is_high = highs[center] >= sliding_window_view(highs, size).max(axis=1)
+    is_low = lows[center] <= sliding_window_view(lows, size).min(axis=1)
+    return np.flatnonzero(is_high) + window, np.flatnonzero(is_low) + window
+
+
+def tolerance_band(expected: float, tolerance: float) -> Tuple[float, float]:
+    """abs(r - e) / e <= tol koşulunu [alt, üst] aralığına çevir"""
+    return expected * (1 - tolerance), expected * (1 + tolerance)
+
+
+@dataclass(frozen=True)
+class Ratio:
+    """move / referans hareket oranı için kabul aralığı"""
+    move: Move
+    low: float
+    high: float
+    reference: Optional[Move] = None  # None: serbest noktaya göre hareket
+
+
+@dataclass(frozen=True)
+class SwingPatternSpec:
+    """
+    Anchor swing'den başlayan alternatif (high/low) zincir + bir serbest nokta
+
+    - anchor: zincirin ilk noktası ('high' | 'low'); legs kadar swing onu izler
+    - free: anchor'a bağlanan serbest nokta (X, Wave1 başlangıcı, WaveA başlangıcı)
+    - free_sign: serbest hareket = free_sign * (anchor - free)
+    - anchor_limit / free_limit: aday listelerinin sonundan atılan eleman sayısı
+    - outer: orijinal döngü sırası ('anchor' veya 'free' dış döngüde)
+    """
+    name: str
+    anchor: str
+    legs: int
+    ratios: Tuple[Ratio, ...]
+    free_sign: int = 1
+    anchor_limit: int = 0
+    free_limit: int = 0
+    outer: str = 'anchor'
+
+    @property
+    def free(self) -> str:
+        return 'low' if self.anchor == 'high' else 'high'
+
+
+@dataclass
+class SwingCandidates:
+    """Geçerli adaylar: zincir noktaları (bar indeksi + fiyat) ve serbest nokta"""
+    spec: SwingPatternSpec
+    indices: List[np.ndarray]  # [anchor, leg1, ...]
+    prices: List[np.ndarray]
+    free_index: np.ndarray
+    free_price: np.ndarray
+    anchor_pos: np.ndarray
+    free_pos: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.free_index)
+
+    def move(self, move: Move) -> np.ndarray:
+        i, j = move
+        return self.prices[i] - self.prices[j]
+
+    @property
+    def free_move(self) -> np.ndarray:
+        return self.spec.free_sign * (self.prices[0] - self.free_price)
+
+    def ratio(self, ratio: Ratio) -> np.ndarray:
+        reference = self.free_move if ratio.reference is None else self.move(ratio.reference)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.move(ratio.move) / reference
+
+    def take(self, rows: np.ndarray) -> 'SwingCandidates':
+        return SwingCandidates(self.spec, [a[rows] for a in self.indices], [p[rows] for p in self.prices],
+                               self.free_index[rows], self.free_price[rows],
+                               self.anchor_pos[rows], self.free_pos[rows])
+
+
+class SwingCandidateGenerator:
+    """Bir fiyat serisinin swing'leri üzerinde pattern adaylarını üretir"""
+
+    def __init__(self, highs: np.ndarray, lows: np.ndarray, window: int = 5):
+        self.highs = np.asarray(highs)
+        self.lows = np.asarray(lows)
+        self.swing_highs, self.swing_lows = find_swing_points(self.highs, self.lows, window)
+        self._swings = {'high': self.swing_highs, 'low': self.swing_lows}
+        self._series = {'high': self.highs, 'low': self.lows}
+
+    def swings(self, kind: str) -> np.ndarray:
+        return self._swings[kind]
+
+    def swing_prices(self, kind: str) -> np.ndarray:
+        return self._series[kind][self._swings[kind]]
+
+    def next_after(self, kind: str, bars: np.ndarray) -> np.ndarray:
+        """Her bar için kendisinden sonraki ilk swing'in pozisyonu (yoksa len)"""
+        return np.searchsorted(self._swings[kind], bars, side='right')
+
+    def chain(self, anchor: str, legs: int,
+              anchor_pos: np.ndarray) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """Anchor'lardan alternatif swing zinciri; tamamlanan anchor'ları ve bar indekslerini döner"""
+        kind = anchor
+        bars = [self._swings[kind][anchor_pos]]
+        keep = np.arange(len(anchor_pos))
+        for _ in range(legs):
+            kind = 'low' if kind == 'high' else 'high'
+            pos = self.next_after(kind, bars[-1])
+            ok = pos < len(self._swings[kind])
+            keep = keep[ok]
+            bars = [b[ok] for b in bars]
+            bars.append(self._swings[kind][pos[ok]])
+        return keep, bars
+
+    def _kinds(self, spec: SwingPatternSpec) -> List[str]:
+        kinds = [spec.anchor]
+        for _ in range(spec.legs):
+            kinds.append('low' if kinds[-1] == 'high' else 'high')
+        return kinds
+
+    def generate(self, spec: SwingPatternSpec) -> SwingCandidates:
+        """Tüm oranları sağlayan (anchor zinciri, serbest nokta) adayları"""
+        kinds = self._kinds(spec)
+        anchors = self._swings[spec.anchor]
+        free_bars = self._swings[spec.free]
+        n_anchor = max(len(anchors) - spec.anchor_limit, 0)
+        n_free = max(len(free_bars) - spec.free_limit, 0)
+
+        anchor_pos, bars = self.chain(spec.anchor, spec.legs, np.arange(n_anchor))
+        prices = [self._series[k][b] for k, b in zip(kinds, bars)]
+
+        # 1) Zincirden bağımsız oranlar: tüm anchor'lar için tek seferde
+        ok = np.ones(len(anchor_pos), dtype=bool)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for r in spec.ratios:
+                if r.reference is not None:
+                    value = ((prices[r.move[0]] - prices[r.move[1]])
+                             / (prices[r.reference[0]] - prices[r.reference[1]]))
+                    ok &= (value >= r.low) & (value <= r.high)
+        anchor_pos = anchor_pos[ok]
+        bars = [b[ok] for b in bars]
+        prices = [p[ok] for p in prices]
+
+        # 2) Serbest noktaya bağlı oranlar: move / (s * (anchor - free)) in [lo, hi]
+        #    => free fiyatı için aralık; aralıkların kesişimi binary search ile aranır
+        free_prices = self._series[spec.free][free_bars[:n_free]]
+        order = np.argsort(free_prices, kind='stable')
+        sorted_prices = free_prices[order]
+        lower = np.full(len(anchor_pos), -np.inf)
+        upper = np.full(len(anchor_pos), np.inf)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for r in spec.ratios:
+                if r.reference is None:
+                    move = prices[r.move[0]] - prices[r.move[1]]
+                    bounds = (prices[0][:, None]
+                              - spec.free_sign * (move[:, None] / np.array([r.low, r.high])))
+                    # NaN hareket NaN sınır üretir: searchsorted boş aralık döner
+                    lower = np.maximum(lower, bounds.min(axis=1))
+                    upper = np.minimum(upper, bounds.max(axis=1))
+        # Kayan nokta sınırlarında aday kaçırmamak için aralık hafif genişletilir
+        slack = 1e-9 * np.maximum(np.abs(lower), np.abs(upper))
+        start = np.searchsorted(sorted_prices, lower - slack, side='left')
+        stop = np.searchsorted(sorted_prices, upper + slack, side='right')
+        counts = np.maximum(stop - start, 0)
+
+        rows = np.repeat(np.arange(len(anchor_pos)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        free_pos = order[np.repeat(start, counts) + offsets]
+
+        candidates = SwingCandidates(
+            spec, [b[rows] for b in bars], [p[rows] for p in prices],
+            free_bars[free_pos], free_prices[free_pos], anchor_pos[rows], free_pos)
+
+        # 3) Kesin kontrol (orijinal formüller) ve orijinal döngü sırası
+        ok = np.ones(len(candidates), dtype=bool)
+        for r in spec.ratios:
+            if r.reference is None:
+                value = candidates.ratio(r)
+                ok &= (value >= r.low) & (value <= r.high)
+        candidates = candidates.take(np.flatnonzero(ok))
+        if spec.outer == 'anchor':
+            sort = np.lexsort((candidates.free_pos, candidates.anchor_pos))
+        else:
+            sort = np.lexsort((candidates.anchor_pos, candidates.free_pos))
+        return candidates.take(sort)
+
+
+def best_per_key(keys: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """Aynı anahtarı (örtüşen bacaklar) paylaşan satırlardan en yüksek skorlu olanı; sıra korunur"""
+    if len(keys) == 0:
+        return np.array([], dtype=np.int64)
+    rows = np.arange(len(keys))
+    # Anahtar içinde skor azalan, eşitlikte ilk görülen
+    order = np.lexsort((rows, -np.asarray(scores, dtype=float), keys))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = keys[order][1:] != keys[order][:-1]
+    return np.sort(order[first])
+
+
+def harmonic_spec(name: str, ab: Tuple[float, float], bc: Tuple[float, float],
+                  cd: Tuple[float, float], ad: Tuple[float, float]) -> SwingPatternSpec:
+    """XABCD (X low, A high) spec; AB ve AD oranları XA hareketine göredir"""
+    return SwingPatternSpec(
+        name=name, anchor='high', legs=3, anchor_limit=2, free_limit=1,
+        ratios=(
+            Ratio((0, 1), *ab),                 # AB / XA
+            Ratio((2, 1), *bc, reference=(0, 1)),  # BC / AB
+            Ratio((2, 3), *cd, reference=(2, 1)),  # CD / BC
+            Ratio((0, 3), *ad),                 # AD / XA
+        ))
+
+
+# Oranlar mevcut dedektörlerin kabul aralıklarıdır (XA'ya göre noktasal oranlar ±8%)
+HARMONIC_SPECS: Dict[str, SwingPatternSpec] = {
+    'gartley': harmonic_spec('Gartley', tolerance_band(0.618, 0.08), (0.382, 0.886),
+                             (1.272, 1.618), tolerance_band(0.786, 0.08)),
+    'butterfly': harmonic_spec('Butterfly', tolerance_band(0.786, 0.08), (0.382, 0.886),
+                               (1.618, 2.240), tolerance_band(1.272, 0.08)),
+    'bat': harmonic_spec('Bat', (0.382, 0.500), (0.382, 0.886),
+                         (1.618, 2.618), tolerance_band(0.886, 0.08)),
+    'crab': harmonic_spec('Crab', (0.382, 0.618), (0.382, 0.886),
+                          (2.240, 3.618), tolerance_band(1.618, 0.08)),
+}
+
+# Hedef oranın kendisi (güven skorunda sapma merkezi)
+HARMONIC_IDEALS: Dict[str, Tuple[float, float]] = {
+    'gartley': (0.618, 0.786),
+    'butterfly': (0.786, 1.272),
+    'bat': (0.441, 0.886),
+    'crab': (0.500, 1.618),
+}
+
+
+def elliott_impulse_spec(ratios: Dict[str, float]) -> SwingPatternSpec:
+    """Wave1 sonu (high) anchor; Wave1 başlangıcı (low) serbest nokta"""
+    return SwingPatternSpec(
+        name='Elliott Impulse Wave', anchor='high', legs=4, anchor_limit=2, free_limit=1,
+        ratios=(
+            Ratio((0, 1), ratios['wave_2_retracement_min'], ratios['wave_2_retracement_max']),
+            Ratio((2, 1), ratios['wave_3_extension_min'], ratios['wave_3_extension_max']),
+            Ratio((2, 3), ratios['wave_4_retracement_min'], ratios['wave_4_retracement_max'],
+                  reference=(2, 1)),
+            Ratio((4, 3), ratios['wave_5_extension_min'], ratios['wave_5_extension_max']),
+        ))
+
+
+# WaveA sonu (low) anchor; WaveA başlangıcı (high) serbest nokta, hareket = high - low
+ELLIOTT_CORRECTIVE_SPEC = SwingPatternSpec(
+    name='Elliott Corrective Wave', anchor='low', legs=2, free_sign=-1, free_limit=1, outer='free',
+    ratios=(
+        Ratio((1, 0), 0.382, 0.786),  # WaveB / WaveA
+        Ratio((1, 2), 1.000, 1.618),  # WaveC / WaveA
+    ))
+
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Notification Queue Test Dosyası
+Aynı sembol için bekleyen uyarıların birleştirilmesi (coalescing)
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from notification_queue_manager import NotificationQueueManager
+
+
+def _drain(manager: NotificationQueueManager, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while any(m['queue_depth'] or m['in_flight'] for m in manager.get_channel_metrics().values()):
+        if time.monotonic() > deadline:
+            raise TimeoutError("kuyruk boşalmadı")
+        time.sleep(0.01)
+
+
+def _blocked_manager():
+    """Tek worker'lı telegram kanalı; ilk mesaj gönderilirken sonrakiler kuyrukta bekler"""
+    manager = NotificationQueueManager()
+    manager.configure_channel('telegram', {'concurrency': 1, 'batch_size': 1})
+    local = manager.use_local_channels({'telegram': 200.0}, keep_messages=True)['telegram']
+    manager.start()
+    manager.queue_notification("Blocker", "meşgul", {'symbol': 'BLOCK', 'signal': 'HOLD'}, ['telegram'])
+    time.sleep(0.05)
+    return manager, local
+
+
+def test_lower_priority_does_not_replace_critical():
+    """Kritik uyarıdan sonra gelen normal mesaj kritik içeriği ezmemeli"""
+    manager, local = _blocked_manager()
+    try:
+        data = {'symbol': 'THYAO', 'alert_type': 'risk'}
+        manager.queue_risk_alert("critical alert", "stop aşıldı", dict(data, level=9), ['telegram'])
+        manager.queue_notification("normal followup", "bilgi", dict(data, note='x'), ['telegram'], priority='normal')
+        _drain(manager)
+    finally:
+        manager.stop()
+
+    delivered = [(m.title, m.priority) for m in local.messages if m.data.get('symbol') == 'THYAO']
+    assert delivered == [("critical alert", "critical")], delivered
+    merged = next(m for m in local.messages if m.data.get('symbol') == 'THYAO')
+    assert merged.data['level'] == 9 and merged.data['note'] == 'x'
+    print(f"✅ Kritik uyarı korundu: {delivered}")
+
+
+def test_higher_priority_replaces_pending():
+    """Daha yüksek (veya eşit) öncelikli mesaj bekleyeni değiştirir"""
+    manager, local = _blocked_manager()
+    try:
+        data = {'symbol': 'ASELS', 'alert_type': 'risk'}
+        manager.queue_notification("normal alert", "bilgi", data, ['telegram'], priority='normal')
+        manager.queue_risk_alert("critical alert", "stop aşıldı", data, ['telegram'])
+        _drain(manager)
+    finally:
+        manager.stop()
+
+    delivered = [(m.title, m.priority) for m in local.messages if m.data.get('symbol') == 'ASELS']
+    assert delivered == [("critical alert", "critical")], delivered
+    print(f"✅ Yüksek öncelik öne alındı: {delivered}")
+
+
+def main():
+    test_lower_priority_does_not_replace_critical()
+    test_higher_priority_replaces_pending()
+    print("\n✅ Notification queue testleri tamamlandı")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,778 @@
+#!/usr/bin/env python3
+"""
+HTTP Benchmark Suite for BIST AI Smart Trader
+fastapi_main uygulamasını süreç içinde (ASGI) başlatır, endpoint karışımlarını
+kontrollü eşzamanlılıkla çalıştırır ve endpoint başına throughput, p50/p95/p99
+gecikme ve istek başına bellek raporlar.
+
+- Dış bağımlılıklar yerel stand-in'lerle değiştirilir: Redis (bellek içi),
+  Postgres (asyncpg havuzu taklidi), yfinance (deterministik sentetik OHLCV)
+- Rate limiter varsayılan olarak devre dışıdır (ölçülen şey uygulama, limit değil)
+- Uygulama geçici bir çalışma dizininde koşar; repodaki dosyalara yazmaz
+- Endpoint önbelleği (@endpoint_cache) ölçümü maskelemesin diye hesaplama
+  karışımları iki fazda koşar: soğuk (önbellek atlanır, motorun kendisi ölçülür)
+  ve önbellekli (yalnız önbellek isabeti yolu); ikisi ayrı raporlanır (--cache)
+- Sonuçlar JSON'a yazılır; --baseline ile kayıtlı sonuca göre regresyon
+  kontrolü yapılır ve regresyon varsa çıkış kodu 1 olur (deploy öncesi CI)
+
+Kullanım (backend dizininden):
+    python testing/benchmark_suite.py --mix realistic --requests 400 --concurrency 16
+    python testing/benchmark_suite.py --baseline testing/benchmark_baseline.json
+    python testing/benchmark_suite.py --save-baseline testing/benchmark_baseline.json
+    python testing/benchmark_suite.py --mix patterns --cache cold
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import logging
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from types import ModuleType, SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BIST_SYMBOLS = ["SISE.IS", "EREGL.IS", "TUPRS.IS", "THYAO.IS", "ASELS.IS", "GARAN.IS", "AKBNK.IS", "KCHOL.IS"]
+
+
+# ---------------------------------------------------------------------------
+# Stand-in'ler
+# ---------------------------------------------------------------------------
+
+class InMemoryRedis:
+    """redis.asyncio.Redis yerine geçen bellek içi anahtar/değer deposu (TTL destekli)"""
+
+    def __init__(self):
+        self.store: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def ping(self):
+        return True
+
+    async def get(self, key: str):
+        entry = self.store.get(key)
+        if entry is None or (entry[1] is not None and entry[1] < time.monotonic()):
+            self.store.pop(key, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None):
+        self.store[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    async def delete(self, *keys: str):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    async def info(self):
+        return {
+            "uptime_in_seconds": 0,
+            "connected_clients": 1,
+            "used_memory_human": "n/a",
+            "db0": {"keys": len(self.store)},
+            "keyspace_hits": self.hits,
+            "keyspace_misses": self.misses,
+        }
+
+    async def close(self):
+        self.store.clear()
+
+
+class _InMemoryConnection:
+    """asyncpg bağlantısı taklidi: sorguları sayar, boş sonuç döner"""
+
+    def __init__(self, pool: 'InMemoryPgPool'):
+        self.pool = pool
+
+    async def fetchval(self, query: str, *args):
+        self.pool.queries += 1
+        return 1 if query.strip().upper() == "SELECT 1" else None
+
+    async def fetchrow(self, query: str, *args):
+        self.pool.queries += 1
+        return None
+
+    async def fetch(self, query: str, *args):
+        self.pool.queries += 1
+        return []
+
+    async def execute(self, query: str, *args):
+        self.pool.queries += 1
+        return "OK"
+
+    async def executemany(self, query: str, args_list):
+        self.pool.queries += len(list(args_list))
+
+
+class InMemoryPgPool:
+    """asyncpg.Pool taklidi (core.database.DatabaseManager'ın kullandığı yüzey)"""
+
+    def __init__(self, min_size: int = 1, max_size: int = 10):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.queries = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield _InMemoryConnection(self)
+
+    async def close(self):
+        return None
+
+    def get_size(self) -> int:
+        return self.min_size
+
+    def get_min_size(self) -> int:
+        return self.min_size
+
+    def get_max_size(self) -> int:
+        return self.max_size
+
+    def get_idle_size(self) -> int:
+        return self.min_size
+
+
+_PERIOD_DAYS = {"d": 1, "wk": 7, "mo": 30, "y": 365}
+_INTERVAL_BARS_PER_DAY = {"d": 1.0, "wk": 1 / 5, "mo": 1 / 21}
+_TRADING_MINUTES = 8 * 60
+
+
+def _period_days(period: Optional[str]) -> int:
+    if not period or period == "max":
+        return 3650
+    if period == "ytd":
+        return max(datetime.now().timetuple().tm_yday, 5)
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not match:
+        return 365
+    return int(match.group(1)) * _PERIOD_DAYS[match.group(2)]
+
+
+def _interval_spec(interval: str) -> Tuple[float, str]:
+    """interval -> (işlem günü başına bar, pandas frekansı)"""
+    match = re.fullmatch(r"(\d+)(m|h|d|wk|mo)", interval or "1d")
+    if not match:
+        return 1.0, "B"
+    size, unit = int(match.group(1)), match.group(2)
+    if unit == "m":
+        return _TRADING_MINUTES / size, f"{size}min"
+    if unit == "h":
+        return _TRADING_MINUTES / 60 / size, f"{size}h"
+    return _INTERVAL_BARS_PER_DAY[unit] / size, {"d": "B", "wk": "W-FRI", "mo": "BME"}[unit]
+
+
+@lru_cache(maxsize=512)
+def _synthetic_ohlcv(symbol: str, bars: int, freq: str) -> pd.DataFrame:
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+    start_price = 20 + (zlib.crc32(symbol.encode()) % 480)
+    returns = rng.normal(0.0003, 0.018, bars)
+    close = start_price * np.exp(np.cumsum(returns))
+    open_ = close * (1 + rng.normal(0, 0.004, bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, bars)))
+    volume = rng.integers(500_000, 5_000_000, bars).astype(float)
+
+    tz = "Europe/Istanbul" if symbol.endswith(".IS") else "America/New_York"
+    end = pd.Timestamp.now(tz=tz).normalize()
+    index = pd.date_range(end=end, periods=bars, freq=freq, name="Date")
+    return pd.DataFrame({
+        "Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume,
+        "Dividends": 0.0, "Stock Splits": 0.0,
+    }, index=index)
+
+
+class SyntheticTicker:
+    """yfinance.Ticker yerine deterministik sentetik veri"""
+
+    def __init__(self, symbol: str, *args, **kwargs):
+        self.ticker = symbol.upper()
+
+    def history(self, period: str = "1mo", interval: str = "1d", start=None, end=None, **kwargs) -> pd.DataFrame:
+        days = _period_days(period)
+        if start is not None:
+            end_ts = pd.Timestamp(end) if end is not None else pd.Timestamp.now()
+            days = max(int((end_ts - pd.Timestamp(start)).days), 1)
+        per_day, freq = _interval_spec(interval)
+        bars = int(min(max(days * 5 / 7 * per_day, 2), 5000))
+        return _synthetic_ohlcv(self.ticker, bars, freq).copy()
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        rng = random.Random(zlib.crc32(self.ticker.encode()))
+        price = float(self.history(period="5d")["Close"].iloc[-1])
+        return {
+            "symbol": self.ticker, "longName": self.ticker.split(".")[0],
+            "sector": rng.choice(["Industrials", "Financial Services", "Energy", "Technology"]),
+            "industry": "Synthetic", "regularMarketPrice": price, "currentPrice": price,
+            "previousClose": price * (1 + rng.uniform(-0.02, 0.02)),
+            "marketCap": rng.uniform(5e9, 5e11), "trailingPE": rng.uniform(4, 30),
+            "priceToBook": rng.uniform(0.5, 6), "returnOnEquity": rng.uniform(0.02, 0.35),
+            "returnOnAssets": rng.uniform(0.01, 0.15), "profitMargins": rng.uniform(0.02, 0.3),
+            "grossMargins": rng.uniform(0.1, 0.5), "debtToEquity": rng.uniform(10, 150),
+            "debtToAssets": rng.uniform(0.1, 0.6), "currentRatio": rng.uniform(0.8, 3.0),
+            "quickRatio": rng.uniform(0.5, 2.5), "cashRatio": rng.uniform(0.1, 1.5),
+            "interestCoverage": rng.uniform(1, 20), "dividendYield": rng.uniform(0, 0.08),
+            "beta": rng.uniform(0.5, 1.8), "volume": rng.randint(10**6, 10**8),
+            "averageVolume": rng.randint(10**6, 10**8),
+        }
+
+    @property
+    def fast_info(self) -> Dict[str, Any]:
+        info = self.info
+        return {"last_price": info["regularMarketPrice"], "market_cap": info["marketCap"]}
+
+    balance_sheet = income_stmt = cashflow = financials = property(lambda self: pd.DataFrame())
+
+
+class SyntheticTickers:
+    def __init__(self, symbols: str):
+        self.tickers = {symbol: SyntheticTicker(symbol) for symbol in symbols.replace(",", " ").split()}
+
+
+def synthetic_download(tickers, period: str = "1mo", interval: str = "1d", start=None, end=None,
+                       group_by: str = "column", **kwargs) -> pd.DataFrame:
+    """yfinance.download taklidi (çoklu sembolde MultiIndex kolonlar)"""
+    symbols = tickers.replace(",", " ").split() if isinstance(tickers, str) else list(tickers)
+    frames = {s: SyntheticTicker(s).history(period=period, interval=interval, start=start, end=end)
+              .drop(columns=["Dividends", "Stock Splits"]) for s in symbols}
+    if len(frames) == 1:
+        return next(iter(frames.values()))
+    data = pd.concat(frames, axis=1)
+    return data if group_by == "ticker" else data.swaplevel(axis=1).sort_index(axis=1)
+
+
+class StandIns:
+    """Redis/Postgres/yfinance bağımlılıklarını geri alınabilir şekilde değiştirir"""
+
+    def __init__(self):
+        self._patches: List[Tuple[Any, str, Any]] = []
+        self._added_modules: List[str] = []
+        self.redis = InMemoryRedis()
+        self.pg_pool: Optional[InMemoryPgPool] = None
+
+    def _patch(self, target: Any, attr: str, value: Any):
+        self._patches.append((target, attr, getattr(target, attr)))
+        setattr(target, attr, value)
+
+    def install(self):
+        try:
+            import yfinance as yf
+        except ImportError:
+            yf = ModuleType("yfinance")
+            yf.Ticker = yf.Tickers = yf.download = None
+            sys.modules["yfinance"] = yf
+            self._added_modules.append("yfinance")
+        self._patch(yf, "Ticker", SyntheticTicker)
+        self._patch(yf, "Tickers", SyntheticTickers)
+        self._patch(yf, "download", synthetic_download)
+
+        from core import cache, database
+        self._patch(cache, "redis", SimpleNamespace(from_url=lambda url, **kwargs: self.redis))
+
+        async def create_pool(dsn, min_size: int = 1, max_size: int = 10, **kwargs):
+            self.pg_pool = InMemoryPgPool(min_size, max_size)
+            return self.pg_pool
+        self._patch(database, "asyncpg", SimpleNamespace(create_pool=create_pool))
+        logger.info("🧪 Stand-ins installed: redis(in-memory), postgres(in-memory pool), yfinance(synthetic)")
+
+    def restore(self):
+        for target, attr, original in reversed(self._patches):
+            setattr(target, attr, original)
+        self._patches.clear()
+        for name in self._added_modules:
+            sys.modules.pop(name, None)
+        self._added_modules.clear()
+
+
+def _prepare_workdir() -> str:
+    """
+    Uygulama göreli yollara (static/, templates/, data/, ranking_history.json,
+    *.log) okur/yazar; benchmark bunları geçici bir çalışma dizininde yapar ki
+    sentetik veri repodaki dosyalara karışmasın.
+    """
+    workdir = tempfile.mkdtemp(prefix="bist_benchmark_")
+    for name in ("static", "templates"):
+        os.symlink(os.path.join(BACKEND_DIR, name), os.path.join(workdir, name))
+    shutil.copytree(os.path.join(BACKEND_DIR, "data"), os.path.join(workdir, "data"),
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    history = os.path.join(BACKEND_DIR, "ranking_history.json")
+    if os.path.exists(history):
+        shutil.copy(history, workdir)
+    return workdir
+
+
+class _IdleScanner:
+    """Benchmark sırasında BIST100 arka plan taramasını çalıştırmaz (ölçümü bozmasın)"""
+
+    async def start_continuous_scanning(self):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Endpoint karışımları
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Scenario:
+    name: str
+    path: str
+    method: str = "GET"
+    weight: float = 1.0
+    params: Dict[str, Any] = field(default_factory=dict)
+    symbols: List[str] = field(default_factory=lambda: list(BIST_SYMBOLS))
+    expect: Tuple[int, ...] = (200,)
+
+    def request(self, i: int) -> Tuple[str, str, Dict[str, Any]]:
+        """i. istek için (method, url, params); {symbol} sembol listesinde döner"""
+        symbol = self.symbols[i % len(self.symbols)]
+        params = {k: (v.format(symbol=symbol) if isinstance(v, str) else v) for k, v in self.params.items()}
+        return self.method, self.path.format(symbol=symbol), params
+
+
+SIGNALS = [
+    Scenario("signals", "/signals", weight=20, params={"symbols": "{symbol}", "include_xai": False}),
+    Scenario("signals_batch", "/signals", weight=5),
+    Scenario("real_trading_signals", "/api/real/trading_signals", weight=10),
+]
+RANKING = [
+    Scenario("ranking", "/ranking", weight=8),
+    Scenario("ranking_mcdm", "/ranking/mcdm", weight=8, params={"market": "BIST"}),
+    Scenario("topsis_ranking", "/analysis/topsis/ranking", weight=4),
+]
+PATTERNS = [
+    Scenario("patterns", "/analysis/patterns/{symbol}", weight=15, params={"limit": 120}),
+]
+BACKTESTS = [
+    Scenario("backtest_run", "/backtest", method="POST", weight=2,
+             params={"symbol": "{symbol}", "period": "1y", "include_walkforward": False}),
+    # Motor raporları saklamıyor: 404 de geçerli yanıt (cache + lookup yolu ölçülür)
+    Scenario("backtest_report", "/backtest/{symbol}", weight=8, expect=(200, 404)),
+]
+
+MIXES: Dict[str, List[Scenario]] = {
+    "realistic": SIGNALS + RANKING + PATTERNS + BACKTESTS,
+    "signals": SIGNALS,
+    "ranking": RANKING,
+    "patterns": PATTERNS,
+    "backtests": BACKTESTS,
+    "smoke": [Scenario("health", "/health"), Scenario("root", "/")],
+}
+
+# cold: endpoint önbelleği atlanır | cached: ısınmış önbellek | both: ikisi ayrı fazlarda
+CACHE_MODES = ("cold", "cached", "both")
+# Hesaplama yapmayan karışımlar yalnız önbellekli koşar; diğerleri varsayılan olarak iki fazlı
+CACHED_ONLY_MIXES = ("signals", "smoke")
+CACHE_HIT_STATES = ("HIT", "STALE", "SHARED")
+
+
+def default_cache_mode(mix: str) -> str:
+    return "cached" if mix in CACHED_ONLY_MIXES else "both"
+
+
+# ---------------------------------------------------------------------------
+# Çalıştırıcı
+# ---------------------------------------------------------------------------
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 (lineer interpolasyon), ms"""
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    if len(samples) == 1:
+        value = round(samples[0] * 1000, 3)
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": round(cuts[49] * 1000, 3), "p95_ms": round(cuts[94] * 1000, 3),
+            "p99_ms": round(cuts[98] * 1000, 3)}
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().rss / 1024 / 1024, 1)
+    except ImportError:
+        return None
+
+
+class BenchmarkSuite:
+    """Süreç içi ASGI benchmark"""
+
+    def __init__(self, mix: str = "realistic", requests: int = 400, concurrency: int = 16,
+                 warmup: int = 1, memory_samples: int = 3, seed: int = 42, rate_limit: bool = False,
+                 cache_mode: Optional[str] = None):
+        if mix not in MIXES:
+            raise ValueError(f"Bilinmeyen mix: {mix} (seçenekler: {', '.join(MIXES)})")
+        cache_mode = cache_mode or default_cache_mode(mix)
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"Bilinmeyen cache modu: {cache_mode} (seçenekler: {', '.join(CACHE_MODES)})")
+        self.cache_mode = cache_mode
+        self.mix = mix
+        self.scenarios = MIXES[mix]
+        self.requests = requests
+        self.concurrency = concurrency
+        self.warmup = warmup
+        self.memory_samples = memory_samples
+        self.seed = seed
+        self.rate_limit = rate_limit
+        self.stand_ins = StandIns()
+
+    @asynccontextmanager
+    async def boot(self):
+        """Stand-in'lerle uygulamayı başlat (startup/shutdown lifespan dahil)"""
+        import httpx
+
+        if BACKEND_DIR not in sys.path:
+            sys.path.insert(0, BACKEND_DIR)
+        previous_cwd = os.getcwd()
+        workdir = _prepare_workdir()
+        os.chdir(workdir)
+        self.stand_ins.install()
+        try:
+            booted = time.perf_counter()
+            import fastapi_main
+            app = fastapi_main.app
+            fastapi_main.BIST100Scanner = _IdleScanner
+            if not self.rate_limit:
+                from middleware.rate_limiter import APIRateLimitMiddleware
+                app.user_middleware = [m for m in app.user_middleware if m.cls is not APIRateLimitMiddleware]
+                app.middleware_stack = None
+
+            async with app.router.lifespan_context(app):
+                self.boot_ms = (time.perf_counter() - booted) * 1000
+                logger.info(f"🚀 App booted in-process ({self.boot_ms:.0f}ms)")
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://benchmark",
+                                             timeout=120) as client:
+                    yield client
+        finally:
+            self.stand_ins.restore()
+            os.chdir(previous_cwd)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    async def _call(self, client, scenario: Scenario, i: int) -> Tuple[float, int, bool]:
+        """(süre, durum kodu, endpoint önbelleğinden mi geldi)"""
+        method, url, params = scenario.request(i)
+        start = time.perf_counter()
+        cached = False
+        try:
+            response = await client.request(method, url, params=params)
+            await response.aread()
+            status = response.status_code
+            cached = response.headers.get("x-cache") in CACHE_HIT_STATES
+        except Exception as e:
+            logger.warning(f"Request failed {scenario.name}: {e}")
+            status = 0
+        return time.perf_counter() - start, status, cached
+
+    async def _measure_memory(self, client) -> Dict[str, float]:
+        """Endpoint başına istek başı tahsis tepe noktası (sıralı, tracemalloc açık)"""
+        peaks: Dict[str, float] = {}
+        if self.memory_samples <= 0:
+            return peaks
+        tracemalloc.start()
+        try:
+            for scenario in self.scenarios:
+                samples = []
+                for i in range(self.memory_samples):
+                    tracemalloc.reset_peak()
+                    base, _ = tracemalloc.get_traced_memory()
+                    await self._call(client, scenario, i)
+                    samples.append(tracemalloc.get_traced_memory()[1] - base)
+                peaks[scenario.name] = round(statistics.median(samples) / 1024, 1)
+        finally:
+            tracemalloc.stop()
+        return peaks
+
+    def _schedule(self) -> List[Tuple[Scenario, int]]:
+        """Ağırlıklı, tohumlu (tekrarlanabilir) istek sırası"""
+        rng = random.Random(self.seed)
+        picks = rng.choices(self.scenarios, weights=[s.weight for s in self.scenarios], k=self.requests)
+        counters: Dict[str, int] = defaultdict(int)
+        schedule = []
+        for scenario in picks:
+            schedule.append((scenario, counters[scenario.name]))
+            counters[scenario.name] += 1
+        return schedule
+
+    async def _reset_caches(self, bypass: bool):
+        """Endpoint önbelleğini (yerel LRU + stand-in Redis) boşalt; bypass=True: soğuk faz"""
+        from core.endpoint_cache import invalidate_endpoint_cache, set_endpoint_cache_bypass
+        set_endpoint_cache_bypass(bypass)
+        await invalidate_endpoint_cache()
+        self.stand_ins.redis.store.clear()
+
+    async def _warm(self, client):
+        # Isınma: her senaryo sırayla (ör. backtest_run, backtest_report'tan önce)
+        for _ in range(self.warmup):
+            for scenario in self.scenarios:
+                for i in range(len(scenario.symbols)):
+                    await self._call(client, scenario, i)
+
+    async def _timed(self, client) -> Dict[str, Any]:
+        """Ağırlıklı istek sırasını eşzamanlı çalıştır"""
+        rss_before = _rss_mb()
+        latencies: Dict[str, List[float]] = defaultdict(list)
+        statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        cache_hits: Dict[str, int] = defaultdict(int)
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in self._schedule():
+            queue.put_nowait(item)
+
+        async def worker():
+            while not queue.empty():
+                scenario, i = queue.get_nowait()
+                elapsed, status, cached = await self._call(client, scenario, i)
+                latencies[scenario.name].append(elapsed)
+                statuses[scenario.name][str(status)] += 1
+                cache_hits[scenario.name] += cached
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        wall = time.perf_counter() - started
+        return {"latencies": latencies, "statuses": statuses, "cache_hits": cache_hits,
+                "wall": wall, "rss_before": rss_before, "rss_after": _rss_mb()}
+
+    async def run(self) -> Dict[str, Any]:
+        phases = ("cold", "cached") if self.cache_mode == "both" else (self.cache_mode,)
+        measured: Dict[str, Dict[str, Any]] = {}
+        memory: Dict[str, float] = {}
+        async with self.boot() as client:
+            try:
+                for phase in phases:
+                    await self._reset_caches(bypass=phase == "cold")
+                    await self._warm(client)
+                    if phase == phases[0]:
+                        memory = await self._measure_memory(client)
+                    measured[phase] = await self._timed(client)
+            finally:
+                await self._reset_caches(bypass=False)
+
+        return self._report(measured, memory)
+
+    def _endpoint_rows(self, phase: Dict[str, Any], memory: Dict[str, float]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        latencies, statuses, wall = phase["latencies"], phase["statuses"], phase["wall"]
+        endpoints = {}
+        all_samples = []
+        total_errors = 0
+        for scenario in self.scenarios:
+            samples = latencies.get(scenario.name, [])
+            if not samples:
+                continue
+            codes = dict(statuses[scenario.name])
+            errors = sum(count for code, count in codes.items() if int(code) not in scenario.expect)
+            total_errors += errors
+            all_samples.extend(samples)
+            endpoints[scenario.name] = {
+                "method": scenario.method,
+                "path": scenario.path,
+                "count": len(samples),
+                "errors": errors,
+                "status_codes": codes,
+                "cache_hits": phase["cache_hits"][scenario.name],
+                "throughput_rps": round(len(samples) / wall, 2),
+                "mean_ms": round(statistics.mean(samples) * 1000, 3),
+                **percentiles(samples),
+                "max_ms": round(max(samples) * 1000, 3),
+                "alloc_peak_kb": memory.get(scenario.name),
+            }
+        overall = {
+            "count": len(all_samples),
+            "errors": total_errors,
+            "wall_seconds": round(wall, 3),
+            "throughput_rps": round(len(all_samples) / wall, 2) if wall > 0 else 0.0,
+            **percentiles(all_samples),
+            "rss_before_mb": phase["rss_before"],
+            "rss_after_mb": phase["rss_after"],
+        }
+        return endpoints, overall
+
+    def _report(self, measured: Dict[str, Dict[str, Any]], memory: Dict[str, float]) -> Dict[str, Any]:
+        # Birincil bölüm ilk faz (both: soğuk); önbellekli faz ayrıca endpoints_cached'da
+        primary = next(iter(measured))
+        endpoints, overall = self._endpoint_rows(measured[primary], memory)
+        results = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(),
+                "mix": self.mix,
+                "requests": self.requests,
+                "concurrency": self.concurrency,
+                "seed": self.seed,
+                "rate_limit": self.rate_limit,
+                "cache_mode": self.cache_mode,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "boot_ms": round(getattr(self, "boot_ms", 0.0), 1),
+            },
+            "overall": overall,
+            "endpoints": endpoints,
+        }
+        if primary != "cached" and "cached" in measured:
+            results["endpoints_cached"], results["overall_cached"] = self._endpoint_rows(measured["cached"], {})
+        return results
+
+
+# ---------------------------------------------------------------------------
+# Baseline karşılaştırma
+# ---------------------------------------------------------------------------
+
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.20,
+            min_delta_ms: float = 2.0, memory_tolerance: float = 0.30,
+            ignore: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Baseline'a göre regresyonlar. Gecikme: hem oran (tolerance) hem mutlak fark
+    (min_delta_ms) aşılmalı; throughput: oran kadar düşüş; bellek: memory_tolerance;
+    yeni hata: baseline'da hata yokken hata görülmesi.
+    """
+    ignore = ignore or []
+    regressions = []
+
+    def flag(endpoint, metric, old, new):
+        change = (new - old) / old * 100 if old else float("inf")
+        regressions.append({"endpoint": endpoint, "metric": metric, "baseline": old,
+                            "current": new, "change_pct": round(change, 1)})
+
+    for meta_key in ("mix", "concurrency", "requests", "cache_mode"):
+        if current["meta"].get(meta_key) != baseline["meta"].get(meta_key):
+            logger.warning(f"⚠️ Baseline {meta_key} farklı: {baseline['meta'].get(meta_key)} "
+                           f"-> {current['meta'].get(meta_key)}")
+
+    # Soğuk ve önbellekli gecikmeler ayrı ayrı karşılaştırılır
+    for section, label in (("endpoints", "{}"), ("endpoints_cached", "{} (cached)")):
+        for name, now in current.get(section, {}).items():
+            old = baseline.get(section, {}).get(name)
+            if old is None or any(fnmatch.fnmatch(name, pattern) for pattern in ignore):
+                continue
+            endpoint = label.format(name)
+            for metric in LATENCY_METRICS:
+                if now[metric] > old[metric] * (1 + tolerance) and now[metric] - old[metric] >= min_delta_ms:
+                    flag(endpoint, metric, old[metric], now[metric])
+            if now["throughput_rps"] < old["throughput_rps"] * (1 - tolerance):
+                flag(endpoint, "throughput_rps", old["throughput_rps"], now["throughput_rps"])
+            if old.get("alloc_peak_kb") and now.get("alloc_peak_kb") and \
+                    now["alloc_peak_kb"] > old["alloc_peak_kb"] * (1 + memory_tolerance):
+                flag(endpoint, "alloc_peak_kb", old["alloc_peak_kb"], now["alloc_peak_kb"])
+            if now["errors"] and not old["errors"]:
+                flag(endpoint, "errors", old["errors"], now["errors"])
+    return regressions
+
+
+def generate_report(results: Dict[str, Any], regressions: Optional[List[Dict[str, Any]]] = None) -> str:
+    """Konsol raporu"""
+    meta = results["meta"]
+    mode = meta.get("cache_mode", "cached")
+    lines = [
+        "🎯 BENCHMARK REPORT",
+        "=" * 102,
+        f"Mix: {meta['mix']}  Requests: {meta['requests']}  Concurrency: {meta['concurrency']}  "
+        f"Cache: {mode}  Boot: {meta['boot_ms']:.0f}ms",
+    ]
+    sections = [("cold" if mode != "cached" else "cached", results["overall"], results["endpoints"])]
+    if "endpoints_cached" in results:
+        sections.append(("cached", results["overall_cached"], results["endpoints_cached"]))
+    for label, overall, endpoints in sections:
+        lines += [
+            "",
+            f"[{label}] {overall['throughput_rps']} req/s  p50 {overall['p50_ms']}ms  p95 {overall['p95_ms']}ms  "
+            f"p99 {overall['p99_ms']}ms  errors {overall['errors']}  RSS {overall['rss_before_mb']}->"
+            f"{overall['rss_after_mb']} MB",
+            f"{'endpoint':<22}{'count':>7}{'err':>5}{'hits':>6}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'alloc KB':>11}",
+            "-" * 102,
+        ]
+        for name, row in endpoints.items():
+            alloc = row["alloc_peak_kb"] if row["alloc_peak_kb"] is not None else "-"
+            lines.append(f"{name:<22}{row['count']:>7}{row['errors']:>5}{row.get('cache_hits', 0):>6}"
+                         f"{row['throughput_rps']:>9}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+                         f"{alloc:>11}")
+
+    if regressions is not None:
+        lines.append("")
+        if regressions:
+            lines.append(f"🔴 {len(regressions)} regression(s) vs baseline")
+            for r in regressions:
+                lines.append(f"   {r['endpoint']:<22}{r['metric']:<16}{r['baseline']} -> {r['current']} "
+                             f"({r['change_pct']:+}%)")
+        else:
+            lines.append("🟢 No regressions vs baseline")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="In-process HTTP benchmark for fastapi_main")
+    parser.add_argument("--mix", default="realistic", choices=sorted(MIXES))
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=1, help="warmup passes over every scenario")
+    parser.add_argument("--memory-samples", type=int, default=3, help="tracemalloc requests per endpoint (0: off)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rate-limit", action="store_true", help="keep the API rate limiter enabled")
+    parser.add_argument("--cache", default=None, choices=CACHE_MODES,
+                        help="endpoint cache: cold (bypassed), cached (warm) or both "
+                             "(default: both for compute mixes, cached for signals/smoke)")
+    parser.add_argument("--output", default=None, help="results JSON path")
+    parser.add_argument("--baseline", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", default=None, help="also write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="allowed relative slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore latency changes below this")
+    parser.add_argument("--ignore", nargs="*", default=[], help="endpoint name patterns to skip in comparison")
+    args = parser.parse_args(argv)
+    # Uygulama backend dizininde çalışır; yollar çağrılan dizine göre çözülür
+    for name in ("output", "baseline", "save_baseline"):
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+
+    logging.basicConfig(level=logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    suite = BenchmarkSuite(mix=args.mix, requests=args.requests, concurrency=args.concurrency,
+                           warmup=args.warmup, memory_samples=args.memory_samples, seed=args.seed,
+                           rate_limit=args.rate_limit, cache_mode=args.cache)
+    results = asyncio.run(suite.run())
+
+    regressions = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, tolerance=args.tolerance,
+                              min_delta_ms=args.min_delta_ms, ignore=args.ignore)
+        results["regressions"] = regressions
+        results["baseline"] = os.path.abspath(args.baseline)
+
+    print(generate_report(results, regressions))
+
+    output = args.output or os.path.abspath(f"benchmark_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    for path in filter(None, (output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved: {os.path.abspath(path)}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
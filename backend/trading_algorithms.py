@@ -18,6 +18,8 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+import indicator_library as indicators
+
 @dataclass
 class TradingSignal:
     """Alım-satım sinyali"""
@@ -197,14 +199,7 @@ class TradingAlgorithms:
             pd.Series: RSI değerleri
         """
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi
+            return indicators.calculate_rsi(prices, period)
             
         except Exception as e:
             print(f"❌ RSI hesaplama hatası: {str(e)}")
@@ -249,14 +244,7 @@ class TradingAlgorithms:
             Tuple[pd.Series, pd.Series, pd.Series]: MACD, sinyal, histogram
         """
         try:
-            ema_fast = prices.ewm(span=fast_period).mean()
-            ema_slow = prices.ewm(span=slow_period).mean()
-            
-            macd_line = ema_fast - ema_slow
-            signal_line = macd_line.ewm(span=signal_period).mean()
-            histogram = macd_line - signal_line
-            
-            return macd_line, signal_line, histogram
+            return indicators.calculate_macd(prices, fast_period, slow_period, signal_period)
             
         except Exception as e:
             print(f"❌ MACD hesaplama hatası: {str(e)}")
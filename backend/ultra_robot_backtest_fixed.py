@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Tuple
 import matplotlib.pyplot as plt
 import seaborn as sns
 from ultra_trading_robot import UltraTradingRobot, TimeFrame, StrategyType, TradingSignal
+from indicator_library import calculate_atr, calculate_macd, calculate_rsi
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
@@ -209,23 +210,14 @@ class UltraRobotBacktestFixed:
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """RSI hesapla"""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
+            return calculate_rsi(prices, period)
         except:
             return pd.Series([50] * len(prices), index=prices.index)
     
     def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict:
         """MACD hesapla"""
         try:
-            ema_fast = prices.ewm(span=fast).mean()
-            ema_slow = prices.ewm(span=slow).mean()
-            macd = ema_fast - ema_slow
-            signal_line = macd.ewm(span=signal).mean()
-            histogram = macd - signal_line
+            macd, signal_line, histogram = calculate_macd(prices, fast, slow, signal)
             
             return {
                 "macd": macd,
@@ -261,15 +253,7 @@ class UltraRobotBacktestFixed:
     def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
         """ATR hesapla"""
         try:
-            high_low = data['High'] - data['Low']
-            high_close = np.abs(data['High'] - data['Close'].shift())
-            low_close = np.abs(data['Low'] - data['Close'].shift())
-            
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = np.max(ranges, axis=1)
-            atr = true_range.rolling(period).mean()
-            
-            return atr
+            return calculate_atr(data['High'], data['Low'], data['Close'], period)
         except:
             return pd.Series([data['Close'].iloc[-1] * 0.01] * len(data), index=data.index)
     
@@ -14,6 +14,8 @@ import json
 from dataclasses import dataclass
 from enum import Enum
 
+from indicator_library import calculate_atr, calculate_macd, calculate_rsi, indicator_engine
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -283,7 +285,8 @@ class UltraTradingRobot:
                 return None
             
             # Teknik analiz
-            technical_indicators = self._calculate_technical_indicators(data, config["indicators"])
+            technical_indicators = self._calculate_technical_indicators(data, config["indicators"],
+                                                                        symbol=symbol, interval=timeframe.value)
             
             # Strateji bazlı sinyal üretimi
             signal = None
@@ -456,17 +459,27 @@ class UltraTradingRobot:
             logger.error(f"❌ Market veri hatası: {e}")
             return pd.DataFrame()
     
-    def _calculate_technical_indicators(self, data: pd.DataFrame, indicators: List[str]) -> Dict:
+    def _calculate_technical_indicators(self, data: pd.DataFrame, indicators: List[str],
+                                        symbol: Optional[str] = None, interval: str = '1d') -> Dict:
         """Teknik indikatörleri hesapla"""
         try:
             result = {}
             
+            # Sembol biliniyorsa streaming durum: yalnızca yeni bar'lar işlenir
+            live = indicator_engine.sync(symbol, data, interval) if symbol and not data.empty else None
+            
             # Basit hesaplamalar (gerçek uygulamada ta-lib kullanılacak)
             if "RSI" in indicators:
-                result["RSI"] = self._calculate_rsi(data['Close'])
+                if live is not None and live['rsi'] is not None:
+                    result["RSI"] = live['rsi']
+                else:
+                    result["RSI"] = self._calculate_rsi(data['Close'])
             
             if "MACD" in indicators:
-                macd_data = self._calculate_macd(data['Close'])
+                if live is not None and live['macd'] is not None:
+                    macd_data = {"macd": live['macd'], "signal": live['macd_signal']}
+                else:
+                    macd_data = self._calculate_macd(data['Close'])
                 result["MACD"] = macd_data["macd"]
                 result["MACD_Signal"] = macd_data["signal"]
             
@@ -477,7 +490,10 @@ class UltraTradingRobot:
                 result["BB_Middle"] = bb_data["middle"]
             
             if "ATR" in indicators:
-                result["ATR"] = self._calculate_atr(data)
+                if live is not None and live['atr'] is not None:
+                    result["ATR"] = live['atr']
+                else:
+                    result["ATR"] = self._calculate_atr(data)
             
             if "Volume" in indicators:
                 result["Volume_SMA"] = data['Volume'].rolling(20).mean()
@@ -491,11 +507,7 @@ class UltraTradingRobot:
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
         """RSI hesapla"""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
+            rsi = calculate_rsi(prices, period)
             return rsi.iloc[-1] if not rsi.empty else 50
         except:
             return 50
@@ -503,10 +515,7 @@ class UltraTradingRobot:
     def _calculate_macd(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict:
         """MACD hesapla"""
         try:
-            ema_fast = prices.ewm(span=fast).mean()
-            ema_slow = prices.ewm(span=slow).mean()
-            macd = ema_fast - ema_slow
-            signal_line = macd.ewm(span=signal).mean()
+            macd, signal_line, _ = calculate_macd(prices, fast, slow, signal)
             
             return {
                 "macd": macd.iloc[-1] if not macd.empty else 0,
@@ -535,14 +544,7 @@ class UltraTradingRobot:
     def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> float:
         """ATR hesapla"""
         try:
-            high_low = data['High'] - data['Low']
-            high_close = np.abs(data['High'] - data['Close'].shift())
-            low_close = np.abs(data['Low'] - data['Close'].shift())
-            
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = np.max(ranges, axis=1)
-            atr = true_range.rolling(period).mean()
-            
+            atr = calculate_atr(data['High'], data['Low'], data['Close'], period)
             return atr.iloc[-1] if not atr.empty else data['Close'].iloc[-1] * 0.01
         except:
             return data['Close'].iloc[-1] * 0.01 if not data.empty else 0
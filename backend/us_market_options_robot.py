@@ -15,6 +15,11 @@ import json
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from options_pricing import black_scholes
+except ImportError:
+    from backend.options_pricing import black_scholes
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -84,6 +89,7 @@ class USMarketOptionsRobot:
             "profit_target": 0.5,          # Hedef kar (%50)
             "stop_loss": 0.3,              # Stop loss (%30)
         }
+        self.risk_free_rate = 0.05         # US risksiz faiz
         
         self.active_positions = {}
         self.options_history = []
@@ -165,41 +171,35 @@ class USMarketOptionsRobot:
                 "open_interest": np.random.randint(500, 5000)
             }
             
-            # Call options
-            for exp in expirations[:3]:  # İlk 3 expiration
-                for strike in strikes:
-                    if abs(strike - current_price) / current_price <= 0.15:  # ATM yakını
-                        key = f"{exp}_{strike}"
-                        options_data["calls"][key] = {
-                            "strike": strike,
-                            "expiration": exp,
-                            "premium": max(0.5, abs(strike - current_price) * 0.1 + np.random.uniform(0.5, 3.0)),
-                            "delta": np.random.uniform(0.2, 0.8),
-                            "gamma": np.random.uniform(0.01, 0.05),
-                            "theta": -np.random.uniform(0.01, 0.05),
-                            "vega": np.random.uniform(0.1, 0.3),
-                            "iv": np.random.uniform(0.2, 0.6),
-                            "volume": np.random.randint(100, 1000),
-                            "open_interest": np.random.randint(50, 500)
-                        }
-            
-            # Put options
-            for exp in expirations[:3]:
-                for strike in strikes:
-                    if abs(strike - current_price) / current_price <= 0.15:
-                        key = f"{exp}_{strike}"
-                        options_data["puts"][key] = {
-                            "strike": strike,
-                            "expiration": exp,
-                            "premium": max(0.5, abs(strike - current_price) * 0.1 + np.random.uniform(0.5, 3.0)),
-                            "delta": -np.random.uniform(0.2, 0.8),
-                            "gamma": np.random.uniform(0.01, 0.05),
-                            "theta": -np.random.uniform(0.01, 0.05),
-                            "vega": np.random.uniform(0.1, 0.3),
-                            "iv": np.random.uniform(0.2, 0.6),
-                            "volume": np.random.randint(100, 1000),
-                            "open_interest": np.random.randint(50, 500)
-                        }
+            # ATM yakını (±%15) kontratlar, ilk 3 expiration: call + put tek çağrıda
+            near_strikes = [k for k in strikes if abs(k - current_price) / current_price <= 0.15]
+            grid = [(exp, days, strike)
+                    for exp, days in zip(expirations[:3], range(7, 46, 7))
+                    for strike in near_strikes]
+            if grid:
+                n = len(grid)
+                K = np.tile([strike for _, _, strike in grid], 2)
+                T = np.tile([days / 365.0 for _, days, _ in grid], 2)
+                is_call = np.repeat([True, False], n)
+                iv = np.random.uniform(0.2, 0.6, 2 * n)
+                priced = black_scholes(current_price, K, T, self.risk_free_rate, iv, is_call)
+                volume = np.random.randint(100, 1000, 2 * n)
+                open_interest = np.random.randint(50, 500, 2 * n)
+                
+                for i, (exp, _, strike) in enumerate(grid * 2):
+                    side = "calls" if i < n else "puts"
+                    options_data[side][f"{exp}_{strike}"] = {
+                        "strike": strike,
+                        "expiration": exp,
+                        "premium": float(priced["price"][i]),
+                        "delta": float(priced["delta"][i]),
+                        "gamma": float(priced["gamma"][i]),
+                        "theta": float(priced["theta"][i]),
+                        "vega": float(priced["vega"][i]),
+                        "iv": float(iv[i]),
+                        "volume": int(volume[i]),
+                        "open_interest": int(open_interest[i])
+                    }
             
             return options_data
             
@@ -15,6 +15,8 @@ import json
 from dataclasses import dataclass
 from enum import Enum
 
+from indicator_library import calculate_rsi
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -404,12 +406,7 @@ class USMarketScalpingRobot:
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """RSI hesapla"""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
+            return calculate_rsi(prices, period)
         except:
             return pd.Series([50] * len(prices), index=prices.index)
     
@@ -7,7 +7,6 @@ import asyncio
 import json
 import datetime
 import random
-import sqlite3
 import numpy as np
 import logging
 from collections import deque, defaultdict
@@ -21,6 +20,8 @@ try:
 except ImportError:
     print("⚠️ aiohttp veya websockets yok. Mock data kullanılacak.")
 
+from backend.signal_recorder import RollingAccuracy, SignalRecorder, broadcast as broadcast_payload
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -29,7 +30,7 @@ CLIENTS = set()
 DB_PATH = "ai_performance.db"
 
 # === STATE MEMORY ===
-HISTORY = deque(maxlen=1500)
+HISTORY = RollingAccuracy(1500)
 BEHAVIOR_HISTORY = deque(maxlen=300)
 WEIGHTS = defaultdict(lambda: 1.0)
 CONFIDENCE_BIAS = defaultdict(lambda: 0.0)
@@ -41,6 +42,7 @@ SENTIMENT_STATE = {"avg": 0.0, "trend": "Nötr"}
 EXPLORATION_RATE = 0.15
 LEARNING_RATE = 0.05
 PENALTY_DECAY = 0.95
+ROLLUP_INTERVAL = 120  # tick (5 sn)
 
 BIST_SYMBOLS = [
     "THYAO", "AKBNK", "GARAN", "EREGL", "SISE", "ASELS", "TUPRS",
@@ -50,10 +52,14 @@ BIST_SYMBOLS = [
 ]
 
 # === DATABASE ===
+SIGNAL_COLUMNS = (
+    "timestamp", "symbol", "price", "change", "signal", "confidence", "bias",
+    "weight", "risk_alloc", "regime", "sentiment", "reward", "success"
+)
+RECORDER = SignalRecorder(DB_PATH, SIGNAL_COLUMNS)
+
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
+    RECORDER.ensure_schema("""
         CREATE TABLE IF NOT EXISTS ai_signals (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp TEXT,
@@ -71,8 +77,6 @@ def init_db():
             success INTEGER
         )
     """)
-    conn.commit()
-    conn.close()
 
 # === KALMAN ===
 def kalman_update(symbol, observation):
@@ -221,8 +225,8 @@ async def fetch_bist_data(session, symbol):
 
 # === LOGGER ===
 def record_signals(ai_signals):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+    now = datetime.datetime.now().isoformat()
+    rows = []
     for s in ai_signals:
         expected = 1 if s["signal"] == "BUY" else -1 if s["signal"] == "SELL" else 0
         realized = 1 if s["change"] > 0 else -1 if s["change"] < 0 else 0
@@ -231,33 +235,20 @@ def record_signals(ai_signals):
         HISTORY.append(success)
         kalman_update(s["symbol"], success)
         
-        c.execute("""
-            INSERT INTO ai_signals (timestamp, symbol, price, change, signal, confidence, bias, weight, risk_alloc, regime, sentiment, reward, success)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            datetime.datetime.now().isoformat(),
+        rows.append((
+            now,
             s["symbol"], s["price"], s["change"], s["signal"],
             s["confidence"], s["bias"], s["weight"], s["risk_alloc"],
             s["regime"], s["sentiment"], reward, success
         ))
-    conn.commit()
-    conn.close()
+    RECORDER.write(rows)
 
 def get_accuracy():
-    if not HISTORY:
-        return 0
-    return round(sum(HISTORY) / len(HISTORY) * 100, 2)
+    return HISTORY.percent
 
 # === BROADCAST ===
 async def broadcast(message):
-    if not CLIENTS:
-        return
-    data = json.dumps(message, ensure_ascii=False)
-    for ws in list(CLIENTS):
-        try:
-            await ws.send(data)
-        except Exception:
-            CLIENTS.remove(ws)
+    await broadcast_payload(CLIENTS, message)
 
 async def generate_realtime_data():
     session = None
@@ -265,7 +256,9 @@ async def generate_realtime_data():
         session = aiohttp.ClientSession()
     
     try:
+        counter = 0
         while True:
+            counter += 1
             selected = random.sample(BIST_SYMBOLS, 8)
             
             if session:
@@ -279,7 +272,9 @@ async def generate_realtime_data():
             ai_signals = [generate_ai_signal(d["symbol"], d["price"], d["change"], regime, sentiment) for d in raw]
             
             record_signals(ai_signals)
-            acc = round(sum(HISTORY)/len(HISTORY)*100, 2) if HISTORY else 0
+            acc = get_accuracy()
+            if counter % ROLLUP_INTERVAL == 0:
+                await RECORDER.rollup_async()
             avg_bias = np.mean(list(CONFIDENCE_BIAS.values())) if CONFIDENCE_BIAS else 0
             
             message = {
@@ -313,15 +308,18 @@ async def handle_client(ws):
             except Exception:
                 pass
     finally:
-        CLIENTS.remove(ws)
+        CLIENTS.discard(ws)
         logger.info(f"❌ Client disconnected ({len(CLIENTS)} remaining)")
 
 async def main():
     import websockets
     init_db()
     logger.info(f"🚀 BIST AI Smart Trader v10.0 running on ws://localhost:{PORT}")
-    async with websockets.serve(handle_client, "localhost", PORT):
-        await generate_realtime_data()
+    try:
+        async with websockets.serve(handle_client, "localhost", PORT):
+            await generate_realtime_data()
+    finally:
+        RECORDER.close()
 
 if __name__ == "__main__":
     try:
@@ -2,7 +2,7 @@
 """
 BIST AI Smart Trader v11.0 - Cognitive Reinforcement Engine
 """
-import asyncio, json, datetime, random, sqlite3, numpy as np, logging
+import asyncio, datetime, random, numpy as np, logging
 from collections import deque, defaultdict
 
 # External deps
@@ -13,6 +13,9 @@ except ImportError:
     print("⚠️ Dependencies missing, using mock")
     EXTERNAL_DEPS = False
 
+from backend.indicator_library import indicator_engine
+from backend.signal_recorder import RollingAccuracy, SignalRecorder, broadcast as broadcast_payload
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -21,7 +24,7 @@ CLIENTS = set()
 DB_PATH = "ai_performance.db"
 
 # Memory systems
-HISTORY = deque(maxlen=2000)
+HISTORY = RollingAccuracy(2000)
 REPLAY_MEMORY = deque(maxlen=500)
 BEHAVIOR_HISTORY = deque(maxlen=300)
 CONFIDENCE_BIAS = defaultdict(lambda: 0.0)
@@ -36,6 +39,7 @@ LEARNING_RATE = 0.05
 PENALTY_DECAY = 0.95
 REPLAY_INTERVAL = 60
 REWARD_MEMORY_WEIGHT = 0.8
+ROLLUP_INTERVAL = 120
 
 BIST_SYMBOLS = [
     "THYAO","AKBNK","GARAN","EREGL","SISE","ASELS","TUPRS","BIMAS","KCHOL","SAHOL",
@@ -43,10 +47,12 @@ BIST_SYMBOLS = [
     "PGSUS","ENJSA","SASA","KORDS","AKSEN"
 ]
 
+SIGNAL_COLUMNS = ("timestamp","symbol","price","change","signal","confidence","bias","weight",
+                  "risk_alloc","regime","sentiment","reward","success")
+RECORDER = SignalRecorder(DB_PATH, SIGNAL_COLUMNS)
+
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
+    RECORDER.ensure_schema("""
     CREATE TABLE IF NOT EXISTS ai_signals (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         timestamp TEXT,
@@ -63,15 +69,11 @@ def init_db():
         reward REAL,
         success INTEGER
     )""")
-    conn.commit(); conn.close()
 
-def calculate_rsi(prices, period=14):
-    if len(prices) < period: return 50
-    deltas = np.diff(prices)
-    gain, loss = deltas[deltas>0].sum()/period, abs(deltas[deltas<0].sum())/period
-    if loss == 0: return 100
-    rs = gain/loss
-    return 100 - (100/(1+rs))
+def calculate_rsi(symbol, price):
+    # Sembol başına streaming RSI: her tick O(1), ısınana kadar nötr 50
+    rsi = indicator_engine.update(symbol, price)['rsi']
+    return 50 if rsi is None else rsi
 
 def detect_market_regime(changes):
     avg, vol, mom = np.mean(changes), np.std(changes), np.sum(np.sign(changes))
@@ -130,8 +132,7 @@ def normalize_portfolio():
     for s in RISK_PROFILE: RISK_PROFILE[s]=round(RISK_PROFILE[s]/total,3)
 
 def generate_signal(symbol, price, change, regime, sentiment):
-    prices=[price+random.uniform(-2,2) for _ in range(15)]
-    rsi=calculate_rsi(prices); mom=random.uniform(-3,3)
+    rsi=calculate_rsi(symbol, price); mom=random.uniform(-3,3)
     explore=random.random()<EXPLORATION_RATE
     signal=random.choice(["BUY","SELL","HOLD"]) if explore else \
         ("BUY" if rsi>55 and mom>0 else "SELL" if rsi<45 else "HOLD")
@@ -145,28 +146,23 @@ def generate_signal(symbol, price, change, regime, sentiment):
             "regime":regime,"sentiment":sentiment}
 
 def record(ai_signals):
-    conn=sqlite3.connect(DB_PATH); c=conn.cursor()
+    now=datetime.datetime.now().isoformat(); rows=[]
     for s in ai_signals:
         exp=1 if s["signal"]=="BUY" else -1 if s["signal"]=="SELL" else 0
         real=1 if s["change"]>0 else -1 if s["change"]<0 else 0
         success=int(exp==real); reward=behavior_update(s["symbol"],success)
         kalman_update(s["symbol"],success)
         HISTORY.append(success)
-        c.execute("""INSERT INTO ai_signals VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-                  (None,datetime.datetime.now().isoformat(),s["symbol"],s["price"],s["change"],s["signal"],
-                   s["confidence"],s["bias"],s["weight"],s["risk"],s["regime"],s["sentiment"],reward,success))
-    conn.commit(); conn.close()
+        rows.append((now,s["symbol"],s["price"],s["change"],s["signal"],
+                     s["confidence"],s["bias"],s["weight"],s["risk"],s["regime"],s["sentiment"],reward,success))
+    RECORDER.write(rows)
 
 async def fetch_bist_data(session,sym):
     base=random.uniform(20,250)
     return {"symbol":sym,"price":base,"change":random.uniform(-3,3)}
 
 async def broadcast(msg):
-    if not CLIENTS: return
-    data=json.dumps(msg,ensure_ascii=False)
-    for ws in list(CLIENTS):
-        try: await ws.send(data)
-        except: CLIENTS.remove(ws)
+    await broadcast_payload(CLIENTS,msg)
 
 async def realtime_loop():
     session = None
@@ -183,9 +179,10 @@ async def realtime_loop():
             sentiment=await fetch_sentiment()
             signals=[generate_signal(r["symbol"],r["price"],r["change"],regime,sentiment) for r in raw]
             record(signals)
-            acc=round(sum(HISTORY)/len(HISTORY)*100,2) if HISTORY else 0
+            acc=HISTORY.percent
             bias_avg=np.mean(list(CONFIDENCE_BIAS.values())) if CONFIDENCE_BIAS else 0
             if counter%REPLAY_INTERVAL==0: replay_learning()
+            if counter%ROLLUP_INTERVAL==0: await RECORDER.rollup_async()
             msg={"type":"market_update","timestamp":datetime.datetime.now().isoformat(),
                  "market":"BIST","regime":regime,"ai_accuracy":acc,"bias_avg":round(bias_avg,3),
                  "sentiment":SENTIMENT_STATE,"portfolio":dict(RISK_PROFILE),"signals":signals}
@@ -201,15 +198,18 @@ async def handle_client(ws):
     try:
         async for _ in ws: pass
     finally:
-        CLIENTS.remove(ws)
+        CLIENTS.discard(ws)
         logger.info(f"❌ Client disconnected ({len(CLIENTS)} remaining)")
 
 async def main():
     import websockets
     init_db()
     logger.info(f"🚀 BIST AI Smart Trader v11.0 running on ws://localhost:{PORT}")
-    async with websockets.serve(handle_client,"0.0.0.0",PORT):
-        await realtime_loop()
+    try:
+        async with websockets.serve(handle_client,"0.0.0.0",PORT):
+            await realtime_loop()
+    finally:
+        RECORDER.close()
 
 if __name__=="__main__":
     try:
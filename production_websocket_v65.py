@@ -8,9 +8,8 @@ import json
 import datetime
 import random
 import websockets
-import sqlite3
 import numpy as np
-from collections import deque, defaultdict
+from collections import defaultdict
 
 # External dependencies check
 EXTERNAL_DEPS_AVAILABLE = False
@@ -21,6 +20,8 @@ except ImportError:
     print("⚠️ aiohttp yok. Mock data kullanılacak.")
 
 import logging
+from backend.signal_recorder import RollingAccuracy, SignalRecorder, broadcast as broadcast_payload
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -29,9 +30,10 @@ CLIENTS = set()
 DB_PATH = "ai_performance.db"
 
 # AI memory
-HISTORY = deque(maxlen=500)
+HISTORY = RollingAccuracy(500)
 WEIGHTS = defaultdict(lambda: 1.0)
 KALMAN_STATE = defaultdict(lambda: {"mean": 1.0, "var": 0.05})
+ROLLUP_INTERVAL = 120  # tick (5 sn)
 
 BIST_SYMBOLS = [
     "THYAO", "AKBNK", "GARAN", "EREGL", "SISE", "ASELS", "TUPRS",
@@ -41,10 +43,11 @@ BIST_SYMBOLS = [
 ]
 
 # === Database setup ===
+SIGNAL_COLUMNS = ("timestamp", "symbol", "price", "change", "signal", "confidence", "weight", "success")
+RECORDER = SignalRecorder(DB_PATH, SIGNAL_COLUMNS)
+
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
+    RECORDER.ensure_schema("""
         CREATE TABLE IF NOT EXISTS ai_signals (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp TEXT,
@@ -57,8 +60,6 @@ def init_db():
             success INTEGER
         )
     """)
-    conn.commit()
-    conn.close()
 
 # === Kalman Filter ===
 def kalman_update(symbol, observation):
@@ -149,8 +150,8 @@ async def fetch_bist_data(session, symbol):
 
 # === Data logging ===
 def record_signals(ai_signals):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+    now = datetime.datetime.now().isoformat()
+    rows = []
     for s in ai_signals:
         expected = 1 if s["signal"] == "BUY" else -1 if s["signal"] == "SELL" else 0
         realized = 1 if s["change"] > 0 else -1 if s["change"] < 0 else 0
@@ -160,32 +161,19 @@ def record_signals(ai_signals):
         # Kalman öğrenme
         kalman_update(s["symbol"], success)
 
-        c.execute("""
-            INSERT INTO ai_signals (timestamp, symbol, price, change, signal, confidence, weight, success)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            datetime.datetime.now().isoformat(),
+        rows.append((
+            now,
             s["symbol"], s["price"], s["change"],
             s["signal"], s["confidence"], s["weight"], success
         ))
-    conn.commit()
-    conn.close()
+    RECORDER.write(rows)
 
 def get_global_accuracy():
-    if not HISTORY:
-        return 0
-    return round(sum(HISTORY) / len(HISTORY) * 100, 2)
+    return HISTORY.percent
 
 # === Main loop ===
 async def broadcast(message):
-    if not CLIENTS:
-        return
-    data = json.dumps(message, ensure_ascii=False)
-    for ws in list(CLIENTS):
-        try:
-            await ws.send(data)
-        except Exception:
-            CLIENTS.remove(ws)
+    await broadcast_payload(CLIENTS, message)
 
 async def generate_realtime_data():
     session = None
@@ -193,7 +181,9 @@ async def generate_realtime_data():
         session = aiohttp.ClientSession()
     
     try:
+        counter = 0
         while True:
+            counter += 1
             selected = random.sample(BIST_SYMBOLS, 6)
             
             if session:
@@ -205,6 +195,8 @@ async def generate_realtime_data():
 
             record_signals(ai_signals)
             accuracy = get_global_accuracy()
+            if counter % ROLLUP_INTERVAL == 0:
+                await RECORDER.rollup_async()
 
             avg_weight = np.mean([s["weight"] for s in ai_signals])
             message = {
@@ -235,14 +227,17 @@ async def handle_client(ws):
             except Exception:
                 pass
     finally:
-        CLIENTS.remove(ws)
+        CLIENTS.discard(ws)
         logger.info(f"❌ Client disconnected ({len(CLIENTS)} remaining)")
 
 async def main():
     init_db()
     logger.info(f"🚀 BIST AI Smart Trader v6.5 running on ws://localhost:{PORT}")
-    async with websockets.serve(handle_client, "localhost", PORT):
-        await generate_realtime_data()
+    try:
+        async with websockets.serve(handle_client, "localhost", PORT):
+            await generate_realtime_data()
+    finally:
+        RECORDER.close()
 
 if __name__ == "__main__":
     try:
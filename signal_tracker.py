@@ -2,99 +2,107 @@
 """
 AI Trading Sinyalleri Doğruluk Takip Sistemi
 Gerçek performansı ölçmek için sinyalleri kaydeder ve istatistik tutar
+
+Tek kalıcı WAL bağlantısı kullanılır; sembol istatistikleri bellekte
+artımlı sayaçlarla tutulur ve statistics tablosuna upsert edilir.
 """
 
 import json
+import math
 import sqlite3
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 import os
 
 class SignalTracker:
     def __init__(self, db_path: str = "signal_tracker.db"):
         self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        # symbol -> {'total_signals', 'correct_signals', 'last_updated'}
+        self._stats: Dict[str, Dict] = {}
         self.init_database()
     
     def init_database(self):
         """Veritabanını başlat"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Sinyaller tablosu
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS signals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT NOT NULL,
-                signal TEXT NOT NULL,
-                confidence REAL NOT NULL,
-                price REAL NOT NULL,
-                timestamp TEXT NOT NULL,
-                prediction_date TEXT NOT NULL,
-                target_date TEXT NOT NULL,
-                actual_price REAL DEFAULT NULL,
-                actual_change REAL DEFAULT NULL,
-                is_correct INTEGER DEFAULT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # İstatistikler tablosu
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS statistics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT NOT NULL,
-                total_signals INTEGER DEFAULT 0,
-                correct_signals INTEGER DEFAULT 0,
-                accuracy_rate REAL DEFAULT 0.0,
-                last_updated TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            
+            # Sinyaller tablosu
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS signals (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    signal TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    price REAL NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    prediction_date TEXT NOT NULL,
+                    target_date TEXT NOT NULL,
+                    actual_price REAL DEFAULT NULL,
+                    actual_change REAL DEFAULT NULL,
+                    is_correct INTEGER DEFAULT NULL,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # İstatistikler tablosu
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS statistics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    total_signals INTEGER DEFAULT 0,
+                    correct_signals INTEGER DEFAULT 0,
+                    accuracy_rate REAL DEFAULT 0.0,
+                    last_updated TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # İndeksler: sembol/durum/zaman sorguları ve bekleyen sinyaller
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_signals_symbol_status_ts
+                ON signals (symbol, is_correct, timestamp)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_signals_pending
+                ON signals (target_date) WHERE actual_price IS NULL
+            ''')
+            
+            # Eski sürüm INSERT OR REPLACE ile yinelenen satırlar bırakmış olabilir
+            cursor.execute('''
+                DELETE FROM statistics
+                WHERE id NOT IN (SELECT MAX(id) FROM statistics GROUP BY symbol)
+            ''')
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_statistics_symbol
+                ON statistics (symbol)
+            ''')
+            
+            # Sayaçları tek geçişte yükle
+            cursor.execute('''
+                SELECT symbol, COUNT(*), SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END)
+                FROM signals WHERE is_correct IS NOT NULL
+                GROUP BY symbol
+            ''')
+            now = datetime.now().isoformat()
+            self._stats = {
+                symbol: {'total_signals': total, 'correct_signals': correct or 0, 'last_updated': now}
+                for symbol, total, correct in cursor.fetchall()
+            }
     
-    def save_signal(self, symbol: str, signal: str, confidence: float, 
-                   price: float, prediction_days: int = 1) -> int:
-        """Yeni sinyal kaydet"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        now = datetime.now()
-        prediction_date = now.strftime('%Y-%m-%d %H:%M:%S')
-        target_date = (now + timedelta(days=prediction_days)).strftime('%Y-%m-%d %H:%M:%S')
-        
-        cursor.execute('''
-            INSERT INTO signals (symbol, signal, confidence, price, timestamp, 
-                               prediction_date, target_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (symbol, signal, confidence, price, now.isoformat(), 
-              prediction_date, target_date))
-        
-        signal_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        print(f"✅ Sinyal kaydedildi: {symbol} {signal} - ID: {signal_id}")
-        return signal_id
+    def close(self):
+        """Bağlantıyı kapat"""
+        with self._lock:
+            self._conn.close()
     
-    def update_result(self, signal_id: int, actual_price: float):
-        """Sinyal sonucunu güncelle"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Orijinal sinyali al
-        cursor.execute('SELECT symbol, signal, price FROM signals WHERE id = ?', (signal_id,))
-        result = cursor.fetchone()
-        
-        if not result:
-            print(f"❌ Sinyal bulunamadı: {signal_id}")
-            conn.close()
-            return
-        
-        symbol, signal, original_price = result
+    @staticmethod
+    def _evaluate(signal: str, original_price: float, actual_price: float) -> Tuple[float, Optional[int]]:
+        """Gerçekleşen değişim ve doğruluk"""
         actual_change = ((actual_price - original_price) / original_price) * 100
         
-        # Doğruluk kontrolü
         is_correct = None
         if signal == 'BUY':
             is_correct = 1 if actual_change > 0 else 0
@@ -103,96 +111,223 @@ class SignalTracker:
         elif signal == 'HOLD':
             is_correct = 1 if abs(actual_change) < 1.0 else 0  # %1'den az değişim
         
-        # Sonucu güncelle
-        cursor.execute('''
+        return actual_change, is_correct
+    
+    def save_signal(self, symbol: str, signal: str, confidence: float, 
+                   price: float, prediction_days: int = 1) -> int:
+        """Yeni sinyal kaydet"""
+        signal_id = self.save_signals([(symbol, signal, confidence, price)], prediction_days)[0]
+        if signal_id is None:
+            raise ValueError(f"Geçersiz sinyal: {symbol} {signal} {confidence} {price}")
+        print(f"✅ Sinyal kaydedildi: {symbol} {signal} - ID: {signal_id}")
+        return signal_id
+    
+    @staticmethod
+    def _clean_signal(item: Union[Mapping[str, Any], Tuple]) -> Optional[Tuple[str, str, float, float]]:
+        """Sinyali doğrula: (symbol, signal, confidence, price) ya da geçersizse None"""
+        try:
+            if isinstance(item, Mapping):
+                symbol, signal, confidence, price = (item.get(k) for k in ('symbol', 'signal', 'confidence', 'price'))
+            else:
+                symbol, signal, confidence, price = item
+            confidence, price = float(confidence), float(price)
+        except (TypeError, ValueError):
+            return None
+        if not symbol or not isinstance(symbol, str) or not signal or not isinstance(signal, str):
+            return None
+        if not math.isfinite(confidence) or not math.isfinite(price) or price <= 0:
+            return None
+        return symbol, signal, confidence, price
+    
+    def save_signals(self, signals: Iterable[Union[Mapping[str, Any], Tuple]],
+                     prediction_days: int = 1) -> List[Optional[int]]:
+        """
+        Toplu sinyal kaydı (tek transaction)
+        
+        Öğeler (symbol, signal, confidence, price) tuple'ı ya da bu anahtarlara sahip
+        dict olabilir. Geçersiz öğeler atlanır (id yerine None), geri kalanı kaydedilir.
+        """
+        now = datetime.now()
+        prediction_date = now.strftime('%Y-%m-%d %H:%M:%S')
+        target_date = (now + timedelta(days=prediction_days)).strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = now.isoformat()
+        
+        cleaned = [self._clean_signal(item) for item in signals]
+        rows = [row + (timestamp, prediction_date, target_date) for row in cleaned if row is not None]
+        skipped = len(cleaned) - len(rows)
+        if skipped:
+            print(f"⚠️ {skipped} geçersiz sinyal atlandı")
+        if not rows:
+            return [None] * len(cleaned)
+        
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            # executemany lastrowid vermez; AUTOINCREMENT id'ler ardışık
+            cursor.executemany('''
+                INSERT INTO signals (symbol, signal, confidence, price, timestamp, 
+                                   prediction_date, target_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+        
+        ids = iter(range(last_id - len(rows) + 1, last_id + 1))
+        return [next(ids) if row is not None else None for row in cleaned]
+    
+    def _apply_results(self, cursor: sqlite3.Cursor, resolved: List[Tuple]) -> Dict[str, Dict]:
+        """
+        Sonuçları yaz ve sayaçları artımlı güncelle
+        
+        resolved: (signal_id, symbol, actual_price, actual_change, is_correct, previous_is_correct)
+        """
+        cursor.executemany('''
             UPDATE signals 
             SET actual_price = ?, actual_change = ?, is_correct = ?
             WHERE id = ?
-        ''', (actual_price, actual_change, is_correct, signal_id))
-        
-        conn.commit()
-        conn.close()
+        ''', [(price, change, correct, signal_id) for signal_id, _, price, change, correct, _ in resolved])
+        
+        now = datetime.now().isoformat()
+        touched = {}
+        for _, symbol, _, _, correct, previous in resolved:
+            stats = self._stats.setdefault(symbol, {'total_signals': 0, 'correct_signals': 0, 'last_updated': now})
+            # Yeniden değerlendirilen sinyalin eski sonucu geri alınır
+            if previous is not None:
+                stats['total_signals'] -= 1
+                stats['correct_signals'] -= previous
+            if correct is not None:
+                stats['total_signals'] += 1
+                stats['correct_signals'] += correct
+            stats['last_updated'] = now
+            touched[symbol] = stats
+        
+        cursor.executemany('''
+            INSERT INTO statistics (symbol, total_signals, correct_signals, accuracy_rate, last_updated)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(symbol) DO UPDATE SET
+                total_signals = excluded.total_signals,
+                correct_signals = excluded.correct_signals,
+                accuracy_rate = excluded.accuracy_rate,
+                last_updated = excluded.last_updated
+        ''', [
+            (symbol, stats['total_signals'], stats['correct_signals'],
+             self._accuracy(stats), stats['last_updated'])
+            for symbol, stats in touched.items() if stats['total_signals'] > 0
+        ])
+        return touched
+    
+    @staticmethod
+    def _accuracy(stats: Dict) -> float:
+        total = stats['total_signals']
+        return (stats['correct_signals'] / total) * 100 if total > 0 else 0.0
+    
+    def update_result(self, signal_id: int, actual_price: float):
+        """Sinyal sonucunu güncelle"""
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            
+            # Orijinal sinyali al
+            cursor.execute('SELECT symbol, signal, price, is_correct FROM signals WHERE id = ?', (signal_id,))
+            result = cursor.fetchone()
+            
+            if not result:
+                print(f"❌ Sinyal bulunamadı: {signal_id}")
+                return
+            
+            symbol, signal, original_price, previous = result
+            actual_change, is_correct = self._evaluate(signal, original_price, actual_price)
+            
+            # Sonucu ve istatistikleri aynı transaction'da güncelle
+            self._apply_results(cursor, [(signal_id, symbol, actual_price, actual_change, is_correct, previous)])
         
         print(f"📊 Sonuç güncellendi: {symbol} {signal} -> {actual_change:.2f}% ({'✅' if is_correct else '❌'})")
-        
-        # İstatistikleri güncelle
-        self.update_statistics(symbol)
     
-    def update_statistics(self, symbol: str):
-        """Sembol istatistiklerini güncelle"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def update_results(self, prices: Dict[str, float]) -> Dict:
+        """Vadesi gelen tüm bekleyen sinyalleri fiyat anlık görüntüsüyle tek transaction'da sonuçlandır"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        # Toplam ve doğru sinyal sayısını hesapla
-        cursor.execute('''
-            SELECT COUNT(*), SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END)
-            FROM signals 
-            WHERE symbol = ? AND is_correct IS NOT NULL
-        ''', (symbol,))
-        
-        total, correct = cursor.fetchone()
-        
-        if total > 0:
-            accuracy = (correct / total) * 100
-            
-            # İstatistikleri güncelle veya ekle
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             cursor.execute('''
-                INSERT OR REPLACE INTO statistics (symbol, total_signals, correct_signals, accuracy_rate, last_updated)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (symbol, total, correct, accuracy, datetime.now().isoformat()))
-        
-        conn.commit()
-        conn.close()
+                SELECT id, symbol, signal, price
+                FROM signals 
+                WHERE actual_price IS NULL AND target_date <= ?
+            ''', (now,))
+            
+            resolved = []
+            for signal_id, symbol, signal, original_price in cursor.fetchall():
+                actual_price = prices.get(symbol)
+                if actual_price is None or actual_price <= 0:
+                    continue
+                actual_change, is_correct = self._evaluate(signal, original_price, actual_price)
+                resolved.append((signal_id, symbol, actual_price, actual_change, is_correct, None))
+            
+            touched = self._apply_results(cursor, resolved) if resolved else {}
+        
+        correct = sum(1 for row in resolved if row[4] == 1)
+        print(f"📊 {len(resolved)} sinyal sonuçlandı ({correct} doğru, {len(touched)} sembol)")
+        return {
+            'resolved': len(resolved),
+            'correct': correct,
+            'symbols': sorted(touched),
+            'timestamp': datetime.now().isoformat()
+        }
     
-    def get_statistics(self, symbol: Optional[str] = None) -> Dict:
-        """İstatistikleri getir"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if symbol:
+    def update_statistics(self, symbol: str):
+        """Sembol istatistiklerini tablodan yeniden hesapla (sayaç düzeltmesi için)"""
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             cursor.execute('''
-                SELECT symbol, total_signals, correct_signals, accuracy_rate, last_updated
-                FROM statistics WHERE symbol = ?
+                SELECT COUNT(*), SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END)
+                FROM signals 
+                WHERE symbol = ? AND is_correct IS NOT NULL
             ''', (symbol,))
-        else:
-            cursor.execute('''
-                SELECT symbol, total_signals, correct_signals, accuracy_rate, last_updated
-                FROM statistics ORDER BY accuracy_rate DESC
-            ''')
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        stats = {}
-        for row in results:
-            symbol_name, total, correct, accuracy, last_updated = row
-            stats[symbol_name] = {
-                'total_signals': total,
-                'correct_signals': correct,
-                'accuracy_rate': accuracy,
-                'last_updated': last_updated
+            total, correct = cursor.fetchone()
+            
+            if total > 0:
+                stats = {'total_signals': total, 'correct_signals': correct or 0,
+                         'last_updated': datetime.now().isoformat()}
+                self._stats[symbol] = stats
+                cursor.execute('''
+                    INSERT INTO statistics (symbol, total_signals, correct_signals, accuracy_rate, last_updated)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(symbol) DO UPDATE SET
+                        total_signals = excluded.total_signals,
+                        correct_signals = excluded.correct_signals,
+                        accuracy_rate = excluded.accuracy_rate,
+                        last_updated = excluded.last_updated
+                ''', (symbol, total, stats['correct_signals'], self._accuracy(stats), stats['last_updated']))
+    
+    def get_statistics(self, symbol: Optional[str] = None) -> Dict:
+        """İstatistikleri getir (bellekteki sayaçlardan)"""
+        with self._lock:
+            if symbol:
+                items = [(symbol, self._stats[symbol])] if symbol in self._stats else []
+            else:
+                items = sorted(self._stats.items(), key=lambda item: self._accuracy(item[1]), reverse=True)
+            
+            return {
+                symbol_name: {
+                    'total_signals': stats['total_signals'],
+                    'correct_signals': stats['correct_signals'],
+                    'accuracy_rate': self._accuracy(stats),
+                    'last_updated': stats['last_updated']
+                }
+                for symbol_name, stats in items
+                if stats['total_signals'] > 0
             }
-        
-        return stats
     
     def get_pending_signals(self) -> List[Dict]:
         """Sonuç bekleyen sinyalleri getir"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, symbol, signal, confidence, price, prediction_date, target_date
-            FROM signals 
-            WHERE actual_price IS NULL AND target_date <= ?
-            ORDER BY target_date ASC
-        ''', (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),))
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        pending = []
-        for row in results:
-            pending.append({
+        with self._lock:
+            cursor = self._conn.execute('''
+                SELECT id, symbol, signal, confidence, price, prediction_date, target_date
+                FROM signals 
+                WHERE actual_price IS NULL AND target_date <= ?
+                ORDER BY target_date ASC
+            ''', (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),))
+            results = cursor.fetchall()
+        
+        return [
+            {
                 'id': row[0],
                 'symbol': row[1],
                 'signal': row[2],
@@ -200,35 +335,23 @@ class SignalTracker:
                 'price': row[4],
                 'prediction_date': row[5],
                 'target_date': row[6]
-            })
-        
-        return pending
+            }
+            for row in results
+        ]
     
     def export_report(self) -> str:
         """Detaylı rapor oluştur"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Genel istatistikler
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total_signals,
-                SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct_signals,
-                AVG(CASE WHEN is_correct IS NOT NULL THEN is_correct ELSE NULL END) * 100 as overall_accuracy
-            FROM signals WHERE is_correct IS NOT NULL
-        ''')
-        
-        general_stats = cursor.fetchone()
-        
-        # Sembol bazında istatistikler
-        cursor.execute('''
-            SELECT symbol, total_signals, correct_signals, accuracy_rate
-            FROM statistics ORDER BY accuracy_rate DESC
-        ''')
-        
-        symbol_stats = cursor.fetchall()
-        
-        conn.close()
+        with self._lock:
+            total = sum(stats['total_signals'] for stats in self._stats.values())
+            correct = sum(stats['correct_signals'] for stats in self._stats.values())
+            overall_accuracy = correct / total if total else None
+            general_stats = (total, correct, overall_accuracy)
+            
+            # Sembol bazında istatistikler
+            symbol_stats = [
+                (symbol, data['total_signals'], data['correct_signals'], data['accuracy_rate'])
+                for symbol, data in self.get_statistics().items()
+            ]
         
         # Rapor oluştur
         report = f"""
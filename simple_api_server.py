@@ -20,6 +20,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from backend.indicator_library import calculate_rsi
+
 try:
     from backend.services.user_service import user_service
     from backend.services.realtime_data import realtime_service, get_realtime_price
@@ -601,6 +603,10 @@ async def get_option_chain(
         if options_analyzer is None:
             return {"error": "Options analyzer not available"}
         
+        if expiration == "all":
+            # Tüm vadeler tek fiyatlama çağrısında
+            return await options_analyzer.analyze_full_chain(symbol)
+        
         if not expiration:
             # Use next month expiration as default
             next_month = datetime.now() + timedelta(days=30)
@@ -1630,11 +1636,7 @@ async def bulk_analyze(request: dict):
 
 def _calculate_rsi(prices, period=14):
     """RSI hesapla"""
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
+    rsi = calculate_rsi(prices, period)
     return rsi.iloc[-1] if not pd.isna(rsi.iloc[-1]) else 50
 
 def _calculate_macd(prices, fast=12, slow=26, signal=9):
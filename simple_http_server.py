@@ -3356,17 +3356,12 @@ class BISTAIHandler(BaseHTTPRequestHandler):
             
             # Sinyalleri takip sistemine kaydet
             if SIGNAL_TRACKING_AVAILABLE:
-                for signal in signals:
-                    try:
-                        signal_tracker.save_signal(
-                            symbol=signal['symbol'],
-                            signal=signal['signal'],
-                            confidence=signal['confidence'],
-                            price=signal['price'],
-                            prediction_days=1
-                        )
-                    except Exception as e:
-                        print(f"⚠️ Sinyal kaydetme hatası: {e}")
+                try:
+                    # Tek transaction'da toplu kayıt
+                    # Eksik/bozuk sinyaller save_signals içinde atlanır
+                    signal_tracker.save_signals(signals, prediction_days=1)
+                except Exception as e:
+                    print(f"⚠️ Sinyal kaydetme hatası: {e}")
             
             return self.send_json_response({
                 'signals': signals,
@@ -3448,17 +3443,12 @@ class BISTAIHandler(BaseHTTPRequestHandler):
             
             # Sinyalleri takip sistemine kaydet
             if SIGNAL_TRACKING_AVAILABLE:
-                for signal in signals:
-                    try:
-                        signal_tracker.save_signal(
-                            symbol=signal['symbol'],
-                            signal=signal['signal'],
-                            confidence=signal['confidence'],
-                            price=signal['price'],
-                            prediction_days=1
-                        )
-                    except Exception as e:
-                        print(f"⚠️ BIST sinyal kaydetme hatası: {e}")
+                try:
+                    # Tek transaction'da toplu kayıt
+                    # Eksik/bozuk sinyaller save_signals içinde atlanır
+                    signal_tracker.save_signals(signals, prediction_days=1)
+                except Exception as e:
+                    print(f"⚠️ BIST sinyal kaydetme hatası: {e}")
             
             return self.send_json_response({
                 'success': True,
@@ -17,6 +17,8 @@ except ImportError:
     TALIB_AVAILABLE = False
     print("⚠️ ta-lib kütüphanesi bulunamadı, mock implementasyon kullanılıyor")
 
+from backend.candlestick_engine import CandleFeatures, CandlestickEngine
+
 class TechnicalPatternProvider:
     def __init__(self):
         # Formasyon türleri
@@ -172,19 +174,25 @@ class TechnicalPatternProvider:
         try:
             patterns = []
             
+            # Son 5 gün + engulfing için bir önceki mum: maskeler tek seferde
+            window = ohlc_data.iloc[max(0, len(ohlc_data) - 6):]
+            offset = len(ohlc_data) - len(window)
+            features = CandleFeatures.from_arrays(window['Open'], window['High'], window['Low'], window['Close'])
+            with np.errstate(invalid='ignore'):
+                hammer = CandlestickEngine.hammer(features, require_body=False)
+                shooting_star = CandlestickEngine.shooting_star(features, require_body=False)
+                doji = features.body < features.range * 0.1
+                bullish_engulfing = CandlestickEngine.bullish_engulfing(features)
+                bearish_engulfing = CandlestickEngine.bearish_engulfing(features)
+            
             # Son 5 günü kontrol et
             for i in range(max(0, len(ohlc_data) - 5), len(ohlc_data)):
                 timestamp = ohlc_data.index[i]
                 row = ohlc_data.iloc[i]
-                
-                # Basit formasyon tespiti
-                body_size = abs(row['Close'] - row['Open'])
-                total_range = row['High'] - row['Low']
-                upper_shadow = row['High'] - max(row['Open'], row['Close'])
-                lower_shadow = min(row['Open'], row['Close']) - row['Low']
+                k = i - offset
                 
                 # Hammer tespiti
-                if lower_shadow > 2 * body_size and upper_shadow < body_size * 0.5:
+                if hammer[k]:
                         patterns.append({
                             'pattern': 'HAMMER',
                             'type': 'candlestick',
@@ -196,7 +204,7 @@ class TechnicalPatternProvider:
                         })
                 
                 # Shooting Star tespiti
-                elif upper_shadow > 2 * body_size and lower_shadow < body_size * 0.5:
+                elif shooting_star[k]:
                     patterns.append({
                         'pattern': 'SHOOTING_STAR',
                         'type': 'candlestick',
@@ -208,7 +216,7 @@ class TechnicalPatternProvider:
                     })
                 
                 # Doji tespiti
-                elif body_size < total_range * 0.1:
+                elif doji[k]:
                     patterns.append({
                         'pattern': 'DOJI',
                         'type': 'candlestick',
@@ -221,15 +229,8 @@ class TechnicalPatternProvider:
                 
                 # Engulfing tespiti (basit)
                 if i > 0:
-                    prev_row = ohlc_data.iloc[i-1]
-                    prev_body = abs(prev_row['Close'] - prev_row['Open'])
-                    current_body = abs(row['Close'] - row['Open'])
-                    
                     # Bullish Engulfing
-                    if (prev_row['Close'] < prev_row['Open'] and  # Önceki mum bearish
-                        row['Close'] > row['Open'] and  # Şimdiki mum bullish
-                        row['Open'] < prev_row['Close'] and  # Açılış önceki kapanıştan düşük
-                        row['Close'] > prev_row['Open']):  # Kapanış önceki açılıştan yüksek
+                    if bullish_engulfing[k]:
                         
                         patterns.append({
                             'pattern': 'BULLISH_ENGULFING',
@@ -242,10 +243,7 @@ class TechnicalPatternProvider:
                         })
                     
                     # Bearish Engulfing
-                    elif (prev_row['Close'] > prev_row['Open'] and  # Önceki mum bullish
-                          row['Close'] < row['Open'] and  # Şimdiki mum bearish
-                          row['Open'] > prev_row['Close'] and  # Açılış önceki kapanıştan yüksek
-                          row['Close'] < prev_row['Open']):  # Kapanış önceki açılıştan düşük
+                    elif bearish_engulfing[k]:
                         
                         patterns.append({
                             'pattern': 'BEARISH_ENGULFING',